@@ -50,6 +50,13 @@ def powmod_vector_nogil(index, vector, e, m):
     result = gmpy2.powmod_base_list(vector, e, m)
     return time.time() - start, index, result
 
+# This function lets powmod_base_list split the work across its own native
+# threads. No partitioning or executor is needed.
+def powmod_vector_threads(big_list, e, m, threads):
+    start = time.time()
+    result = gmpy2.powmod_base_list(big_list, e, m, threads=threads)
+    return time.time() - start, result
+
 # Run threaded versions.
 def run_test(function, big_list, e, m, threads, release_gil = True):
     over_split = 8
@@ -84,6 +91,11 @@ if __name__ == "__main__":
             print("Number of threads: ", t, end = '')
             print(" Wall time, CPU time: ", run_test(powmod_list_nogil, big_list, e, m, t, True))
 
+    # Use the thread pool that is built into powmod_base_list.
+    for t in test_threads:
+        print("Number of internal threads: ", t, end = '')
+        print(" Wall time: ", powmod_vector_threads(big_list, e, m, t)[0])
+
     # Repeat the tests multiple times to try to trigger a crash.
     for i in range(100):
         print("Threaded, vector-based, releasing the GIL, pass: ", i + 1)
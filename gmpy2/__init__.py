@@ -5,6 +5,6 @@ from .gmpy2 import __version__
 # at the top level.
 # Use try...except to for static builds were _C_API is not available.
 try:
-    from .gmpy2 import _C_API, _mpmath_normalize, _mpmath_create
+    from .gmpy2 import _C_API, _mpmath_normalize, _mpmath_create, _from_limbs
 except ImportError:
-    from .gmpy2 import _mpmath_normalize, _mpmath_create
+    from .gmpy2 import _mpmath_normalize, _mpmath_create, _from_limbs
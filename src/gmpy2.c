@@ -127,8 +127,22 @@ versions of the GMP, MPFR, and MPC libraries are also licensed under \
 LGPL 3 or later.";
 
 /* The following global structures are used by gmpy_cache.c.
+ *
+ * On the free-threaded build of CPython, each thread has its own caches so
+ * objects can be reused without locking. The caches of a thread are freed
+ * when its thread state is cleared as the thread exits.
  */
 
+#ifdef Py_GIL_DISABLED
+#  ifdef _MSC_VER
+#    define GMPY_THREAD_LOCAL __declspec(thread)
+#  else
+#    define GMPY_THREAD_LOCAL _Thread_local
+#  endif
+#else
+#  define GMPY_THREAD_LOCAL
+#endif
+
 #ifndef PYPY_VERSION
 #define CACHE_SIZE (100)
 #else
@@ -137,26 +151,75 @@ LGPL 3 or later.";
 #define MAX_CACHE_MPZ_LIMBS (64)
 #define MAX_CACHE_MPFR_BITS (1024)
 
+/* The limits can be changed with set_cache() and are shared by all threads.
+ * size is the maximum number of objects of each type in a cache, mpz_limbs
+ * is the maximum allocation of a cached mpz, xmpz, or the numerator and
+ * denominator of an mpq, and mpfr_bits is the maximum precision of a cached
+ * mpfr or the real and imaginary parts of an mpc.
+ */
+
+typedef struct {
+    int size;
+    int mpz_limbs;
+    mpfr_prec_t mpfr_bits;
+} gmpy_cache_limits;
+
+static gmpy_cache_limits cache_limits = {
+    .size = CACHE_SIZE,
+    .mpz_limbs = MAX_CACHE_MPZ_LIMBS,
+    .mpfr_bits = MAX_CACHE_MPFR_BITS,
+};
+
+/* Counters reported by cache_stats(). hits and misses count the objects
+ * created with and without reusing a cached object. cached counts the
+ * objects returned to the cache. full and too_large count the objects that
+ * were freed because the cache was full or the object exceeded the size
+ * limit.
+ */
+
+typedef struct {
+    Py_ssize_t hits;
+    Py_ssize_t misses;
+    Py_ssize_t cached;
+    Py_ssize_t full;
+    Py_ssize_t too_large;
+} gmpy_cache_stats;
+
+/* The arrays are allocated when the first object is cached. cache_alloc is
+ * the number of entries allocated in each array. closed is set once the
+ * caches of an exiting thread have been freed so no more objects are
+ * cached.
+ */
+
 typedef struct {
-    mpz_t tempz;             /* Temporary variable used for integer conversions */
+    int cache_alloc;
+    int closed;
 
-    MPZ_Object *gmpympzcache[CACHE_SIZE];
+    MPZ_Object **gmpympzcache;
     int in_gmpympzcache;
 
-    XMPZ_Object *gmpyxmpzcache[CACHE_SIZE];
+    XMPZ_Object **gmpyxmpzcache;
     int in_gmpyxmpzcache;
 
-    MPQ_Object *gmpympqcache[CACHE_SIZE];
+    MPQ_Object **gmpympqcache;
     int in_gmpympqcache;
 
-    MPFR_Object *gmpympfrcache[CACHE_SIZE];
+    MPFR_Object **gmpympfrcache;
     int in_gmpympfrcache;
 
-    MPC_Object *gmpympccache[CACHE_SIZE];
+    MPC_Object **gmpympccache;
     int in_gmpympccache;
+
+    gmpy_cache_stats mpz_stats;
+    gmpy_cache_stats xmpz_stats;
+    gmpy_cache_stats mpq_stats;
+    gmpy_cache_stats mpfr_stats;
+    gmpy_cache_stats mpc_stats;
 } gmpy_global;
 
-static gmpy_global global = {
+static GMPY_THREAD_LOCAL gmpy_global global = {
+    .cache_alloc = 0,
+    .closed = 0,
     .in_gmpympzcache = 0,
     .in_gmpyxmpzcache = 0,
     .in_gmpympqcache = 0,
@@ -181,6 +244,18 @@ static PyObject *GMPyExc_Overflow = NULL;
 static PyObject *GMPyExc_Underflow = NULL;
 static PyObject *GMPyExc_Erange = NULL;
 
+/* The APR-CL test uses static variables. This lock ensures that only one
+ * thread runs the test at a time.
+ */
+
+static PyThread_type_lock aprcl_lock = NULL;
+
+/* This lock ensures that the product tree used for trial division by
+ * is_prime_list() is only created once.
+ */
+
+static PyThread_type_lock trial_tree_lock = NULL;
+
 #ifndef PYPY_VERSION
 /*
  * Parameters of Python’s internal representation of integers.
@@ -204,6 +279,10 @@ int int_digits_order, int_endianness;
 
 #include "gmpy2_misc.c"
 
+/* Support for splitting loops across native threads. */
+
+#include "gmpy2_threads.c"
+
 /* Support for conversion to/from binary representation. */
 
 #include "gmpy2_binary.c"
@@ -228,6 +307,10 @@ int int_digits_order, int_endianness;
 
 #include "gmpy_mpz_prp.c"
 
+/* Support for proving primality with the APR-CL test. */
+
+#include "posix64/mpz_aprcl.c"
+
 /* Include helper functions for mpmath. */
 
 #include "gmpy2_mpmath.c"
@@ -268,10 +351,18 @@ int int_digits_order, int_endianness;
 #include "gmpy2_mpz_misc.c"
 #include "gmpy2_xmpz_misc.c"
 #include "gmpy2_xmpz_limbs.c"
+#include "gmpy2_mpz_array.c"
+#include "gmpy2_modring.c"
+#include "gmpy2_fixedbase.c"
+#include "gmpy2_sieve.c"
+#include "gmpy2_mpz_tree.c"
+#include "gmpy2_crt.c"
+#include "gmpy2_alloc.c"
+#include "gmpy2_mpfr_array.c"
+#include "gmpy2_sum.c"
+#include "gmpy2_dump.c"
 
-#ifdef VECTOR
 #include "gmpy2_vector.c"
-#endif
 
 /* Include gmpy_context last to avoid adding doc names to .h files. */
 
@@ -285,7 +376,8 @@ int int_digits_order, int_endianness;
 
 static PyMethodDef Pygmpy_methods [] =
 {
-    { "add", GMPy_Context_Add, METH_VARARGS, GMPy_doc_function_add },
+    { "add", (PyCFunction)GMPy_Context_Add, METH_FASTCALL, GMPy_doc_function_add },
+    { "allocator_stats", GMPy_allocator_stats, METH_NOARGS, GMPy_doc_allocator_stats },
     { "bit_clear", GMPy_MPZ_bit_clear_function, METH_VARARGS, doc_bit_clear_function },
     { "bit_count", GMPy_MPZ_bit_count, METH_O, doc_bit_count },
     { "bit_flip", GMPy_MPZ_bit_flip_function, METH_VARARGS, doc_bit_flip_function },
@@ -295,10 +387,12 @@ static PyMethodDef Pygmpy_methods [] =
     { "bit_scan1", (PyCFunction)GMPy_MPZ_bit_scan1_function, METH_FASTCALL, doc_bit_scan1_function },
     { "bit_set", GMPy_MPZ_bit_set_function, METH_VARARGS, doc_bit_set_function },
     { "bit_test", (PyCFunction)GMPy_MPZ_bit_test_function, METH_FASTCALL, doc_bit_test_function },
+    { "cache_stats", GMPy_cache_stats, METH_NOARGS, GMPy_doc_cache_stats },
     { "bincoef", (PyCFunction)GMPy_MPZ_Function_Bincoef, METH_FASTCALL, GMPy_doc_mpz_function_bincoef },
     { "cmp", GMPy_MPANY_cmp, METH_VARARGS, GMPy_doc_mpany_cmp },
     { "cmp_abs", GMPy_MPANY_cmp_abs, METH_VARARGS, GMPy_doc_mpany_cmp_abs },
     { "comb", (PyCFunction)GMPy_MPZ_Function_Bincoef, METH_FASTCALL, GMPy_doc_mpz_function_comb },
+    { "crt", (PyCFunction)GMPy_MPZ_Function_CRT, METH_FASTCALL, GMPy_doc_mpz_function_crt },
     { "c_div", GMPy_MPZ_c_div, METH_VARARGS, doc_c_div },
     { "c_div_2exp", GMPy_MPZ_c_div_2exp, METH_VARARGS, doc_c_div_2exp },
     { "c_divmod", GMPy_MPZ_c_divmod, METH_VARARGS, doc_c_divmod },
@@ -307,14 +401,15 @@ static PyMethodDef Pygmpy_methods [] =
     { "c_mod_2exp", GMPy_MPZ_c_mod_2exp, METH_VARARGS, doc_c_mod_2exp },
     { "denom", GMPy_MPQ_Function_Denom, METH_O, GMPy_doc_mpq_function_denom },
     { "digits", GMPy_Context_Digits, METH_VARARGS, GMPy_doc_context_digits },
-    { "div", GMPy_Context_TrueDiv, METH_VARARGS, GMPy_doc_truediv },
+    { "div", (PyCFunction)GMPy_Context_TrueDiv, METH_FASTCALL, GMPy_doc_truediv },
     { "divexact", (PyCFunction)GMPy_MPZ_Function_Divexact, METH_FASTCALL, GMPy_doc_mpz_function_divexact },
     { "divm", (PyCFunction)GMPy_MPZ_Function_Divm, METH_FASTCALL, GMPy_doc_mpz_function_divm },
     { "double_fac", GMPy_MPZ_Function_DoubleFac, METH_O, GMPy_doc_mpz_function_double_fac },
+    { "dump", (PyCFunction)GMPy_MPANY_Dump, METH_FASTCALL, GMPy_doc_function_dump },
     { "fac", GMPy_MPZ_Function_Fac, METH_O, GMPy_doc_mpz_function_fac },
     { "fib", GMPy_MPZ_Function_Fib, METH_O, GMPy_doc_mpz_function_fib },
     { "fib2", GMPy_MPZ_Function_Fib2, METH_O, GMPy_doc_mpz_function_fib2 },
-    { "floor_div", GMPy_Context_FloorDiv, METH_VARARGS, GMPy_doc_floordiv },
+    { "floor_div", (PyCFunction)GMPy_Context_FloorDiv, METH_FASTCALL, GMPy_doc_floordiv },
     { "from_binary", GMPy_MPANY_From_Binary, METH_O, doc_from_binary },
     { "f_div", GMPy_MPZ_f_div, METH_VARARGS, doc_f_div },
     { "f_div_2exp", GMPy_MPZ_f_div_2exp, METH_VARARGS, doc_f_div_2exp },
@@ -324,13 +419,16 @@ static PyMethodDef Pygmpy_methods [] =
     { "f_mod_2exp", GMPy_MPZ_f_mod_2exp, METH_VARARGS, doc_f_mod_2exp },
     { "gcd", (PyCFunction)GMPy_MPZ_Function_GCD, METH_FASTCALL, GMPy_doc_mpz_function_gcd },
     { "gcdext", (PyCFunction)GMPy_MPZ_Function_GCDext, METH_FASTCALL, GMPy_doc_mpz_function_gcdext },
+    { "get_cache", GMPy_get_cache, METH_NOARGS, GMPy_doc_get_cache },
     { "hamdist", GMPy_MPZ_hamdist, METH_VARARGS, doc_hamdist },
     { "invert", (PyCFunction)GMPy_MPZ_Function_Invert, METH_FASTCALL, GMPy_doc_mpz_function_invert },
+    { "invert_list", (PyCFunction)GMPy_MPZ_Function_InvertList, METH_FASTCALL, GMPy_doc_mpz_function_invert_list },
     { "iroot", (PyCFunction)GMPy_MPZ_Function_Iroot, METH_FASTCALL, GMPy_doc_mpz_function_iroot },
     { "iroot_rem", (PyCFunction)GMPy_MPZ_Function_IrootRem, METH_FASTCALL, GMPy_doc_mpz_function_iroot_rem },
     { "isqrt", GMPy_MPZ_Function_Isqrt, METH_O, GMPy_doc_mpz_function_isqrt },
     { "isqrt_rem", GMPy_MPZ_Function_IsqrtRem, METH_O, GMPy_doc_mpz_function_isqrt_rem },
     { "is_bpsw_prp", GMPY_mpz_is_bpsw_prp, METH_VARARGS, doc_mpz_is_bpsw_prp },
+    { "is_bpsw_prp_list", (PyCFunction)GMPy_MPZ_Function_IsBPSWPRPList, METH_VARARGS | METH_KEYWORDS, GMPy_doc_mpz_function_is_bpsw_prp_list },
     { "is_congruent", (PyCFunction)GMPy_MPZ_Function_IsCongruent, METH_FASTCALL, GMPy_doc_mpz_function_is_congruent },
     { "is_divisible", (PyCFunction)GMPy_MPZ_Function_IsDivisible, METH_FASTCALL, GMPy_doc_mpz_function_is_divisible },
     { "is_even", GMPy_MPZ_Function_IsEven, METH_O, GMPy_doc_mpz_function_is_even },
@@ -341,7 +439,9 @@ static PyMethodDef Pygmpy_methods [] =
     { "is_lucas_prp", GMPY_mpz_is_lucas_prp, METH_VARARGS, doc_mpz_is_lucas_prp },
     { "is_odd", GMPy_MPZ_Function_IsOdd, METH_O, GMPy_doc_mpz_function_is_odd },
     { "is_power", GMPy_MPZ_Function_IsPower, METH_O, GMPy_doc_mpz_function_is_power },
-    { "is_prime", (PyCFunction)GMPy_MPZ_Function_IsPrime, METH_FASTCALL, GMPy_doc_mpz_function_is_prime },
+    { "is_prime", (PyCFunction)GMPy_MPZ_Function_IsPrime, METH_FASTCALL | METH_KEYWORDS, GMPy_doc_mpz_function_is_prime },
+    { "is_prime_list", (PyCFunction)GMPy_MPZ_Function_IsPrimeList, METH_VARARGS | METH_KEYWORDS, GMPy_doc_mpz_function_is_prime_list },
+    { "is_prime_proven", GMPy_MPZ_Function_IsPrimeProven, METH_O, GMPy_doc_mpz_function_is_prime_proven },
     { "is_probab_prime", (PyCFunction)GMPy_MPZ_Function_IsProbabPrime, METH_FASTCALL, GMPy_doc_mpz_function_is_probab_prime },
     { "is_selfridge_prp", GMPY_mpz_is_selfridge_prp, METH_VARARGS, doc_mpz_is_selfridge_prp },
     { "is_square", GMPy_MPZ_Function_IsSquare, METH_O, GMPy_doc_mpz_function_is_square },
@@ -360,7 +460,7 @@ static PyMethodDef Pygmpy_methods [] =
     { "lucasv", GMPY_mpz_lucasv, METH_VARARGS, doc_mpz_lucasv },
     { "lucasv_mod", GMPY_mpz_lucasv_mod, METH_VARARGS, doc_mpz_lucasv_mod },
     { "lucas2", GMPy_MPZ_Function_Lucas2, METH_O, GMPy_doc_mpz_function_lucas2 },
-    { "mod", GMPy_Context_Mod, METH_VARARGS, GMPy_doc_mod },
+    { "mod", (PyCFunction)GMPy_Context_Mod, METH_FASTCALL, GMPy_doc_mod },
     { "mp_version", GMPy_get_mp_version, METH_NOARGS, GMPy_doc_mp_version },
     { "mp_limbsize", GMPy_get_mp_limbsize, METH_NOARGS, GMPy_doc_mp_limbsize },
     { "mpc_version", GMPy_get_mpc_version, METH_NOARGS, GMPy_doc_mpc_version },
@@ -370,7 +470,7 @@ static PyMethodDef Pygmpy_methods [] =
     { "mpz_random", GMPy_MPZ_random_Function, METH_VARARGS, GMPy_doc_mpz_random_function },
     { "mpz_rrandomb", GMPy_MPZ_rrandomb_Function, METH_VARARGS, GMPy_doc_mpz_rrandomb_function },
     { "mpz_urandomb", GMPy_MPZ_urandomb_Function, METH_VARARGS, GMPy_doc_mpz_urandomb_function },
-    { "mul", GMPy_Context_Mul, METH_VARARGS, GMPy_doc_function_mul },
+    { "mul", (PyCFunction)GMPy_Context_Mul, METH_FASTCALL, GMPy_doc_function_mul },
     { "multi_fac", (PyCFunction)GMPy_MPZ_Function_MultiFac, METH_FASTCALL, GMPy_doc_mpz_function_multi_fac },
     { "next_prime", GMPy_MPZ_Function_NextPrime, METH_O, GMPy_doc_mpz_function_next_prime },
 #if (__GNU_MP_VERSION > 6) || (__GNU_MP_VERSION == 6 &&  __GNU_MP_VERSION_MINOR >= 3)
@@ -379,18 +479,26 @@ static PyMethodDef Pygmpy_methods [] =
     { "numer", GMPy_MPQ_Function_Numer, METH_O, GMPy_doc_mpq_function_numer },
     { "num_digits", (PyCFunction)GMPy_MPZ_Function_NumDigits, METH_FASTCALL, GMPy_doc_mpz_function_num_digits },
     { "pack", GMPy_MPZ_pack, METH_VARARGS, doc_pack },
+    { "pack_bytes", (PyCFunction)GMPy_MPZ_pack_bytes, METH_VARARGS | METH_KEYWORDS, doc_pack_bytes },
     { "popcount", GMPy_MPZ_popcount, METH_O, doc_popcount },
     { "powmod", GMPy_Integer_PowMod, METH_VARARGS, GMPy_doc_integer_powmod },
-    { "powmod_base_list", GMPy_Integer_PowMod_Base_List, METH_VARARGS, GMPy_doc_integer_powmod_base_list },
-    { "powmod_exp_list", GMPy_Integer_PowMod_Exp_List, METH_VARARGS, GMPy_doc_integer_powmod_exp_list },
+    { "powmod_base_list", (PyCFunction)GMPy_Integer_PowMod_Base_List, METH_VARARGS | METH_KEYWORDS, GMPy_doc_integer_powmod_base_list },
+    { "powmod_exp_list", (PyCFunction)GMPy_Integer_PowMod_Exp_List, METH_VARARGS | METH_KEYWORDS, GMPy_doc_integer_powmod_exp_list },
+    { "powmod_multi", (PyCFunction)GMPy_Integer_PowMod_Multi, METH_FASTCALL, GMPy_doc_integer_powmod_multi },
     { "powmod_sec", GMPy_Integer_PowMod_Sec, METH_VARARGS, GMPy_doc_integer_powmod_sec },
+    { "prime_sieve", (PyCFunction)GMPy_MPZ_Function_PrimeSieve, METH_FASTCALL, GMPy_doc_mpz_function_prime_sieve },
     { "primorial", GMPy_MPZ_Function_Primorial, METH_O, GMPy_doc_mpz_function_primorial },
+    { "prod", GMPy_MPZ_Function_Prod, METH_O, GMPy_doc_mpz_function_prod },
+    { "product_tree", GMPy_MPZ_Function_ProductTree, METH_O, GMPy_doc_mpz_function_product_tree },
     { "qdiv", GMPy_MPQ_Function_Qdiv, METH_VARARGS, GMPy_doc_function_qdiv },
+    { "remainder_tree", (PyCFunction)GMPy_MPZ_Function_RemainderTree, METH_FASTCALL, GMPy_doc_mpz_function_remainder_tree },
     { "remove", (PyCFunction)GMPy_MPZ_Function_Remove, METH_FASTCALL, GMPy_doc_mpz_function_remove },
     { "random_state", GMPy_RandomState_Factory, METH_VARARGS, GMPy_doc_random_state_factory },
+    { "set_allocator", GMPy_set_allocator, METH_O, GMPy_doc_set_allocator },
+    { "set_cache", (PyCFunction)GMPy_set_cache, METH_VARARGS | METH_KEYWORDS, GMPy_doc_set_cache },
     { "sign", GMPy_Context_Sign, METH_O, GMPy_doc_function_sign },
     { "square", GMPy_Context_Square, METH_O, GMPy_doc_function_square },
-    { "sub", GMPy_Context_Sub, METH_VARARGS, GMPy_doc_sub },
+    { "sub", (PyCFunction)GMPy_Context_Sub, METH_FASTCALL, GMPy_doc_sub },
     { "to_binary", GMPy_MPANY_To_Binary, METH_O, doc_to_binary },
     { "t_div", GMPy_MPZ_t_div, METH_VARARGS, doc_t_div },
     { "t_div_2exp", GMPy_MPZ_t_div_2exp, METH_VARARGS, doc_t_div_2exp },
@@ -399,8 +507,10 @@ static PyMethodDef Pygmpy_methods [] =
     { "t_mod", GMPy_MPZ_t_mod, METH_VARARGS, doc_t_mod },
     { "t_mod_2exp", GMPy_MPZ_t_mod_2exp, METH_VARARGS, doc_t_mod_2exp },
     { "unpack", GMPy_MPZ_unpack, METH_VARARGS, doc_unpack },
+    { "unpack_bytes", (PyCFunction)GMPy_MPZ_unpack_bytes, METH_VARARGS | METH_KEYWORDS, doc_unpack_bytes },
     { "version", GMPy_get_version, METH_NOARGS, GMPy_doc_version },
     { "xbit_mask", GMPy_XMPZ_Function_XbitMask, METH_O, GMPy_doc_xmpz_function_xbit_mask },
+    { "_from_limbs", (PyCFunction)GMPy_MPANY_From_Limbs, METH_FASTCALL, GMPy_doc_function_from_limbs },
     { "_mpmath_normalize", (PyCFunction)Pympz_mpmath_normalize_fast, METH_FASTCALL, doc_mpmath_normalizeg },
     { "_mpmath_create", (PyCFunction)Pympz_mpmath_create_fast, METH_FASTCALL, doc_mpmath_create },
 
@@ -431,6 +541,7 @@ static PyMethodDef Pygmpy_methods [] =
     { "degrees", GMPy_Context_Degrees, METH_O, GMPy_doc_function_degrees },
     { "digamma", GMPy_Context_Digamma, METH_O, GMPy_doc_function_digamma },
     { "div_2exp", GMPy_Context_Div_2exp, METH_VARARGS, GMPy_doc_function_div_2exp },
+    { "dot", (PyCFunction)GMPy_Context_Dot, METH_FASTCALL, GMPy_doc_function_dot },
     { "eint", GMPy_Context_Eint, METH_O, GMPy_doc_function_eint },
     { "erf", GMPy_Context_Erf, METH_O, GMPy_doc_function_erf },
     { "erfc", GMPy_Context_Erfc, METH_O, GMPy_doc_function_erfc },
@@ -519,10 +630,7 @@ static PyMethodDef Pygmpy_methods [] =
     { "tan", GMPy_Context_Tan, METH_O, GMPy_doc_function_tan },
     { "tanh", GMPy_Context_Tanh, METH_O, GMPy_doc_function_tanh },
     { "trunc", GMPy_Context_Trunc, METH_O, GMPy_doc_function_trunc},
-#ifdef VECTOR
-    { "vector", GMPy_Context_Vector, METH_O, GMPy_doc_function_vector},
-    { "vector2", GMPy_Context_Vector2, METH_VARARGS, GMPy_doc_function_vector2},
-#endif
+    { "vmap", (PyCFunction)GMPy_Context_VMap, METH_VARARGS | METH_KEYWORDS, GMPy_doc_function_vmap },
     { "yn", GMPy_Context_Yn, METH_VARARGS, GMPy_doc_function_yn },
     { "y0", GMPy_Context_Y0, METH_O, GMPy_doc_function_y0 },
     { "y1", GMPy_Context_Y1, METH_O, GMPy_doc_function_y1 },
@@ -569,6 +677,16 @@ static char _gmpy_docs[] =
  * implemented. No per-module state has been defined.
  */
 
+/* Release the memory held by the module-level caches when the module is
+ * freed.
+ */
+
+static void
+gmpy_free(void *m)
+{
+    GMPy_Trial_Tree_Clear();
+}
+
 static struct PyModuleDef moduledef = {
         PyModuleDef_HEAD_INIT,
         "gmpy2",
@@ -578,7 +696,7 @@ static struct PyModuleDef moduledef = {
         NULL,
         NULL, /* gmpy_traverse */
         NULL, /* gmpy_clear */
-        NULL
+        gmpy_free
 };
 
 void
@@ -603,7 +721,6 @@ PyMODINIT_FUNC PyInit_gmpy2(void)
     PyObject *result = NULL;
     PyObject *namespace = NULL;
     PyObject *gmpy_module = NULL;
-    PyObject *copy_reg_module = NULL;
     PyObject *temp = NULL;
     PyObject *numbers_module = NULL;
     PyObject* xmpz = NULL;
@@ -682,6 +799,67 @@ PyMODINIT_FUNC PyInit_gmpy2(void)
         return NULL;;
         /* LCOV_EXCL_STOP */
     }
+    if (PyType_Ready(&GMPy_Limbs_Type) < 0) {
+        /* LCOV_EXCL_START */
+        return NULL;;
+        /* LCOV_EXCL_STOP */
+    }
+    if (PyType_Ready(&MPZ_Array_Type) < 0) {
+        /* LCOV_EXCL_START */
+        return NULL;;
+        /* LCOV_EXCL_STOP */
+    }
+    if (PyType_Ready(&MPFR_Array_Type) < 0) {
+        /* LCOV_EXCL_START */
+        return NULL;;
+        /* LCOV_EXCL_STOP */
+    }
+    if (PyType_Ready(&Accumulator_Type) < 0) {
+        /* LCOV_EXCL_START */
+        return NULL;;
+        /* LCOV_EXCL_STOP */
+    }
+    if (PyType_Ready(&Load_Type) < 0) {
+        /* LCOV_EXCL_START */
+        return NULL;;
+        /* LCOV_EXCL_STOP */
+    }
+    if (PyType_Ready(&ModRing_Type) < 0) {
+        /* LCOV_EXCL_START */
+        return NULL;;
+        /* LCOV_EXCL_STOP */
+    }
+    if (PyType_Ready(&FixedBase_Type) < 0) {
+        /* LCOV_EXCL_START */
+        return NULL;;
+        /* LCOV_EXCL_STOP */
+    }
+    if (PyType_Ready(&Primes_Type) < 0) {
+        /* LCOV_EXCL_START */
+        return NULL;;
+        /* LCOV_EXCL_STOP */
+    }
+    if (PyType_Ready(&CRTBasis_Type) < 0) {
+        /* LCOV_EXCL_START */
+        return NULL;;
+        /* LCOV_EXCL_STOP */
+    }
+
+    /* Allocate the lock used by the APR-CL test. */
+    if (!(aprcl_lock = PyThread_allocate_lock())) {
+        /* LCOV_EXCL_START */
+        PyErr_NoMemory();
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+
+    /* Allocate the lock used to create the trial division tree. */
+    if (!(trial_tree_lock = PyThread_allocate_lock())) {
+        /* LCOV_EXCL_START */
+        PyErr_NoMemory();
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
 
     /* Initialize exceptions. */
     GMPyExc_GmpyError = PyErr_NewException("gmpy2.gmpy2Error", PyExc_ArithmeticError, NULL);
@@ -756,6 +934,11 @@ PyMODINIT_FUNC PyInit_gmpy2(void)
         /* LCOV_EXCL_STOP */
     }
 
+#ifdef Py_GIL_DISABLED
+    /* The object caches are thread-local so gmpy2 does not need the GIL. */
+    PyUnstable_Module_SetGIL(gmpy_module, Py_MOD_GIL_NOT_USED);
+#endif
+
 
     /* Add the context type to the module namespace. */
 
@@ -777,6 +960,46 @@ PyMODINIT_FUNC PyInit_gmpy2(void)
     PyDict_SetItemString(xmpz, "limb_size", limb_size);
     Py_DECREF(limb_size);
 
+    /* Add the mpz_array type to the module namespace. */
+
+    Py_INCREF(&MPZ_Array_Type);
+    PyModule_AddObject(gmpy_module, "mpz_array", (PyObject*)&MPZ_Array_Type);
+
+    /* Add the mpfr_array type to the module namespace. */
+
+    Py_INCREF(&MPFR_Array_Type);
+    PyModule_AddObject(gmpy_module, "mpfr_array", (PyObject*)&MPFR_Array_Type);
+
+    /* Add the Accumulator type to the module namespace. */
+
+    Py_INCREF(&Accumulator_Type);
+    PyModule_AddObject(gmpy_module, "Accumulator", (PyObject*)&Accumulator_Type);
+
+    /* Add the load type to the module namespace. */
+
+    Py_INCREF(&Load_Type);
+    PyModule_AddObject(gmpy_module, "load", (PyObject*)&Load_Type);
+
+    /* Add the ModRing type to the module namespace. */
+
+    Py_INCREF(&ModRing_Type);
+    PyModule_AddObject(gmpy_module, "ModRing", (PyObject*)&ModRing_Type);
+
+    /* Add the powmod_fixed_base type to the module namespace. */
+
+    Py_INCREF(&FixedBase_Type);
+    PyModule_AddObject(gmpy_module, "powmod_fixed_base", (PyObject*)&FixedBase_Type);
+
+    /* Add the primes type to the module namespace. */
+
+    Py_INCREF(&Primes_Type);
+    PyModule_AddObject(gmpy_module, "primes", (PyObject*)&Primes_Type);
+
+    /* Add the CRTBasis type to the module namespace. */
+
+    Py_INCREF(&CRTBasis_Type);
+    PyModule_AddObject(gmpy_module, "CRTBasis", (PyObject*)&CRTBasis_Type);
+
     /* Add the MPQ type to the module namespace. */
 
     Py_INCREF(&MPQ_Type);
@@ -924,35 +1147,13 @@ PyMODINIT_FUNC PyInit_gmpy2(void)
     }
 #endif
 
-    /* Add support for pickling. */
-    copy_reg_module = PyImport_ImportModule("copyreg");
-    if (copy_reg_module) {
-        char* enable_pickle =
-            "def gmpy2_reducer(x): return (gmpy2.from_binary, (gmpy2.to_binary(x),))\n"
-            "copyreg.pickle(gmpy2.mpz, gmpy2_reducer)\n"
-            "copyreg.pickle(gmpy2.xmpz, gmpy2_reducer)\n"
-            "copyreg.pickle(gmpy2.mpq, gmpy2_reducer)\n"
-            "copyreg.pickle(gmpy2.mpfr, gmpy2_reducer)\n"
-            "copyreg.pickle(gmpy2.mpc, gmpy2_reducer)\n";
-
-        namespace = PyDict_New();
-        result = NULL;
-
-        PyDict_SetItemString(namespace, "copyreg", copy_reg_module);
-        PyDict_SetItemString(namespace, "gmpy2", gmpy_module);
-        result = PyRun_String(enable_pickle, Py_file_input, namespace, namespace);
-        if (!result) {
-            /* LCOV_EXCL_START */
-            PyErr_Clear();
-            /* LCOV_EXCL_STOP */
-        }
-        Py_DECREF(namespace);
-        Py_DECREF(copy_reg_module);
-        Py_XDECREF(result);
-    }
-    else {
+    /* Add support for pickling. The functions are used by __reduce_ex__()
+     * so the pickles refer to gmpy2.from_binary and gmpy2._from_limbs.
+     */
+    if (!(GMPy_Pickle_From_Binary = PyObject_GetAttrString(gmpy_module, "from_binary")) ||
+        !(GMPy_Pickle_From_Limbs = PyObject_GetAttrString(gmpy_module, "_from_limbs"))) {
         /* LCOV_EXCL_START */
-        PyErr_Clear();
+        return NULL;
         /* LCOV_EXCL_STOP */
     }
 
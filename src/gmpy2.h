@@ -128,6 +128,7 @@ typedef struct {
 typedef struct {
     PyObject_HEAD
     mpz_t z;
+    Py_ssize_t exports;     /* number of exports of the limbs */
 } XMPZ_Object;
 
 typedef struct {
@@ -352,15 +353,16 @@ typedef struct {
 #define GMPY_DEFAULT -1
 
 /* To prevent excessive memory usage, we don't want to save very large
- * numbers in the cache. The default value specified in the options
- * structure is 128 words (512 bytes on 32-bit platforms, 1024 bytes on
- * 64-bit platforms).
+ * numbers in the cache. These are the largest values accepted by
+ * set_cache() for mpz_limbs and mpfr_bits. The default values are 64 limbs
+ * and 1024 bits.
  */
 #define MAX_CACHE_LIMBS 16384
+#define MAX_CACHE_BITS (MAX_CACHE_LIMBS * GMP_NUMB_BITS)
 
-/* The maximum number of objects that can be saved in a cache is specified
- * here. The default value is 100.*/
-#define MAX_CACHE 1000
+/* The maximum number of objects of each type that can be saved in a cache
+ * is specified here. The default value is 100.*/
+#define MAX_CACHE 1000000
 
 #ifdef USE_ALLOCA
 #  define TEMP_ALLOC(B, S)     \
@@ -414,6 +416,10 @@ typedef struct {
 
 #include "gmpy2_misc.h"
 
+/* Support for splitting loops across native threads. */
+
+#include "gmpy2_threads.h"
+
 /* Support conversion to/from binary format. */
 
 #include "gmpy2_binary.h"
@@ -435,6 +441,13 @@ typedef struct {
 #include "gmpy2_xmpz_inplace.h"
 #include "gmpy2_xmpz_misc.h"
 #include "gmpy2_xmpz_limbs.h"
+#include "gmpy2_mpz_array.h"
+#include "gmpy2_modring.h"
+#include "gmpy2_fixedbase.h"
+#include "gmpy2_sieve.h"
+#include "gmpy2_mpz_tree.h"
+#include "gmpy2_crt.h"
+#include "gmpy2_alloc.h"
 
 /* Support for mpq specific functions. */
 
@@ -455,6 +468,7 @@ typedef struct {
 /* Support probable-prime tests. */
 
 #include "gmpy_mpz_prp.h"
+#include "posix64/mpz_aprcl.h"
 
 /* Support higher-level Python methods and functions; generally not
  * specific to a single type.
@@ -483,9 +497,10 @@ typedef struct {
 #include "gmpy2_richcompare.h"
 #include "gmpy2_cmp.h"
 
-#ifdef VECTOR
-#  include "gmpy2_vector.h"
-#endif /* defined(VECTOR) */
+#include "gmpy2_mpfr_array.h"
+#include "gmpy2_sum.h"
+#include "gmpy2_dump.h"
+#include "gmpy2_vector.h"
 
 #else /* defined(GMPY2_MODULE) */
 
@@ -353,11 +353,11 @@ PyDoc_STRVAR(GMPy_doc_context_add,
 "Return x + y.");
 
 static PyObject *
-GMPy_Context_Add(PyObject *self, PyObject *args)
+GMPy_Context_Add(PyObject *self, PyObject *const *args, Py_ssize_t nargs)
 {
     CTXT_Object *context = NULL;
 
-    if (PyTuple_GET_SIZE(args) != 2) {
+    if (nargs != 2) {
         TYPE_ERROR("add() requires 2 arguments");
         return NULL;
     }
@@ -369,7 +369,5 @@ GMPy_Context_Add(PyObject *self, PyObject *args)
         CHECK_CONTEXT(context);
     }
 
-    return GMPy_Number_Add(PyTuple_GET_ITEM(args, 0),
-                           PyTuple_GET_ITEM(args, 1),
-                           context);
+    return GMPy_Number_Add(args[0], args[1], context);
 }
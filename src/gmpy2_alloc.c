@@ -0,0 +1,495 @@
+/* * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * *
+ * gmpy2_alloc.c                                                            *
+ * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * *
+ * Python interface to the GMP, MPFR, and MPC multiple precision           *
+ * libraries.                                                              *
+ *                                                                         *
+ * Copyright 2000 - 2009 Alex Martelli                                     *
+ *                                                                         *
+ * Copyright 2008 - 2024 Case Van Horsen                                   *
+ *                                                                         *
+ * This file is part of GMPY2.                                             *
+ *                                                                         *
+ * GMPY2 is free software: you can redistribute it and/or modify it under  *
+ * the terms of the GNU Lesser General Public License as published by the  *
+ * Free Software Foundation, either version 3 of the License, or (at your  *
+ * option) any later version.                                              *
+ *                                                                         *
+ * GMPY2 is distributed in the hope that it will be useful, but WITHOUT    *
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or   *
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public    *
+ * License for more details.                                               *
+ *                                                                         *
+ * You should have received a copy of the GNU Lesser General Public        *
+ * License along with GMPY2; if not, see <http://www.gnu.org/licenses/>    *
+ * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * */
+
+/* This file provides memory allocation functions for GMP that can use the
+ * Python raw memory allocator, so the memory is visible to tracemalloc, or
+ * an arena of fixed size blocks for small allocations. All the functions
+ * also maintain counters of the memory allocated and freed.
+ *
+ * GMP, MPFR, and MPC always pass the size of a block to the free and
+ * reallocate functions. The arena uses the size to find the size class of
+ * a block. Blocks that do not come from the arena are found by looking up
+ * their page in a hash table of the pages owned by the arena.
+ *
+ * The other blocks allocated by these functions start with a header that
+ * records the allocator that created them, so a block is freed by the same
+ * allocator even if another one was selected later. See GMPy_Block_Tag().
+ * A block without a header was allocated before set_allocator() was called
+ * and is freed with the functions in use at that time. Only blocks with a
+ * header or from the arena are counted in bytes_freed.
+ */
+
+static GMPy_Allocator gmpy_allocator = {
+    .allocator = GMPY_ALLOC_SYSTEM,
+    .installed = 0,
+};
+
+#define GMPY_ARENA_CLASS(size) ((size) ? ((size) - 1) / GMPY_ARENA_QUANTUM : 0)
+
+/* Return the slot in the page table where the search for page starts. */
+
+static size_t
+GMPy_Arena_Hash(uint64_t page)
+{
+    return (size_t)((page * UINT64_C(0x9E3779B97F4A7C15)) >> 51) & (GMPY_ARENA_SLOTS - 1);
+}
+
+/* Return 1 if ptr was allocated from the arena. Pages are only ever added
+ * to the table so no lock is needed.
+ */
+
+static int
+GMPy_Arena_Owns(void *ptr)
+{
+    int64_t page = (int64_t)((uintptr_t)ptr >> GMPY_ARENA_PAGE_SHIFT);
+    int64_t entry;
+    size_t i;
+
+    if (!GMPY_ATOMIC_LOAD(&gmpy_allocator.npages)) {
+        return 0;
+    }
+    for (i = GMPy_Arena_Hash((uint64_t)page); ; i = (i + 1) & (GMPY_ARENA_SLOTS - 1)) {
+        entry = GMPY_ATOMIC_LOAD(&gmpy_allocator.pages[i]);
+        if (entry == page) {
+            return 1;
+        }
+        if (entry == 0) {
+            return 0;
+        }
+    }
+}
+
+/* Add the memory at raw, of (GMPY_ARENA_PAGES + 1) pages, to the arena and
+ * start allocating from it. Must be called with the lock held. Returns -1
+ * if the page table is full.
+ */
+
+static int
+GMPy_Arena_Add(char *raw)
+{
+    size_t page_size = (size_t)1 << GMPY_ARENA_PAGE_SHIFT;
+    uintptr_t start;
+    int k;
+
+    if (gmpy_allocator.npages + GMPY_ARENA_PAGES > GMPY_ARENA_SLOTS / 2) {
+        return -1;
+    }
+
+    start = ((uintptr_t)raw + page_size - 1) & ~(uintptr_t)(page_size - 1);
+    for (k = 0; k < GMPY_ARENA_PAGES; k++) {
+        int64_t page = (int64_t)((start >> GMPY_ARENA_PAGE_SHIFT) + k);
+        size_t i = GMPy_Arena_Hash((uint64_t)page);
+
+        while (gmpy_allocator.pages[i]) {
+            i = (i + 1) & (GMPY_ARENA_SLOTS - 1);
+        }
+        GMPY_ATOMIC_STORE(&gmpy_allocator.pages[i], page);
+    }
+    GMPY_ATOMIC_STORE(&gmpy_allocator.npages,
+                      gmpy_allocator.npages + GMPY_ARENA_PAGES);
+    GMPY_ATOMIC_ADD(&gmpy_allocator.arena_bytes,
+                    (int64_t)((GMPY_ARENA_PAGES + 1) * page_size));
+
+    gmpy_allocator.bump = (char *)start;
+    gmpy_allocator.bump_end = (char *)start + GMPY_ARENA_PAGES * page_size;
+    return 0;
+}
+
+/* Return a block of at most GMPY_ARENA_MAX bytes or NULL if the arena is
+ * exhausted.
+ */
+
+static void *
+GMPy_Arena_Allocate(size_t size)
+{
+    size_t k = GMPY_ARENA_CLASS(size);
+    size_t block = (k + 1) * GMPY_ARENA_QUANTUM;
+    size_t arena_size = ((size_t)GMPY_ARENA_PAGES + 1) << GMPY_ARENA_PAGE_SHIFT;
+    void *result = NULL;
+    char *raw;
+
+    GMPY_SPIN_LOCK(&gmpy_allocator.lock);
+    if ((result = gmpy_allocator.freelist[k])) {
+        gmpy_allocator.freelist[k] = *(void **)result;
+    }
+    else if ((size_t)(gmpy_allocator.bump_end - gmpy_allocator.bump) >= block) {
+        result = gmpy_allocator.bump;
+        gmpy_allocator.bump += block;
+    }
+    GMPY_SPIN_UNLOCK(&gmpy_allocator.lock);
+    if (result) {
+        return result;
+    }
+
+    /* The memory for a new arena is obtained without holding the lock, and
+     * with the system functions since the Python raw allocator may wait for
+     * the GIL when tracemalloc is active. Another thread may add an arena at
+     * the same time; the unused end of the previous one is then lost.
+     */
+    if (GMPY_ATOMIC_LOAD(&gmpy_allocator.npages) + GMPY_ARENA_PAGES > GMPY_ARENA_SLOTS / 2 ||
+        !(raw = gmpy_allocator.sys_allocate(arena_size))) {
+        return NULL;
+    }
+    GMPY_SPIN_LOCK(&gmpy_allocator.lock);
+    if (!GMPy_Arena_Add(raw)) {
+        result = gmpy_allocator.bump;
+        gmpy_allocator.bump += block;
+    }
+    GMPY_SPIN_UNLOCK(&gmpy_allocator.lock);
+    if (!result) {
+        gmpy_allocator.sys_free(raw, arena_size);
+    }
+    return result;
+}
+
+static void
+GMPy_Arena_Free(void *ptr, size_t size)
+{
+    size_t k = GMPY_ARENA_CLASS(size);
+
+    GMPY_SPIN_LOCK(&gmpy_allocator.lock);
+    *(void **)ptr = gmpy_allocator.freelist[k];
+    gmpy_allocator.freelist[k] = ptr;
+    GMPY_SPIN_UNLOCK(&gmpy_allocator.lock);
+}
+
+/* GMP does not check for allocation failures. Match the behavior of the
+ * default GMP functions.
+ */
+
+static void
+GMPy_Allocation_Failed(size_t size)
+{
+    fprintf(stderr, "GNU MP: Cannot allocate memory (size=%zu)\n", size);
+    abort();
+}
+
+/* A block that is not in the arena is allocated with GMPY_BLOCK_EXTRA more
+ * bytes than requested and the address returned to GMP is 8 modulo 16. The
+ * 8 bytes before it hold a tag: the address XORed with a secret, with the
+ * low bits replaced by the allocator that created the block and the offset
+ * of the address in the block. The system and Python allocators return
+ * addresses that are multiples of 16 on 64-bit platforms, so a block
+ * allocated before set_allocator() was called is normally recognized by its
+ * address alone. Otherwise the secret makes a false match unlikely.
+ */
+
+#define GMPY_BLOCK_EXTRA 16
+#define GMPY_BLOCK_WIDE  2      /* the address is 16 bytes into the block */
+#define GMPY_BLOCK_MARK  4      /* always set so a tag is never 0         */
+
+#define GMPY_BLOCK_OFFSET(raw) (((uintptr_t)(raw) & 8) ? 16 : 8)
+
+static uintptr_t
+GMPy_Block_Tag(const char *ptr, int64_t allocator, int wide)
+{
+    return (((uintptr_t)ptr ^ gmpy_allocator.secret) & ~(uintptr_t)15) |
+           (uintptr_t)allocator | (wide ? GMPY_BLOCK_WIDE : 0) | GMPY_BLOCK_MARK;
+}
+
+/* Store the tag of the block at raw and return the address given to GMP. */
+
+static void *
+GMPy_Block_Wrap(char *raw, int64_t allocator)
+{
+    size_t offset = GMPY_BLOCK_OFFSET(raw);
+    uintptr_t tag = GMPy_Block_Tag(raw + offset, allocator, offset == 16);
+
+    memcpy(raw + offset - 8, &tag, sizeof(uintptr_t));
+    return raw + offset;
+}
+
+/* Return the tag of ptr, or 0 if ptr was not allocated by GMPy_Block_Wrap. */
+
+static uintptr_t
+GMPy_Block_Find(const char *ptr)
+{
+    uintptr_t tag;
+
+    if (((uintptr_t)ptr & 15) != 8) {
+        return 0;
+    }
+    memcpy(&tag, ptr - 8, sizeof(uintptr_t));
+    if ((tag ^ GMPy_Block_Tag(ptr, 0, 0)) & ~(uintptr_t)15 || !(tag & GMPY_BLOCK_MARK)) {
+        return 0;
+    }
+    return tag;
+}
+
+#define GMPY_BLOCK_ALLOCATOR(tag) ((int64_t)((tag) & 1))
+#define GMPY_BLOCK_START(ptr, tag) ((char *)(ptr) - (((tag) & GMPY_BLOCK_WIDE) ? 16 : 8))
+
+/* Allocate a block using the selected allocator but do not update the
+ * counters.
+ */
+
+static void *
+GMPy_Allocate_Block(size_t size)
+{
+    int64_t allocator = GMPY_ATOMIC_LOAD(&gmpy_allocator.allocator);
+    char *raw;
+    void *result;
+
+    if (allocator == GMPY_ALLOC_ARENA) {
+        if (size <= GMPY_ARENA_MAX && (result = GMPy_Arena_Allocate(size))) {
+            return result;
+        }
+        allocator = GMPY_ALLOC_PYMALLOC;
+    }
+    if (allocator == GMPY_ALLOC_PYMALLOC) {
+        raw = PyMem_RawMalloc(size + GMPY_BLOCK_EXTRA);
+    }
+    else {
+        raw = gmpy_allocator.sys_allocate(size + GMPY_BLOCK_EXTRA);
+    }
+    if (!raw) {
+        GMPy_Allocation_Failed(size);
+    }
+    return GMPy_Block_Wrap(raw, allocator);
+}
+
+static void *
+GMPy_Allocate(size_t size)
+{
+    GMPY_COUNTER_ADD(&gmpy_allocator.allocations, 1);
+    GMPY_ATOMIC_ADD(&gmpy_allocator.bytes_allocated, (int64_t)size);
+    return GMPy_Allocate_Block(size);
+}
+
+static void *
+GMPy_Reallocate(void *ptr, size_t old_size, size_t new_size)
+{
+    uintptr_t tag;
+    char *raw, *start;
+    void *result;
+    size_t old_offset, new_offset;
+
+    GMPY_COUNTER_ADD(&gmpy_allocator.reallocations, 1);
+
+    if (GMPy_Arena_Owns(ptr)) {
+        GMPY_ATOMIC_ADD(&gmpy_allocator.bytes_allocated, (int64_t)new_size);
+        GMPY_ATOMIC_ADD(&gmpy_allocator.bytes_freed, (int64_t)old_size);
+        if (new_size <= GMPY_ARENA_MAX &&
+            GMPY_ARENA_CLASS(new_size) == GMPY_ARENA_CLASS(old_size)) {
+            return ptr;
+        }
+        result = GMPy_Allocate_Block(new_size);
+        memcpy(result, ptr, old_size < new_size ? old_size : new_size);
+        GMPy_Arena_Free(ptr, old_size);
+        return result;
+    }
+
+    if (!(tag = GMPy_Block_Find(ptr))) {
+        /* Move a block allocated before set_allocator() was called to the
+         * selected allocator.
+         */
+        GMPY_ATOMIC_ADD(&gmpy_allocator.bytes_allocated, (int64_t)new_size);
+        result = GMPy_Allocate_Block(new_size);
+        memcpy(result, ptr, old_size < new_size ? old_size : new_size);
+        gmpy_allocator.sys_free(ptr, old_size);
+        return result;
+    }
+
+    GMPY_ATOMIC_ADD(&gmpy_allocator.bytes_allocated, (int64_t)new_size);
+    GMPY_ATOMIC_ADD(&gmpy_allocator.bytes_freed, (int64_t)old_size);
+    start = GMPY_BLOCK_START(ptr, tag);
+    old_offset = (size_t)((char *)ptr - start);
+    if (GMPY_BLOCK_ALLOCATOR(tag) == GMPY_ALLOC_PYMALLOC) {
+        raw = PyMem_RawRealloc(start, new_size + GMPY_BLOCK_EXTRA);
+    }
+    else {
+        raw = gmpy_allocator.sys_reallocate(start, old_size + GMPY_BLOCK_EXTRA,
+                                            new_size + GMPY_BLOCK_EXTRA);
+    }
+    if (!raw) {
+        GMPy_Allocation_Failed(new_size);
+    }
+    /* The data must be moved if the new block has a different alignment. */
+    new_offset = GMPY_BLOCK_OFFSET(raw);
+    if (new_offset != old_offset) {
+        memmove(raw + new_offset, raw + old_offset,
+                old_size < new_size ? old_size : new_size);
+    }
+    return GMPy_Block_Wrap(raw, GMPY_BLOCK_ALLOCATOR(tag));
+}
+
+static void
+GMPy_Free(void *ptr, size_t size)
+{
+    uintptr_t tag;
+    char *start;
+
+    if (GMPy_Arena_Owns(ptr)) {
+        GMPY_COUNTER_ADD(&gmpy_allocator.frees, 1);
+        GMPY_ATOMIC_ADD(&gmpy_allocator.bytes_freed, (int64_t)size);
+        GMPy_Arena_Free(ptr, size);
+        return;
+    }
+
+    if (!(tag = GMPy_Block_Find(ptr))) {
+        gmpy_allocator.sys_free(ptr, size);
+        return;
+    }
+
+    GMPY_COUNTER_ADD(&gmpy_allocator.frees, 1);
+    GMPY_ATOMIC_ADD(&gmpy_allocator.bytes_freed, (int64_t)size);
+    start = GMPY_BLOCK_START(ptr, tag);
+    memset((char *)ptr - 8, 0, sizeof(uintptr_t));
+    if (GMPY_BLOCK_ALLOCATOR(tag) == GMPY_ALLOC_PYMALLOC) {
+        PyMem_RawFree(start);
+    }
+    else {
+        gmpy_allocator.sys_free(start, size + GMPY_BLOCK_EXTRA);
+    }
+}
+
+/* Return 1 if Python's debug memory hooks may be enabled. */
+
+static int
+GMPy_Debug_Hooks(void)
+{
+#ifdef Py_DEBUG
+    return 1;
+#else
+    PyObject *flags, *dev_mode;
+    const char *env = getenv("PYTHONMALLOC");
+    int result = 0;
+
+    if (env && strstr(env, "debug")) {
+        return 1;
+    }
+    if ((flags = PySys_GetObject("flags")) &&
+        (dev_mode = PyObject_GetAttrString(flags, "dev_mode"))) {
+        result = PyObject_IsTrue(dev_mode);
+        Py_DECREF(dev_mode);
+    }
+    PyErr_Clear();
+    return result > 0;
+#endif
+}
+
+PyDoc_STRVAR(GMPy_doc_set_allocator,
+"set_allocator(name, /) -> None\n\n"
+"Select the memory allocator used by GMP, MPFR, and MPC. name must be\n"
+"one of:\n\n"
+"* 'system': the allocator in use when gmpy2 was imported\n"
+"* 'pymalloc': Python's raw memory allocator, so the memory is visible\n"
+"  to tracemalloc\n"
+"* 'arena': blocks of up to 512 bytes are taken from arenas of fixed size\n"
+"  blocks and larger blocks use Python's raw memory allocator\n\n"
+"The first call installs gmpy2's memory functions with\n"
+"mp_set_memory_functions() and they remain installed. The statistics\n"
+"returned by allocator_stats() are counted from then on. It should be\n"
+"called before other threads use gmpy2. Memory taken by the arena is\n"
+"never returned to the system. 'pymalloc' and 'arena' can not be used\n"
+"when Python's debug memory hooks are enabled.");
+
+static PyObject *
+GMPy_set_allocator(PyObject *self, PyObject *other)
+{
+    int64_t allocator;
+
+    if (!PyUnicode_Check(other)) {
+        TYPE_ERROR("set_allocator() argument must be str");
+        return NULL;
+    }
+
+    if (!PyUnicode_CompareWithASCIIString(other, "system")) {
+        allocator = GMPY_ALLOC_SYSTEM;
+    }
+    else if (!PyUnicode_CompareWithASCIIString(other, "pymalloc")) {
+        allocator = GMPY_ALLOC_PYMALLOC;
+    }
+    else if (!PyUnicode_CompareWithASCIIString(other, "arena")) {
+        allocator = GMPY_ALLOC_ARENA;
+    }
+    else {
+        PyErr_Format(PyExc_ValueError,
+                     "set_allocator() unknown allocator '%U'", other);
+        return NULL;
+    }
+
+    if (allocator != GMPY_ALLOC_SYSTEM && GMPy_Debug_Hooks()) {
+        PyErr_Format(PyExc_ValueError,
+                     "set_allocator() '%U' can not be used with Python's "
+                     "debug memory hooks", other);
+        return NULL;
+    }
+
+    if (!gmpy_allocator.installed) {
+        /* The secret only needs to differ between processes. */
+        gmpy_allocator.secret = (uintptr_t)(((uint64_t)(uintptr_t)&gmpy_allocator ^
+                                             (uint64_t)time(NULL) ^
+                                             ((uint64_t)(uintptr_t)PyThreadState_Get() << 20)) *
+                                            UINT64_C(0x9E3779B97F4A7C15));
+        mp_get_memory_functions(&gmpy_allocator.sys_allocate,
+                                &gmpy_allocator.sys_reallocate,
+                                &gmpy_allocator.sys_free);
+        /* MPFR caches the memory functions in each thread. */
+        mpfr_mp_memory_cleanup();
+        mp_set_memory_functions(GMPy_Allocate, GMPy_Reallocate, GMPy_Free);
+        gmpy_allocator.installed = 1;
+    }
+    GMPY_ATOMIC_STORE(&gmpy_allocator.allocator, allocator);
+    Py_RETURN_NONE;
+}
+
+PyDoc_STRVAR(GMPy_doc_allocator_stats,
+"allocator_stats() -> dict\n\n"
+"Return the name of the memory allocator selected by set_allocator() and\n"
+"counters of the memory allocated and freed by GMP, MPFR, and MPC since\n"
+"set_allocator() was first called. bytes_in_use is the difference between\n"
+"bytes_allocated and bytes_freed. Memory allocated before set_allocator()\n"
+"was first called is not counted when it is freed. arena_bytes is the\n"
+"memory reserved by the arena. The numbers of allocations, reallocations,\n"
+"and frees may be slightly low if several threads allocate memory at the\n"
+"same time.");
+
+static PyObject *
+GMPy_allocator_stats(PyObject *self, PyObject *args)
+{
+    static const char *names[] = {"system", "pymalloc", "arena"};
+    /* A block is counted as allocated before it can be freed, so reading
+     * bytes_freed first keeps bytes_in_use from being negative.
+     */
+    int64_t freed = GMPY_ATOMIC_LOAD(&gmpy_allocator.bytes_freed);
+    int64_t allocated = GMPY_ATOMIC_LOAD(&gmpy_allocator.bytes_allocated);
+
+    return Py_BuildValue("{s:s,s:L,s:L,s:L,s:L,s:L,s:L,s:L}",
+                         "allocator",
+                         names[GMPY_ATOMIC_LOAD(&gmpy_allocator.allocator)],
+                         "allocations",
+                         (long long)GMPY_ATOMIC_LOAD(&gmpy_allocator.allocations),
+                         "reallocations",
+                         (long long)GMPY_ATOMIC_LOAD(&gmpy_allocator.reallocations),
+                         "frees",
+                         (long long)GMPY_ATOMIC_LOAD(&gmpy_allocator.frees),
+                         "bytes_allocated", (long long)allocated,
+                         "bytes_freed", (long long)freed,
+                         "bytes_in_use", (long long)(allocated - freed),
+                         "arena_bytes",
+                         (long long)GMPY_ATOMIC_LOAD(&gmpy_allocator.arena_bytes));
+}
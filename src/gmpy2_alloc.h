@@ -0,0 +1,126 @@
+/* * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * *
+ * gmpy2_alloc.h                                                            *
+ * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * *
+ * Python interface to the GMP, MPFR, and MPC multiple precision           *
+ * libraries.                                                              *
+ *                                                                         *
+ * Copyright 2000 - 2009 Alex Martelli                                     *
+ *                                                                         *
+ * Copyright 2008 - 2024 Case Van Horsen                                   *
+ *                                                                         *
+ * This file is part of GMPY2.                                             *
+ *                                                                         *
+ * GMPY2 is free software: you can redistribute it and/or modify it under  *
+ * the terms of the GNU Lesser General Public License as published by the  *
+ * Free Software Foundation, either version 3 of the License, or (at your  *
+ * option) any later version.                                              *
+ *                                                                         *
+ * GMPY2 is distributed in the hope that it will be useful, but WITHOUT    *
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or   *
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public    *
+ * License for more details.                                               *
+ *                                                                         *
+ * You should have received a copy of the GNU Lesser General Public        *
+ * License along with GMPY2; if not, see <http://www.gnu.org/licenses/>    *
+ * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * */
+
+#ifndef GMPY_ALLOC_H
+#define GMPY_ALLOC_H
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+/* Optional memory allocation functions for GMP, MPFR, and MPC.
+ *
+ * The functions are installed with mp_set_memory_functions() the first time
+ * set_allocator() is called and are never removed. The allocator selects how
+ * new blocks are allocated. Blocks are always freed by the allocator that
+ * created them: the arena finds its blocks in a table of its pages and the
+ * other blocks start with a header that records their allocator. Blocks
+ * with neither were allocated before the functions were installed and are
+ * freed by the functions in use at that time.
+ */
+
+#define GMPY_ALLOC_SYSTEM   0   /* the functions GMP used before gmpy2 */
+#define GMPY_ALLOC_PYMALLOC 1   /* PyMem_RawMalloc() and friends        */
+#define GMPY_ALLOC_ARENA    2   /* size classes carved from arenas      */
+
+/* The arena serves blocks of up to GMPY_ARENA_CLASSES * GMPY_ARENA_QUANTUM
+ * bytes. Arenas are GMPY_ARENA_PAGES pages of 2^GMPY_ARENA_PAGE_SHIFT
+ * bytes and are never returned to the system. The pages are recorded in a
+ * hash table with GMPY_ARENA_SLOTS entries which is never more than half
+ * full.
+ */
+
+#define GMPY_ARENA_QUANTUM    16
+#define GMPY_ARENA_CLASSES    32
+#define GMPY_ARENA_MAX        (GMPY_ARENA_CLASSES * GMPY_ARENA_QUANTUM)
+#define GMPY_ARENA_PAGE_SHIFT 16
+#define GMPY_ARENA_PAGES      16
+#define GMPY_ARENA_SLOTS      8192
+
+/* Atomic operations used by the allocation functions. They may be called
+ * by several threads at the same time without the GIL. The number of calls
+ * is counted with GMPY_COUNTER_ADD which avoids the cost of a locked
+ * instruction but may lose updates made by different threads at the same
+ * time. The byte counters are always exact.
+ */
+
+#if defined(_MSC_VER)
+#  include <intrin.h>
+#  define GMPY_ATOMIC_ADD(p, v)   _InterlockedExchangeAdd64((volatile __int64*)(p), (__int64)(v))
+#  define GMPY_COUNTER_ADD(p, v)  (*(volatile __int64*)(p) += (__int64)(v))
+#  define GMPY_ATOMIC_LOAD(p)     _InterlockedOr64((volatile __int64*)(p), 0)
+#  define GMPY_ATOMIC_STORE(p, v) _InterlockedExchange64((volatile __int64*)(p), (__int64)(v))
+#  define GMPY_SPIN_LOCK(l)       while (_InterlockedExchange((volatile long*)(l), 1)) { }
+#  define GMPY_SPIN_UNLOCK(l)     _InterlockedExchange((volatile long*)(l), 0)
+#else
+#  define GMPY_ATOMIC_ADD(p, v)   __atomic_fetch_add((p), (v), __ATOMIC_RELAXED)
+#  define GMPY_COUNTER_ADD(p, v)  __atomic_store_n((p), __atomic_load_n((p), __ATOMIC_RELAXED) + (v), __ATOMIC_RELAXED)
+#  define GMPY_ATOMIC_LOAD(p)     __atomic_load_n((p), __ATOMIC_ACQUIRE)
+#  define GMPY_ATOMIC_STORE(p, v) __atomic_store_n((p), (v), __ATOMIC_RELEASE)
+#  define GMPY_SPIN_LOCK(l)       while (__atomic_exchange_n((l), 1, __ATOMIC_ACQUIRE)) { }
+#  define GMPY_SPIN_UNLOCK(l)     __atomic_store_n((l), 0, __ATOMIC_RELEASE)
+#endif
+
+typedef struct {
+    int64_t allocator;              /* one of GMPY_ALLOC_*               */
+    int installed;                  /* memory functions are installed    */
+
+    /* The memory functions in use before set_allocator() was called. */
+    void *(*sys_allocate)(size_t);
+    void *(*sys_reallocate)(void *, size_t, size_t);
+    void (*sys_free)(void *, size_t);
+
+    /* Counters reported by allocator_stats(). */
+    int64_t allocations;
+    int64_t reallocations;
+    int64_t frees;
+    int64_t bytes_allocated;
+    int64_t bytes_freed;
+    int64_t arena_bytes;
+
+    /* Used to tag the blocks allocated outside the arena. */
+    uintptr_t secret;
+
+    /* The arena. The lock protects everything except pages and npages. */
+    long lock;
+    void *freelist[GMPY_ARENA_CLASSES];
+    char *bump;
+    char *bump_end;
+    int64_t npages;
+    int64_t pages[GMPY_ARENA_SLOTS];
+} GMPy_Allocator;
+
+static void *      GMPy_Allocate(size_t size);
+static void *      GMPy_Reallocate(void *ptr, size_t old_size, size_t new_size);
+static void        GMPy_Free(void *ptr, size_t size);
+
+static PyObject *  GMPy_set_allocator(PyObject *self, PyObject *other);
+static PyObject *  GMPy_allocator_stats(PyObject *self, PyObject *args);
+
+#ifdef __cplusplus
+}
+#endif
+#endif
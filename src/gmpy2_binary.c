@@ -230,6 +230,12 @@ GMPy_MPFR_From_Old_Binary(PyObject *self, PyObject *other)
     return (PyObject*)result;
 }
 
+/* The encoders below are split into a function that returns the exact size
+ * of the binary representation and a function that writes it into a buffer
+ * of that size. to_binary() writes directly into a new bytes object and
+ * dump() writes many values into a single chunk.
+ */
+
 /* Format of the binary representation of an mpz/xmpz.
  *
  * byte[0]:     1 => mpz
@@ -244,70 +250,29 @@ GMPy_MPFR_From_Old_Binary(PyObject *self, PyObject *other)
  * byte[2]+: value
  */
 
-static PyObject *
-GMPy_MPZ_To_Binary(MPZ_Object *self)
+static size_t
+GMPy_MPZ_Binary_Size(mpz_srcptr z)
 {
-    size_t size = 2;
-    int sgn;
-    char *buffer;
-    PyObject *result;
-
-    sgn = mpz_sgn(self->z);
-    if (sgn == 0) {
-        TEMP_ALLOC(buffer, size);
-        buffer[0] = 0x01;
-        buffer[1] = 0x00;
-        goto done;
-    }
-
-    size = mpz_sizeinbase(self->z, 256) + 2;
-
-    TEMP_ALLOC(buffer, size);
-    buffer[0] = 0x01;
-    if (sgn > 0)
-        buffer[1] = 0x01;
-    else
-        buffer[1] = 0x02;
-    mpn_get_str((unsigned char *)(buffer + 2), 256,
-                self->z->_mp_d, Py_ABS(self->z->_mp_size));
-    revstr(buffer, 2, size - 1);
-
-  done:
-    result = PyBytes_FromStringAndSize(buffer, size);
-    TEMP_FREE(buffer, size);
-    return result;
+    if (mpz_sgn(z) == 0)
+        return 2;
+    return ((mpz_sizeinbase(z, 2) + 7) / 8) + 2;
 }
 
-static PyObject *
-GMPy_XMPZ_To_Binary(XMPZ_Object *self)
+static void
+GMPy_MPZ_Binary_Write(char *buffer, mpz_srcptr z, char type)
 {
-    size_t size = 2;
-    int sgn;
-    char *buffer;
-    PyObject *result;
+    int sgn = mpz_sgn(z);
 
-    sgn = mpz_sgn(self->z);
+    buffer[0] = type;
     if (sgn == 0) {
-        TEMP_ALLOC(buffer, size);
-        buffer[0] = 0x02;
         buffer[1] = 0x00;
-        goto done;
+        return;
     }
-
-    size = ((mpz_sizeinbase(self->z, 2) + 7) / 8) + 2;
-
-    TEMP_ALLOC(buffer, size);
-    buffer[0] = 0x02;
     if (sgn > 0)
         buffer[1] = 0x01;
     else
         buffer[1] = 0x02;
-    mpz_export(buffer+2, NULL, -1, sizeof(char), 0, 0, self->z);
-
-  done:
-    result = PyBytes_FromStringAndSize(buffer, size);
-    TEMP_FREE(buffer, size);
-    return result;
+    mpz_export(buffer+2, NULL, -1, sizeof(char), 0, 0, z);
 }
 
 /* Format of the binary representation of an mpq.
@@ -327,27 +292,11 @@ GMPy_XMPZ_To_Binary(XMPZ_Object *self)
  * byte[2+n]+:  numerator, followed by denominator
  */
 
-static PyObject *
-GMPy_MPQ_To_Binary(MPQ_Object *self)
-{
-    size_t sizenum, sizeden, sizesize = 4, size = 2, sizetemp, i;
-    size_t count = 0;
-    int sgn;
-    char *buffer, large = 0x00;
-    PyObject *result = 0;
-
-    sgn = mpq_sgn(self->q);
-    if (sgn == 0) {
-        TEMP_ALLOC(buffer, size);
-        buffer[0] = 0x03;
-        buffer[1] = 0x00;
-        goto done;
-    }
-
-    sizenum = (mpz_sizeinbase(mpq_numref(self->q), 2) + 7) / 8;
-    sizeden = (mpz_sizeinbase(mpq_denref(self->q), 2) + 7) / 8;
-    size = sizenum + sizeden + 2;
+/* Return 4 or 8, the number of bytes used to save the numerator length. */
 
+static size_t
+GMPy_MPQ_Binary_SizeSize(size_t sizenum)
+{
     /* Check if sizenum larger than 32 bits. */
     if ((sizenum >> 16) >> 16) {
         /* Current versions of GMP do not allow values to be this large. The
@@ -355,14 +304,44 @@ GMPy_MPQ_To_Binary(MPQ_Object *self)
          * larger values.
          */
         /* LCOV_EXCL_START */
-        large = 0x04;
-        sizesize = 8;
+        return 8;
         /* LCOV_EXCL_STOP */
     }
-    size += sizesize;
+    return 4;
+}
+
+static size_t
+GMPy_MPQ_Binary_Size(mpq_srcptr q)
+{
+    size_t sizenum, sizeden;
+
+    if (mpq_sgn(q) == 0)
+        return 2;
+
+    sizenum = (mpz_sizeinbase(mpq_numref(q), 2) + 7) / 8;
+    sizeden = (mpz_sizeinbase(mpq_denref(q), 2) + 7) / 8;
+    return sizenum + sizeden + 2 + GMPy_MPQ_Binary_SizeSize(sizenum);
+}
+
+static void
+GMPy_MPQ_Binary_Write(char *buffer, mpq_srcptr q)
+{
+    size_t sizenum, sizesize, sizetemp, i;
+    int sgn;
+    char large = 0x00;
 
-    TEMP_ALLOC(buffer, size);
     buffer[0] = 0x03;
+    sgn = mpq_sgn(q);
+    if (sgn == 0) {
+        buffer[1] = 0x00;
+        return;
+    }
+
+    sizenum = (mpz_sizeinbase(mpq_numref(q), 2) + 7) / 8;
+    sizesize = GMPy_MPQ_Binary_SizeSize(sizenum);
+    if (sizesize == 8)
+        large = 0x04;
+
     if (sgn > 0)
         buffer[1] = 0x01 | large;
     else
@@ -375,31 +354,10 @@ GMPy_MPQ_To_Binary(MPQ_Object *self)
         sizetemp >>= 8;
     }
 
-    mpz_export(buffer+sizesize+2, &count, -1,
-               sizeof(char), 0, 0, mpq_numref(self->q));
-    if (count != sizenum) {
-        /* LCOV_EXCL_START */
-        SYSTEM_ERROR("internal error in Pympq_To_Binary");
-        TEMP_FREE(buffer, size);
-        return NULL;
-        /* LCOV_EXCL_STOP */
-    }
-    count = 0;
-    mpz_export(buffer+sizenum+sizesize+2, &count, -1,
-               sizeof(char), 0, 0, mpq_denref(self->q));
-    if (count != sizeden) {
-        /* LCOV_EXCL_START */
-        SYSTEM_ERROR("internal error in Pympq_To_Binary");
-        TEMP_FREE(buffer, size);
-        return NULL;
-        /* LCOV_EXCL_STOP */
-    }
-
-
-  done:
-    result = PyBytes_FromStringAndSize(buffer, size);
-    TEMP_FREE(buffer, size);
-    return result;
+    mpz_export(buffer+sizesize+2, NULL, -1,
+               sizeof(char), 0, 0, mpq_numref(q));
+    mpz_export(buffer+sizenum+sizesize+2, NULL, -1,
+               sizeof(char), 0, 0, mpq_denref(q));
 }
 
 /* Format of the binary representation of an mpfr.
@@ -432,35 +390,33 @@ GMPy_MPQ_To_Binary(MPQ_Object *self)
  * byte[4+2n]+:  mantissa
  */
 
-static PyObject *
-GMPy_MPFR_To_Binary(MPFR_Object *self)
+/* Return the size of the mantissa in limbs. The exponent and mantissa are
+ * only valid for regular numbers (not 0, Nan, Inf, -Inf).
+ */
+
+static size_t
+GMPy_MPFR_Binary_SizeMant(mpfr_srcptr f)
 {
-    size_t sizemant = 0, sizesize = 4, size = 4, sizetemp, i;
-    mp_limb_t templimb;
-    mpfr_prec_t precision;
-    mpfr_exp_t exponent = 0;
-    int sgn;
-    char *buffer, *cp, large = 0x00, expsgn = 0x00;
-    PyObject *result = 0;
+    if (!mpfr_regular_p(f))
+        return 0;
+    return (f->_mpfr_prec + mp_bits_per_limb - 1)/mp_bits_per_limb;
+}
 
-    /* Check if the precision, exponent and mantissa length can fit in
-     * 32 bits.
-     */
+/* Return 4 or 8, depending on whether the precision, exponent and mantissa
+ * length can fit in 32 bits.
+ */
 
-    sgn = mpfr_signbit(self->f);
-    precision = mpfr_get_prec(self->f);
+static size_t
+GMPy_MPFR_Binary_SizeSize(mpfr_srcptr f)
+{
+    mpfr_exp_t exponent = 0;
+    mpfr_prec_t precision = mpfr_get_prec(f);
+    size_t sizemant = GMPy_MPFR_Binary_SizeMant(f);
 
-    /* Exponent and mantiss are only valid for regular numbers
-     * (not 0, Nan, Inf, -Inf).
-     */
-    if (mpfr_regular_p(self->f)) {
-        exponent = self->f->_mpfr_exp;
-        if (exponent < 0) {
+    if (mpfr_regular_p(f)) {
+        exponent = f->_mpfr_exp;
+        if (exponent < 0)
             exponent = -exponent;
-            expsgn = 0x20;
-        }
-        /* Calculate the size of mantissa in limbs */
-        sizemant = (self->f->_mpfr_prec + mp_bits_per_limb - 1)/mp_bits_per_limb;
     }
     if (((exponent >> 16) >> 16) ||
         ((precision >> 16) >> 16) ||
@@ -468,90 +424,81 @@ GMPy_MPFR_To_Binary(MPFR_Object *self)
         /* This can only be tested on 64-bit platforms. lcov will report the
          * code as not tested until 64-bit specific tests are created.
          */
-        sizesize = 8;
-        large = 0x04;
+        return 8;
     }
+    return 4;
+}
 
-    if (!mpfr_regular_p(self->f)) {
-        /* Only need to save the precision. */
-        size += sizesize;
-        TEMP_ALLOC(buffer, size);
-        buffer[0] = 0x04;
-
-        /* Set to all 0 since we are special. */
-        buffer[1] = 0x00;
-
-        /* Set the sign bit. */
-        if (sgn) buffer[1] |= 0x02;
+static size_t
+GMPy_MPFR_Binary_Size(mpfr_srcptr f)
+{
+    size_t sizesize = GMPy_MPFR_Binary_SizeSize(f);
 
-        /* 4 or 8 byte values. */
-        buffer[1] |= large;
+    /* Special values only need to save the precision. */
+    if (!mpfr_regular_p(f))
+        return 4 + sizesize;
+    return 4 + (2 * sizesize) +
+           (GMPy_MPFR_Binary_SizeMant(f) * (mp_bits_per_limb >> 3));
+}
 
-        /* Check if NaN. */
-        if (mpfr_nan_p(self->f)) buffer[1] |= 0x08;
+static void
+GMPy_MPFR_Binary_Write(char *buffer, mpfr_srcptr f, int rc, char type)
+{
+    size_t sizemant, sizesize, sizetemp, i;
+    mp_limb_t templimb;
+    mpfr_exp_t exponent;
+    char *cp;
 
-        /* Check if Infinity. */
-        if (mpfr_inf_p(self->f)) buffer[1] |= 0x10;
-
-        /* Save the result code */
-        if (self->rc == 0)     buffer[2] = 0x00;
-        else if (self->rc > 0) buffer[2] = 0x01;
-        else                   buffer[2] = 0x02;
-
-        /* Save the precision */
-        sizetemp = precision;
-        for (i=0; i<sizesize; i++) {
-            buffer[i+4] = (char)(sizetemp & 0xff);
-            sizetemp >>= 8;
-        }
-        goto done;
-    }
+    sizesize = GMPy_MPFR_Binary_SizeSize(f);
 
-    /* Now process all actual numbers. */
-    size += (2 * sizesize) + (sizemant * (mp_bits_per_limb >> 3));
-    TEMP_ALLOC(buffer, size);
-    buffer[0] = 0x04;
+    buffer[0] = type;
 
-    /* Set bit 0 to 1 since we are an actual number. */
-    buffer[1] = 0x01;
+    /* Set bit 0 to 1 if we are an actual number. */
+    buffer[1] = mpfr_regular_p(f) ? 0x01 : 0x00;
 
     /* Save the sign bit. */
-    if (sgn) buffer[1] |= 0x02;
+    if (mpfr_signbit(f)) buffer[1] |= 0x02;
 
     /* Save the size of the values. */
-    buffer[1] |= large;
-
-    /* Save the exponent sign. */
-    buffer[1] |= expsgn;
-
-    /* Save the limb size. */
-    if ((mp_bits_per_limb >> 3) == 8)
-        buffer[1] |= 0x40;
-    /* This branch can only be reached on 32-bit platforms. */
-    else if ((mp_bits_per_limb >> 3) != 4) {
-        /* LCOV_EXCL_START */
-        SYSTEM_ERROR("cannot support current limb size");
-        TEMP_FREE(buffer, size);
-        return NULL;
-        /* LCOV_EXCL_STOP */
-    }
+    if (sizesize == 8) buffer[1] |= 0x04;
 
     /* Save the result code. */
-    if (self->rc == 0)     buffer[2] = 0x00;
-    else if (self->rc > 0) buffer[2] = 0x01;
-    else                   buffer[2] = 0x02;
+    if (rc == 0)     buffer[2] = 0x00;
+    else if (rc > 0) buffer[2] = 0x01;
+    else             buffer[2] = 0x02;
 
     /* Rounding mode is no longer used, so just store a null byte. */
     buffer[3] = 0x00;
 
     /* Save the precision */
     cp = buffer + 4;
-    sizetemp = precision;
+    sizetemp = mpfr_get_prec(f);
     for (i=0; i<sizesize; i++) {
         cp[i] = (char)(sizetemp & 0xff);
         sizetemp >>= 8;
     }
 
+    if (!mpfr_regular_p(f)) {
+        /* Check if NaN. */
+        if (mpfr_nan_p(f)) buffer[1] |= 0x08;
+
+        /* Check if Infinity. */
+        if (mpfr_inf_p(f)) buffer[1] |= 0x10;
+        return;
+    }
+
+    /* Save the exponent sign. */
+    exponent = f->_mpfr_exp;
+    if (exponent < 0) {
+        exponent = -exponent;
+        buffer[1] |= 0x20;
+    }
+
+    /* Save the limb size. */
+#if GMP_LIMB_BITS == 64
+    buffer[1] |= 0x40;
+#endif
+
     /* Save the exponenet */
     cp += sizesize;
     sizetemp = exponent;
@@ -562,8 +509,9 @@ GMPy_MPFR_To_Binary(MPFR_Object *self)
 
     /* Save the actual mantissa */
     cp += sizesize;
+    sizemant = GMPy_MPFR_Binary_SizeMant(f);
     for (i=0; i<sizemant; i++) {
-        templimb = self->f->_mpfr_d[i];
+        templimb = f->_mpfr_d[i];
 #if GMP_LIMB_BITS == 64
         cp[0] = (char)(templimb & 0xff);
         templimb >>= 8;
@@ -592,120 +540,80 @@ GMPy_MPFR_To_Binary(MPFR_Object *self)
         cp[3] = (char)(templimb & 0xff);
         cp += 4;
 #endif
-}
-
-  done:
-    result = PyBytes_FromStringAndSize(buffer, size);
-    TEMP_FREE(buffer, size);
-    return result;
+    }
 }
 
 /* Format of the binary representation of an mpc.
  *
  * The format consists of the concatenation of mpfrs (real and imaginary)
  * converted to binary format. The 0x04 leading byte of each binary string
- * is replaced by 0x05.
+ * is replaced by 0x05. Only the real part saves the result code.
  */
 
-static PyObject *
-GMPy_MPC_To_Binary(MPC_Object *obj)
+static size_t
+GMPy_MPC_Binary_Size(mpc_srcptr c)
 {
-    MPFR_Object *real = NULL, *imag = NULL;
-    PyObject *result = NULL, *temp = NULL;
-    mpfr_prec_t rprec = 0, iprec = 0;
-    CTXT_Object *context = NULL;
-
-    CHECK_CONTEXT(context);
-
-    mpc_get_prec2(&rprec, &iprec, obj->c);
-
-    if (!(real = GMPy_MPFR_New(rprec, context)) ||
-        !(imag = GMPy_MPFR_New(iprec, context))) {
-        /* LCOV_EXCL_START */
-        Py_XDECREF((PyObject*)real);
-        Py_XDECREF((PyObject*)imag);
-        return NULL;
-        /* LCOV_EXCL_STOP */
-    }
-
-    mpfr_set(real->f, mpc_realref(obj->c), MPFR_RNDN);
-    mpfr_set(imag->f, mpc_imagref(obj->c), MPFR_RNDN);
-    real->rc = obj->rc;
-
-    if (!(result = GMPy_MPFR_To_Binary(real)) ||
-        !(temp = GMPy_MPFR_To_Binary(imag))) {
-        /* LCOV_EXCL_START */
-        Py_XDECREF((PyObject*)result);
-        Py_XDECREF((PyObject*)temp);
-        Py_DECREF((PyObject*)real);
-        Py_DECREF((PyObject*)imag);
-        return NULL;
-        /* LCOV_EXCL_STOP */
-    }
-
-    Py_DECREF((PyObject*)real);
-    Py_DECREF((PyObject*)imag);
-
-    Py_ssize_t result_size, temp_size;
-    char *result_str, *temp_str;
+    return GMPy_MPFR_Binary_Size(mpc_realref(c)) +
+           GMPy_MPFR_Binary_Size(mpc_imagref(c));
+}
 
-    if ((PyBytes_AsStringAndSize(result, &result_str, &result_size) < 0)
-        || (PyBytes_AsStringAndSize(temp, &temp_str, &temp_size) < 0))
-    {
-        /* LCOV_EXCL_START */
-        Py_DECREF(result);
-        Py_DECREF(temp);
-        return NULL;
-        /* LCOV_EXCL_STOP */
-    }
-    result_str[0] = 0x05;
-    temp_str[0] = 0x05;
+static void
+GMPy_MPC_Binary_Write(char *buffer, mpc_srcptr c, int rc)
+{
+    GMPy_MPFR_Binary_Write(buffer, mpc_realref(c), rc, 0x05);
+    GMPy_MPFR_Binary_Write(buffer + GMPy_MPFR_Binary_Size(mpc_realref(c)),
+                           mpc_imagref(c), 0, 0x05);
+}
 
-    char *buf = PyMem_Malloc(result_size + temp_size);
+/* Return the size of the binary representation of obj. Returns 0 if obj is
+ * not a gmpy2 object.
+ */
 
-    if (!buf) {
-        /* LCOV_EXCL_START */
-        Py_DECREF(result);
-        Py_DECREF(temp);
-        return NULL;
-        /* LCOV_EXCL_STOP */
-    }
-    memcpy(buf, result_str, result_size);
-    memcpy(buf + result_size, temp_str, temp_size);
-    Py_DECREF(result);
-    Py_DECREF(temp);
+static size_t
+GMPy_MPANY_Binary_Size(PyObject *obj)
+{
+    if (MPZ_Check(obj) || XMPZ_Check(obj))
+        return GMPy_MPZ_Binary_Size(MPZ(obj));
+    else if (MPQ_Check(obj))
+        return GMPy_MPQ_Binary_Size(MPQ(obj));
+    else if (MPFR_Check(obj))
+        return GMPy_MPFR_Binary_Size(MPFR(obj));
+    else if (MPC_Check(obj))
+        return GMPy_MPC_Binary_Size(MPC(obj));
+    return 0;
+}
 
-    PyObject *ret = PyBytes_FromStringAndSize(buf, result_size + temp_size);
+/* Write the binary representation of obj. The buffer must have room for
+ * GMPy_MPANY_Binary_Size(obj) bytes.
+ */
 
-    PyMem_Free(buf);
-    return ret;
+static void
+GMPy_MPANY_Binary_Write(char *buffer, PyObject *obj)
+{
+    if (MPZ_Check(obj))
+        GMPy_MPZ_Binary_Write(buffer, MPZ(obj), 0x01);
+    else if (XMPZ_Check(obj))
+        GMPy_MPZ_Binary_Write(buffer, MPZ(obj), 0x02);
+    else if (MPQ_Check(obj))
+        GMPy_MPQ_Binary_Write(buffer, MPQ(obj));
+    else if (MPFR_Check(obj))
+        GMPy_MPFR_Binary_Write(buffer, MPFR(obj), ((MPFR_Object*)obj)->rc, 0x04);
+    else if (MPC_Check(obj))
+        GMPy_MPC_Binary_Write(buffer, MPC(obj), ((MPC_Object*)obj)->rc);
 }
 
-PyDoc_STRVAR(doc_from_binary,
-"from_binary(bytes, /) -> mpz | xmpz | mpq | mpfr | mpc\n\n"
-"Return a Python object from a byte sequence created by `to_binary()`.");
+/* Decode the len bytes at buffer. Used by from_binary() and load(). */
 
 static PyObject *
-GMPy_MPANY_From_Binary(PyObject *self, PyObject *other)
+GMPy_MPANY_From_Binary_Buffer(unsigned char *buffer, Py_ssize_t len,
+                              CTXT_Object *context)
 {
-    unsigned char *buffer, *cp;
-    Py_ssize_t len;
-    CTXT_Object *context = NULL;
-
-    CHECK_CONTEXT(context);
-
-    if (!(PyBytes_Check(other))) {
-        TYPE_ERROR("from_binary() requires bytes argument");
-        return NULL;
-    }
+    unsigned char *cp = buffer;
 
-    len = PyBytes_Size(other);
     if (len < 2) {
         VALUE_ERROR("byte sequence too short for from_binary()");
         return NULL;
     }
-    buffer = (unsigned char*)PyBytes_AsString(other);
-    cp = buffer;
 
     switch (cp[0]) {
         case 0x01: {
@@ -841,8 +749,10 @@ GMPy_MPANY_From_Binary(PyObject *self, PyObject *other)
                 /* Process special numbers. */
                 if ((cp[1] & 0x18) == 0x00)
                     mpfr_set_zero(result->f, sgn);
-                else if ((cp[1] & 0x18) == 0x08)
+                else if ((cp[1] & 0x18) == 0x08) {
                     mpfr_set_nan(result->f);
+                    mpfr_setsign(result->f, result->f, sgn < 0, MPFR_RNDN);
+                }
                 else
                     mpfr_set_inf(result->f, sgn);
                 return (PyObject*)result;
@@ -996,8 +906,10 @@ GMPy_MPANY_From_Binary(PyObject *self, PyObject *other)
             if (!(cp[1] & 0x01)) {
                 if ((cp[1] & 0x18) == 0x00)
                     mpfr_set_zero(real->f, sgn);
-                else if ((cp[1] & 0x18) == 0x08)
+                else if ((cp[1] & 0x18) == 0x08) {
                     mpfr_set_nan(real->f);
+                    mpfr_setsign(real->f, real->f, sgn < 0, MPFR_RNDN);
+                }
                 else
                     mpfr_set_inf(real->f, sgn);
                 cp += 4 + sizesize;
@@ -1124,8 +1036,10 @@ GMPy_MPANY_From_Binary(PyObject *self, PyObject *other)
             if (!(cp[1] & 0x01)) {
                 if ((cp[1] & 0x18) == 0x00)
                     mpfr_set_zero(imag->f, sgn);
-                else if ((cp[1] & 0x18) == 0x08)
+                else if ((cp[1] & 0x18) == 0x08) {
                     mpfr_set_nan(imag->f);
+                    mpfr_setsign(imag->f, imag->f, sgn < 0, MPFR_RNDN);
+                }
                 else
                     mpfr_set_inf(imag->f, sgn);
                 goto alldone;
@@ -1237,6 +1151,26 @@ GMPy_MPANY_From_Binary(PyObject *self, PyObject *other)
     }
 }
 
+PyDoc_STRVAR(doc_from_binary,
+"from_binary(bytes, /) -> mpz | xmpz | mpq | mpfr | mpc\n\n"
+"Return a Python object from a byte sequence created by `to_binary()`.");
+
+static PyObject *
+GMPy_MPANY_From_Binary(PyObject *self, PyObject *other)
+{
+    CTXT_Object *context = NULL;
+
+    CHECK_CONTEXT(context);
+
+    if (!(PyBytes_Check(other))) {
+        TYPE_ERROR("from_binary() requires bytes argument");
+        return NULL;
+    }
+
+    return GMPy_MPANY_From_Binary_Buffer((unsigned char*)PyBytes_AS_STRING(other),
+                                         PyBytes_GET_SIZE(other), context);
+}
+
 PyDoc_STRVAR(doc_to_binary,
 "to_binary(x, /) -> bytes\n\n"
 "Return a Python byte sequence that is a portable binary\n"
@@ -1247,16 +1181,410 @@ PyDoc_STRVAR(doc_to_binary,
 static PyObject *
 GMPy_MPANY_To_Binary(PyObject *self, PyObject *other)
 {
-    if(MPZ_Check(other))
-        return GMPy_MPZ_To_Binary((MPZ_Object*)other);
-    else if(XMPZ_Check(other))
-        return GMPy_XMPZ_To_Binary((XMPZ_Object*)other);
-    else if(MPQ_Check(other))
-        return GMPy_MPQ_To_Binary((MPQ_Object*)other);
-    else if(MPFR_Check(other))
-        return GMPy_MPFR_To_Binary((MPFR_Object*)other);
-    else if(MPC_Check(other))
-        return GMPy_MPC_To_Binary((MPC_Object*)other);
-    TYPE_ERROR("to_binary() argument type not supported");
+    size_t size;
+    PyObject *result;
+
+    if (!(size = GMPy_MPANY_Binary_Size(other))) {
+        TYPE_ERROR("to_binary() argument type not supported");
+        return NULL;
+    }
+
+    if (!(result = PyBytes_FromStringAndSize(NULL, (Py_ssize_t)size))) {
+        /* LCOV_EXCL_START */
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+    GMPy_MPANY_Binary_Write(PyBytes_AS_STRING(result), other);
+    return result;
+}
+
+/* Pickle support. For protocols below 5, and for values whose binary
+ * representation is smaller than GMPY_PICKLE_BUFFER_MIN bytes, an object x
+ * is pickled as from_binary(to_binary(x)). Otherwise the limbs are passed to
+ * pickle as PickleBuffer objects that refer to the memory of x, so they can
+ * be transferred out-of-band without a copy. They are reassembled by
+ * _from_limbs(kind, info, *buffers) where kind is the leading byte of the
+ * binary format and info is a tuple that starts with the limb size and the
+ * byte order of the limbs.
+ *
+ *   mpz/xmpz: info = (limbsize, bigendian, sign), buffers = (abs(x),)
+ *   mpq:      info = (limbsize, bigendian, sign), buffers = (num, den)
+ *   mpfr:     info = (limbsize, bigendian, rc, prec, flags, exp),
+ *             buffers = (mantissa,)
+ *   mpc:      info = (limbsize, bigendian, rc, prec, flags, exp,
+ *                     prec, flags, exp), buffers = (real, imag)
+ *
+ * For an mpfr, bit 0 of flags is the sign bit and bits 1-2 are 0 for a
+ * regular number, 1 for zero, 2 for NaN, and 3 for Inf. The mantissa of a
+ * number that is not regular is empty.
+ */
+
+#define GMPY_PICKLE_BUFFER_MIN (1 << 16)
+
+/* The functions used to unpickle. Set when the module is initialized. */
+
+static PyObject *GMPy_Pickle_From_Binary = NULL;
+static PyObject *GMPy_Pickle_From_Limbs = NULL;
+
+static int
+GMPy_Pickle_BigEndian(void)
+{
+    const uint16_t one = 1;
+
+    return *(const unsigned char*)&one == 0;
+}
+
+/* Return a PickleBuffer that refers to size limbs owned by owner. */
+
+static PyObject *
+GMPy_Pickle_Buffer(PyObject *owner, const mp_limb_t *limbs, size_t size)
+{
+    PyObject *exporter, *result;
+
+    if (!(exporter = GMPy_Limbs_New(owner, limbs, size))) {
+        /* LCOV_EXCL_START */
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+    result = PyPickleBuffer_FromObject(exporter);
+    Py_DECREF(exporter);
+    return result;
+}
+
+static int
+GMPy_Pickle_MPFR_Flags(mpfr_srcptr f)
+{
+    int flags = mpfr_signbit(f) ? 1 : 0;
+
+    if (mpfr_zero_p(f))
+        flags |= 2;
+    else if (mpfr_nan_p(f))
+        flags |= 4;
+    else if (mpfr_inf_p(f))
+        flags |= 6;
+    return flags;
+}
+
+static PyObject *
+GMPy_Pickle_MPFR_Mantissa(PyObject *owner, mpfr_srcptr f)
+{
+    return GMPy_Pickle_Buffer(owner, f->_mpfr_d, GMPy_MPFR_Binary_SizeMant(f));
+}
+
+PyDoc_STRVAR(GMPy_doc_method_reduce_ex,
+"x.__reduce_ex__(protocol, /) -> tuple\n\n"
+"Support for pickle. With protocol 5 or higher, the limbs of large values\n"
+"are passed to pickle as PickleBuffer objects so they can be transferred\n"
+"out-of-band without being copied.");
+
+static PyObject *
+GMPy_MPANY_Method_Reduce_Ex(PyObject *self, PyObject *other)
+{
+    PyObject *binary, *temp = NULL, *buf1 = NULL, *buf2 = NULL, *info = NULL;
+    int limbsize = (int)sizeof(mp_limb_t);
+    int bigendian = GMPy_Pickle_BigEndian();
+    long protocol;
+
+    protocol = PyLong_AsLong(other);
+    if (protocol == -1 && PyErr_Occurred()) {
+        return NULL;
+    }
+
+    if (protocol < 5 || GMPy_MPANY_Binary_Size(self) < GMPY_PICKLE_BUFFER_MIN) {
+        if (!(binary = GMPy_MPANY_To_Binary(NULL, self))) {
+            return NULL;
+        }
+        return Py_BuildValue("(O(N))", GMPy_Pickle_From_Binary, binary);
+    }
+
+    if (MPZ_Check(self) || XMPZ_Check(self)) {
+        /* An xmpz is copied so it can still be changed while pickle holds
+         * the buffer.
+         */
+        if (XMPZ_Check(self)) {
+            if (!(temp = (PyObject*)GMPy_MPZ_New(NULL))) {
+                /* LCOV_EXCL_START */
+                return NULL;
+                /* LCOV_EXCL_STOP */
+            }
+            mpz_set(MPZ(temp), MPZ(self));
+        }
+        else {
+            Py_INCREF(self);
+            temp = self;
+        }
+        buf1 = GMPy_Pickle_Buffer(temp, mpz_limbs_read(MPZ(temp)), mpz_size(MPZ(temp)));
+        info = Py_BuildValue("(iii)", limbsize, bigendian, mpz_sgn(MPZ(temp)));
+        Py_DECREF(temp);
+        if (!buf1 || !info) {
+            /* LCOV_EXCL_START */
+            goto error;
+            /* LCOV_EXCL_STOP */
+        }
+        return Py_BuildValue("(O(iNN))", GMPy_Pickle_From_Limbs,
+                             MPZ_Check(self) ? 0x01 : 0x02, info, buf1);
+    }
+    else if (MPQ_Check(self)) {
+        mpz_srcptr num = mpq_numref(MPQ(self)), den = mpq_denref(MPQ(self));
+
+        buf1 = GMPy_Pickle_Buffer(self, mpz_limbs_read(num), mpz_size(num));
+        buf2 = GMPy_Pickle_Buffer(self, mpz_limbs_read(den), mpz_size(den));
+        info = Py_BuildValue("(iii)", limbsize, bigendian, mpq_sgn(MPQ(self)));
+        if (!buf1 || !buf2 || !info) {
+            /* LCOV_EXCL_START */
+            goto error;
+            /* LCOV_EXCL_STOP */
+        }
+        return Py_BuildValue("(O(iNNN))", GMPy_Pickle_From_Limbs, 0x03,
+                             info, buf1, buf2);
+    }
+    else if (MPFR_Check(self)) {
+        mpfr_srcptr f = MPFR(self);
+
+        buf1 = GMPy_Pickle_MPFR_Mantissa(self, f);
+        info = Py_BuildValue("(iiilil)", limbsize, bigendian,
+                             ((MPFR_Object*)self)->rc, (long)mpfr_get_prec(f),
+                             GMPy_Pickle_MPFR_Flags(f),
+                             mpfr_regular_p(f) ? (long)f->_mpfr_exp : 0L);
+        if (!buf1 || !info) {
+            /* LCOV_EXCL_START */
+            goto error;
+            /* LCOV_EXCL_STOP */
+        }
+        return Py_BuildValue("(O(iNN))", GMPy_Pickle_From_Limbs, 0x04, info, buf1);
+    }
+    else {
+        mpfr_srcptr re = mpc_realref(MPC(self)), im = mpc_imagref(MPC(self));
+
+        buf1 = GMPy_Pickle_MPFR_Mantissa(self, re);
+        buf2 = GMPy_Pickle_MPFR_Mantissa(self, im);
+        info = Py_BuildValue("(iiilillil)", limbsize, bigendian,
+                             ((MPC_Object*)self)->rc,
+                             (long)mpfr_get_prec(re), GMPy_Pickle_MPFR_Flags(re),
+                             mpfr_regular_p(re) ? (long)re->_mpfr_exp : 0L,
+                             (long)mpfr_get_prec(im), GMPy_Pickle_MPFR_Flags(im),
+                             mpfr_regular_p(im) ? (long)im->_mpfr_exp : 0L);
+        if (!buf1 || !buf2 || !info) {
+            /* LCOV_EXCL_START */
+            goto error;
+            /* LCOV_EXCL_STOP */
+        }
+        return Py_BuildValue("(O(iNNN))", GMPy_Pickle_From_Limbs, 0x05,
+                             info, buf1, buf2);
+    }
+
+  error:
+    /* LCOV_EXCL_START */
+    Py_XDECREF(buf1);
+    Py_XDECREF(buf2);
+    Py_XDECREF(info);
+    return NULL;
+    /* LCOV_EXCL_STOP */
+}
+
+/* Set z to the limbs in the buffer of obj. */
+
+static int
+GMPy_Pickle_Import(mpz_ptr z, PyObject *obj, int limbsize, int bigendian)
+{
+    Py_buffer view;
+
+    if (PyObject_GetBuffer(obj, &view, PyBUF_SIMPLE) < 0) {
+        return -1;
+    }
+    if (view.len % limbsize) {
+        PyBuffer_Release(&view);
+        VALUE_ERROR("invalid limbs for _from_limbs()");
+        return -1;
+    }
+    mpz_import(z, (size_t)(view.len / limbsize), -1, (size_t)limbsize,
+               bigendian ? 1 : -1, 0, view.buf);
+    PyBuffer_Release(&view);
+    return 0;
+}
+
+/* Set f, which already has the saved precision, from the flags, exponent
+ * and mantissa saved by GMPy_MPANY_Method_Reduce_Ex().
+ */
+
+static int
+GMPy_Pickle_Import_MPFR(mpfr_ptr f, int flags, long exp, PyObject *obj,
+                        int limbsize, int bigendian)
+{
+    mpz_t mant;
+    size_t bits;
+    int sgn = (flags & 1) ? -1 : 1;
+
+    switch ((flags >> 1) & 3) {
+        case 1:
+            mpfr_set_zero(f, sgn);
+            return 0;
+        case 2:
+            mpfr_set_nan(f);
+            mpfr_setsign(f, f, sgn < 0, MPFR_RNDN);
+            return 0;
+        case 3:
+            mpfr_set_inf(f, sgn);
+            return 0;
+    }
+
+    mpz_init(mant);
+    if (GMPy_Pickle_Import(mant, obj, limbsize, bigendian) < 0) {
+        mpz_clear(mant);
+        return -1;
+    }
+
+    /* The most significant bit of the mantissa must be set and the value
+     * must fit in the precision.
+     */
+    bits = mpz_sgn(mant) ? mpz_sizeinbase(mant, 2) : 0;
+    if (bits == 0 || bits % (8 * limbsize) ||
+        bits - mpz_scan1(mant, 0) > (size_t)mpfr_get_prec(f) ||
+        exp < mpfr_get_emin_min() || exp > mpfr_get_emax_max()) {
+        mpz_clear(mant);
+        VALUE_ERROR("invalid limbs for _from_limbs()");
+        return -1;
+    }
+
+    /* Set f to mant / 2**bits, which is in [1/2, 1), and then restore the
+     * exponent directly so it does not depend on the current exponent range.
+     */
+    mpfr_set_z_2exp(f, mant, -(mpfr_exp_t)bits, MPFR_RNDN);
+    mpz_clear(mant);
+    f->_mpfr_exp = (mpfr_exp_t)exp;
+    if (sgn < 0)
+        mpfr_neg(f, f, MPFR_RNDN);
+    return 0;
+}
+
+PyDoc_STRVAR(GMPy_doc_function_from_limbs,
+"_from_limbs(kind, info, *buffers, /) -> mpz | xmpz | mpq | mpfr | mpc\n\n"
+"Return a gmpy2 object from the limbs saved by __reduce_ex__(). Used by\n"
+"pickle.");
+
+static PyObject *
+GMPy_MPANY_From_Limbs(PyObject *self, PyObject *const *args, Py_ssize_t nargs)
+{
+    PyObject *result = NULL;
+    CTXT_Object *context = NULL;
+    int limbsize, bigendian, sign = 0, rc = 0, flags = 0, iflags = 0;
+    long kind, prec = 0, exp = 0, iprec = 0, iexp = 0;
+
+    CHECK_CONTEXT(context);
+
+    if (nargs < 3 || !PyTuple_Check(args[1])) {
+        TYPE_ERROR("_from_limbs() requires a kind, a tuple, and buffers");
+        return NULL;
+    }
+    kind = PyLong_AsLong(args[0]);
+    if (kind == -1 && PyErr_Occurred()) {
+        return NULL;
+    }
+
+    switch (kind) {
+        case 0x01:
+        case 0x02:
+        case 0x03:
+            if (nargs != (kind == 0x03 ? 4 : 3) ||
+                !PyArg_ParseTuple(args[1], "iii", &limbsize, &bigendian, &sign)) {
+                goto invalid;
+            }
+            break;
+        case 0x04:
+            if (nargs != 3 ||
+                !PyArg_ParseTuple(args[1], "iiilil", &limbsize, &bigendian,
+                                  &rc, &prec, &flags, &exp)) {
+                goto invalid;
+            }
+            break;
+        case 0x05:
+            if (nargs != 4 ||
+                !PyArg_ParseTuple(args[1], "iiilillil", &limbsize, &bigendian,
+                                  &rc, &prec, &flags, &exp,
+                                  &iprec, &iflags, &iexp)) {
+                goto invalid;
+            }
+            break;
+        default:
+            goto invalid;
+    }
+    if (limbsize < 1 || limbsize > 16 ||
+        ((kind == 0x04 || kind == 0x05) &&
+         (prec < MPFR_PREC_MIN || prec > MPFR_PREC_MAX)) ||
+        (kind == 0x05 && (iprec < MPFR_PREC_MIN || iprec > MPFR_PREC_MAX))) {
+        goto invalid;
+    }
+
+    switch (kind) {
+        case 0x01:
+        case 0x02:
+            if (kind == 0x01)
+                result = (PyObject*)GMPy_MPZ_New(context);
+            else
+                result = (PyObject*)GMPy_XMPZ_New(context);
+            if (!result) {
+                /* LCOV_EXCL_START */
+                return NULL;
+                /* LCOV_EXCL_STOP */
+            }
+            if (GMPy_Pickle_Import(MPZ(result), args[2], limbsize, bigendian) < 0) {
+                Py_DECREF(result);
+                return NULL;
+            }
+            if (sign < 0)
+                mpz_neg(MPZ(result), MPZ(result));
+            return result;
+        case 0x03:
+            if (!(result = (PyObject*)GMPy_MPQ_New(context))) {
+                /* LCOV_EXCL_START */
+                return NULL;
+                /* LCOV_EXCL_STOP */
+            }
+            if (GMPy_Pickle_Import(mpq_numref(MPQ(result)), args[2], limbsize, bigendian) < 0 ||
+                GMPy_Pickle_Import(mpq_denref(MPQ(result)), args[3], limbsize, bigendian) < 0) {
+                Py_DECREF(result);
+                return NULL;
+            }
+            if (mpz_sgn(mpq_denref(MPQ(result))) == 0) {
+                Py_DECREF(result);
+                goto invalid;
+            }
+            if (sign < 0)
+                mpq_neg(MPQ(result), MPQ(result));
+            return result;
+        case 0x04:
+            if (!(result = (PyObject*)GMPy_MPFR_New((mpfr_prec_t)prec, context))) {
+                /* LCOV_EXCL_START */
+                return NULL;
+                /* LCOV_EXCL_STOP */
+            }
+            if (GMPy_Pickle_Import_MPFR(MPFR(result), flags, exp, args[2],
+                                        limbsize, bigendian) < 0) {
+                Py_DECREF(result);
+                return NULL;
+            }
+            ((MPFR_Object*)result)->rc = rc;
+            return result;
+        default:
+            if (!(result = (PyObject*)GMPy_MPC_New((mpfr_prec_t)prec,
+                                                   (mpfr_prec_t)iprec, context))) {
+                /* LCOV_EXCL_START */
+                return NULL;
+                /* LCOV_EXCL_STOP */
+            }
+            if (GMPy_Pickle_Import_MPFR(mpc_realref(MPC(result)), flags, exp,
+                                        args[2], limbsize, bigendian) < 0 ||
+                GMPy_Pickle_Import_MPFR(mpc_imagref(MPC(result)), iflags, iexp,
+                                        args[3], limbsize, bigendian) < 0) {
+                Py_DECREF(result);
+                return NULL;
+            }
+            ((MPC_Object*)result)->rc = rc;
+            return result;
+    }
+
+  invalid:
+    PyErr_Clear();
+    VALUE_ERROR("invalid arguments for _from_limbs()");
     return NULL;
 }
@@ -43,11 +43,14 @@ static PyObject * GMPy_MPFR_From_Old_Binary(PyObject *self, PyObject *other);
 static PyObject * GMPy_MPANY_From_Binary(PyObject *self, PyObject *other);
 static PyObject * GMPy_MPANY_To_Binary(PyObject *self, PyObject *other);
 
-static PyObject * GMPy_MPZ_To_Binary(MPZ_Object *self);
-static PyObject * GMPy_XMPZ_To_Binary(XMPZ_Object *self);
-static PyObject * GMPy_MPQ_To_Binary(MPQ_Object *self);
-static PyObject * GMPy_MPFR_To_Binary(MPFR_Object *self);
-static PyObject * GMPy_MPC_To_Binary(MPC_Object *self);
+static size_t     GMPy_MPZ_Binary_Size(mpz_srcptr z);
+static void       GMPy_MPZ_Binary_Write(char *buffer, mpz_srcptr z, char type);
+static size_t     GMPy_MPANY_Binary_Size(PyObject *obj);
+static void       GMPy_MPANY_Binary_Write(char *buffer, PyObject *obj);
+static PyObject * GMPy_MPANY_Method_Reduce_Ex(PyObject *self, PyObject *other);
+static PyObject * GMPy_MPANY_From_Limbs(PyObject *self, PyObject *const *args, Py_ssize_t nargs);
+static PyObject * GMPy_MPANY_From_Binary_Buffer(unsigned char *buffer, Py_ssize_t len,
+                                                CTXT_Object *context);
 
 #ifdef __cplusplus
 }
@@ -29,6 +29,139 @@
  * memory allocation or object construction.
  */
 
+#ifdef Py_GIL_DISABLED
+#define GMPY_CACHE_CAPSULE "gmpy2._cache"
+
+static void GMPy_Cache_Clear(void);
+
+/* Free the caches of the current thread. Called when the thread state dict
+ * is cleared. If the dict of another thread is cleared, for example at
+ * shutdown, its caches can not be reached and are left alone.
+ */
+
+static void
+GMPy_Cache_Thread_Exit(PyObject *capsule)
+{
+    if (PyCapsule_GetPointer(capsule, GMPY_CACHE_CAPSULE) != (void*)&global) {
+        return;
+    }
+    GMPy_Cache_Clear();
+    PyMem_RawFree(global.gmpympzcache);
+    PyMem_RawFree(global.gmpyxmpzcache);
+    PyMem_RawFree(global.gmpympqcache);
+    PyMem_RawFree(global.gmpympfrcache);
+    PyMem_RawFree(global.gmpympccache);
+    global.gmpympzcache = NULL;
+    global.gmpyxmpzcache = NULL;
+    global.gmpympqcache = NULL;
+    global.gmpympfrcache = NULL;
+    global.gmpympccache = NULL;
+    global.cache_alloc = 0;
+    global.closed = 1;
+}
+
+/* Arrange for the caches of the current thread to be freed when the thread
+ * exits by storing a capsule in the thread state dict. Returns 0 on success
+ * and -1 on failure. Any exception that is set is preserved.
+ */
+
+static int
+GMPy_Cache_Register(void)
+{
+    PyObject *exc = PyErr_GetRaisedException();
+    PyObject *dict, *capsule;
+    int res = -1;
+
+    if ((dict = PyThreadState_GetDict()) &&
+        (res = PyDict_ContainsString(dict, GMPY_CACHE_CAPSULE)) == 0) {
+        res = -1;
+        if ((capsule = PyCapsule_New((void*)&global, GMPY_CACHE_CAPSULE,
+                                     GMPy_Cache_Thread_Exit))) {
+            res = PyDict_SetItemString(dict, GMPY_CACHE_CAPSULE, capsule);
+            Py_DECREF(capsule);
+        }
+    }
+    else if (res > 0) {
+        res = 0;
+    }
+    PyErr_Clear();
+    PyErr_SetRaisedException(exc);
+    return res;
+}
+#endif
+
+/* Grow the cache arrays of the current thread to cache_limits.size entries.
+ * Returns 0 on success and -1 if memory could not be allocated. No exception
+ * is set since this is called from the dealloc functions.
+ */
+
+static int
+GMPy_Cache_Grow(void)
+{
+    size_t n = (size_t)cache_limits.size;
+    void *temp;
+
+#ifdef Py_GIL_DISABLED
+    if (global.closed || (!global.cache_alloc && GMPy_Cache_Register() < 0)) {
+        return -1;
+    }
+#endif
+    if (!(temp = PyMem_RawRealloc(global.gmpympzcache, n * sizeof(MPZ_Object*)))) {
+        return -1; /* LCOV_EXCL_LINE */
+    }
+    global.gmpympzcache = temp;
+    if (!(temp = PyMem_RawRealloc(global.gmpyxmpzcache, n * sizeof(XMPZ_Object*)))) {
+        return -1; /* LCOV_EXCL_LINE */
+    }
+    global.gmpyxmpzcache = temp;
+    if (!(temp = PyMem_RawRealloc(global.gmpympqcache, n * sizeof(MPQ_Object*)))) {
+        return -1; /* LCOV_EXCL_LINE */
+    }
+    global.gmpympqcache = temp;
+    if (!(temp = PyMem_RawRealloc(global.gmpympfrcache, n * sizeof(MPFR_Object*)))) {
+        return -1; /* LCOV_EXCL_LINE */
+    }
+    global.gmpympfrcache = temp;
+    if (!(temp = PyMem_RawRealloc(global.gmpympccache, n * sizeof(MPC_Object*)))) {
+        return -1; /* LCOV_EXCL_LINE */
+    }
+    global.gmpympccache = temp;
+    global.cache_alloc = (int)n;
+    return 0;
+}
+
+/* Release all the objects in the caches of the current thread. */
+
+static void
+GMPy_Cache_Clear(void)
+{
+    while (global.in_gmpympzcache) {
+        MPZ_Object *obj = global.gmpympzcache[--(global.in_gmpympzcache)];
+        mpz_clear(obj->z);
+        PyObject_Free(obj);
+    }
+    while (global.in_gmpyxmpzcache) {
+        XMPZ_Object *obj = global.gmpyxmpzcache[--(global.in_gmpyxmpzcache)];
+        mpz_clear(obj->z);
+        PyObject_Free(obj);
+    }
+    while (global.in_gmpympqcache) {
+        MPQ_Object *obj = global.gmpympqcache[--(global.in_gmpympqcache)];
+        mpq_clear(obj->q);
+        PyObject_Free(obj);
+    }
+    while (global.in_gmpympfrcache) {
+        MPFR_Object *obj = global.gmpympfrcache[--(global.in_gmpympfrcache)];
+        mpfr_clear(obj->f);
+        PyObject_Free(obj);
+    }
+    while (global.in_gmpympccache) {
+        MPC_Object *obj = global.gmpympccache[--(global.in_gmpympccache)];
+        mpc_clear(obj->c);
+        PyObject_Free(obj);
+    }
+}
+
 /* Caching logic for Pympz. */
 
 /* GMPy_MPZ_New returns a reference to a new MPZ_Object. Its value
@@ -42,7 +175,8 @@ GMPy_MPZ_New(CTXT_Object *context)
 
     if (global.in_gmpympzcache) {
         result = global.gmpympzcache[--(global.in_gmpympzcache)];
-        Py_INCREF((PyObject*)result);
+        GMPY_CACHE_REUSE(result, &MPZ_Type);
+        global.mpz_stats.hits++;
         mpz_set_ui(result->z, 0);
     }
     else {
@@ -51,6 +185,7 @@ GMPy_MPZ_New(CTXT_Object *context)
             return NULL;
         }
         mpz_init(result->z);
+        global.mpz_stats.misses++;
     }
     result->hash_cache = -1;
     return result;
@@ -179,11 +314,19 @@ GMPy_MPZ_NewInit(PyTypeObject *type, PyObject *args, PyObject *keywds)
 static void
 GMPy_MPZ_Dealloc(MPZ_Object *self)
 {
-   if (global.in_gmpympzcache < CACHE_SIZE &&
-       self->z->_mp_alloc <= MAX_CACHE_MPZ_LIMBS) {
+   if (global.in_gmpympzcache < cache_limits.size &&
+       self->z->_mp_alloc <= cache_limits.mpz_limbs &&
+       (global.in_gmpympzcache < global.cache_alloc || !GMPy_Cache_Grow())) {
         global.gmpympzcache[(global.in_gmpympzcache)++] = self;
+        global.mpz_stats.cached++;
     }
     else {
+        if (self->z->_mp_alloc > cache_limits.mpz_limbs) {
+            global.mpz_stats.too_large++;
+        }
+        else {
+            global.mpz_stats.full++;
+        }
         mpz_clear(self->z);
         PyObject_Free(self);
     }
@@ -198,7 +341,8 @@ GMPy_XMPZ_New(CTXT_Object *context)
 
     if (global.in_gmpyxmpzcache) {
         result = global.gmpyxmpzcache[--(global.in_gmpyxmpzcache)];
-        Py_INCREF((PyObject*)result);
+        GMPY_CACHE_REUSE(result, &XMPZ_Type);
+        global.xmpz_stats.hits++;
         mpz_set_ui(result->z, 0);
     }
     else {
@@ -207,6 +351,8 @@ GMPy_XMPZ_New(CTXT_Object *context)
             return NULL;
         }
         mpz_init(result->z);
+        result->exports = 0;
+        global.xmpz_stats.misses++;
     }
     return result;
 }
@@ -314,11 +460,19 @@ GMPy_XMPZ_NewInit(PyTypeObject *type, PyObject *args, PyObject *keywds)
 static void
 GMPy_XMPZ_Dealloc(XMPZ_Object *self)
 {
-   if (global.in_gmpyxmpzcache < CACHE_SIZE &&
-       self->z->_mp_alloc <= MAX_CACHE_MPZ_LIMBS) {
+   if (global.in_gmpyxmpzcache < cache_limits.size &&
+       self->z->_mp_alloc <= cache_limits.mpz_limbs &&
+       (global.in_gmpyxmpzcache < global.cache_alloc || !GMPy_Cache_Grow())) {
         global.gmpyxmpzcache[(global.in_gmpyxmpzcache)++] = self;
+        global.xmpz_stats.cached++;
     }
     else {
+        if (self->z->_mp_alloc > cache_limits.mpz_limbs) {
+            global.xmpz_stats.too_large++;
+        }
+        else {
+            global.xmpz_stats.full++;
+        }
         mpz_clear(self->z);
         PyObject_Free((PyObject*)self);
     }
@@ -333,7 +487,8 @@ GMPy_MPQ_New(CTXT_Object *context)
 
     if (global.in_gmpympqcache) {
         result = global.gmpympqcache[--(global.in_gmpympqcache)];
-        Py_INCREF((PyObject*)result);
+        GMPY_CACHE_REUSE(result, &MPQ_Type);
+        global.mpq_stats.hits++;
         mpq_set_ui(result->q, 0, 1);
     }
     else {
@@ -342,6 +497,7 @@ GMPy_MPQ_New(CTXT_Object *context)
             return NULL;
         }
         mpq_init(result->q);
+        global.mpq_stats.misses++;
     }
     result->hash_cache = -1;
     return result;
@@ -443,13 +599,22 @@ GMPy_MPQ_NewInit(PyTypeObject *type, PyObject *args, PyObject *keywds)
 static void
 GMPy_MPQ_Dealloc(MPQ_Object *self)
 {
-    if (global.in_gmpympqcache < CACHE_SIZE &&
-        mpq_numref(self->q)->_mp_alloc <= MAX_CACHE_MPZ_LIMBS &&
-        mpq_denref(self->q)->_mp_alloc <= MAX_CACHE_MPZ_LIMBS) {
+    if (global.in_gmpympqcache < cache_limits.size &&
+        mpq_numref(self->q)->_mp_alloc <= cache_limits.mpz_limbs &&
+        mpq_denref(self->q)->_mp_alloc <= cache_limits.mpz_limbs &&
+        (global.in_gmpympqcache < global.cache_alloc || !GMPy_Cache_Grow())) {
 
         global.gmpympqcache[(global.in_gmpympqcache)++] = self;
+        global.mpq_stats.cached++;
     }
     else {
+        if (mpq_numref(self->q)->_mp_alloc > cache_limits.mpz_limbs ||
+            mpq_denref(self->q)->_mp_alloc > cache_limits.mpz_limbs) {
+            global.mpq_stats.too_large++;
+        }
+        else {
+            global.mpq_stats.full++;
+        }
         mpq_clear(self->q);
         PyObject_Free(self);
     }
@@ -474,7 +639,8 @@ GMPy_MPFR_New(mpfr_prec_t bits, CTXT_Object *context)
 
     if (global.in_gmpympfrcache) {
         result = global.gmpympfrcache[--(global.in_gmpympfrcache)];
-        Py_INCREF((PyObject*)result);
+        GMPY_CACHE_REUSE(result, &MPFR_Type);
+        global.mpfr_stats.hits++;
         mpfr_set_prec(result->f, bits);
     }
     else {
@@ -483,6 +649,7 @@ GMPy_MPFR_New(mpfr_prec_t bits, CTXT_Object *context)
             return NULL;
         }
         mpfr_init2(result->f, bits);
+        global.mpfr_stats.misses++;
     }
     result->hash_cache = -1;
     result->rc = 0;
@@ -606,12 +773,20 @@ GMPy_MPFR_NewInit(PyTypeObject *type, PyObject *args, PyObject *keywds)
 static void
 GMPy_MPFR_Dealloc(MPFR_Object *self)
 {
-    if (global.in_gmpympfrcache < CACHE_SIZE &&
-        self->f->_mpfr_prec <= MAX_CACHE_MPFR_BITS) {
+    if (global.in_gmpympfrcache < cache_limits.size &&
+        self->f->_mpfr_prec <= cache_limits.mpfr_bits &&
+        (global.in_gmpympfrcache < global.cache_alloc || !GMPy_Cache_Grow())) {
 
         global.gmpympfrcache[(global.in_gmpympfrcache)++] = self;
+        global.mpfr_stats.cached++;
     }
     else {
+        if (self->f->_mpfr_prec > cache_limits.mpfr_bits) {
+            global.mpfr_stats.too_large++;
+        }
+        else {
+            global.mpfr_stats.full++;
+        }
         mpfr_clear(self->f);
         PyObject_Free(self);
     }
@@ -639,7 +814,8 @@ GMPy_MPC_New(mpfr_prec_t rprec, mpfr_prec_t iprec, CTXT_Object *context)
     }
     if (global.in_gmpympccache) {
         result = global.gmpympccache[--(global.in_gmpympccache)];
-        Py_INCREF((PyObject*)result);
+        GMPY_CACHE_REUSE(result, &MPC_Type);
+        global.mpc_stats.hits++;
         if (rprec == iprec) {
             mpc_set_prec(result->c, rprec);
         }
@@ -654,6 +830,7 @@ GMPy_MPC_New(mpfr_prec_t rprec, mpfr_prec_t iprec, CTXT_Object *context)
             return NULL;
         }
         mpc_init3(result->c, rprec, iprec);
+        global.mpc_stats.misses++;
     }
     result->hash_cache = -1;
     result->rc = 0;
@@ -887,14 +1064,159 @@ GMPy_MPC_NewInit(PyTypeObject *type, PyObject *args, PyObject *keywds)
 static void
 GMPy_MPC_Dealloc(MPC_Object *self)
 {
-    if (global.in_gmpympccache < CACHE_SIZE &&
-        mpc_realref(self->c)->_mpfr_prec <= MAX_CACHE_MPFR_BITS &&
-        mpc_imagref(self->c)->_mpfr_prec <= MAX_CACHE_MPFR_BITS) {
+    if (global.in_gmpympccache < cache_limits.size &&
+        mpc_realref(self->c)->_mpfr_prec <= cache_limits.mpfr_bits &&
+        mpc_imagref(self->c)->_mpfr_prec <= cache_limits.mpfr_bits &&
+        (global.in_gmpympccache < global.cache_alloc || !GMPy_Cache_Grow())) {
 
         global.gmpympccache[(global.in_gmpympccache)++] = self;
+        global.mpc_stats.cached++;
     }
     else {
+        if (mpc_realref(self->c)->_mpfr_prec > cache_limits.mpfr_bits ||
+            mpc_imagref(self->c)->_mpfr_prec > cache_limits.mpfr_bits) {
+            global.mpc_stats.too_large++;
+        }
+        else {
+            global.mpc_stats.full++;
+        }
         mpc_clear(self->c);
         PyObject_Free(self);
     }
 }
+
+/* Functions to inspect and change the caches. */
+
+/* Convert an optional argument of set_cache(). Returns 0 if obj is NULL or
+ * None, 1 if *value was set, and -1 with an exception set on error.
+ */
+
+static int
+GMPy_Cache_Parse_Limit(PyObject *obj, const char *name, long limit, long *value)
+{
+    Py_ssize_t temp;
+
+    if (!obj || obj == Py_None) {
+        return 0;
+    }
+    if (!IS_INTEGER(obj)) {
+        PyErr_Format(PyExc_TypeError,
+                     "set_cache() '%s' must be an integer", name);
+        return -1;
+    }
+    temp = GMPy_Integer_AsSsize_t(obj);
+    if ((temp == -1 && PyErr_Occurred()) || temp < 0 || temp > limit) {
+        PyErr_Clear();
+        PyErr_Format(PyExc_ValueError,
+                     "set_cache() '%s' must be in the range [0, %ld]",
+                     name, limit);
+        return -1;
+    }
+    *value = (long)temp;
+    return 1;
+}
+
+PyDoc_STRVAR(GMPy_doc_set_cache,
+"set_cache(*, size=None, mpz_limbs=None, mpfr_bits=None) -> None\n\n"
+"Change the limits of the object caches. size is the maximum number of\n"
+"objects of each type that are kept for reuse, mpz_limbs is the largest\n"
+"allocation, in limbs, of a cached `mpz`, `xmpz`, or `mpq`, and mpfr_bits\n"
+"is the largest precision of a cached `mpfr` or `mpc`. Limits that are\n"
+"omitted or None are not changed. The objects already in the cache of\n"
+"the current thread are released.");
+
+static PyObject *
+GMPy_set_cache(PyObject *self, PyObject *args, PyObject *keywds)
+{
+    PyObject *size = NULL, *mpz_limbs = NULL, *mpfr_bits = NULL;
+    long new_size = cache_limits.size;
+    long new_mpz_limbs = cache_limits.mpz_limbs;
+    long new_mpfr_bits = (long)cache_limits.mpfr_bits;
+    static char *kwlist[] = {"size", "mpz_limbs", "mpfr_bits", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "|$OOO:set_cache", kwlist,
+                                     &size, &mpz_limbs, &mpfr_bits)) {
+        return NULL;
+    }
+
+    if (GMPy_Cache_Parse_Limit(size, "size", MAX_CACHE, &new_size) < 0 ||
+        GMPy_Cache_Parse_Limit(mpz_limbs, "mpz_limbs", MAX_CACHE_LIMBS,
+                               &new_mpz_limbs) < 0 ||
+        GMPy_Cache_Parse_Limit(mpfr_bits, "mpfr_bits", MAX_CACHE_BITS,
+                               &new_mpfr_bits) < 0) {
+        return NULL;
+    }
+
+    GMPy_Cache_Clear();
+    cache_limits.size = (int)new_size;
+    cache_limits.mpz_limbs = (int)new_mpz_limbs;
+    cache_limits.mpfr_bits = (mpfr_prec_t)new_mpfr_bits;
+    Py_RETURN_NONE;
+}
+
+PyDoc_STRVAR(GMPy_doc_get_cache,
+"get_cache() -> dict\n\n"
+"Return the limits of the object caches and the number of objects of\n"
+"each type currently in the cache. On the free-threaded build of Python\n"
+"the counts are for the cache of the current thread.");
+
+static PyObject *
+GMPy_get_cache(PyObject *self, PyObject *args)
+{
+    return Py_BuildValue("{s:i,s:i,s:l,s:i,s:i,s:i,s:i,s:i}",
+                         "size", cache_limits.size,
+                         "mpz_limbs", cache_limits.mpz_limbs,
+                         "mpfr_bits", (long)cache_limits.mpfr_bits,
+                         "mpz", global.in_gmpympzcache,
+                         "xmpz", global.in_gmpyxmpzcache,
+                         "mpq", global.in_gmpympqcache,
+                         "mpfr", global.in_gmpympfrcache,
+                         "mpc", global.in_gmpympccache);
+}
+
+/* Return a dict with the counters for one type. */
+
+static PyObject *
+GMPy_Cache_Stats_Dict(gmpy_cache_stats *stats, int in_cache)
+{
+    return Py_BuildValue("{s:n,s:n,s:n,s:n,s:n,s:n,s:i}",
+                         "hits", stats->hits,
+                         "misses", stats->misses,
+                         "cached", stats->cached,
+                         "full", stats->full,
+                         "too_large", stats->too_large,
+                         "live", stats->hits + stats->misses - stats->cached -
+                                 stats->full - stats->too_large,
+                         "in_cache", in_cache);
+}
+
+PyDoc_STRVAR(GMPy_doc_cache_stats,
+"cache_stats() -> dict\n\n"
+"Return a dict mapping 'mpz', 'xmpz', 'mpq', 'mpfr', and 'mpc' to a dict\n"
+"of counters for that type:\n\n"
+"* hits: objects created by reusing an object from the cache\n"
+"* misses: objects created by allocating a new object\n"
+"* cached: objects returned to the cache when released\n"
+"* full: objects freed because the cache was full\n"
+"* too_large: objects freed because they exceeded the size limit\n"
+"* live: objects currently in use\n"
+"* in_cache: objects currently in the cache\n\n"
+"The counters start at 0 when gmpy2 is imported. On the free-threaded\n"
+"build of Python the counters are for the current thread and live may be\n"
+"negative if objects were created in another thread.");
+
+static PyObject *
+GMPy_cache_stats(PyObject *self, PyObject *args)
+{
+    return Py_BuildValue("{s:N,s:N,s:N,s:N,s:N}",
+                         "mpz", GMPy_Cache_Stats_Dict(&global.mpz_stats,
+                                                      global.in_gmpympzcache),
+                         "xmpz", GMPy_Cache_Stats_Dict(&global.xmpz_stats,
+                                                       global.in_gmpyxmpzcache),
+                         "mpq", GMPy_Cache_Stats_Dict(&global.mpq_stats,
+                                                      global.in_gmpympqcache),
+                         "mpfr", GMPy_Cache_Stats_Dict(&global.mpfr_stats,
+                                                       global.in_gmpympfrcache),
+                         "mpc", GMPy_Cache_Stats_Dict(&global.mpc_stats,
+                                                      global.in_gmpympccache));
+}
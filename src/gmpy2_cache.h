@@ -38,6 +38,18 @@ extern "C" {
 
 /* Private functions */
 
+/* Return an object taken from the cache to use. On the free-threaded build
+ * the object may have been cached by a different thread than the one that
+ * created it, so the object header is initialized again to make the current
+ * thread the owner.
+ */
+
+#ifdef Py_GIL_DISABLED
+#define GMPY_CACHE_REUSE(obj, type) PyObject_Init((PyObject*)(obj), (type))
+#else
+#define GMPY_CACHE_REUSE(obj, type) Py_INCREF((PyObject*)(obj))
+#endif
+
 /* C-API functions */
 
 /* static MPZ_Object *  GMPy_MPZ_New(CTXT_Object *context); */
@@ -71,6 +83,12 @@ static GMPy_MPFR_Dealloc_RETURN GMPy_MPFR_Dealloc GMPy_MPFR_Dealloc_PROTO;
 static MPC_Object *  GMPy_MPC_New(mpfr_prec_t rprec, mpfr_prec_t iprec, CTXT_Object *context);
 static void          GMPy_MPC_Dealloc(MPC_Object *self);
 
+static int           GMPy_Cache_Grow(void);
+static void          GMPy_Cache_Clear(void);
+static PyObject *    GMPy_set_cache(PyObject *self, PyObject *args, PyObject *keywds);
+static PyObject *    GMPy_get_cache(PyObject *self, PyObject *args);
+static PyObject *    GMPy_cache_stats(PyObject *self, PyObject *args);
+
 #ifdef __cplusplus
 }
 #endif
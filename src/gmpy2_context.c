@@ -1108,7 +1108,7 @@ static PyMethodDef GMPyContext_methods[] =
     { "abs", GMPy_Context_Abs, METH_O, GMPy_doc_context_abs },
     { "acos", GMPy_Context_Acos, METH_O, GMPy_doc_context_acos },
     { "acosh", GMPy_Context_Acosh, METH_O, GMPy_doc_context_acosh },
-    { "add", GMPy_Context_Add, METH_VARARGS, GMPy_doc_context_add },
+    { "add", (PyCFunction)GMPy_Context_Add, METH_FASTCALL, GMPy_doc_context_add },
     { "agm", GMPy_Context_AGM, METH_VARARGS, GMPy_doc_context_agm },
     { "ai", GMPy_Context_Ai, METH_O, GMPy_doc_context_ai },
     { "asin", GMPy_Context_Asin, METH_O, GMPy_doc_context_asin },
@@ -1133,9 +1133,10 @@ static PyMethodDef GMPyContext_methods[] =
     { "csch", GMPy_Context_Csch, METH_O, GMPy_doc_context_csch },
     { "degrees", GMPy_Context_Degrees, METH_O, GMPy_doc_context_degrees },
     { "digamma", GMPy_Context_Digamma, METH_O, GMPy_doc_context_digamma },
-    { "div", GMPy_Context_TrueDiv, METH_VARARGS, GMPy_doc_context_truediv },
-    { "divmod", GMPy_Context_DivMod, METH_VARARGS, GMPy_doc_context_divmod },
+    { "div", (PyCFunction)GMPy_Context_TrueDiv, METH_FASTCALL, GMPy_doc_context_truediv },
+    { "divmod", (PyCFunction)GMPy_Context_DivMod, METH_FASTCALL, GMPy_doc_context_divmod },
     { "div_2exp", GMPy_Context_Div_2exp, METH_VARARGS, GMPy_doc_context_div_2exp },
+    { "dot", (PyCFunction)GMPy_Context_Dot, METH_FASTCALL, GMPy_doc_context_dot },
     { "eint", GMPy_Context_Eint, METH_O, GMPy_doc_context_eint },
     { "erf", GMPy_Context_Erf, METH_O, GMPy_doc_context_erf },
     { "erfc", GMPy_Context_Erfc, METH_O, GMPy_doc_context_erfc },
@@ -1145,7 +1146,7 @@ static PyMethodDef GMPyContext_methods[] =
     { "exp2", GMPy_Context_Exp2, METH_O, GMPy_doc_context_exp2 },
     { "factorial", GMPy_Context_Factorial, METH_O, GMPy_doc_context_factorial },
     { "floor", GMPy_Context_Floor, METH_O, GMPy_doc_context_floor },
-    { "floor_div", GMPy_Context_FloorDiv, METH_VARARGS, GMPy_doc_context_floordiv },
+    { "floor_div", (PyCFunction)GMPy_Context_FloorDiv, METH_FASTCALL, GMPy_doc_context_floordiv },
     { "fma", GMPy_Context_FMA, METH_VARARGS, GMPy_doc_context_fma },
     { "fms", GMPy_Context_FMS, METH_VARARGS, GMPy_doc_context_fms },
 #if MPFR_VERSION_MAJOR > 3
@@ -1179,9 +1180,9 @@ static PyMethodDef GMPyContext_methods[] =
     { "maxnum", GMPy_Context_Maxnum, METH_VARARGS, GMPy_doc_context_maxnum },
     { "minnum", GMPy_Context_Minnum, METH_VARARGS, GMPy_doc_context_minnum },
     { "minus", GMPy_Context_Minus, METH_VARARGS, GMPy_doc_context_minus },
-    { "mod", GMPy_Context_Mod, METH_VARARGS, GMPy_doc_context_mod },
+    { "mod", (PyCFunction)GMPy_Context_Mod, METH_FASTCALL, GMPy_doc_context_mod },
     { "modf", GMPy_Context_Modf, METH_O, GMPy_doc_context_modf },
-    { "mul", GMPy_Context_Mul, METH_VARARGS, GMPy_doc_context_mul },
+    { "mul", (PyCFunction)GMPy_Context_Mul, METH_FASTCALL, GMPy_doc_context_mul },
     { "mul_2exp", GMPy_Context_Mul_2exp, METH_VARARGS, GMPy_doc_context_mul_2exp },
     { "next_above", GMPy_Context_NextAbove, METH_O, GMPy_doc_context_next_above },
     { "next_below", GMPy_Context_NextBelow, METH_O, GMPy_doc_context_next_below },
@@ -1216,14 +1217,11 @@ static PyMethodDef GMPyContext_methods[] =
     { "sinh_cosh", GMPy_Context_Sinh_Cosh, METH_O, GMPy_doc_context_sinh_cosh },
     { "sqrt", GMPy_Context_Sqrt, METH_O, GMPy_doc_context_sqrt },
     { "square", GMPy_Context_Square, METH_O, GMPy_doc_context_square },
-    { "sub", GMPy_Context_Sub, METH_VARARGS, GMPy_doc_context_sub },
+    { "sub", (PyCFunction)GMPy_Context_Sub, METH_FASTCALL, GMPy_doc_context_sub },
     { "tan", GMPy_Context_Tan, METH_O, GMPy_doc_context_tan },
     { "tanh", GMPy_Context_Tanh, METH_O, GMPy_doc_context_tanh },
     { "trunc", GMPy_Context_Trunc, METH_O, GMPy_doc_context_trunc },
-#ifdef VECTOR
-    { "vector", GMPy_Context_Vector, METH_O, GMPy_doc_context_vector },
-    { "vector2", GMPy_Context_Vector2, METH_VARARGS, GMPy_doc_context_vector2 },
-#endif
+    { "vmap", (PyCFunction)GMPy_Context_VMap, METH_VARARGS | METH_KEYWORDS, GMPy_doc_context_vmap },
     { "yn", GMPy_Context_Yn, METH_VARARGS, GMPy_doc_context_yn },
     { "y0", GMPy_Context_Y0, METH_O, GMPy_doc_context_y0 },
     { "y1", GMPy_Context_Y1, METH_O, GMPy_doc_context_y1 },
@@ -45,7 +45,7 @@ static int
 mpz_set_PyLong(mpz_t z, PyObject *obj)
 {
 #ifndef PYPY_VERSION
-    static PyLongExport long_export;
+    PyLongExport long_export;
 
     if (PyLong_Export(obj, &long_export) < 0) {
         /* LCOV_EXCL_START */
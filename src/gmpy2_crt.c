@@ -0,0 +1,563 @@
+/* * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * *
+ * gmpy2_crt.c                                                              *
+ * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * *
+ * Python interface to the GMP, MPFR, and MPC multiple precision           *
+ * libraries.                                                              *
+ *                                                                         *
+ * Copyright 2000 - 2009 Alex Martelli                                     *
+ *                                                                         *
+ * Copyright 2008 - 2024 Case Van Horsen                                   *
+ *                                                                         *
+ * This file is part of GMPY2.                                             *
+ *                                                                         *
+ * GMPY2 is free software: you can redistribute it and/or modify it under  *
+ * the terms of the GNU Lesser General Public License as published by the  *
+ * Free Software Foundation, either version 3 of the License, or (at your  *
+ * option) any later version.                                              *
+ *                                                                         *
+ * GMPY2 is distributed in the hope that it will be useful, but WITHOUT    *
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or   *
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public    *
+ * License for more details.                                               *
+ *                                                                         *
+ * You should have received a copy of the GNU Lesser General Public        *
+ * License along with GMPY2; if not, see <http://www.gnu.org/licenses/>    *
+ * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * */
+
+/* This file implements crt() and the CRTBasis type. */
+
+/* tmp[k] contains M mod (node idx on level k)^2. Set inverses[i] for the
+ * leaves below the node. Returns the index of the first leaf that has no
+ * inverse or -1.
+ */
+
+static Py_ssize_t
+GMPy_CRT_Descend(GMPy_CRT *crt, int k, Py_ssize_t idx, mpz_t *tmp, mpz_ptr sq)
+{
+    const GMPy_Product_Tree *tree = &crt->tree;
+    Py_ssize_t i, bad;
+
+    if (k == 0) {
+        /* (M mod m^2) / m == (M / m) mod m */
+        mpz_divexact(tmp[0], tmp[0], tree->nodes[0][idx]);
+        if (!mpz_invert(crt->inverses[idx], tmp[0], tree->nodes[0][idx])) {
+            return idx;
+        }
+        return -1;
+    }
+
+    for (i = 2 * idx; i <= 2 * idx + 1 && i < tree->count[k - 1]; i++) {
+        mpz_mul(sq, tree->nodes[k - 1][i], tree->nodes[k - 1][i]);
+        mpz_tdiv_r(tmp[k - 1], tmp[k], sq);
+        if ((bad = GMPy_CRT_Descend(crt, k - 1, i, tmp, sq)) >= 0) {
+            return bad;
+        }
+    }
+    return -1;
+}
+
+/* Create a CRT basis from an iterable of moduli. Returns 0 on success or
+ * -1 with an exception set. Must be called with the GIL; the GIL is
+ * released while the basis is computed.
+ */
+
+static int
+GMPy_CRT_Init(GMPy_CRT *crt, PyObject *moduli, const char *fname)
+{
+    GMPy_Product_Tree *tree = &crt->tree;
+    mpz_t tmp[GMPY_TREE_MAX_LEVELS], sq;
+    mpz_t *leaves;
+    Py_ssize_t i, length, bad, other = -1;
+    int k, top;
+
+    crt->inverses = NULL;
+    tree->levels = 0;
+
+    if (!(leaves = GMPy_MPZ_Tree_Leaves(moduli, &length))) {
+        return -1;
+    }
+
+    if (length == 0) {
+        GMPy_MPZ_Tree_Free_Leaves(leaves, length);
+        PyErr_Format(PyExc_ValueError, "%s() requires at least one modulus", fname);
+        return -1;
+    }
+
+    for (i = 0; i < length; i++) {
+        if (mpz_sgn(leaves[i]) <= 0) {
+            GMPy_MPZ_Tree_Free_Leaves(leaves, length);
+            PyErr_Format(PyExc_ValueError, "%s() moduli must be > 0", fname);
+            return -1;
+        }
+    }
+
+    if (GMPy_Product_Tree_Init(tree, leaves, length) < 0) {
+        /* LCOV_EXCL_START */
+        return -1;
+        /* LCOV_EXCL_STOP */
+    }
+
+    if (!(crt->inverses = PyMem_RawMalloc(length * sizeof(mpz_t)))) {
+        /* LCOV_EXCL_START */
+        GMPy_Product_Tree_Clear(tree);
+        PyErr_NoMemory();
+        return -1;
+        /* LCOV_EXCL_STOP */
+    }
+
+    Py_BEGIN_ALLOW_THREADS;
+    for (i = 0; i < length; i++) {
+        mpz_init(crt->inverses[i]);
+    }
+    GMPy_Product_Tree_Build(tree);
+
+    top = tree->levels - 1;
+    for (k = 0; k <= top; k++) {
+        mpz_init(tmp[k]);
+    }
+    mpz_init(sq);
+    mpz_set(tmp[top], tree->nodes[top][0]);
+    bad = GMPy_CRT_Descend(crt, top, 0, tmp, sq);
+    if (bad >= 0) {
+        /* Find a modulus that shares a factor with the one that has no
+         * inverse so the error names the colliding pair.
+         */
+        for (i = 0; i < length; i++) {
+            mpz_gcd(sq, tree->nodes[0][bad], tree->nodes[0][i]);
+            if (i != bad && mpz_cmp_ui(sq, 1) > 0) {
+                other = i;
+                break;
+            }
+        }
+    }
+    for (k = 0; k <= top; k++) {
+        mpz_clear(tmp[k]);
+    }
+    mpz_clear(sq);
+    Py_END_ALLOW_THREADS;
+
+    if (bad >= 0) {
+        GMPy_CRT_Clear(crt);
+        if (other < 0) {
+            /* LCOV_EXCL_START */
+            PyErr_Format(PyExc_ValueError,
+                         "%s() moduli must be pairwise coprime (modulus at index %zd)",
+                         fname, bad);
+            return -1;
+            /* LCOV_EXCL_STOP */
+        }
+        PyErr_Format(PyExc_ValueError,
+                     "%s() moduli must be pairwise coprime (moduli at index %zd "
+                     "and index %zd have a common factor)",
+                     fname, bad < other ? bad : other, bad < other ? other : bad);
+        return -1;
+    }
+    return 0;
+}
+
+static void
+GMPy_CRT_Clear(GMPy_CRT *crt)
+{
+    Py_ssize_t i;
+
+    if (crt->inverses) {
+        for (i = 0; i < crt->tree.length; i++) {
+            mpz_clear(crt->inverses[i]);
+        }
+        PyMem_RawFree(crt->inverses);
+        crt->inverses = NULL;
+    }
+    GMPy_Product_Tree_Clear(&crt->tree);
+}
+
+/* Set out to the sum of (r_i * c_i mod m_i) * P / m_i for the leaves below
+ * node idx on level k, where P is the value of the node. Only tmp[j] for
+ * j <= k is used.
+ */
+
+static void
+GMPy_CRT_Sum(const GMPy_CRT *crt, int k, Py_ssize_t idx, mpz_t *residues,
+             mpz_ptr out, mpz_t *tmp)
+{
+    const GMPy_Product_Tree *tree = &crt->tree;
+    Py_ssize_t left = 2 * idx, right = 2 * idx + 1;
+
+    if (k == 0) {
+        mpz_mod(out, residues[idx], tree->nodes[0][idx]);
+        mpz_mul(out, out, crt->inverses[idx]);
+        mpz_mod(out, out, tree->nodes[0][idx]);
+        return;
+    }
+
+    GMPy_CRT_Sum(crt, k - 1, left, residues, out, tmp);
+    if (right < tree->count[k - 1]) {
+        mpz_mul(out, out, tree->nodes[k - 1][right]);
+        GMPy_CRT_Sum(crt, k - 1, right, residues, tmp[k], tmp);
+        mpz_addmul(out, tmp[k], tree->nodes[k - 1][left]);
+    }
+}
+
+/* Set out to the x in [0, M) with x == residues[i] mod m_i for all i. */
+
+static void
+GMPy_CRT_Combine(const GMPy_CRT *crt, mpz_t *residues, mpz_ptr out)
+{
+    mpz_t tmp[GMPY_TREE_MAX_LEVELS];
+    int k, top = crt->tree.levels - 1;
+
+    for (k = 0; k <= top; k++) {
+        mpz_init(tmp[k]);
+    }
+    GMPy_CRT_Sum(crt, top, 0, residues, out, tmp);
+    mpz_mod(out, out, crt->tree.nodes[top][0]);
+    for (k = 0; k <= top; k++) {
+        mpz_clear(tmp[k]);
+    }
+}
+
+/* Convert an iterable of residues for crt. Returns NULL with an exception
+ * set on error.
+ */
+
+static mpz_t *
+GMPy_CRT_Residues(const GMPy_CRT *crt, PyObject *obj, const char *fname)
+{
+    mpz_t *result;
+    Py_ssize_t length;
+
+    if (!(result = GMPy_MPZ_Tree_Leaves(obj, &length))) {
+        return NULL;
+    }
+    if (length != crt->tree.length) {
+        GMPy_MPZ_Tree_Free_Leaves(result, length);
+        PyErr_Format(PyExc_ValueError, "%s() requires %zd residues", fname,
+                     crt->tree.length);
+        return NULL;
+    }
+    return result;
+}
+
+PyDoc_STRVAR(GMPy_doc_mpz_function_crt,
+"crt(residues, moduli, /) -> mpz\n\n"
+"Return the x in the range [0, M) such that x == residues[i] mod\n"
+"moduli[i] for all i, where M is the product of the moduli. The moduli\n"
+"must be positive and pairwise coprime. Use CRTBasis if many values\n"
+"are combined with the same moduli. Will always release the GIL.");
+
+static PyObject *
+GMPy_MPZ_Function_CRT(PyObject *self, PyObject *const *args, Py_ssize_t nargs)
+{
+    GMPy_CRT crt;
+    MPZ_Object *result;
+    mpz_t *residues;
+
+    if (nargs != 2) {
+        TYPE_ERROR("crt() requires 2 arguments");
+        return NULL;
+    }
+
+    if (GMPy_CRT_Init(&crt, args[1], "crt") < 0) {
+        return NULL;
+    }
+
+    if (!(residues = GMPy_CRT_Residues(&crt, args[0], "crt"))) {
+        GMPy_CRT_Clear(&crt);
+        return NULL;
+    }
+
+    if ((result = GMPy_MPZ_New(NULL))) {
+        Py_BEGIN_ALLOW_THREADS;
+        GMPy_CRT_Combine(&crt, residues, result->z);
+        Py_END_ALLOW_THREADS;
+    }
+
+    GMPy_MPZ_Tree_Free_Leaves(residues, crt.tree.length);
+    GMPy_CRT_Clear(&crt);
+    return (PyObject*)result;
+}
+
+PyDoc_STRVAR(GMPy_doc_crtbasis,
+"CRTBasis(moduli, /)\n\n"
+"Return an object that solves the Chinese Remainder Theorem for a fixed\n"
+"set of positive, pairwise coprime moduli. A product tree of the moduli\n"
+"and the inverses needed to combine residues are computed once when the\n"
+"object is created, so each call of combine() only needs a number of\n"
+"multiplications that grows almost linearly with the size of the\n"
+"product of the moduli.");
+
+static PyObject *
+GMPy_CRTBasis_NewInit(PyTypeObject *type, PyObject *args, PyObject *keywds)
+{
+    CRTBasis_Object *result;
+    PyObject *moduli = NULL;
+
+    if (keywds && PyDict_GET_SIZE(keywds)) {
+        TYPE_ERROR("CRTBasis() takes no keyword arguments");
+        return NULL;
+    }
+
+    if (!PyArg_UnpackTuple(args, "CRTBasis", 1, 1, &moduli)) {
+        return NULL;
+    }
+
+    if (!(result = PyObject_New(CRTBasis_Object, &CRTBasis_Type))) {
+        /* LCOV_EXCL_START */
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+
+    if (GMPy_CRT_Init(&result->crt, moduli, "CRTBasis") < 0) {
+        Py_DECREF((PyObject*)result);
+        return NULL;
+    }
+    return (PyObject*)result;
+}
+
+static void
+GMPy_CRTBasis_Dealloc(CRTBasis_Object *self)
+{
+    GMPy_CRT_Clear(&self->crt);
+    PyObject_Free(self);
+}
+
+static PyObject *
+GMPy_CRTBasis_GetModuli(CRTBasis_Object *self, void *closure)
+{
+    PyObject *result;
+    MPZ_Object *temp;
+    Py_ssize_t i;
+
+    if (!(result = PyTuple_New(self->crt.tree.length))) {
+        /* LCOV_EXCL_START */
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+    for (i = 0; i < self->crt.tree.length; i++) {
+        if (!(temp = GMPy_MPZ_New(NULL))) {
+            /* LCOV_EXCL_START */
+            Py_DECREF(result);
+            return NULL;
+            /* LCOV_EXCL_STOP */
+        }
+        mpz_set(temp->z, self->crt.tree.nodes[0][i]);
+        PyTuple_SET_ITEM(result, i, (PyObject*)temp);
+    }
+    return result;
+}
+
+static PyObject *
+GMPy_CRTBasis_GetModulus(CRTBasis_Object *self, void *closure)
+{
+    MPZ_Object *result;
+
+    if ((result = GMPy_MPZ_New(NULL))) {
+        mpz_set(result->z, self->crt.tree.nodes[self->crt.tree.levels - 1][0]);
+    }
+    return (PyObject*)result;
+}
+
+static Py_ssize_t
+GMPy_CRTBasis_Length(CRTBasis_Object *self)
+{
+    return self->crt.tree.length;
+}
+
+static PyObject *
+GMPy_CRTBasis_Repr(CRTBasis_Object *self)
+{
+    PyObject *items, *temp, *sep, *result = NULL;
+    Py_ssize_t i;
+
+    if (!(items = GMPy_CRTBasis_GetModuli(self, NULL))) {
+        /* LCOV_EXCL_START */
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+    /* Replace each modulus by its str() in place. */
+    for (i = 0; i < PyTuple_GET_SIZE(items); i++) {
+        if (!(temp = PyObject_Str(PyTuple_GET_ITEM(items, i)))) {
+            /* LCOV_EXCL_START */
+            Py_DECREF(items);
+            return NULL;
+            /* LCOV_EXCL_STOP */
+        }
+        Py_DECREF(PyTuple_GET_ITEM(items, i));
+        PyTuple_SET_ITEM(items, i, temp);
+    }
+    if ((sep = PyUnicode_FromString(", "))) {
+        if ((temp = PyUnicode_Join(sep, items))) {
+            result = PyUnicode_FromFormat("CRTBasis([%U])", temp);
+            Py_DECREF(temp);
+        }
+        Py_DECREF(sep);
+    }
+    Py_DECREF(items);
+    return result;
+}
+
+PyDoc_STRVAR(GMPy_doc_crtbasis_method_combine,
+"x.combine(residues, /) -> mpz\n\n"
+"Return the y in the range [0, x.modulus) such that y == residues[i]\n"
+"mod x.moduli[i] for all i. Will always release the GIL.");
+
+static PyObject *
+GMPy_CRTBasis_Method_Combine(PyObject *self, PyObject *other)
+{
+    GMPy_CRT *crt = &((CRTBasis_Object*)self)->crt;
+    MPZ_Object *result;
+    mpz_t *residues;
+
+    if (!(residues = GMPy_CRT_Residues(crt, other, "CRTBasis.combine"))) {
+        return NULL;
+    }
+
+    if ((result = GMPy_MPZ_New(NULL))) {
+        Py_BEGIN_ALLOW_THREADS;
+        GMPy_CRT_Combine(crt, residues, result->z);
+        Py_END_ALLOW_THREADS;
+    }
+
+    GMPy_MPZ_Tree_Free_Leaves(residues, crt->tree.length);
+    return (PyObject*)result;
+}
+
+/* Arguments for GMPy_CRTBasis_BatchWork. Each item of lst is an MPZ_Object
+ * that is replaced by the combined value of the residues in rows.
+ */
+
+typedef struct {
+    const GMPy_CRT *crt;
+    mpz_t **rows;
+    PyObject *lst;
+} GMPy_CRTBasis_BatchArgs;
+
+static void
+GMPy_CRTBasis_BatchWork(void *arg, Py_ssize_t start, Py_ssize_t stop)
+{
+    GMPy_CRTBasis_BatchArgs *args = (GMPy_CRTBasis_BatchArgs*)arg;
+    Py_ssize_t i;
+
+    for (i = start; i < stop; i++) {
+        GMPy_CRT_Combine(args->crt, args->rows[i], MPZ(PyList_GET_ITEM(args->lst, i)));
+    }
+}
+
+PyDoc_STRVAR(GMPy_doc_crtbasis_method_combine_batch,
+"x.combine_batch(residues_list, /, *, threads=1) -> list[mpz, ...]\n\n"
+"Return [x.combine(r) for r in residues_list]. Will always release the\n"
+"GIL. If threads is greater than 1, the work is split across that many\n"
+"native threads.");
+
+static PyObject *
+GMPy_CRTBasis_Method_CombineBatch(PyObject *self, PyObject *args, PyObject *keywds)
+{
+    GMPy_CRT *crt = &((CRTBasis_Object*)self)->crt;
+    GMPy_CRTBasis_BatchArgs bargs;
+    PyObject *seq, *result = NULL;
+    MPZ_Object *temp;
+    Py_ssize_t i, count = 0, length;
+    int threads;
+
+    if (PyTuple_GET_SIZE(args) != 1) {
+        TYPE_ERROR("CRTBasis.combine_batch() requires 1 argument");
+        return NULL;
+    }
+
+    if ((threads = GMPy_Parse_Threads(keywds, "CRTBasis.combine_batch")) < 0) {
+        return NULL;
+    }
+
+    if (!(seq = PySequence_Fast(PyTuple_GET_ITEM(args, 0), "argument must be an iterable"))) {
+        return NULL;
+    }
+    length = PySequence_Fast_GET_SIZE(seq);
+
+    if (!(bargs.rows = PyMem_New(mpz_t*, length ? length : 1))) {
+        /* LCOV_EXCL_START */
+        Py_DECREF(seq);
+        return PyErr_NoMemory();
+        /* LCOV_EXCL_STOP */
+    }
+
+    for (count = 0; count < length; count++) {
+        if (!(bargs.rows[count] = GMPy_CRT_Residues(crt, PySequence_Fast_GET_ITEM(seq, count),
+                                                    "CRTBasis.combine_batch"))) {
+            goto done;
+        }
+    }
+
+    if (!(result = PyList_New(length))) {
+        /* LCOV_EXCL_START */
+        goto done;
+        /* LCOV_EXCL_STOP */
+    }
+    for (i = 0; i < length; i++) {
+        if (!(temp = GMPy_MPZ_New(NULL))) {
+            /* LCOV_EXCL_START */
+            Py_CLEAR(result);
+            goto done;
+            /* LCOV_EXCL_STOP */
+        }
+        PyList_SET_ITEM(result, i, (PyObject*)temp);
+    }
+
+    bargs.crt = crt;
+    bargs.lst = result;
+    if (GMPy_Parallel_For(length, threads, GMPy_CRTBasis_BatchWork, &bargs) < 0) {
+        /* LCOV_EXCL_START */
+        Py_CLEAR(result);
+        /* LCOV_EXCL_STOP */
+    }
+
+  done:
+    for (i = 0; i < count; i++) {
+        GMPy_MPZ_Tree_Free_Leaves(bargs.rows[i], crt->tree.length);
+    }
+    PyMem_Free(bargs.rows);
+    Py_DECREF(seq);
+    return result;
+}
+
+static PyObject *
+GMPy_CRTBasis_Method_Reduce(PyObject *self, PyObject *other)
+{
+    PyObject *moduli;
+
+    if (!(moduli = GMPy_CRTBasis_GetModuli((CRTBasis_Object*)self, NULL))) {
+        /* LCOV_EXCL_START */
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+    return Py_BuildValue("(O(N))", (PyObject*)&CRTBasis_Type, moduli);
+}
+
+static PyGetSetDef GMPy_CRTBasis_getseters[] = {
+    { "moduli", (getter)GMPy_CRTBasis_GetModuli, NULL, "the moduli", NULL },
+    { "modulus", (getter)GMPy_CRTBasis_GetModulus, NULL, "the product of the moduli", NULL },
+    { NULL }
+};
+
+static PyMethodDef GMPy_CRTBasis_methods[] = {
+    { "__reduce__", GMPy_CRTBasis_Method_Reduce, METH_NOARGS, NULL },
+    { "combine", GMPy_CRTBasis_Method_Combine, METH_O, GMPy_doc_crtbasis_method_combine },
+    { "combine_batch", (PyCFunction)GMPy_CRTBasis_Method_CombineBatch, METH_VARARGS | METH_KEYWORDS, GMPy_doc_crtbasis_method_combine_batch },
+    { NULL }
+};
+
+static PySequenceMethods GMPy_CRTBasis_as_sequence = {
+    .sq_length = (lenfunc) GMPy_CRTBasis_Length,
+};
+
+static PyTypeObject CRTBasis_Type = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = "gmpy2.CRTBasis",
+    .tp_basicsize = sizeof(CRTBasis_Object),
+    .tp_dealloc = (destructor) GMPy_CRTBasis_Dealloc,
+    .tp_repr = (reprfunc) GMPy_CRTBasis_Repr,
+    .tp_as_sequence = &GMPy_CRTBasis_as_sequence,
+    .tp_flags = Py_TPFLAGS_DEFAULT,
+    .tp_doc = GMPy_doc_crtbasis,
+    .tp_methods = GMPy_CRTBasis_methods,
+    .tp_getset = GMPy_CRTBasis_getseters,
+    .tp_new = GMPy_CRTBasis_NewInit,
+};
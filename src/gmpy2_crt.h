@@ -0,0 +1,70 @@
+/* * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * *
+ * gmpy2_crt.h                                                              *
+ * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * *
+ * Python interface to the GMP, MPFR, and MPC multiple precision           *
+ * libraries.                                                              *
+ *                                                                         *
+ * Copyright 2000 - 2009 Alex Martelli                                     *
+ *                                                                         *
+ * Copyright 2008 - 2024 Case Van Horsen                                   *
+ *                                                                         *
+ * This file is part of GMPY2.                                             *
+ *                                                                         *
+ * GMPY2 is free software: you can redistribute it and/or modify it under  *
+ * the terms of the GNU Lesser General Public License as published by the  *
+ * Free Software Foundation, either version 3 of the License, or (at your  *
+ * option) any later version.                                              *
+ *                                                                         *
+ * GMPY2 is distributed in the hope that it will be useful, but WITHOUT    *
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or   *
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public    *
+ * License for more details.                                               *
+ *                                                                         *
+ * You should have received a copy of the GNU Lesser General Public        *
+ * License along with GMPY2; if not, see <http://www.gnu.org/licenses/>    *
+ * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * */
+
+#ifndef GMPY_CRT_H
+#define GMPY_CRT_H
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+/* A CRT basis stores a product tree of pairwise coprime moduli m_i and
+ * c_i = (M / m_i)^-1 mod m_i where M is the product of the moduli. The
+ * solution of x = r_i mod m_i is the sum of (r_i * c_i mod m_i) * M / m_i
+ * reduced mod M. The sum is computed up the product tree: the value of a
+ * node is left * (product of right) + right * (product of left). The
+ * GMPy_CRT functions other than GMPy_CRT_Init do not use the Python API.
+ */
+
+typedef struct {
+    GMPy_Product_Tree tree;     /* product tree of the moduli       */
+    mpz_t *inverses;            /* c_i                              */
+} GMPy_CRT;
+
+typedef struct {
+    PyObject_HEAD
+    GMPy_CRT crt;
+} CRTBasis_Object;
+
+static PyTypeObject CRTBasis_Type;
+#define CRTBasis_Check(v) (((PyObject*)v)->ob_type == &CRTBasis_Type)
+
+static int        GMPy_CRT_Init(GMPy_CRT *crt, PyObject *moduli, const char *fname);
+static void       GMPy_CRT_Clear(GMPy_CRT *crt);
+static void       GMPy_CRT_Combine(const GMPy_CRT *crt, mpz_t *residues, mpz_ptr out);
+
+static PyObject * GMPy_CRTBasis_NewInit(PyTypeObject *type, PyObject *args, PyObject *keywds);
+static void       GMPy_CRTBasis_Dealloc(CRTBasis_Object *self);
+static PyObject * GMPy_CRTBasis_Repr(CRTBasis_Object *self);
+static PyObject * GMPy_CRTBasis_Method_Combine(PyObject *self, PyObject *other);
+static PyObject * GMPy_CRTBasis_Method_CombineBatch(PyObject *self, PyObject *args, PyObject *keywds);
+static PyObject * GMPy_CRTBasis_Method_Reduce(PyObject *self, PyObject *other);
+static PyObject * GMPy_MPZ_Function_CRT(PyObject *self, PyObject *const *args, Py_ssize_t nargs);
+
+#ifdef __cplusplus
+}
+#endif
+#endif
@@ -393,14 +393,21 @@ PyDoc_STRVAR(GMPy_doc_context_divmod,
 "`mpfr` arguments.");
 
 static PyObject *
-GMPy_Context_DivMod(PyObject *self, PyObject *args)
+GMPy_Context_DivMod(PyObject *self, PyObject *const *args, Py_ssize_t nargs)
 {
-    if (PyTuple_GET_SIZE(args) != 2) {
+    CTXT_Object *context = NULL;
+
+    if (nargs != 2) {
         TYPE_ERROR("div_mod() requires 2 arguments");
         return NULL;
     }
 
-    return GMPy_Number_DivMod(PyTuple_GET_ITEM(args, 0),
-                              PyTuple_GET_ITEM(args, 1),
-                              (CTXT_Object*)self);
+    if (self && CTXT_Check(self)) {
+        context = (CTXT_Object*)self;
+    }
+    else {
+        CHECK_CONTEXT(context);
+    }
+
+    return GMPy_Number_DivMod(args[0], args[1], context);
 }
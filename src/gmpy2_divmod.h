@@ -43,7 +43,7 @@ static PyObject * GMPy_Real_DivModWithType(PyObject *x, int xtype, PyObject *y,
 static PyObject * GMPy_Complex_DivModWithType(PyObject *x, int xtype, PyObject *y, int ytype, CTXT_Object *context);
 
 static PyObject * GMPy_Number_DivMod_Slot(PyObject *x, PyObject *y);
-static PyObject * GMPy_Context_DivMod(PyObject *self, PyObject *args);
+static PyObject * GMPy_Context_DivMod(PyObject *self, PyObject *const *args, Py_ssize_t nargs);
 
 #ifdef __cplusplus
 }
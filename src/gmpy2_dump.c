@@ -0,0 +1,555 @@
+/* * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * *
+ * gmpy2_dump.c                                                            *
+ * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * *
+ * Python interface to the GMP, MPFR, and MPC multiple precision           *
+ * libraries.                                                              *
+ *                                                                         *
+ * Copyright 2000 - 2009 Alex Martelli                                     *
+ *                                                                         *
+ * Copyright 2008 - 2024 Case Van Horsen                                   *
+ *                                                                         *
+ * This file is part of GMPY2.                                             *
+ *                                                                         *
+ * GMPY2 is free software: you can redistribute it and/or modify it under  *
+ * the terms of the GNU Lesser General Public License as published by the  *
+ * Free Software Foundation, either version 3 of the License, or (at your  *
+ * option) any later version.                                              *
+ *                                                                         *
+ * GMPY2 is distributed in the hope that it will be useful, but WITHOUT    *
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or   *
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public    *
+ * License for more details.                                               *
+ *                                                                         *
+ * You should have received a copy of the GNU Lesser General Public        *
+ * License along with GMPY2; if not, see <http://www.gnu.org/licenses/>    *
+ * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * */
+
+
+/* Streaming versions of to_binary() and from_binary(). See gmpy2_dump.h for
+ * a description of the container format.
+ */
+
+static void
+GMPy_Dump_Put64(unsigned char *cp, uint64_t n)
+{
+    int i;
+
+    for (i = 0; i < 8; i++) {
+        cp[i] = (unsigned char)(n & 0xff);
+        n >>= 8;
+    }
+}
+
+static uint64_t
+GMPy_Dump_Get64(const unsigned char *cp)
+{
+    uint64_t n = 0;
+    int i;
+
+    for (i = 7; i >= 0; i--) {
+        n = (n << 8) | cp[i];
+    }
+    return n;
+}
+
+/* Return the number of bytes needed to save n as an unsigned LEB128 value. */
+
+static size_t
+GMPy_Dump_VarintSize(size_t n)
+{
+    size_t size = 1;
+
+    while (n >= 0x80) {
+        n >>= 7;
+        size++;
+    }
+    return size;
+}
+
+static unsigned char *
+GMPy_Dump_PutVarint(unsigned char *cp, size_t n)
+{
+    while (n >= 0x80) {
+        *cp++ = (unsigned char)(n & 0x7f) | 0x80;
+        n >>= 7;
+    }
+    *cp++ = (unsigned char)n;
+    return cp;
+}
+
+typedef struct {
+    PyObject *write;            /* bound write() of the file        */
+    unsigned char *buf;
+    size_t alloc;
+    size_t used;
+    size_t frame;               /* offset of the current frame      */
+    uint64_t count;             /* records in the current frame     */
+} GMPy_Dump_Writer;
+
+/* Write len bytes at buf using the write() method of a file. The memoryview
+ * is released after each call so the file can not keep a reference to the
+ * memory. Also used by mpz_array.save().
+ */
+
+static int
+GMPy_Dump_Write(PyObject *write, const char *buf, size_t len)
+{
+    PyObject *view, *result, *temp;
+    size_t done = 0;
+    Py_ssize_t n;
+
+    while (done < len) {
+        if (!(view = PyMemoryView_FromMemory((char*)buf + done,
+                                             (Py_ssize_t)(len - done), PyBUF_READ))) {
+            /* LCOV_EXCL_START */
+            return -1;
+            /* LCOV_EXCL_STOP */
+        }
+        result = PyObject_CallFunctionObjArgs(write, view, NULL);
+        if (!(temp = PyObject_CallMethod(view, "release", NULL))) {
+            Py_XDECREF(result);
+            Py_DECREF(view);
+            return -1;
+        }
+        Py_DECREF(temp);
+        Py_DECREF(view);
+        if (!result) {
+            return -1;
+        }
+
+        /* A raw file in non-blocking mode returns None if nothing could be
+         * written. The bytes already written can not be taken back.
+         */
+        if (result == Py_None) {
+            Py_DECREF(result);
+            if ((result = Py_BuildValue("(isn)", EAGAIN,
+                                        "dump() does not support non-blocking files",
+                                        (Py_ssize_t)done))) {
+                PyErr_SetObject(PyExc_BlockingIOError, result);
+                Py_DECREF(result);
+            }
+            return -1;
+        }
+        n = PyLong_AsSsize_t(result);
+        Py_DECREF(result);
+        if (n == -1 && PyErr_Occurred()) {
+            return -1;
+        }
+        if (n <= 0 || (size_t)n > len - done) {
+            VALUE_ERROR("write() returned an invalid number of bytes");
+            return -1;
+        }
+        done += (size_t)n;
+    }
+    return 0;
+}
+
+/* Write the records of the current frame and start a new frame. */
+
+static int
+GMPy_Dump_Flush(GMPy_Dump_Writer *w)
+{
+    GMPy_Dump_Put64(w->buf + w->frame, w->count);
+    GMPy_Dump_Put64(w->buf + w->frame + 8,
+                    (uint64_t)(w->used - w->frame - GMPY_DUMP_FRAME));
+    if (GMPy_Dump_Write(w->write, (char*)w->buf, w->used) < 0) {
+        return -1;
+    }
+    w->frame = 0;
+    w->used = GMPY_DUMP_FRAME;
+    w->count = 0;
+    return 0;
+}
+
+/* Reserve room for a record of size bytes. Space for the frame that ends
+ * the stream is always kept free. Returns a pointer to the record or NULL
+ * with an exception set.
+ */
+
+static unsigned char *
+GMPy_Dump_Reserve(GMPy_Dump_Writer *w, size_t size)
+{
+    size_t need = GMPy_Dump_VarintSize(size) + size;
+    unsigned char *cp;
+
+    if (w->used + need + GMPY_DUMP_FRAME > w->alloc) {
+        if (w->count && GMPy_Dump_Flush(w) < 0) {
+            return NULL;
+        }
+        if (w->used + need + GMPY_DUMP_FRAME > w->alloc) {
+            if (need > PY_SSIZE_T_MAX - w->used - GMPY_DUMP_FRAME) {
+                /* LCOV_EXCL_START */
+                PyErr_NoMemory();
+                return NULL;
+                /* LCOV_EXCL_STOP */
+            }
+            if (!(cp = PyMem_Realloc(w->buf, w->used + need + GMPY_DUMP_FRAME))) {
+                /* LCOV_EXCL_START */
+                PyErr_NoMemory();
+                return NULL;
+                /* LCOV_EXCL_STOP */
+            }
+            w->buf = cp;
+            w->alloc = w->used + need + GMPY_DUMP_FRAME;
+        }
+    }
+    cp = GMPy_Dump_PutVarint(w->buf + w->used, size);
+    w->used += need;
+    w->count++;
+    return cp;
+}
+
+static int
+GMPy_Dump_Item(GMPy_Dump_Writer *w, PyObject *item)
+{
+    unsigned char *cp;
+    size_t size;
+
+    if (!(size = GMPy_MPANY_Binary_Size(item))) {
+        TYPE_ERROR("dump() argument type not supported");
+        return -1;
+    }
+    if (!(cp = GMPy_Dump_Reserve(w, size))) {
+        return -1;
+    }
+    GMPy_MPANY_Binary_Write((char*)cp, item);
+    return 0;
+}
+
+PyDoc_STRVAR(GMPy_doc_function_dump,
+"dump(iterable, file, /) -> None\n\n"
+"Write the gmpy2 objects in iterable to file, a binary file object. The\n"
+"objects are saved using the format of `to_binary()` and are written in\n"
+"large chunks. Use `load()` to read the objects back. The elements of an\n"
+"`mpz_array` are saved as mpz. BlockingIOError is raised if file is in\n"
+"non-blocking mode and can not accept more data.");
+
+static PyObject *
+GMPy_MPANY_Dump(PyObject *self, PyObject *const *args, Py_ssize_t nargs)
+{
+    GMPy_Dump_Writer w = {NULL, NULL, 0, 0, 0, 0};
+    PyObject *iter = NULL, *item;
+    unsigned char *cp;
+    mpz_t elem;
+    Py_ssize_t i;
+
+    if (nargs != 2) {
+        TYPE_ERROR("dump() requires 2 arguments");
+        return NULL;
+    }
+
+    if (!(w.write = PyObject_GetAttrString(args[1], "write"))) {
+        return NULL;
+    }
+    if (!(w.buf = PyMem_Malloc(GMPY_DUMP_CHUNK))) {
+        /* LCOV_EXCL_START */
+        Py_DECREF(w.write);
+        return PyErr_NoMemory();
+        /* LCOV_EXCL_STOP */
+    }
+    w.alloc = GMPY_DUMP_CHUNK;
+    memcpy(w.buf, GMPY_DUMP_MAGIC, 6);
+    w.buf[6] = GMPY_DUMP_VERSION;
+    w.buf[7] = 0x00;
+    w.frame = GMPY_DUMP_HEADER;
+    w.used = GMPY_DUMP_HEADER + GMPY_DUMP_FRAME;
+
+    if (MPZ_Array_Check(args[0])) {
+        /* The elements are written without creating any mpz objects. */
+        MPZ_Array_Object *a = (MPZ_Array_Object*)args[0];
+
+        for (i = 0; i < a->length; i++) {
+            MPZ_ARRAY_GET(elem, a, i);
+            if (!(cp = GMPy_Dump_Reserve(&w, GMPy_MPZ_Binary_Size(elem)))) {
+                goto error;
+            }
+            GMPy_MPZ_Binary_Write((char*)cp, elem, 0x01);
+        }
+    }
+    else {
+        if (!(iter = PyObject_GetIter(args[0]))) {
+            goto error;
+        }
+        while ((item = PyIter_Next(iter))) {
+            if (GMPy_Dump_Item(&w, item) < 0) {
+                Py_DECREF(item);
+                goto error;
+            }
+            Py_DECREF(item);
+        }
+        if (PyErr_Occurred()) {
+            goto error;
+        }
+    }
+
+    /* Finish the last frame and add the frame that ends the stream. */
+    if (w.count) {
+        GMPy_Dump_Put64(w.buf + w.frame, w.count);
+        GMPy_Dump_Put64(w.buf + w.frame + 8,
+                        (uint64_t)(w.used - w.frame - GMPY_DUMP_FRAME));
+        w.used += GMPY_DUMP_FRAME;
+    }
+    memset(w.buf + w.used - GMPY_DUMP_FRAME, 0, GMPY_DUMP_FRAME);
+    if (GMPy_Dump_Write(w.write, (char*)w.buf, w.used) < 0) {
+        goto error;
+    }
+
+    Py_XDECREF(iter);
+    Py_DECREF(w.write);
+    PyMem_Free(w.buf);
+    Py_RETURN_NONE;
+
+  error:
+    Py_XDECREF(iter);
+    Py_DECREF(w.write);
+    PyMem_Free(w.buf);
+    return NULL;
+}
+
+PyDoc_STRVAR(GMPy_doc_load,
+"load(file, /)\n\n"
+"Return an iterator over the gmpy2 objects saved by `dump()` in file, a\n"
+"binary file object that supports readinto(). The data is read in large\n"
+"chunks. The iterator stops at the end of the data written by one call\n"
+"to `dump()` and leaves the file positioned just after it. Only load data\n"
+"from trusted sources.");
+
+static PyObject *
+GMPy_Load_NewInit(PyTypeObject *type, PyObject *args, PyObject *keywds)
+{
+    Load_Object *result;
+    PyObject *readinto;
+
+    if (keywds && PyDict_Size(keywds)) {
+        TYPE_ERROR("load() takes no keyword arguments");
+        return NULL;
+    }
+    if (PyTuple_GET_SIZE(args) != 1) {
+        TYPE_ERROR("load() requires 1 argument");
+        return NULL;
+    }
+    if (!(readinto = PyObject_GetAttrString(PyTuple_GET_ITEM(args, 0), "readinto"))) {
+        return NULL;
+    }
+    if (!(result = PyObject_New(Load_Object, &Load_Type))) {
+        /* LCOV_EXCL_START */
+        Py_DECREF(readinto);
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+    result->readinto = readinto;
+    result->buf = NULL;
+    result->alloc = result->len = result->pos = 0;
+    result->remaining = 0;
+    result->state = 0;
+    return (PyObject*)result;
+}
+
+static void
+GMPy_Load_Dealloc(Load_Object *self)
+{
+    Py_XDECREF(self->readinto);
+    PyMem_Free(self->buf);
+    PyObject_Free(self);
+}
+
+/* Read up to len bytes into buf. Returns the number of bytes read, which is
+ * less than len only at the end of the file, or -1 with an exception set.
+ */
+
+static Py_ssize_t
+GMPy_Load_Read(Load_Object *self, unsigned char *buf, size_t len)
+{
+    PyObject *view, *result, *temp;
+    size_t done = 0;
+    Py_ssize_t n;
+
+    while (done < len) {
+        if (!(view = PyMemoryView_FromMemory((char*)buf + done,
+                                             (Py_ssize_t)(len - done), PyBUF_WRITE))) {
+            /* LCOV_EXCL_START */
+            return -1;
+            /* LCOV_EXCL_STOP */
+        }
+        result = PyObject_CallFunctionObjArgs(self->readinto, view, NULL);
+        if (!(temp = PyObject_CallMethod(view, "release", NULL))) {
+            Py_XDECREF(result);
+            Py_DECREF(view);
+            return -1;
+        }
+        Py_DECREF(temp);
+        Py_DECREF(view);
+        if (!result) {
+            return -1;
+        }
+        if (result == Py_None) {
+            Py_DECREF(result);
+            VALUE_ERROR("load() does not support non-blocking files");
+            return -1;
+        }
+        n = PyLong_AsSsize_t(result);
+        Py_DECREF(result);
+        if (n == -1 && PyErr_Occurred()) {
+            return -1;
+        }
+        if (n < 0 || (size_t)n > len - done) {
+            VALUE_ERROR("readinto() returned an invalid number of bytes");
+            return -1;
+        }
+        if (n == 0) {
+            break;
+        }
+        done += (size_t)n;
+    }
+    return (Py_ssize_t)done;
+}
+
+/* Read the next frame. Returns 1 if a frame was read, 0 at the end of the
+ * stream, or -1 with an exception set.
+ */
+
+static int
+GMPy_Load_Frame(Load_Object *self)
+{
+    unsigned char header[GMPY_DUMP_FRAME], *cp;
+    uint64_t count, len;
+    size_t done, size;
+    Py_ssize_t n;
+
+    if (self->state == 0) {
+        if ((n = GMPy_Load_Read(self, header, GMPY_DUMP_HEADER)) < 0) {
+            return -1;
+        }
+        if (n == 0) {
+            PyErr_SetString(PyExc_EOFError, "no data to load()");
+            return -1;
+        }
+        if (n < GMPY_DUMP_HEADER ||
+            memcmp(header, GMPY_DUMP_MAGIC, 6)) {
+            VALUE_ERROR("data is not a gmpy2 dump");
+            return -1;
+        }
+        if (header[6] != GMPY_DUMP_VERSION) {
+            VALUE_ERROR("unsupported gmpy2 dump version");
+            return -1;
+        }
+        self->state = 1;
+    }
+
+    if ((n = GMPy_Load_Read(self, header, GMPY_DUMP_FRAME)) < 0) {
+        return -1;
+    }
+    if (n < GMPY_DUMP_FRAME) {
+        VALUE_ERROR("gmpy2 dump is truncated");
+        return -1;
+    }
+    count = GMPy_Dump_Get64(header);
+    len = GMPy_Dump_Get64(header + 8);
+    if (count == 0) {
+        if (len != 0) {
+            VALUE_ERROR("gmpy2 dump is corrupt");
+            return -1;
+        }
+        return 0;
+    }
+    if (len > (uint64_t)PY_SSIZE_T_MAX) {
+        VALUE_ERROR("gmpy2 dump is corrupt");
+        return -1;
+    }
+
+    /* The buffer grows as data is read so a corrupt length does not cause a
+     * large allocation.
+     */
+    for (done = 0; done < len; done += (size_t)n) {
+        if (done == self->alloc) {
+            size = self->alloc ? 2 * self->alloc : GMPY_DUMP_CHUNK;
+            if (size > len)
+                size = (size_t)len;
+            if (!(cp = PyMem_Realloc(self->buf, size))) {
+                /* LCOV_EXCL_START */
+                PyErr_NoMemory();
+                return -1;
+                /* LCOV_EXCL_STOP */
+            }
+            self->buf = cp;
+            self->alloc = size;
+        }
+        if ((n = GMPy_Load_Read(self, self->buf + done,
+                                Py_MIN(self->alloc, (size_t)len) - done)) < 0) {
+            return -1;
+        }
+        if (n < (Py_ssize_t)(Py_MIN(self->alloc, (size_t)len) - done)) {
+            VALUE_ERROR("gmpy2 dump is truncated");
+            return -1;
+        }
+    }
+    self->len = (size_t)len;
+    self->pos = 0;
+    self->remaining = count;
+    return 1;
+}
+
+static PyObject *
+GMPy_Load_Next(Load_Object *self)
+{
+    PyObject *result;
+    CTXT_Object *context = NULL;
+    size_t size = 0;
+    int shift = 0, r;
+    unsigned char byte;
+
+    if (self->state == 2) {
+        return NULL;
+    }
+
+    CHECK_CONTEXT(context);
+
+    if (self->remaining == 0) {
+        if ((r = GMPy_Load_Frame(self)) <= 0) {
+            goto stop;
+        }
+    }
+
+    /* Get the length of the record. */
+    do {
+        if (self->pos == self->len || shift >= (int)(8 * sizeof(size_t))) {
+            goto corrupt;
+        }
+        byte = self->buf[self->pos++];
+        size |= (size_t)(byte & 0x7f) << shift;
+        shift += 7;
+    } while (byte & 0x80);
+
+    if (size > self->len - self->pos) {
+        goto corrupt;
+    }
+    if (!(result = GMPy_MPANY_From_Binary_Buffer(self->buf + self->pos,
+                                                 (Py_ssize_t)size, context))) {
+        goto stop;
+    }
+    self->pos += size;
+    if (--self->remaining == 0 && self->pos != self->len) {
+        Py_DECREF(result);
+        goto corrupt;
+    }
+    return result;
+
+  corrupt:
+    VALUE_ERROR("gmpy2 dump is corrupt");
+  stop:
+    /* The position in the file is not known after an error. */
+    self->state = 2;
+    return NULL;
+}
+
+static PyTypeObject Load_Type = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = "gmpy2.load",
+    .tp_basicsize = sizeof(Load_Object),
+    .tp_dealloc = (destructor) GMPy_Load_Dealloc,
+    .tp_flags = Py_TPFLAGS_DEFAULT,
+    .tp_doc = GMPy_doc_load,
+    .tp_iter = PyObject_SelfIter,
+    .tp_iternext = (iternextfunc) GMPy_Load_Next,
+    .tp_new = GMPy_Load_NewInit,
+};
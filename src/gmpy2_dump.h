@@ -0,0 +1,77 @@
+/* * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * *
+ * gmpy2_dump.h                                                            *
+ * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * *
+ * Python interface to the GMP, MPFR, and MPC multiple precision           *
+ * libraries.                                                              *
+ *                                                                         *
+ * Copyright 2000 - 2009 Alex Martelli                                     *
+ *                                                                         *
+ * Copyright 2008 - 2024 Case Van Horsen                                   *
+ *                                                                         *
+ * This file is part of GMPY2.                                             *
+ *                                                                         *
+ * GMPY2 is free software: you can redistribute it and/or modify it under  *
+ * the terms of the GNU Lesser General Public License as published by the  *
+ * Free Software Foundation, either version 3 of the License, or (at your  *
+ * option) any later version.                                              *
+ *                                                                         *
+ * GMPY2 is distributed in the hope that it will be useful, but WITHOUT    *
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or   *
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public    *
+ * License for more details.                                               *
+ *                                                                         *
+ * You should have received a copy of the GNU Lesser General Public        *
+ * License along with GMPY2; if not, see <http://www.gnu.org/licenses/>    *
+ * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * */
+
+
+#ifndef GMPY_DUMP_H
+#define GMPY_DUMP_H
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+/* A framed container for the binary format used by to_binary(). A stream
+ * starts with an 8 byte header: the magic bytes b"GMPY2\x1a", a version
+ * byte and a reserved byte that is 0. The header is followed by frames.
+ * A frame starts with the number of records and the length in bytes of the
+ * records, both saved as 8 byte little-endian values. Each record is the
+ * length of a to_binary() encoding, saved as an unsigned LEB128 value,
+ * followed by the encoding itself. A frame with 0 records and a length of 0
+ * ends the stream.
+ */
+
+#define GMPY_DUMP_MAGIC   "GMPY2\x1a"
+#define GMPY_DUMP_VERSION 1
+#define GMPY_DUMP_HEADER  8
+#define GMPY_DUMP_FRAME   16
+
+/* dump() collects records into chunks of this size before writing them. */
+
+#define GMPY_DUMP_CHUNK   (1 << 20)
+
+typedef struct {
+    PyObject_HEAD
+    PyObject *readinto;         /* bound readinto() of the file     */
+    unsigned char *buf;         /* records of the current frame     */
+    size_t alloc;
+    size_t len;                 /* length of the current frame      */
+    size_t pos;                 /* offset of the next record        */
+    uint64_t remaining;         /* records left in the current frame */
+    int state;                  /* 0 = start, 1 = reading, 2 = done */
+} Load_Object;
+
+static PyTypeObject Load_Type;
+#define Load_Check(v) (((PyObject*)v)->ob_type == &Load_Type)
+
+static int        GMPy_Dump_Write(PyObject *write, const char *buf, size_t len);
+static PyObject * GMPy_MPANY_Dump(PyObject *self, PyObject *const *args, Py_ssize_t nargs);
+static PyObject * GMPy_Load_NewInit(PyTypeObject *type, PyObject *args, PyObject *keywds);
+static void       GMPy_Load_Dealloc(Load_Object *self);
+static PyObject * GMPy_Load_Next(Load_Object *self);
+
+#ifdef __cplusplus
+}
+#endif
+#endif
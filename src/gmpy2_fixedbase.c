@@ -0,0 +1,582 @@
+/* * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * *
+ * gmpy2_fixedbase.c                                                        *
+ * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * *
+ * Python interface to the GMP, MPFR, and MPC multiple precision           *
+ * libraries.                                                              *
+ *                                                                         *
+ * Copyright 2000 - 2009 Alex Martelli                                     *
+ *                                                                         *
+ * Copyright 2008 - 2024 Case Van Horsen                                   *
+ *                                                                         *
+ * This file is part of GMPY2.                                             *
+ *                                                                         *
+ * GMPY2 is free software: you can redistribute it and/or modify it under  *
+ * the terms of the GNU Lesser General Public License as published by the  *
+ * Free Software Foundation, either version 3 of the License, or (at your  *
+ * option) any later version.                                              *
+ *                                                                         *
+ * GMPY2 is distributed in the hope that it will be useful, but WITHOUT    *
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or   *
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public    *
+ * License for more details.                                               *
+ *                                                                         *
+ * You should have received a copy of the GNU Lesser General Public        *
+ * License along with GMPY2; if not, see <http://www.gnu.org/licenses/>    *
+ * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * */
+
+
+/* This file implements powmod_fixed_base, a table of precomputed powers of
+ * a fixed base. It is useful when many powers of the same base are needed,
+ * for example to compute g^x mod p for many random values of x.
+ */
+
+/* Limit on the size of the table in bytes. If the table for the default
+ * window would be larger, a smaller window is used. If the table is still
+ * too large with a window of one bit, the object is not created.
+ */
+
+#define GMPY_FIXEDBASE_MAX_TABLE ((size_t)16 << 20)
+
+/* Return the default number of bits per digit for exponents of the given
+ * size.
+ */
+
+static int
+GMPy_FixedBase_Window(mp_bitcnt_t bits)
+{
+    if (bits <= 16)
+        return 2;
+    if (bits <= 64)
+        return 3;
+    if (bits <= 256)
+        return 4;
+    if (bits <= 1024)
+        return 5;
+    if (bits <= 4096)
+        return 6;
+    return 7;
+}
+
+/* Set rp to ap * bp mod m. tp must have room for 3*n + 1 limbs. rp may be
+ * the same as ap or bp.
+ */
+
+static void
+GMPy_FixedBase_Mul(const FixedBase_Object *fb, mp_limb_t *rp,
+                   const mp_limb_t *ap, const mp_limb_t *bp, mp_limb_t *tp)
+{
+    mp_size_t n = fb->mont.n;
+
+    if (fb->odd) {
+        GMPy_Mont_Mul(&fb->mont, rp, ap, bp, tp);
+    }
+    else {
+        mpn_mul_n(tp, ap, bp, n);
+        mpn_tdiv_qr(tp + 2 * n, rp, 0, tp, 2 * n, fb->mont.mp, n);
+    }
+}
+
+/* Return the w bits of the exponent with limbs ep starting at bit pos. */
+
+static size_t
+GMPy_FixedBase_Digit(const mp_limb_t *ep, mp_size_t en, mp_bitcnt_t pos, int w)
+{
+    mp_size_t i = (mp_size_t)(pos / GMP_NUMB_BITS);
+    unsigned int s = (unsigned int)(pos % GMP_NUMB_BITS);
+    mp_limb_t d;
+
+    if (i >= en) {
+        return 0;
+    }
+    d = ep[i] >> s;
+    if (s + w > GMP_NUMB_BITS && i + 1 < en) {
+        d |= ep[i + 1] << (GMP_NUMB_BITS - s);
+    }
+    return (size_t)(d & (((mp_limb_t)1 << w) - 1));
+}
+
+/* Set r to g^e mod m. buf must have room for 4*n + 1 limbs and r must not
+ * be the same as e. Exponents that are larger than the table use mpz_powm.
+ * Returns 0 on success or 1 if e < 0 and g is not invertible. Does not use
+ * the Python API.
+ */
+
+static int
+GMPy_FixedBase_Pow(const FixedBase_Object *fb, mpz_ptr r, mpz_srcptr e,
+                   mp_limb_t *buf)
+{
+    mp_size_t n = fb->mont.n, en = (mp_size_t)mpz_size(e);
+    const mp_limb_t *ep = mpz_limbs_read(e);
+    size_t tsize = ((size_t)1 << fb->window) - 1, d;
+    mp_limb_t *acc = buf, *tp = buf + n, *entry;
+    Py_ssize_t j;
+    int started = 0;
+
+    if (mpz_sgn(e) < 0 && !fb->invertible) {
+        return 1;
+    }
+
+    if (mpz_cmp_ui(fb->mont.m, 1) == 0) {
+        mpz_set_ui(r, 0);
+        return 0;
+    }
+
+    if (mpz_sizeinbase(e, 2) > fb->max_bits) {
+        mpz_powm(r, fb->g, e, fb->mont.m);
+        return 0;
+    }
+
+    for (j = 0; j < fb->digits; j++) {
+        d = GMPy_FixedBase_Digit(ep, en, (mp_bitcnt_t)j * fb->window, fb->window);
+        if (!d) {
+            continue;
+        }
+        entry = fb->table + ((size_t)j * tsize + d - 1) * n;
+        if (started) {
+            GMPy_FixedBase_Mul(fb, acc, acc, entry, tp);
+        }
+        else {
+            memcpy(acc, entry, n * sizeof(mp_limb_t));
+            started = 1;
+        }
+    }
+
+    if (!started) {
+        mpz_set_ui(r, 1);
+        return 0;
+    }
+
+    if (fb->odd) {
+        GMPy_Mont_From(&fb->mont, acc, acc, tp);
+    }
+    GMPy_Mont_Store(&fb->mont, r, acc);
+
+    if (mpz_sgn(e) < 0) {
+        mpz_invert(r, r, fb->mont.m);
+    }
+    return 0;
+}
+
+/* Fill in the table. Row j holds g^(d * 2^(w*j)) for d = 1 .. 2^w - 1. tp
+ * must have room for 3*n + 1 limbs. Does not use the Python API.
+ */
+
+static void
+GMPy_FixedBase_Build(FixedBase_Object *fb, mp_limb_t *tp)
+{
+    mp_size_t n = fb->mont.n;
+    size_t tsize = ((size_t)1 << fb->window) - 1, d;
+    mp_limb_t *row, *prev;
+    Py_ssize_t j;
+
+    for (j = 0; j < fb->digits; j++) {
+        row = fb->table + (size_t)j * tsize * n;
+        if (j == 0) {
+            GMPy_Mont_Load(&fb->mont, row, fb->g, NULL);
+            if (fb->odd) {
+                GMPy_Mont_To(&fb->mont, row, row, tp);
+            }
+        }
+        else {
+            /* g^(2^(w*j)) is the square of g^(2^(w*j - 1)). */
+            prev = row - tsize * n + (tsize >> 1) * n;
+            GMPy_FixedBase_Mul(fb, row, prev, prev, tp);
+        }
+        for (d = 1; d < tsize; d++) {
+            GMPy_FixedBase_Mul(fb, row + d * n, row + (d - 1) * n, row, tp);
+        }
+    }
+}
+
+PyDoc_STRVAR(GMPy_doc_fixedbase,
+"powmod_fixed_base(g, mod, max_exp_bits, /)\n\n"
+"Return an object that computes powmod(g, e, mod) for a fixed base g.\n"
+"A table of powers of g is computed once when the object is created.\n"
+"After that, each power for an exponent with at most max_exp_bits bits\n"
+"only needs about max_exp_bits/w multiplications (w is between 1 and 7)\n"
+"and no squarings. Larger exponents are still supported but do not use\n"
+"the table. Building the table costs about as much as ten calls to\n"
+"powmod() so it is only useful if many powers of g are needed.\n"
+"ValueError is raised if the table would need more than 16 MiB.");
+
+static PyObject *
+GMPy_FixedBase_NewInit(PyTypeObject *type, PyObject *args, PyObject *keywds)
+{
+    FixedBase_Object *result;
+    MPZ_Object *tempg = NULL, *tempm = NULL;
+    PyObject *g = NULL, *m = NULL, *bits = NULL;
+    mp_bitcnt_t max_bits;
+    mp_limb_t *tp;
+    size_t tsize;
+    int w;
+
+    if (keywds && PyDict_GET_SIZE(keywds)) {
+        TYPE_ERROR("powmod_fixed_base() takes no keyword arguments");
+        return NULL;
+    }
+
+    if (!PyArg_UnpackTuple(args, "powmod_fixed_base", 3, 3, &g, &m, &bits)) {
+        return NULL;
+    }
+
+    if (!IS_TYPE_INTEGER(GMPy_ObjectType(g)) ||
+        !IS_TYPE_INTEGER(GMPy_ObjectType(m)) ||
+        !IS_TYPE_INTEGER(GMPy_ObjectType(bits))) {
+        TYPE_ERROR("powmod_fixed_base() requires integer arguments");
+        return NULL;
+    }
+
+    max_bits = GMPy_Integer_AsMpBitCnt(bits);
+    if (max_bits == (mp_bitcnt_t)(-1) && PyErr_Occurred()) {
+        return NULL;
+    }
+    if (max_bits == 0) {
+        VALUE_ERROR("powmod_fixed_base() 'max_exp_bits' must be > 0");
+        return NULL;
+    }
+
+    if (!(tempg = GMPy_MPZ_From_Integer(g, NULL)) ||
+        !(tempm = GMPy_MPZ_From_Integer(m, NULL))) {
+        /* LCOV_EXCL_START */
+        Py_XDECREF((PyObject*)tempg);
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+
+    if (mpz_sgn(tempm->z) < 1) {
+        VALUE_ERROR("powmod_fixed_base() 'mod' must be > 0");
+        Py_DECREF((PyObject*)tempg);
+        Py_DECREF((PyObject*)tempm);
+        return NULL;
+    }
+
+    if (!(result = PyObject_New(FixedBase_Object, &FixedBase_Type))) {
+        /* LCOV_EXCL_START */
+        Py_DECREF((PyObject*)tempg);
+        Py_DECREF((PyObject*)tempm);
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+    result->table = NULL;
+
+    /* An even modulus only uses the limbs of m stored in mont. */
+    if (GMPy_Mont_Init(&result->mont, tempm->z) < 0) {
+        /* LCOV_EXCL_START */
+        result->mont.mp = NULL;
+        Py_DECREF((PyObject*)tempg);
+        Py_DECREF((PyObject*)tempm);
+        Py_DECREF((PyObject*)result);
+        return PyErr_NoMemory();
+        /* LCOV_EXCL_STOP */
+    }
+    mpz_init(result->g);
+    mpz_mod(result->g, tempg->z, tempm->z);
+    Py_DECREF((PyObject*)tempg);
+    Py_DECREF((PyObject*)tempm);
+
+    result->max_bits = max_bits;
+    result->odd = mpz_odd_p(result->mont.m);
+    if (mpz_cmp_ui(result->mont.m, 1) == 0) {
+        result->invertible = 1;
+    }
+    else {
+        mpz_t t;
+
+        mpz_init(t);
+        result->invertible = mpz_invert(t, result->g, result->mont.m) != 0;
+        mpz_clear(t);
+    }
+
+    /* Use a smaller window if the table would be too large. If even a
+     * window of one bit is too large, max_exp_bits is rejected.
+     */
+    w = GMPy_FixedBase_Window(max_bits);
+    while (1) {
+        mp_bitcnt_t digits = max_bits / w + (max_bits % w != 0);
+
+        tsize = ((size_t)1 << w) - 1;
+        if ((double)digits * tsize * result->mont.n *
+            sizeof(mp_limb_t) <= (double)GMPY_FIXEDBASE_MAX_TABLE) {
+            result->window = w;
+            result->digits = (Py_ssize_t)digits;
+            break;
+        }
+        if (w == 1) {
+            VALUE_ERROR("powmod_fixed_base() 'max_exp_bits' is too large for 'mod'");
+            Py_DECREF((PyObject*)result);
+            return NULL;
+        }
+        w--;
+    }
+
+    if (!(result->table = PyMem_RawMalloc((size_t)result->digits * tsize *
+                                          result->mont.n * sizeof(mp_limb_t))) ||
+        !(tp = PyMem_RawMalloc((3 * result->mont.n + 1) * sizeof(mp_limb_t)))) {
+        Py_DECREF((PyObject*)result);
+        return PyErr_NoMemory();
+    }
+
+    Py_BEGIN_ALLOW_THREADS;
+    GMPy_FixedBase_Build(result, tp);
+    Py_END_ALLOW_THREADS;
+
+    PyMem_RawFree(tp);
+    return (PyObject*)result;
+}
+
+static void
+GMPy_FixedBase_Dealloc(FixedBase_Object *self)
+{
+    if (self->mont.mp) {
+        mpz_clear(self->g);
+    }
+    GMPy_Mont_Clear(&self->mont);
+    PyMem_RawFree(self->table);
+    PyObject_Free(self);
+}
+
+static PyObject *
+GMPy_FixedBase_GetBase(FixedBase_Object *self, void *closure)
+{
+    MPZ_Object *result;
+
+    if ((result = GMPy_MPZ_New(NULL))) {
+        mpz_set(result->z, self->g);
+    }
+    return (PyObject*)result;
+}
+
+static PyObject *
+GMPy_FixedBase_GetModulus(FixedBase_Object *self, void *closure)
+{
+    MPZ_Object *result;
+
+    if ((result = GMPy_MPZ_New(NULL))) {
+        mpz_set(result->z, self->mont.m);
+    }
+    return (PyObject*)result;
+}
+
+static PyObject *
+GMPy_FixedBase_GetMaxExpBits(FixedBase_Object *self, void *closure)
+{
+    return GMPy_PyLong_FromMpBitCnt(self->max_bits);
+}
+
+static PyObject *
+GMPy_FixedBase_Repr(FixedBase_Object *self)
+{
+    PyObject *g, *m, *result = NULL;
+
+    if (!(g = GMPy_FixedBase_GetBase(self, NULL))) {
+        /* LCOV_EXCL_START */
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+    if ((m = GMPy_FixedBase_GetModulus(self, NULL))) {
+        result = PyUnicode_FromFormat("powmod_fixed_base(%S, %S, %zu)", g, m,
+                                      (size_t)self->max_bits);
+        Py_DECREF(m);
+    }
+    Py_DECREF(g);
+    return result;
+}
+
+static PyObject *
+GMPy_FixedBase_Call(FixedBase_Object *self, PyObject *args, PyObject *keywds)
+{
+    MPZ_Object *result, *tempe;
+    mp_limb_t *buf;
+    PyObject *e;
+    int res;
+
+    if (keywds && PyDict_GET_SIZE(keywds)) {
+        TYPE_ERROR("powmod_fixed_base() takes no keyword arguments");
+        return NULL;
+    }
+
+    if (!PyArg_UnpackTuple(args, "powmod_fixed_base", 1, 1, &e)) {
+        return NULL;
+    }
+
+    if (!IS_TYPE_INTEGER(GMPy_ObjectType(e))) {
+        TYPE_ERROR("powmod_fixed_base() requires an integer exponent");
+        return NULL;
+    }
+
+    if (!(tempe = GMPy_MPZ_From_Integer(e, NULL))) {
+        /* LCOV_EXCL_START */
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+
+    if (!(result = GMPy_MPZ_New(NULL))) {
+        /* LCOV_EXCL_START */
+        Py_DECREF((PyObject*)tempe);
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+
+    if (!(buf = PyMem_New(mp_limb_t, 4 * self->mont.n + 1))) {
+        /* LCOV_EXCL_START */
+        Py_DECREF((PyObject*)tempe);
+        Py_DECREF((PyObject*)result);
+        return PyErr_NoMemory();
+        /* LCOV_EXCL_STOP */
+    }
+
+    Py_BEGIN_ALLOW_THREADS;
+    res = GMPy_FixedBase_Pow(self, result->z, tempe->z, buf);
+    Py_END_ALLOW_THREADS;
+
+    PyMem_Free(buf);
+    Py_DECREF((PyObject*)tempe);
+    if (res) {
+        VALUE_ERROR("pow() base not invertible");
+        Py_DECREF((PyObject*)result);
+        return NULL;
+    }
+    return (PyObject*)result;
+}
+
+/* Arguments for GMPy_FixedBase_BatchWork. Each item of lst is an
+ * MPZ_Object that is replaced by the result.
+ */
+
+typedef struct {
+    const FixedBase_Object *fb;
+    PyObject *lst;
+    int nomem;
+} GMPy_FixedBase_BatchArgs;
+
+static void
+GMPy_FixedBase_BatchWork(void *arg, Py_ssize_t start, Py_ssize_t stop)
+{
+    GMPy_FixedBase_BatchArgs *args = (GMPy_FixedBase_BatchArgs*)arg;
+    mp_limb_t *buf;
+    mpz_t temp;
+    Py_ssize_t i;
+
+    if (!(buf = PyMem_RawMalloc((4 * args->fb->mont.n + 1) * sizeof(mp_limb_t)))) {
+        /* LCOV_EXCL_START */
+        args->nomem = 1;
+        return;
+        /* LCOV_EXCL_STOP */
+    }
+
+    mpz_init(temp);
+    for (i = start; i < stop; i++) {
+        mpz_ptr e = MPZ(PyList_GET_ITEM(args->lst, i));
+
+        GMPy_FixedBase_Pow(args->fb, temp, e, buf);
+        mpz_swap(temp, e);
+    }
+    mpz_clear(temp);
+    PyMem_RawFree(buf);
+}
+
+PyDoc_STRVAR(GMPy_doc_fixedbase_method_batch,
+"x.batch(exps, /, *, threads=1) -> list[mpz, ...]\n\n"
+"Return [x(e) for e in exps]. Will always release the GIL. If threads\n"
+"is greater than 1, the work is split across that many native threads.");
+
+static PyObject *
+GMPy_FixedBase_Method_Batch(PyObject *self, PyObject *args, PyObject *keywds)
+{
+    FixedBase_Object *fb = (FixedBase_Object*)self;
+    GMPy_FixedBase_BatchArgs bargs;
+    PyObject *result;
+    Py_ssize_t i;
+    int threads;
+
+    if (PyTuple_GET_SIZE(args) != 1) {
+        TYPE_ERROR("powmod_fixed_base.batch() requires 1 argument");
+        return NULL;
+    }
+
+    if ((threads = GMPy_Parse_Threads(keywds, "powmod_fixed_base.batch")) < 0) {
+        return NULL;
+    }
+
+    if (!(result = GMPy_Integer_PowModList_Copy(PyTuple_GET_ITEM(args, 0)))) {
+        return NULL;
+    }
+
+    if (!fb->invertible) {
+        for (i = 0; i < PyList_GET_SIZE(result); i++) {
+            if (mpz_sgn(MPZ(PyList_GET_ITEM(result, i))) < 0) {
+                PyErr_Format(PyExc_ValueError,
+                             "pow() base not invertible at index %zd", i);
+                Py_DECREF(result);
+                return NULL;
+            }
+        }
+    }
+
+    bargs.fb = fb;
+    bargs.lst = result;
+    bargs.nomem = 0;
+    if (GMPy_Parallel_For(PyList_GET_SIZE(result), threads,
+                          GMPy_FixedBase_BatchWork, &bargs) < 0) {
+        /* LCOV_EXCL_START */
+        Py_DECREF(result);
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+
+    if (bargs.nomem) {
+        /* LCOV_EXCL_START */
+        Py_DECREF(result);
+        return PyErr_NoMemory();
+        /* LCOV_EXCL_STOP */
+    }
+    return result;
+}
+
+static PyObject *
+GMPy_FixedBase_Method_Reduce(PyObject *self, PyObject *other)
+{
+    FixedBase_Object *fb = (FixedBase_Object*)self;
+    PyObject *g, *m;
+
+    if (!(g = GMPy_FixedBase_GetBase(fb, NULL))) {
+        /* LCOV_EXCL_START */
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+    if (!(m = GMPy_FixedBase_GetModulus(fb, NULL))) {
+        /* LCOV_EXCL_START */
+        Py_DECREF(g);
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+    return Py_BuildValue("(O(NNN))", (PyObject*)&FixedBase_Type, g, m,
+                         GMPy_PyLong_FromMpBitCnt(fb->max_bits));
+}
+
+static PyGetSetDef GMPy_FixedBase_getseters[] = {
+    { "base", (getter)GMPy_FixedBase_GetBase, NULL, "the base reduced modulo mod", NULL },
+    { "max_exp_bits", (getter)GMPy_FixedBase_GetMaxExpBits, NULL, "the largest exponent size covered by the table", NULL },
+    { "modulus", (getter)GMPy_FixedBase_GetModulus, NULL, "the modulus", NULL },
+    { NULL }
+};
+
+static PyMethodDef GMPy_FixedBase_methods[] = {
+    { "__reduce__", GMPy_FixedBase_Method_Reduce, METH_NOARGS, NULL },
+    { "batch", (PyCFunction)GMPy_FixedBase_Method_Batch, METH_VARARGS | METH_KEYWORDS, GMPy_doc_fixedbase_method_batch },
+    { NULL }
+};
+
+static PyTypeObject FixedBase_Type = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = "gmpy2.powmod_fixed_base",
+    .tp_basicsize = sizeof(FixedBase_Object),
+    .tp_dealloc = (destructor) GMPy_FixedBase_Dealloc,
+    .tp_repr = (reprfunc) GMPy_FixedBase_Repr,
+    .tp_call = (ternaryfunc) GMPy_FixedBase_Call,
+    .tp_flags = Py_TPFLAGS_DEFAULT,
+    .tp_doc = GMPy_doc_fixedbase,
+    .tp_methods = GMPy_FixedBase_methods,
+    .tp_getset = GMPy_FixedBase_getseters,
+    .tp_new = GMPy_FixedBase_NewInit,
+};
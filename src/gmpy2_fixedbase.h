@@ -0,0 +1,69 @@
+/* * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * *
+ * gmpy2_fixedbase.h                                                        *
+ * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * *
+ * Python interface to the GMP, MPFR, and MPC multiple precision           *
+ * libraries.                                                              *
+ *                                                                         *
+ * Copyright 2000 - 2009 Alex Martelli                                     *
+ *                                                                         *
+ * Copyright 2008 - 2024 Case Van Horsen                                   *
+ *                                                                         *
+ * This file is part of GMPY2.                                             *
+ *                                                                         *
+ * GMPY2 is free software: you can redistribute it and/or modify it under  *
+ * the terms of the GNU Lesser General Public License as published by the  *
+ * Free Software Foundation, either version 3 of the License, or (at your  *
+ * option) any later version.                                              *
+ *                                                                         *
+ * GMPY2 is distributed in the hope that it will be useful, but WITHOUT    *
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or   *
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public    *
+ * License for more details.                                               *
+ *                                                                         *
+ * You should have received a copy of the GNU Lesser General Public        *
+ * License along with GMPY2; if not, see <http://www.gnu.org/licenses/>    *
+ * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * */
+
+#ifndef GMPY_FIXEDBASE_H
+#define GMPY_FIXEDBASE_H
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+/* A powmod_fixed_base object stores a table of powers of a fixed base g
+ * modulo m. The exponent is split into digits of w bits and digit j uses the
+ * entries g^(d * 2^(w*j)) for d = 1 .. 2^w - 1, so each power only needs
+ * one multiplication per nonzero digit and no squarings. For an odd modulus
+ * the table is kept in Montgomery form; for an even modulus only the limbs
+ * of m in mont are used and the table holds ordinary residues.
+ */
+
+typedef struct {
+    PyObject_HEAD
+    GMPy_Mont mont;
+    mpz_t g;                    /* base, reduced mod m              */
+    mp_bitcnt_t max_bits;       /* largest exponent in the table    */
+    int window;                 /* bits per digit                   */
+    int odd;                    /* modulus is odd                   */
+    int invertible;             /* g is invertible mod m            */
+    Py_ssize_t digits;          /* number of digits                 */
+    mp_limb_t *table;           /* digits * (2^window - 1) entries  */
+} FixedBase_Object;
+
+static PyTypeObject FixedBase_Type;
+#define FixedBase_Check(v) (((PyObject*)v)->ob_type == &FixedBase_Type)
+
+static int        GMPy_FixedBase_Pow(const FixedBase_Object *fb, mpz_ptr r, mpz_srcptr e, mp_limb_t *buf);
+
+static PyObject * GMPy_FixedBase_NewInit(PyTypeObject *type, PyObject *args, PyObject *keywds);
+static void       GMPy_FixedBase_Dealloc(FixedBase_Object *self);
+static PyObject * GMPy_FixedBase_Repr(FixedBase_Object *self);
+static PyObject * GMPy_FixedBase_Call(FixedBase_Object *self, PyObject *args, PyObject *keywds);
+static PyObject * GMPy_FixedBase_Method_Batch(PyObject *self, PyObject *args, PyObject *keywds);
+static PyObject * GMPy_FixedBase_Method_Reduce(PyObject *self, PyObject *other);
+
+#ifdef __cplusplus
+}
+#endif
+#endif
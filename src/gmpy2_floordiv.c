@@ -340,14 +340,21 @@ PyDoc_STRVAR(GMPy_doc_context_floordiv,
 "Return x // y; uses floor division.");
 
 static PyObject *
-GMPy_Context_FloorDiv(PyObject *self, PyObject *args)
+GMPy_Context_FloorDiv(PyObject *self, PyObject *const *args, Py_ssize_t nargs)
 {
-    if (PyTuple_GET_SIZE(args) != 2) {
+    CTXT_Object *context = NULL;
+
+    if (nargs != 2) {
         TYPE_ERROR("floor_div() requires 2 arguments");
         return NULL;
     }
 
-    return GMPy_Number_FloorDiv(PyTuple_GET_ITEM(args, 0),
-                                PyTuple_GET_ITEM(args, 1),
-                                (CTXT_Object*)self);
+    if (self && CTXT_Check(self)) {
+        context = (CTXT_Object*)self;
+    }
+    else {
+        CHECK_CONTEXT(context);
+    }
+
+    return GMPy_Number_FloorDiv(args[0], args[1], context);
 }
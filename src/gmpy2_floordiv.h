@@ -42,7 +42,7 @@ static PyObject * GMPy_Rational_FloorDivWithType(PyObject *x, int xtype, PyObjec
 static PyObject * GMPy_Real_FloorDivWithType(PyObject *x, int xtype, PyObject *y, int ytype, CTXT_Object *context);
 static PyObject * GMPy_Complex_FloorDivWithType(PyObject *x, int xtype, PyObject *y, int ytype, CTXT_Object *context);
 static PyObject * GMPy_Number_FloorDiv_Slot(PyObject *x, PyObject *y);
-static PyObject * GMPy_Context_FloorDiv(PyObject *self, PyObject *args);
+static PyObject * GMPy_Context_FloorDiv(PyObject *self, PyObject *const *args, Py_ssize_t nargs);
 
 #ifdef __cplusplus
 }
@@ -1994,88 +1994,3 @@ GMPy_Context_Factorial(PyObject *self, PyObject *other)
     _GMPy_MPFR_Cleanup(&result, context);
     return (PyObject*)result;
 }
-
-PyDoc_STRVAR(GMPy_doc_function_fsum,
-"fsum(iterable, /) -> mpfr\n\n"
-"Return an accurate sum of the values in the iterable.");
-
-PyDoc_STRVAR(GMPy_doc_context_fsum,
-"fsum(iterable, /) -> mpfr\n\n"
-"Return an accurate sum of the values in the iterable.");
-
-static PyObject *
-GMPy_Context_Fsum(PyObject *self, PyObject *other)
-{
-    MPFR_Object *temp, *result;
-    mpfr_ptr *tab;
-    int errcode;
-    Py_ssize_t i, seq_length = 0;
-    CTXT_Object *context = NULL;
-
-    if (self && CTXT_Check(self)) {
-        context = (CTXT_Object*)self;
-    }
-    else {
-        CHECK_CONTEXT(context);
-    }
-
-    if (!(result = GMPy_MPFR_New(0, context))) {
-        return NULL;
-    }
-
-    if (!(other = PySequence_List(other))) {
-        Py_DECREF((PyObject*)result);
-        TYPE_ERROR("argument must be an iterable");
-        return NULL;
-    }
-
-    /* other contains a new list containing all the values from the
-     * iterable. Now make sure each item in the list is an mpfr.
-     */
-
-    seq_length = PyList_GET_SIZE(other);
-    if (seq_length > LONG_MAX) {
-        OVERFLOW_ERROR("temporary array is too large");
-	Py_DECREF(other);
-	Py_DECREF((PyObject*)result);
-	return NULL;
-    }
-    for (i=0; i < seq_length; i++) {
-        if (!(temp = GMPy_MPFR_From_Real(PyList_GET_ITEM(other, i), 1, context))) {
-            Py_DECREF(other);
-            Py_DECREF((PyObject*)result);
-            TYPE_ERROR("all items in iterable must be real numbers");
-            return NULL;
-        }
-
-        errcode = PyList_SetItem(other, i,(PyObject*)temp);
-        if (errcode < 0) {
-            Py_DECREF(other);
-            Py_DECREF((PyObject*)result);
-            TYPE_ERROR("all items in iterable must be real numbers");
-            return NULL;
-        }
-    }
-
-    /* create an array of pointers to the mpfr_t field of a Pympfr object */
-
-    if (!(tab = (mpfr_ptr *)malloc((sizeof(mpfr_srcptr) * seq_length)))) {
-        Py_DECREF(other);
-        Py_DECREF((PyObject*)result);
-        return PyErr_NoMemory();
-    }
-    for (i=0; i < seq_length; i++) {
-        temp = (MPFR_Object*)PyList_GET_ITEM(other, i);
-        tab[i] = temp->f;
-    }
-
-    mpfr_clear_flags();
-
-    /* The cast is safe since we have compared seq_length to LONG_MAX. */
-    result->rc = mpfr_sum(result->f, tab, (unsigned long)seq_length, GET_MPFR_ROUND(context));
-    Py_DECREF(other);
-    free(tab);
-
-    _GMPy_MPFR_Cleanup(&result, context);
-    return (PyObject*)result;
-}
@@ -338,7 +338,6 @@ static PyObject * GMPy_Context_NextBelow(PyObject *self, PyObject *other);
 
 static PyObject * GMPy_Context_Factorial(PyObject *self, PyObject *other);
 
-static PyObject * GMPy_Context_Fsum(PyObject *self, PyObject *other);
 
 #ifdef __cplusplus
 }
@@ -351,11 +351,11 @@ PyDoc_STRVAR(GMPy_doc_context_mod,
 "`mpfr` arguments.");
 
 static PyObject *
-GMPy_Context_Mod(PyObject *self, PyObject *args)
+GMPy_Context_Mod(PyObject *self, PyObject *const *args, Py_ssize_t nargs)
 {
     CTXT_Object *context = NULL;
 
-    if (PyTuple_GET_SIZE(args) != 2) {
+    if (nargs != 2) {
         TYPE_ERROR("mod() requires 2 arguments");
         return NULL;
     }
@@ -367,7 +367,5 @@ GMPy_Context_Mod(PyObject *self, PyObject *args)
         CHECK_CONTEXT(context);
     }
 
-    return GMPy_Number_Mod(PyTuple_GET_ITEM(args, 0),
-                           PyTuple_GET_ITEM(args, 1),
-                           context);
+    return GMPy_Number_Mod(args[0], args[1], context);
 }
@@ -0,0 +1,1007 @@
+/* * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * *
+ * gmpy2_modring.c                                                          *
+ * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * *
+ * Python interface to the GMP, MPFR, and MPC multiple precision           *
+ * libraries.                                                              *
+ *                                                                         *
+ * Copyright 2000 - 2009 Alex Martelli                                     *
+ *                                                                         *
+ * Copyright 2008 - 2024 Case Van Horsen                                   *
+ *                                                                         *
+ * This file is part of GMPY2.                                             *
+ *                                                                         *
+ * GMPY2 is free software: you can redistribute it and/or modify it under  *
+ * the terms of the GNU Lesser General Public License as published by the  *
+ * Free Software Foundation, either version 3 of the License, or (at your  *
+ * option) any later version.                                              *
+ *                                                                         *
+ * GMPY2 is distributed in the hope that it will be useful, but WITHOUT    *
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or   *
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public    *
+ * License for more details.                                               *
+ *                                                                         *
+ * You should have received a copy of the GNU Lesser General Public        *
+ * License along with GMPY2; if not, see <http://www.gnu.org/licenses/>    *
+ * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * */
+
+
+/* This file implements Montgomery multiplication for a fixed odd modulus
+ * and the ModRing type that exposes it to Python.
+ *
+ * The reduction (REDC) follows the approach of GMP's mpn_redc_1: one limb
+ * of the quotient is computed at a time and the carry out of each
+ * mpn_addmul_1 is stored in the limb that was just cleared. The carries are
+ * added back in a single mpn_add_n at the end.
+ */
+
+/* Returns 0 on success or -1 if memory could not be allocated. m must be
+ * odd and greater than 1. Does not set an exception.
+ */
+
+static int
+GMPy_Mont_Init(GMPy_Mont *mt, mpz_srcptr m)
+{
+    mp_size_t n = (mp_size_t)mpz_size(m);
+    mp_limb_t m0, inv;
+    mpz_t t;
+    int i;
+
+    if (!(mt->mp = PyMem_RawMalloc(3 * n * sizeof(mp_limb_t)))) {
+        /* LCOV_EXCL_START */
+        return -1;
+        /* LCOV_EXCL_STOP */
+    }
+    mt->n = n;
+    mt->r2 = mt->mp + n;
+    mt->one = mt->mp + 2 * n;
+    mpz_init_set(mt->m, m);
+    memcpy(mt->mp, mpz_limbs_read(m), n * sizeof(mp_limb_t));
+
+    /* Newton iteration for 1/m mod B; each step doubles the number of
+     * correct bits starting from 3 bits.
+     */
+    m0 = mt->mp[0];
+    inv = m0;
+    for (i = 0; i < 6; i++) {
+        inv *= 2 - m0 * inv;
+    }
+    mt->minv = -inv;
+
+    mpz_init(t);
+    mpz_setbit(t, 2 * (mp_bitcnt_t)n * GMP_NUMB_BITS);
+    mpz_mod(t, t, m);
+    GMPy_Mont_Load(mt, mt->r2, t, NULL);
+    mpz_set_ui(t, 0);
+    mpz_setbit(t, (mp_bitcnt_t)n * GMP_NUMB_BITS);
+    mpz_mod(t, t, m);
+    GMPy_Mont_Load(mt, mt->one, t, NULL);
+    mpz_clear(t);
+    return 0;
+}
+
+static void
+GMPy_Mont_Clear(GMPy_Mont *mt)
+{
+    if (mt->mp) {
+        PyMem_RawFree(mt->mp);
+        mpz_clear(mt->m);
+        mt->mp = NULL;
+    }
+}
+
+/* Store a mod m in rp as n limbs. tmp is used if a must be reduced; it may
+ * be NULL if 0 <= a < m.
+ */
+
+static void
+GMPy_Mont_Load(const GMPy_Mont *mt, mp_limb_t *rp, mpz_srcptr a, mpz_ptr tmp)
+{
+    mp_size_t size;
+
+    if (mpz_sgn(a) < 0 || mpz_cmp(a, mt->m) >= 0) {
+        mpz_fdiv_r(tmp, a, mt->m);
+        a = tmp;
+    }
+    size = (mp_size_t)mpz_size(a);
+    if (size) {
+        memcpy(rp, mpz_limbs_read(a), size * sizeof(mp_limb_t));
+    }
+    if (size < mt->n) {
+        memset(rp + size, 0, (mt->n - size) * sizeof(mp_limb_t));
+    }
+}
+
+static void
+GMPy_Mont_Store(const GMPy_Mont *mt, mpz_ptr r, const mp_limb_t *ap)
+{
+    mp_limb_t *rp = mpz_limbs_write(r, mt->n);
+
+    memcpy(rp, ap, mt->n * sizeof(mp_limb_t));
+    mpz_limbs_finish(r, mt->n);
+}
+
+/* Set rp to tp / R mod m. tp contains 2n limbs and is destroyed. */
+
+static void
+GMPy_Mont_Redc(const GMPy_Mont *mt, mp_limb_t *rp, mp_limb_t *tp)
+{
+    mp_size_t i, n = mt->n;
+    mp_limb_t cy;
+
+    for (i = 0; i < n; i++) {
+        cy = mpn_addmul_1(tp + i, mt->mp, n, tp[i] * mt->minv);
+        tp[i] = cy;
+    }
+    cy = mpn_add_n(rp, tp + n, tp, n);
+    if (cy || mpn_cmp(rp, mt->mp, n) >= 0) {
+        mpn_sub_n(rp, rp, mt->mp, n);
+    }
+}
+
+/* Set rp to ap * bp / R mod m. tp must have room for 2n limbs. rp may be
+ * the same as ap or bp.
+ */
+
+static void
+GMPy_Mont_Mul(const GMPy_Mont *mt, mp_limb_t *rp, const mp_limb_t *ap,
+              const mp_limb_t *bp, mp_limb_t *tp)
+{
+    if (ap == bp) {
+        mpn_sqr(tp, ap, mt->n);
+    }
+    else {
+        mpn_mul_n(tp, ap, bp, mt->n);
+    }
+    GMPy_Mont_Redc(mt, rp, tp);
+}
+
+static void
+GMPy_Mont_Sqr(const GMPy_Mont *mt, mp_limb_t *rp, const mp_limb_t *ap,
+              mp_limb_t *tp)
+{
+    mpn_sqr(tp, ap, mt->n);
+    GMPy_Mont_Redc(mt, rp, tp);
+}
+
+/* Convert to and from Montgomery form. */
+
+static void
+GMPy_Mont_To(const GMPy_Mont *mt, mp_limb_t *rp, const mp_limb_t *ap,
+             mp_limb_t *tp)
+{
+    GMPy_Mont_Mul(mt, rp, ap, mt->r2, tp);
+}
+
+static void
+GMPy_Mont_From(const GMPy_Mont *mt, mp_limb_t *rp, const mp_limb_t *ap,
+               mp_limb_t *tp)
+{
+    memcpy(tp, ap, mt->n * sizeof(mp_limb_t));
+    memset(tp + mt->n, 0, mt->n * sizeof(mp_limb_t));
+    GMPy_Mont_Redc(mt, rp, tp);
+}
+
+/* Return the window size used for an exponent of the given size. */
+
+static int
+GMPy_Mont_Window(mp_bitcnt_t bits)
+{
+    if (bits <= 8)
+        return 1;
+    if (bits <= 24)
+        return 2;
+    if (bits <= 80)
+        return 3;
+    if (bits <= 240)
+        return 4;
+    if (bits <= 672)
+        return 5;
+    if (bits <= 1792)
+        return 6;
+    return 7;
+}
+
+/* Return bit i of the exponent with limbs ep. */
+
+#define MONT_GETBIT(ep, i) \
+    ((int)(((ep)[(i) / GMP_NUMB_BITS] >> ((i) % GMP_NUMB_BITS)) & 1))
+
+/* Set rp to ap^e using a sliding window over the odd powers of ap. ap and
+ * rp are in Montgomery form and must not overlap; e must be >= 0. Returns 0
+ * on success or -1 if memory could not be allocated.
+ */
+
+static int
+GMPy_Mont_Pow(const GMPy_Mont *mt, mp_limb_t *rp, const mp_limb_t *ap,
+              mpz_srcptr e)
+{
+    mp_size_t n = mt->n;
+    const mp_limb_t *ep = mpz_limbs_read(e);
+    mp_limb_t *table, *tp, *a2;
+    Py_ssize_t i, j, l, bits;
+    size_t tsize, w;
+    int k, started = 0;
+
+    if (mpz_sgn(e) == 0) {
+        memcpy(rp, mt->one, n * sizeof(mp_limb_t));
+        return 0;
+    }
+
+    bits = (Py_ssize_t)mpz_sizeinbase(e, 2);
+    k = GMPy_Mont_Window((mp_bitcnt_t)bits);
+    tsize = (size_t)1 << (k - 1);
+
+    if (!(table = PyMem_RawMalloc((tsize * n + 3 * n) * sizeof(mp_limb_t)))) {
+        /* LCOV_EXCL_START */
+        return -1;
+        /* LCOV_EXCL_STOP */
+    }
+    tp = table + tsize * n;
+    a2 = tp + 2 * n;
+
+    /* table[w] = ap^(2*w+1) */
+    memcpy(table, ap, n * sizeof(mp_limb_t));
+    if (tsize > 1) {
+        GMPy_Mont_Sqr(mt, a2, ap, tp);
+        for (w = 1; w < tsize; w++) {
+            GMPy_Mont_Mul(mt, table + w * n, table + (w - 1) * n, a2, tp);
+        }
+    }
+
+    i = bits - 1;
+    while (i >= 0) {
+        if (!MONT_GETBIT(ep, i)) {
+            GMPy_Mont_Sqr(mt, rp, rp, tp);
+            i--;
+            continue;
+        }
+
+        /* Find the longest window ending in a 1 bit. */
+        j = (i >= k - 1) ? i - k + 1 : 0;
+        while (!MONT_GETBIT(ep, j)) {
+            j++;
+        }
+        for (w = 0, l = i; l >= j; l--) {
+            w = (w << 1) | (size_t)MONT_GETBIT(ep, l);
+        }
+
+        if (started) {
+            for (l = i; l >= j; l--) {
+                GMPy_Mont_Sqr(mt, rp, rp, tp);
+            }
+            GMPy_Mont_Mul(mt, rp, rp, table + (w >> 1) * n, tp);
+        }
+        else {
+            memcpy(rp, table + (w >> 1) * n, n * sizeof(mp_limb_t));
+            started = 1;
+        }
+        i = j - 1;
+    }
+
+    PyMem_RawFree(table);
+    return 0;
+}
+
+/* Convert obj to an mpz. Returns a new reference or NULL with an exception
+ * set.
+ */
+
+static MPZ_Object *
+GMPy_ModRing_Arg(PyObject *obj, const char *fname)
+{
+    int xtype = GMPy_ObjectType(obj);
+
+    if (!IS_TYPE_INTEGER(xtype)) {
+        PyErr_Format(PyExc_TypeError,
+                     "ModRing.%s() requires integer arguments", fname);
+        return NULL;
+    }
+    return GMPy_MPZ_From_IntegerWithType(obj, xtype, NULL);
+}
+
+/* Convert all items of an iterable to mpz. Returns a new list of mpz or
+ * NULL with an exception set.
+ */
+
+static PyObject *
+GMPy_ModRing_ArgList(PyObject *obj, const char *fname)
+{
+    PyObject *seq, *result;
+    MPZ_Object *temp;
+    Py_ssize_t i, length;
+
+    if (!(seq = PySequence_Fast(obj, "argument must be an iterable"))) {
+        return NULL;
+    }
+
+    length = PySequence_Fast_GET_SIZE(seq);
+    if (!(result = PyList_New(length))) {
+        /* LCOV_EXCL_START */
+        Py_DECREF(seq);
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+
+    for (i = 0; i < length; i++) {
+        if (!(temp = GMPy_ModRing_Arg(PySequence_Fast_GET_ITEM(seq, i), fname))) {
+            Py_DECREF(seq);
+            Py_DECREF(result);
+            return NULL;
+        }
+        PyList_SET_ITEM(result, i, (PyObject*)temp);
+    }
+    Py_DECREF(seq);
+    return result;
+}
+
+/* Return a list of length new mpz objects. */
+
+static PyObject *
+GMPy_ModRing_ResultList(Py_ssize_t length)
+{
+    PyObject *result;
+    MPZ_Object *temp;
+    Py_ssize_t i;
+
+    if (!(result = PyList_New(length))) {
+        /* LCOV_EXCL_START */
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+    for (i = 0; i < length; i++) {
+        if (!(temp = GMPy_MPZ_New(NULL))) {
+            /* LCOV_EXCL_START */
+            Py_DECREF(result);
+            return NULL;
+            /* LCOV_EXCL_STOP */
+        }
+        PyList_SET_ITEM(result, i, (PyObject*)temp);
+    }
+    return result;
+}
+
+PyDoc_STRVAR(GMPy_doc_modring,
+"ModRing(m, /)\n\n"
+"Return an object for arithmetic modulo a fixed odd integer m > 1.\n"
+"The values needed for Montgomery multiplication are computed once when\n"
+"the object is created. All methods accept any integers and return an\n"
+"mpz in the range [0, m). The batch methods mul_list(), pow_list(), and\n"
+"prod() keep intermediate values in Montgomery form and release the GIL.");
+
+static PyObject *
+GMPy_ModRing_NewInit(PyTypeObject *type, PyObject *args, PyObject *keywds)
+{
+    ModRing_Object *result;
+    MPZ_Object *tempm;
+    PyObject *m = NULL;
+
+    if (keywds && PyDict_GET_SIZE(keywds)) {
+        TYPE_ERROR("ModRing() takes no keyword arguments");
+        return NULL;
+    }
+
+    if (!PyArg_UnpackTuple(args, "ModRing", 1, 1, &m)) {
+        return NULL;
+    }
+
+    if (!IS_TYPE_INTEGER(GMPy_ObjectType(m))) {
+        TYPE_ERROR("ModRing() requires an integer modulus");
+        return NULL;
+    }
+
+    if (!(tempm = GMPy_MPZ_From_Integer(m, NULL))) {
+        /* LCOV_EXCL_START */
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+
+    if (mpz_cmp_ui(tempm->z, 1) <= 0 || mpz_even_p(tempm->z)) {
+        VALUE_ERROR("ModRing() modulus must be odd and > 1");
+        Py_DECREF((PyObject*)tempm);
+        return NULL;
+    }
+
+    if (!(result = PyObject_New(ModRing_Object, &ModRing_Type))) {
+        /* LCOV_EXCL_START */
+        Py_DECREF((PyObject*)tempm);
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+
+    if (GMPy_Mont_Init(&result->mont, tempm->z) < 0) {
+        /* LCOV_EXCL_START */
+        result->mont.mp = NULL;
+        Py_DECREF((PyObject*)tempm);
+        Py_DECREF((PyObject*)result);
+        return PyErr_NoMemory();
+        /* LCOV_EXCL_STOP */
+    }
+    Py_DECREF((PyObject*)tempm);
+    return (PyObject*)result;
+}
+
+static void
+GMPy_ModRing_Dealloc(ModRing_Object *self)
+{
+    GMPy_Mont_Clear(&self->mont);
+    PyObject_Free(self);
+}
+
+static PyObject *
+GMPy_ModRing_GetModulus(ModRing_Object *self, void *closure)
+{
+    MPZ_Object *result;
+
+    if ((result = GMPy_MPZ_New(NULL))) {
+        mpz_set(result->z, self->mont.m);
+    }
+    return (PyObject*)result;
+}
+
+static PyObject *
+GMPy_ModRing_Repr(ModRing_Object *self)
+{
+    PyObject *m, *result;
+
+    if (!(m = GMPy_ModRing_GetModulus(self, NULL))) {
+        /* LCOV_EXCL_START */
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+    result = PyUnicode_FromFormat("ModRing(%S)", m);
+    Py_DECREF(m);
+    return result;
+}
+
+static PyObject *
+GMPy_ModRing_AddSub(PyObject *self, PyObject *const *args, Py_ssize_t nargs,
+                    int subtract)
+{
+    GMPy_Mont *mt = &((ModRing_Object*)self)->mont;
+    const char *fname = subtract ? "sub" : "add";
+    MPZ_Object *result, *tempx, *tempy;
+
+    if (nargs != 2) {
+        PyErr_Format(PyExc_TypeError, "ModRing.%s() requires 2 arguments", fname);
+        return NULL;
+    }
+
+    if (!(tempx = GMPy_ModRing_Arg(args[0], fname))) {
+        return NULL;
+    }
+    if (!(tempy = GMPy_ModRing_Arg(args[1], fname))) {
+        Py_DECREF((PyObject*)tempx);
+        return NULL;
+    }
+
+    if ((result = GMPy_MPZ_New(NULL))) {
+        if (subtract) {
+            mpz_sub(result->z, tempx->z, tempy->z);
+        }
+        else {
+            mpz_add(result->z, tempx->z, tempy->z);
+        }
+        mpz_fdiv_r(result->z, result->z, mt->m);
+    }
+    Py_DECREF((PyObject*)tempx);
+    Py_DECREF((PyObject*)tempy);
+    return (PyObject*)result;
+}
+
+PyDoc_STRVAR(GMPy_doc_modring_method_add,
+"R.add(x, y, /) -> mpz\n\n"
+"Return (x + y) mod R.modulus.");
+
+static PyObject *
+GMPy_ModRing_Method_Add(PyObject *self, PyObject *const *args, Py_ssize_t nargs)
+{
+    return GMPy_ModRing_AddSub(self, args, nargs, 0);
+}
+
+PyDoc_STRVAR(GMPy_doc_modring_method_sub,
+"R.sub(x, y, /) -> mpz\n\n"
+"Return (x - y) mod R.modulus.");
+
+static PyObject *
+GMPy_ModRing_Method_Sub(PyObject *self, PyObject *const *args, Py_ssize_t nargs)
+{
+    return GMPy_ModRing_AddSub(self, args, nargs, 1);
+}
+
+/* Set result to x * y mod m. If y is NULL, x is squared. */
+
+static PyObject *
+GMPy_ModRing_MulSqr(GMPy_Mont *mt, MPZ_Object *x, MPZ_Object *y)
+{
+    MPZ_Object *result;
+    mp_limb_t *buf, *ap, *bp, *tp;
+
+    if (!(buf = PyMem_New(mp_limb_t, 4 * mt->n))) {
+        /* LCOV_EXCL_START */
+        return PyErr_NoMemory();
+        /* LCOV_EXCL_STOP */
+    }
+
+    if (!(result = GMPy_MPZ_New(NULL))) {
+        /* LCOV_EXCL_START */
+        PyMem_Free(buf);
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+
+    ap = buf;
+    bp = ap + mt->n;
+    tp = bp + mt->n;
+
+    /* (x * y / R) * R^2 / R = x * y */
+    GMPy_Mont_Load(mt, ap, x->z, result->z);
+    if (y) {
+        GMPy_Mont_Load(mt, bp, y->z, result->z);
+        GMPy_Mont_Mul(mt, ap, ap, bp, tp);
+    }
+    else {
+        GMPy_Mont_Sqr(mt, ap, ap, tp);
+    }
+    GMPy_Mont_To(mt, ap, ap, tp);
+    GMPy_Mont_Store(mt, result->z, ap);
+
+    PyMem_Free(buf);
+    return (PyObject*)result;
+}
+
+PyDoc_STRVAR(GMPy_doc_modring_method_mul,
+"R.mul(x, y, /) -> mpz\n\n"
+"Return (x * y) mod R.modulus.");
+
+static PyObject *
+GMPy_ModRing_Method_Mul(PyObject *self, PyObject *const *args, Py_ssize_t nargs)
+{
+    MPZ_Object *tempx, *tempy;
+    PyObject *result;
+
+    if (nargs != 2) {
+        TYPE_ERROR("ModRing.mul() requires 2 arguments");
+        return NULL;
+    }
+
+    if (!(tempx = GMPy_ModRing_Arg(args[0], "mul"))) {
+        return NULL;
+    }
+    if (!(tempy = GMPy_ModRing_Arg(args[1], "mul"))) {
+        Py_DECREF((PyObject*)tempx);
+        return NULL;
+    }
+
+    result = GMPy_ModRing_MulSqr(&((ModRing_Object*)self)->mont, tempx, tempy);
+    Py_DECREF((PyObject*)tempx);
+    Py_DECREF((PyObject*)tempy);
+    return result;
+}
+
+PyDoc_STRVAR(GMPy_doc_modring_method_sqr,
+"R.sqr(x, /) -> mpz\n\n"
+"Return (x * x) mod R.modulus.");
+
+static PyObject *
+GMPy_ModRing_Method_Sqr(PyObject *self, PyObject *other)
+{
+    MPZ_Object *tempx;
+    PyObject *result;
+
+    if (!(tempx = GMPy_ModRing_Arg(other, "sqr"))) {
+        return NULL;
+    }
+
+    result = GMPy_ModRing_MulSqr(&((ModRing_Object*)self)->mont, tempx, NULL);
+    Py_DECREF((PyObject*)tempx);
+    return result;
+}
+
+/* For small moduli, mpz_powm is faster than GMPy_Mont_Pow since GMP can
+ * use its internal (assembly) REDC routines. The precomputation that is
+ * saved by ModRing only matters for larger moduli.
+ */
+
+#define GMPY_MONT_POW_THRESHOLD 16
+
+/* Set r to x^e mod m. If e is negative, x must be invertible. Returns 0 on
+ * success, 1 if x is not invertible, and -1 if memory could not be
+ * allocated. buf must have room for 4n limbs. Does not use the Python API.
+ */
+
+static int
+GMPy_ModRing_PowWork(const GMPy_Mont *mt, mpz_ptr r, mpz_srcptr x,
+                     mpz_srcptr e, mp_limb_t *buf)
+{
+    mp_limb_t *ap = buf, *rp = buf + mt->n, *tp = rp + mt->n;
+    mpz_t abs_e;
+
+    if (mpz_sgn(e) < 0) {
+        if (!mpz_invert(r, x, mt->m)) {
+            return 1;
+        }
+        x = r;
+        e = mpz_roinit_n(abs_e, mpz_limbs_read(e), (mp_size_t)mpz_size(e));
+    }
+
+    if (mt->n < GMPY_MONT_POW_THRESHOLD) {
+        mpz_powm(r, x, e, mt->m);
+        return 0;
+    }
+
+    GMPy_Mont_Load(mt, ap, x, r);
+
+    GMPy_Mont_To(mt, ap, ap, tp);
+    if (GMPy_Mont_Pow(mt, rp, ap, e) < 0) {
+        /* LCOV_EXCL_START */
+        return -1;
+        /* LCOV_EXCL_STOP */
+    }
+    GMPy_Mont_From(mt, rp, rp, tp);
+    GMPy_Mont_Store(mt, r, rp);
+    return 0;
+}
+
+PyDoc_STRVAR(GMPy_doc_modring_method_pow,
+"R.pow(x, e, /) -> mpz\n\n"
+"Return (x ** e) mod R.modulus. A negative exponent is allowed if the\n"
+"inverse of x exists.");
+
+static PyObject *
+GMPy_ModRing_Method_Pow(PyObject *self, PyObject *const *args, Py_ssize_t nargs)
+{
+    GMPy_Mont *mt = &((ModRing_Object*)self)->mont;
+    MPZ_Object *result = NULL, *tempx = NULL, *tempe = NULL;
+    CTXT_Object *context = NULL;
+    mp_limb_t *buf;
+    int res;
+
+    if (nargs != 2) {
+        TYPE_ERROR("ModRing.pow() requires 2 arguments");
+        return NULL;
+    }
+
+    CHECK_CONTEXT(context);
+
+    if (!(tempx = GMPy_ModRing_Arg(args[0], "pow")) ||
+        !(tempe = GMPy_ModRing_Arg(args[1], "pow")) ||
+        !(result = GMPy_MPZ_New(NULL))) {
+        Py_XDECREF((PyObject*)tempx);
+        Py_XDECREF((PyObject*)tempe);
+        return NULL;
+    }
+
+    if (!(buf = PyMem_New(mp_limb_t, 4 * mt->n))) {
+        /* LCOV_EXCL_START */
+        res = -1;
+        /* LCOV_EXCL_STOP */
+    }
+    else {
+        GMPY_MAYBE_BEGIN_ALLOW_THREADS(context);
+        res = GMPy_ModRing_PowWork(mt, result->z, tempx->z, tempe->z, buf);
+        GMPY_MAYBE_END_ALLOW_THREADS(context);
+        PyMem_Free(buf);
+    }
+
+    Py_DECREF((PyObject*)tempx);
+    Py_DECREF((PyObject*)tempe);
+    if (res) {
+        if (res > 0) {
+            VALUE_ERROR("pow() base not invertible");
+        }
+        else {
+            /* LCOV_EXCL_START */
+            PyErr_NoMemory();
+            /* LCOV_EXCL_STOP */
+        }
+        Py_DECREF((PyObject*)result);
+        return NULL;
+    }
+    return (PyObject*)result;
+}
+
+PyDoc_STRVAR(GMPy_doc_modring_method_inv,
+"R.inv(x, /) -> mpz\n\n"
+"Return y such that x * y == 1 modulo R.modulus. Raises\n"
+"ZeroDivisionError if no inverse exists.");
+
+static PyObject *
+GMPy_ModRing_Method_Inv(PyObject *self, PyObject *other)
+{
+    MPZ_Object *result, *tempx;
+
+    if (!(tempx = GMPy_ModRing_Arg(other, "inv"))) {
+        return NULL;
+    }
+
+    if ((result = GMPy_MPZ_New(NULL))) {
+        if (!mpz_invert(result->z, tempx->z, ((ModRing_Object*)self)->mont.m)) {
+            ZERO_ERROR("ModRing.inv() no inverse exists");
+            Py_CLEAR(result);
+        }
+    }
+    Py_DECREF((PyObject*)tempx);
+    return (PyObject*)result;
+}
+
+/* Convert the second argument of mul_list() and pow_list(). Sets *scalar to
+ * a single value or *lst to a list with length items.
+ */
+
+static int
+GMPy_ModRing_ArgScalarOrList(PyObject *obj, Py_ssize_t length,
+                             MPZ_Object **scalar, PyObject **lst,
+                             const char *fname)
+{
+    *scalar = NULL;
+    *lst = NULL;
+
+    if (IS_TYPE_INTEGER(GMPy_ObjectType(obj))) {
+        return (*scalar = GMPy_ModRing_Arg(obj, fname)) ? 0 : -1;
+    }
+
+    if (!(*lst = GMPy_ModRing_ArgList(obj, fname))) {
+        return -1;
+    }
+    if (PyList_GET_SIZE(*lst) != length) {
+        PyErr_Format(PyExc_ValueError,
+                     "ModRing.%s() arguments must have the same length", fname);
+        Py_CLEAR(*lst);
+        return -1;
+    }
+    return 0;
+}
+
+PyDoc_STRVAR(GMPy_doc_modring_method_mul_list,
+"R.mul_list(xs, ys, /) -> list[mpz, ...]\n\n"
+"Return [R.mul(x, y) for x, y in zip(xs, ys)]. ys may also be a single\n"
+"integer that multiplies every element of xs. Always releases the GIL.");
+
+static PyObject *
+GMPy_ModRing_Method_MulList(PyObject *self, PyObject *const *args, Py_ssize_t nargs)
+{
+    GMPy_Mont *mt = &((ModRing_Object*)self)->mont;
+    PyObject *xs = NULL, *ys = NULL, *result = NULL;
+    MPZ_Object *scalar = NULL;
+    mp_limb_t *buf, *ap, *bp, *tp;
+    Py_ssize_t i, length;
+    mpz_t tmp;
+
+    if (nargs != 2) {
+        TYPE_ERROR("ModRing.mul_list() requires 2 arguments");
+        return NULL;
+    }
+
+    if (!(xs = GMPy_ModRing_ArgList(args[0], "mul_list"))) {
+        return NULL;
+    }
+    length = PyList_GET_SIZE(xs);
+    if (GMPy_ModRing_ArgScalarOrList(args[1], length, &scalar, &ys, "mul_list") < 0 ||
+        !(result = GMPy_ModRing_ResultList(length))) {
+        goto done;
+    }
+
+    if (!(buf = PyMem_New(mp_limb_t, 4 * mt->n))) {
+        /* LCOV_EXCL_START */
+        Py_CLEAR(result);
+        PyErr_NoMemory();
+        goto done;
+        /* LCOV_EXCL_STOP */
+    }
+    ap = buf;
+    bp = ap + mt->n;
+    tp = bp + mt->n;
+    mpz_init(tmp);
+
+    Py_BEGIN_ALLOW_THREADS;
+    if (scalar) {
+        /* Keep y * R in bp so each product needs a single REDC. */
+        GMPy_Mont_Load(mt, bp, scalar->z, tmp);
+        GMPy_Mont_To(mt, bp, bp, tp);
+    }
+    for (i = 0; i < length; i++) {
+        GMPy_Mont_Load(mt, ap, MPZ(PyList_GET_ITEM(xs, i)), tmp);
+        if (scalar) {
+            GMPy_Mont_Mul(mt, ap, ap, bp, tp);
+        }
+        else {
+            GMPy_Mont_Load(mt, bp, MPZ(PyList_GET_ITEM(ys, i)), tmp);
+            GMPy_Mont_Mul(mt, ap, ap, bp, tp);
+            GMPy_Mont_To(mt, ap, ap, tp);
+        }
+        GMPy_Mont_Store(mt, MPZ(PyList_GET_ITEM(result, i)), ap);
+    }
+    Py_END_ALLOW_THREADS;
+
+    mpz_clear(tmp);
+    PyMem_Free(buf);
+
+  done:
+    Py_XDECREF(xs);
+    Py_XDECREF(ys);
+    Py_XDECREF((PyObject*)scalar);
+    return result;
+}
+
+PyDoc_STRVAR(GMPy_doc_modring_method_pow_list,
+"R.pow_list(xs, e, /) -> list[mpz, ...]\n\n"
+"Return [R.pow(x, e) for x in xs]. e may also be a list of exponents with\n"
+"the same length as xs. Always releases the GIL.");
+
+static PyObject *
+GMPy_ModRing_Method_PowList(PyObject *self, PyObject *const *args, Py_ssize_t nargs)
+{
+    GMPy_Mont *mt = &((ModRing_Object*)self)->mont;
+    PyObject *xs = NULL, *es = NULL, *result = NULL;
+    MPZ_Object *scalar = NULL;
+    Py_ssize_t i, length, bad_index = -1;
+    mp_limb_t *buf;
+    int res = 0;
+
+    if (nargs != 2) {
+        TYPE_ERROR("ModRing.pow_list() requires 2 arguments");
+        return NULL;
+    }
+
+    if (!(xs = GMPy_ModRing_ArgList(args[0], "pow_list"))) {
+        return NULL;
+    }
+    length = PyList_GET_SIZE(xs);
+    if (GMPy_ModRing_ArgScalarOrList(args[1], length, &scalar, &es, "pow_list") < 0 ||
+        !(result = GMPy_ModRing_ResultList(length))) {
+        goto done;
+    }
+
+    if (!(buf = PyMem_New(mp_limb_t, 4 * mt->n))) {
+        /* LCOV_EXCL_START */
+        Py_CLEAR(result);
+        PyErr_NoMemory();
+        goto done;
+        /* LCOV_EXCL_STOP */
+    }
+
+    Py_BEGIN_ALLOW_THREADS;
+    for (i = 0; i < length; i++) {
+        res = GMPy_ModRing_PowWork(mt, MPZ(PyList_GET_ITEM(result, i)),
+                                   MPZ(PyList_GET_ITEM(xs, i)),
+                                   scalar ? scalar->z : MPZ(PyList_GET_ITEM(es, i)),
+                                   buf);
+        if (res) {
+            bad_index = i;
+            break;
+        }
+    }
+    Py_END_ALLOW_THREADS;
+
+    PyMem_Free(buf);
+
+    if (res) {
+        if (res > 0) {
+            PyErr_Format(PyExc_ValueError,
+                         "pow() base not invertible at index %zd", bad_index);
+        }
+        else {
+            /* LCOV_EXCL_START */
+            PyErr_NoMemory();
+            /* LCOV_EXCL_STOP */
+        }
+        Py_CLEAR(result);
+    }
+
+  done:
+    Py_XDECREF(xs);
+    Py_XDECREF(es);
+    Py_XDECREF((PyObject*)scalar);
+    return result;
+}
+
+PyDoc_STRVAR(GMPy_doc_modring_method_prod,
+"R.prod(xs, /) -> mpz\n\n"
+"Return the product of the integers in xs modulo R.modulus. Always\n"
+"releases the GIL.");
+
+static PyObject *
+GMPy_ModRing_Method_Prod(PyObject *self, PyObject *other)
+{
+    GMPy_Mont *mt = &((ModRing_Object*)self)->mont;
+    MPZ_Object *result = NULL;
+    PyObject *xs;
+    mp_limb_t *buf, *ap, *bp, *tp;
+    Py_ssize_t i, length;
+    mpz_t tmp, one;
+
+    if (!(xs = GMPy_ModRing_ArgList(other, "prod"))) {
+        return NULL;
+    }
+    length = PyList_GET_SIZE(xs);
+
+    if (!(result = GMPy_MPZ_New(NULL))) {
+        /* LCOV_EXCL_START */
+        Py_DECREF(xs);
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+
+    if (length == 0) {
+        mpz_set_ui(result->z, 1);
+        Py_DECREF(xs);
+        return (PyObject*)result;
+    }
+
+    if (!(buf = PyMem_New(mp_limb_t, 4 * mt->n))) {
+        /* LCOV_EXCL_START */
+        Py_DECREF(xs);
+        Py_DECREF((PyObject*)result);
+        return PyErr_NoMemory();
+        /* LCOV_EXCL_STOP */
+    }
+    ap = buf;
+    bp = ap + mt->n;
+    tp = bp + mt->n;
+    mpz_init(tmp);
+
+    /* After k - 1 products the accumulator is prod(xs) / R^(k-1). A final
+     * product with R^k mod m removes the extra factors.
+     */
+    Py_BEGIN_ALLOW_THREADS;
+    GMPy_Mont_Load(mt, ap, MPZ(PyList_GET_ITEM(xs, 0)), tmp);
+    for (i = 1; i < length; i++) {
+        GMPy_Mont_Load(mt, bp, MPZ(PyList_GET_ITEM(xs, i)), tmp);
+        GMPy_Mont_Mul(mt, ap, ap, bp, tp);
+    }
+    mpz_powm_ui(tmp, mpz_roinit_n(one, mt->one, mt->n), (unsigned long)length, mt->m);
+    GMPy_Mont_Load(mt, bp, tmp, NULL);
+    GMPy_Mont_Mul(mt, ap, ap, bp, tp);
+    GMPy_Mont_Store(mt, result->z, ap);
+    Py_END_ALLOW_THREADS;
+
+    mpz_clear(tmp);
+    PyMem_Free(buf);
+    Py_DECREF(xs);
+    return (PyObject*)result;
+}
+
+static PyObject *
+GMPy_ModRing_Method_Reduce(PyObject *self, PyObject *other)
+{
+    PyObject *m;
+
+    if (!(m = GMPy_ModRing_GetModulus((ModRing_Object*)self, NULL))) {
+        /* LCOV_EXCL_START */
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+    return Py_BuildValue("(O(N))", (PyObject*)&ModRing_Type, m);
+}
+
+static PyGetSetDef GMPy_ModRing_getseters[] = {
+    { "modulus", (getter)GMPy_ModRing_GetModulus, NULL, "the modulus", NULL },
+    { NULL }
+};
+
+static PyMethodDef GMPy_ModRing_methods[] = {
+    { "__reduce__", GMPy_ModRing_Method_Reduce, METH_NOARGS, NULL },
+    { "add", (PyCFunction)GMPy_ModRing_Method_Add, METH_FASTCALL, GMPy_doc_modring_method_add },
+    { "inv", GMPy_ModRing_Method_Inv, METH_O, GMPy_doc_modring_method_inv },
+    { "mul", (PyCFunction)GMPy_ModRing_Method_Mul, METH_FASTCALL, GMPy_doc_modring_method_mul },
+    { "mul_list", (PyCFunction)GMPy_ModRing_Method_MulList, METH_FASTCALL, GMPy_doc_modring_method_mul_list },
+    { "pow", (PyCFunction)GMPy_ModRing_Method_Pow, METH_FASTCALL, GMPy_doc_modring_method_pow },
+    { "pow_list", (PyCFunction)GMPy_ModRing_Method_PowList, METH_FASTCALL, GMPy_doc_modring_method_pow_list },
+    { "prod", GMPy_ModRing_Method_Prod, METH_O, GMPy_doc_modring_method_prod },
+    { "sqr", GMPy_ModRing_Method_Sqr, METH_O, GMPy_doc_modring_method_sqr },
+    { "sub", (PyCFunction)GMPy_ModRing_Method_Sub, METH_FASTCALL, GMPy_doc_modring_method_sub },
+    { NULL }
+};
+
+static PyTypeObject ModRing_Type = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = "gmpy2.ModRing",
+    .tp_basicsize = sizeof(ModRing_Object),
+    .tp_dealloc = (destructor) GMPy_ModRing_Dealloc,
+    .tp_repr = (reprfunc) GMPy_ModRing_Repr,
+    .tp_flags = Py_TPFLAGS_DEFAULT,
+    .tp_doc = GMPy_doc_modring,
+    .tp_methods = GMPy_ModRing_methods,
+    .tp_getset = GMPy_ModRing_getseters,
+    .tp_new = GMPy_ModRing_NewInit,
+};
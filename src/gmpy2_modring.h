@@ -0,0 +1,89 @@
+/* * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * *
+ * gmpy2_modring.h                                                          *
+ * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * *
+ * Python interface to the GMP, MPFR, and MPC multiple precision           *
+ * libraries.                                                              *
+ *                                                                         *
+ * Copyright 2000 - 2009 Alex Martelli                                     *
+ *                                                                         *
+ * Copyright 2008 - 2024 Case Van Horsen                                   *
+ *                                                                         *
+ * This file is part of GMPY2.                                             *
+ *                                                                         *
+ * GMPY2 is free software: you can redistribute it and/or modify it under  *
+ * the terms of the GNU Lesser General Public License as published by the  *
+ * Free Software Foundation, either version 3 of the License, or (at your  *
+ * option) any later version.                                              *
+ *                                                                         *
+ * GMPY2 is distributed in the hope that it will be useful, but WITHOUT    *
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or   *
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public    *
+ * License for more details.                                               *
+ *                                                                         *
+ * You should have received a copy of the GNU Lesser General Public        *
+ * License along with GMPY2; if not, see <http://www.gnu.org/licenses/>    *
+ * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * */
+
+
+#ifndef GMPY_MODRING_H
+#define GMPY_MODRING_H
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+/* Precomputed values for Montgomery multiplication modulo a fixed odd
+ * modulus m of n limbs. Values in Montgomery form are stored as arrays of
+ * exactly n limbs (zero padded) and are always less than m. The GMPy_Mont
+ * functions do not use the Python API and may be called without the GIL.
+ */
+
+typedef struct {
+    mp_size_t n;            /* number of limbs in m          */
+    mp_limb_t minv;         /* -1/m mod B                    */
+    mp_limb_t *mp;          /* limbs of m                    */
+    mp_limb_t *r2;          /* R^2 mod m, R = B^n            */
+    mp_limb_t *one;         /* R mod m, 1 in Montgomery form */
+    mpz_t m;
+} GMPy_Mont;
+
+typedef struct {
+    PyObject_HEAD
+    GMPy_Mont mont;
+} ModRing_Object;
+
+static PyTypeObject ModRing_Type;
+#define ModRing_Check(v) (((PyObject*)v)->ob_type == &ModRing_Type)
+
+static int        GMPy_Mont_Init(GMPy_Mont *mt, mpz_srcptr m);
+static void       GMPy_Mont_Clear(GMPy_Mont *mt);
+static void       GMPy_Mont_Load(const GMPy_Mont *mt, mp_limb_t *rp, mpz_srcptr a, mpz_ptr tmp);
+static void       GMPy_Mont_Store(const GMPy_Mont *mt, mpz_ptr r, const mp_limb_t *ap);
+static void       GMPy_Mont_Redc(const GMPy_Mont *mt, mp_limb_t *rp, mp_limb_t *tp);
+static void       GMPy_Mont_Mul(const GMPy_Mont *mt, mp_limb_t *rp, const mp_limb_t *ap, const mp_limb_t *bp, mp_limb_t *tp);
+static void       GMPy_Mont_Sqr(const GMPy_Mont *mt, mp_limb_t *rp, const mp_limb_t *ap, mp_limb_t *tp);
+static void       GMPy_Mont_To(const GMPy_Mont *mt, mp_limb_t *rp, const mp_limb_t *ap, mp_limb_t *tp);
+static void       GMPy_Mont_From(const GMPy_Mont *mt, mp_limb_t *rp, const mp_limb_t *ap, mp_limb_t *tp);
+static int        GMPy_Mont_Window(mp_bitcnt_t bits);
+static int        GMPy_Mont_Pow(const GMPy_Mont *mt, mp_limb_t *rp, const mp_limb_t *ap, mpz_srcptr e);
+
+static PyObject * GMPy_ModRing_NewInit(PyTypeObject *type, PyObject *args, PyObject *keywds);
+static void       GMPy_ModRing_Dealloc(ModRing_Object *self);
+static PyObject * GMPy_ModRing_Repr(ModRing_Object *self);
+static PyObject * GMPy_ModRing_GetModulus(ModRing_Object *self, void *closure);
+
+static PyObject * GMPy_ModRing_Method_Add(PyObject *self, PyObject *const *args, Py_ssize_t nargs);
+static PyObject * GMPy_ModRing_Method_Sub(PyObject *self, PyObject *const *args, Py_ssize_t nargs);
+static PyObject * GMPy_ModRing_Method_Mul(PyObject *self, PyObject *const *args, Py_ssize_t nargs);
+static PyObject * GMPy_ModRing_Method_Sqr(PyObject *self, PyObject *other);
+static PyObject * GMPy_ModRing_Method_Pow(PyObject *self, PyObject *const *args, Py_ssize_t nargs);
+static PyObject * GMPy_ModRing_Method_Inv(PyObject *self, PyObject *other);
+static PyObject * GMPy_ModRing_Method_MulList(PyObject *self, PyObject *const *args, Py_ssize_t nargs);
+static PyObject * GMPy_ModRing_Method_PowList(PyObject *self, PyObject *const *args, Py_ssize_t nargs);
+static PyObject * GMPy_ModRing_Method_Prod(PyObject *self, PyObject *other);
+static PyObject * GMPy_ModRing_Method_Reduce(PyObject *self, PyObject *other);
+
+#ifdef __cplusplus
+}
+#endif
+#endif
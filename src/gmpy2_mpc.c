@@ -161,6 +161,7 @@ static PyMethodDef Pympc_methods[] =
 {
     { "__complex__", GMPy_PyComplex_From_MPC, METH_NOARGS, GMPy_doc_mpc_complex },
     { "__format__", GMPy_MPC_Format, METH_VARARGS, GMPy_doc_mpc_format },
+    { "__reduce_ex__", GMPy_MPANY_Method_Reduce_Ex, METH_O, GMPy_doc_method_reduce_ex },
     { "__sizeof__", GMPy_MPC_SizeOf_Method, METH_NOARGS, GMPy_doc_mpc_sizeof_method },
     { "conjugate", GMPy_MPC_Conjugate_Method, METH_NOARGS, GMPy_doc_mpc_conjugate_method },
     { "digits", GMPy_MPC_Digits_Method, METH_VARARGS, GMPy_doc_mpc_digits_method },
@@ -31,36 +31,63 @@
 
 static inline void
 _GMPy_MPFR_Cleanup(MPFR_Object **v, CTXT_Object *ctext)
+{
+    (*v)->rc = _GMPy_MPFR_Range((*v)->f, (*v)->rc, ctext);
+
+    /* GMPY_MPFR_EXCEPTIONS(V, CTX) */
+    if (_GMPy_MPFR_Merge_Flags(ctext) < 0) {
+        Py_XDECREF((PyObject*)(*v));
+        (*v) = NULL;
+    }
+}
+
+/* Check the exponent range of f and subnormalize f as required by the
+ * context. rc is the ternary value of the operation that computed f and the
+ * new ternary value is returned. Does not use the Python API.
+ */
+
+static inline int
+_GMPy_MPFR_Range(mpfr_ptr f, int rc, CTXT_Object *ctext)
 {
     /* GMPY_MPFR_CHECK_RANGE(V, CTX) */
-    if (mpfr_regular_p((*v)->f) &&
-        (!(((*v)->f->_mpfr_exp >= ctext->ctx.emin) &&
-           ((*v)->f->_mpfr_exp <= ctext->ctx.emax)))) {
+    if (mpfr_regular_p(f) &&
+        (!((f->_mpfr_exp >= ctext->ctx.emin) &&
+           (f->_mpfr_exp <= ctext->ctx.emax)))) {
         mpfr_exp_t _oldemin, _oldemax;
         _oldemin = mpfr_get_emin();
         _oldemax = mpfr_get_emax();
         mpfr_set_emin(ctext->ctx.emin);
         mpfr_set_emax(ctext->ctx.emax);
-        (*v)->rc = mpfr_check_range((*v)->f, (*v)->rc, GET_MPFR_ROUND(ctext));
+        rc = mpfr_check_range(f, rc, GET_MPFR_ROUND(ctext));
         mpfr_set_emin(_oldemin);
         mpfr_set_emax(_oldemax);
     }
 
     /* GMPY_MPFR_SUBNORMALIZE(V, CTX) */
     if (ctext->ctx.subnormalize &&
-        (*v)->f->_mpfr_exp >= ctext->ctx.emin &&
-        (*v)->f->_mpfr_exp <= ctext->ctx.emin + mpfr_get_prec((*v)->f) - 2) {
+        f->_mpfr_exp >= ctext->ctx.emin &&
+        f->_mpfr_exp <= ctext->ctx.emin + mpfr_get_prec(f) - 2) {
         mpfr_exp_t _oldemin, _oldemax;
         _oldemin = mpfr_get_emin();
         _oldemax = mpfr_get_emax();
         mpfr_set_emin(ctext->ctx.emin);
         mpfr_set_emax(ctext->ctx.emax);
-        (*v)->rc = mpfr_subnormalize((*v)->f, (*v)->rc, GET_MPFR_ROUND(ctext));
+        rc = mpfr_subnormalize(f, rc, GET_MPFR_ROUND(ctext));
         mpfr_set_emin(_oldemin);
         mpfr_set_emax(_oldemax);
     }
+    return rc;
+}
+
+/* Add the current MPFR flags to the context. Returns -1 and sets an
+ * exception if a flag is trapped by the context, otherwise returns 0.
+ */
+
+static int
+_GMPy_MPFR_Merge_Flags(CTXT_Object *ctext)
+{
+    int res = 0;
 
-    /* GMPY_MPFR_EXCEPTIONS(V, CTX) */
     ctext->ctx.underflow |= mpfr_underflow_p();
     ctext->ctx.overflow |= mpfr_overflow_p();
     ctext->ctx.invalid |= mpfr_nanflag_p();
@@ -69,30 +96,26 @@ _GMPy_MPFR_Cleanup(MPFR_Object **v, CTXT_Object *ctext)
     if (ctext->ctx.traps) {
         if ((ctext->ctx.traps & TRAP_UNDERFLOW) && mpfr_underflow_p()) {
             PyErr_SetString(GMPyExc_Underflow, "underflow");
-            Py_XDECREF((PyObject*)(*v));
-            (*v) = NULL;
+            res = -1;
         }
         if ((ctext->ctx.traps & TRAP_OVERFLOW) && mpfr_overflow_p()) {
             PyErr_SetString(GMPyExc_Overflow, "overflow");
-            Py_XDECREF((PyObject*)(*v));
-            (*v) = NULL;
+            res = -1;
         }
         if ((ctext->ctx.traps & TRAP_INEXACT) && mpfr_inexflag_p()) {
             PyErr_SetString(GMPyExc_Inexact, "inexact result");
-            Py_XDECREF((PyObject*)(*v));
-            (*v) = NULL;
+            res = -1;
         }
         if ((ctext->ctx.traps & TRAP_INVALID) && mpfr_nanflag_p()) {
             PyErr_SetString(GMPyExc_Invalid, "invalid operation");
-            Py_XDECREF((PyObject*)(*v));
-            (*v) = NULL;
+            res = -1;
         }
         if ((ctext->ctx.traps & TRAP_DIVZERO) && mpfr_divby0_p()) {
             PyErr_SetString(GMPyExc_DivZero, "division by zero");
-            Py_XDECREF((PyObject*)(*v));
-            (*v) = NULL;
+            res = -1;
         }
     }
+    return res;
 }
 
 PyDoc_STRVAR(GMPy_doc_mpfr,
@@ -155,6 +178,7 @@ static PyMethodDef Pympfr_methods [] =
     { "__ceil__", GMPy_MPFR_Method_Ceil, METH_NOARGS, GMPy_doc_mpfr_ceil_method },
     { "__floor__", GMPy_MPFR_Method_Floor, METH_NOARGS, GMPy_doc_mpfr_floor_method },
     { "__format__", GMPy_MPFR_Format, METH_VARARGS, GMPy_doc_mpfr_format },
+    { "__reduce_ex__", GMPy_MPANY_Method_Reduce_Ex, METH_O, GMPy_doc_method_reduce_ex },
     { "__round__", GMPy_MPFR_Method_Round10, METH_VARARGS, GMPy_doc_method_round10 },
     { "__sizeof__", GMPy_MPFR_SizeOf_Method, METH_NOARGS, GMPy_doc_mpfr_sizeof_method },
     { "__trunc__", GMPy_MPFR_Method_Trunc, METH_NOARGS, GMPy_doc_mpfr_trunc_method },
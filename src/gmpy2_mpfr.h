@@ -194,6 +194,8 @@ static PyTypeObject MPFR_Type;
     } \
 
 static void _GMPy_MPFR_Cleanup(MPFR_Object **v, CTXT_Object *ctext);
+static int _GMPy_MPFR_Range(mpfr_ptr f, int rc, CTXT_Object *ctext);
+static int _GMPy_MPFR_Merge_Flags(CTXT_Object *ctext);
 
 #ifdef __cplusplus
 }
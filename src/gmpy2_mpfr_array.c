@@ -0,0 +1,1009 @@
+/* * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * *
+ * gmpy2_mpfr_array.c                                                       *
+ * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * *
+ * Python interface to the GMP, MPFR, and MPC multiple precision           *
+ * libraries.                                                              *
+ *                                                                         *
+ * Copyright 2000 - 2009 Alex Martelli                                     *
+ *                                                                         *
+ * Copyright 2008 - 2024 Case Van Horsen                                   *
+ *                                                                         *
+ * This file is part of GMPY2.                                             *
+ *                                                                         *
+ * GMPY2 is free software: you can redistribute it and/or modify it under  *
+ * the terms of the GNU Lesser General Public License as published by the  *
+ * Free Software Foundation, either version 3 of the License, or (at your  *
+ * option) any later version.                                              *
+ *                                                                         *
+ * GMPY2 is distributed in the hope that it will be useful, but WITHOUT    *
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or   *
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public    *
+ * License for more details.                                               *
+ *                                                                         *
+ * You should have received a copy of the GNU Lesser General Public        *
+ * License along with GMPY2; if not, see <http://www.gnu.org/licenses/>    *
+ * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * */
+
+/* This file implements the mpfr_array type. An mpfr_array is a fixed-length
+ * mutable sequence of floating-point numbers that all have the same
+ * precision. The significands are stored in a single block of limbs using
+ * the MPFR custom interface, so an element needs neither a Python object nor
+ * a separate allocation. Elementwise operations call MPFR directly on the
+ * elements and always release the GIL.
+ *
+ * The MPFR flags raised by an operation on the whole array are added to the
+ * context once, after the loop. If one of those flags is trapped, the
+ * exception is raised and no result is returned.
+ */
+
+/* Number of limbs used for the significand of each element. */
+
+#define MPFR_ARRAY_LIMBS(prec) \
+    ((mpfr_custom_get_size(prec) + sizeof(mp_limb_t) - 1) / sizeof(mp_limb_t))
+
+/* Create a new mpfr_array with all the elements set to 0. */
+
+static MPFR_Array_Object *
+GMPy_MPFR_Array_New(Py_ssize_t length, mpfr_prec_t prec)
+{
+    MPFR_Array_Object *result;
+    size_t nlimbs, i;
+
+    /* A precision of 1 is not supported since GMPy_MPFR_New() uses it to
+     * select an exact conversion.
+     */
+    if (prec < 2 || prec > MPFR_PREC_MAX) {
+        VALUE_ERROR("invalid value for precision");
+        return NULL;
+    }
+
+    nlimbs = MPFR_ARRAY_LIMBS(prec);
+    if ((size_t)length > PY_SSIZE_T_MAX / (nlimbs * sizeof(mp_limb_t) + sizeof(__mpfr_struct))) {
+        PyErr_NoMemory();
+        return NULL;
+    }
+
+    if (!(result = PyObject_New(MPFR_Array_Object, &MPFR_Array_Type))) {
+        /* LCOV_EXCL_START */
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+
+    result->length = length;
+    result->prec = prec;
+    result->values = PyMem_RawMalloc((length ? length : 1) * sizeof(__mpfr_struct));
+    result->limbs = PyMem_RawMalloc((length ? length * nlimbs : 1) * sizeof(mp_limb_t));
+    if (!result->values || !result->limbs) {
+        /* LCOV_EXCL_START */
+        Py_DECREF((PyObject*)result);
+        return (MPFR_Array_Object*)PyErr_NoMemory();
+        /* LCOV_EXCL_STOP */
+    }
+
+    for (i = 0; i < (size_t)length; i++) {
+        mp_limb_t *limbs = result->limbs + i * nlimbs;
+
+        mpfr_custom_init(limbs, prec);
+        mpfr_custom_init_set(MPFR_ARRAY_GET(result, i), MPFR_ZERO_KIND, 0, prec, limbs);
+    }
+    return result;
+}
+
+/* Set dst to the value of obj rounded to the precision of dst. The value is
+ * only rounded once. Returns -1 with an exception set if obj is not a real
+ * number or a string, otherwise stores the ternary value in rc. Must be
+ * called with the GIL.
+ */
+
+static int
+mpfr_array_set_object(mpfr_ptr dst, PyObject *obj, int *rc, CTXT_Object *context)
+{
+    MPFR_Object *temp;
+    int xtype = GMPy_ObjectType(obj);
+
+    if (IS_TYPE_MPFR(xtype)) {
+        *rc = mpfr_set(dst, MPFR(obj), GET_MPFR_ROUND(context));
+        return 0;
+    }
+
+    if (IS_TYPE_PyFloat(xtype)) {
+        *rc = mpfr_set_d(dst, PyFloat_AS_DOUBLE(obj), GET_MPFR_ROUND(context));
+        return 0;
+    }
+
+    if (IS_TYPE_REAL(xtype)) {
+        temp = GMPy_MPFR_From_RealWithType(obj, xtype, mpfr_get_prec(dst), context);
+    }
+    else if (PyUnicode_Check(obj)) {
+        temp = GMPy_MPFR_From_PyStr(obj, 10, mpfr_get_prec(dst), context);
+    }
+    else {
+        TYPE_ERROR("mpfr_array items must be real numbers or strings");
+        return -1;
+    }
+
+    if (!temp) {
+        return -1;
+    }
+    mpfr_set(dst, temp->f, MPFR_RNDN);
+    *rc = temp->rc;
+    Py_DECREF((PyObject*)temp);
+    return 0;
+}
+
+/* Accept a C-contiguous one-dimensional buffer of native doubles, like a
+ * NumPy float64 array or array.array('d'). Returns 1 and fills view if obj is
+ * such a buffer, otherwise returns 0.
+ */
+
+static int
+mpfr_array_get_double_buffer(PyObject *obj, Py_buffer *view)
+{
+    const char *fmt;
+
+    if (!PyObject_CheckBuffer(obj)) {
+        return 0;
+    }
+    if (PyObject_GetBuffer(obj, view, PyBUF_FORMAT | PyBUF_C_CONTIGUOUS) < 0) {
+        PyErr_Clear();
+        return 0;
+    }
+
+    fmt = view->format ? view->format : "B";
+    if (*fmt == '@' || *fmt == '=' ||
+#if PY_LITTLE_ENDIAN
+        *fmt == '<'
+#else
+        *fmt == '>' || *fmt == '!'
+#endif
+        ) {
+        fmt++;
+    }
+    if (view->ndim == 1 && view->itemsize == sizeof(double) && !strcmp(fmt, "d")) {
+        return 1;
+    }
+    PyBuffer_Release(view);
+    return 0;
+}
+
+/* Create a new mpfr_array from an mpfr_array, a buffer of doubles, or an
+ * iterable of real numbers and strings. If prec is 0, the precision of the
+ * context is used, except when obj is an mpfr_array whose precision is kept.
+ */
+
+static MPFR_Array_Object *
+GMPy_MPFR_Array_From_Object(PyObject *obj, mpfr_prec_t prec, CTXT_Object *context)
+{
+    MPFR_Array_Object *result;
+    mpfr_flags_t flags = 0;
+    Py_ssize_t i, length;
+    Py_buffer view;
+    int rc;
+
+    if (MPFR_Array_Check(obj)) {
+        MPFR_Array_Object *src = (MPFR_Array_Object*)obj;
+
+        if (!(result = GMPy_MPFR_Array_New(src->length, prec ? prec : src->prec))) {
+            return NULL;
+        }
+
+        Py_BEGIN_ALLOW_THREADS;
+        mpfr_clear_flags();
+        for (i = 0; i < src->length; i++) {
+            rc = mpfr_set(MPFR_ARRAY_GET(result, i), MPFR_ARRAY_GET(src, i),
+                          GET_MPFR_ROUND(context));
+            _GMPy_MPFR_Range(MPFR_ARRAY_GET(result, i), rc, context);
+        }
+        flags = mpfr_flags_save();
+        Py_END_ALLOW_THREADS;
+    }
+    else if (mpfr_array_get_double_buffer(obj, &view)) {
+        const double *data = (const double*)view.buf;
+
+        if (!(result = GMPy_MPFR_Array_New(view.shape[0], prec ? prec : GET_MPFR_PREC(context)))) {
+            PyBuffer_Release(&view);
+            return NULL;
+        }
+
+        Py_BEGIN_ALLOW_THREADS;
+        mpfr_clear_flags();
+        for (i = 0; i < result->length; i++) {
+            rc = mpfr_set_d(MPFR_ARRAY_GET(result, i), data[i], GET_MPFR_ROUND(context));
+            _GMPy_MPFR_Range(MPFR_ARRAY_GET(result, i), rc, context);
+        }
+        flags = mpfr_flags_save();
+        Py_END_ALLOW_THREADS;
+
+        PyBuffer_Release(&view);
+    }
+    else {
+        PyObject *seq;
+
+        if (!(seq = PySequence_Fast(obj, "mpfr_array() argument must be an iterable"))) {
+            return NULL;
+        }
+
+        length = PySequence_Fast_GET_SIZE(seq);
+        if (!(result = GMPy_MPFR_Array_New(length, prec ? prec : GET_MPFR_PREC(context)))) {
+            Py_DECREF(seq);
+            return NULL;
+        }
+
+        /* The conversion functions may clear the MPFR flags so the flags
+         * of each element are collected separately.
+         */
+        for (i = 0; i < length; i++) {
+            mpfr_clear_flags();
+            if (mpfr_array_set_object(MPFR_ARRAY_GET(result, i),
+                                      PySequence_Fast_GET_ITEM(seq, i),
+                                      &rc, context) < 0) {
+                Py_DECREF(seq);
+                Py_DECREF((PyObject*)result);
+                return NULL;
+            }
+            _GMPy_MPFR_Range(MPFR_ARRAY_GET(result, i), rc, context);
+            flags |= mpfr_flags_save();
+        }
+        Py_DECREF(seq);
+    }
+
+    mpfr_flags_restore(flags, MPFR_FLAGS_ALL);
+    if (_GMPy_MPFR_Merge_Flags(context) < 0) {
+        Py_DECREF((PyObject*)result);
+        return NULL;
+    }
+    return result;
+}
+
+PyDoc_STRVAR(GMPy_doc_mpfr_array,
+"mpfr_array(iterable=(), /, precision=0)\n"
+"mpfr_array(n, /, precision=0)\n\n"
+"Return a fixed-length array of floating-point numbers that all have the\n"
+"same precision. The significands are stored in a single contiguous block\n"
+"of memory. The values may be real numbers or strings. If an integer n is\n"
+"given, the array contains n zeros. A buffer of float64 values, like a\n"
+"NumPy float64 array, is converted directly. If precision is 0, the\n"
+"precision of the current context is used, or the precision of the\n"
+"argument if it is an mpfr_array.\n\n"
+"The arithmetic operators +, -, *, and / are applied elementwise to two\n"
+"mpfr_array of the same length, or to an mpfr_array and a real number,\n"
+"using the rounding mode and exponent range of the current context. The\n"
+"result has the largest precision of the mpfr_array operands. The loops\n"
+"run in C and always release the GIL.\n\n"
+"An mpfr_array exports a read-only buffer of float64 values, so\n"
+"memoryview(x) and numpy.asarray(x) return a float64 copy. The copy is\n"
+"a snapshot taken when the buffer is requested; later changes to x are\n"
+"not visible through it.");
+
+static PyObject *
+GMPy_MPFR_Array_NewInit(PyTypeObject *type, PyObject *args, PyObject *keywds)
+{
+    static char *kwlist[] = {"", "precision", NULL};
+    PyObject *arg = NULL;
+    long prec = 0;
+    Py_ssize_t length;
+    CTXT_Object *context = NULL;
+
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "|Ol:mpfr_array", kwlist,
+                                     &arg, &prec)) {
+        return NULL;
+    }
+
+    if (prec < 0 || prec > MPFR_PREC_MAX) {
+        VALUE_ERROR("invalid value for precision");
+        return NULL;
+    }
+
+    CHECK_CONTEXT(context);
+
+    if (!arg) {
+        return (PyObject*)GMPy_MPFR_Array_New(0, prec ? prec : GET_MPFR_PREC(context));
+    }
+
+    if (IS_TYPE_INTEGER(GMPy_ObjectType(arg))) {
+        length = PyNumber_AsSsize_t(arg, PyExc_OverflowError);
+        if (length == -1 && PyErr_Occurred()) {
+            return NULL;
+        }
+        if (length < 0) {
+            VALUE_ERROR("mpfr_array() length must be >= 0");
+            return NULL;
+        }
+        return (PyObject*)GMPy_MPFR_Array_New(length, prec ? prec : GET_MPFR_PREC(context));
+    }
+
+    return (PyObject*)GMPy_MPFR_Array_From_Object(arg, (mpfr_prec_t)prec, context);
+}
+
+static void
+GMPy_MPFR_Array_Dealloc(MPFR_Array_Object *self)
+{
+    PyMem_RawFree(self->values);
+    PyMem_RawFree(self->limbs);
+    PyObject_Free(self);
+}
+
+static PyObject *
+GMPy_MPFR_Array_Repr(MPFR_Array_Object *self)
+{
+    PyObject *parts, *temp, *result = NULL;
+    Py_ssize_t i;
+
+    if (!(parts = PyList_New(self->length))) {
+        /* LCOV_EXCL_START */
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+
+    for (i = 0; i < self->length; i++) {
+        PyObject *elem;
+
+        if (!(elem = GMPy_MPFR_Array_Item(self, i))) {
+            /* LCOV_EXCL_START */
+            Py_DECREF(parts);
+            return NULL;
+            /* LCOV_EXCL_STOP */
+        }
+        temp = GMPy_MPFR_Str_Slot((MPFR_Object*)elem);
+        Py_DECREF(elem);
+        if (!temp) {
+            /* LCOV_EXCL_START */
+            Py_DECREF(parts);
+            return NULL;
+            /* LCOV_EXCL_STOP */
+        }
+        PyList_SET_ITEM(parts, i, temp);
+    }
+
+    if ((temp = PyObject_Repr(parts))) {
+        result = PyUnicode_FromFormat("mpfr_array(%U, %ld)", temp, (long)self->prec);
+        Py_DECREF(temp);
+    }
+    Py_DECREF(parts);
+    return result;
+}
+
+static Py_ssize_t
+GMPy_MPFR_Array_Length(MPFR_Array_Object *self)
+{
+    return self->length;
+}
+
+static PyObject *
+GMPy_MPFR_Array_Item(MPFR_Array_Object *self, Py_ssize_t i)
+{
+    MPFR_Object *result;
+
+    if (i < 0 || i >= self->length) {
+        INDEX_ERROR("mpfr_array index out of range");
+        return NULL;
+    }
+
+    if ((result = GMPy_MPFR_New(self->prec, NULL))) {
+        Py_BEGIN_CRITICAL_SECTION(self);
+        mpfr_set(result->f, MPFR_ARRAY_GET(self, i), MPFR_RNDN);
+        Py_END_CRITICAL_SECTION();
+    }
+    return (PyObject*)result;
+}
+
+static int
+GMPy_MPFR_Array_Ass_Item(MPFR_Array_Object *self, Py_ssize_t i, PyObject *value)
+{
+    CTXT_Object *context = NULL;
+    mpfr_t temp;
+    int rc;
+
+    if (!value) {
+        TYPE_ERROR("mpfr_array does not support item deletion");
+        return -1;
+    }
+
+    if (i < 0 || i >= self->length) {
+        INDEX_ERROR("mpfr_array assignment index out of range");
+        return -1;
+    }
+
+    CHECK_CONTEXT_M1(context);
+
+    /* Convert into a temporary so the array is not changed if a trap is
+     * raised.
+     */
+    mpfr_init2(temp, self->prec);
+    mpfr_clear_flags();
+    if (mpfr_array_set_object(temp, value, &rc, context) < 0) {
+        mpfr_clear(temp);
+        return -1;
+    }
+    _GMPy_MPFR_Range(temp, rc, context);
+    if (_GMPy_MPFR_Merge_Flags(context) < 0) {
+        mpfr_clear(temp);
+        return -1;
+    }
+    Py_BEGIN_CRITICAL_SECTION(self);
+    mpfr_set(MPFR_ARRAY_GET(self, i), temp, MPFR_RNDN);
+    Py_END_CRITICAL_SECTION();
+    mpfr_clear(temp);
+    return 0;
+}
+
+static PyObject *
+GMPy_MPFR_Array_SubScript(MPFR_Array_Object *self, PyObject *item)
+{
+    if (PyIndex_Check(item)) {
+        Py_ssize_t i;
+
+        i = PyNumber_AsSsize_t(item, PyExc_IndexError);
+        if (i == -1 && PyErr_Occurred()) {
+            return NULL;
+        }
+        if (i < 0) {
+            i += self->length;
+        }
+        return GMPy_MPFR_Array_Item(self, i);
+    }
+    else if (PySlice_Check(item)) {
+        MPFR_Array_Object *result;
+        Py_ssize_t start, stop, step, slicelength, cur, i;
+
+        if (PySlice_GetIndicesEx(item, self->length,
+                                 &start, &stop, &step, &slicelength) < 0) {
+            return NULL;
+        }
+
+        if (!(result = GMPy_MPFR_Array_New(slicelength, self->prec))) {
+            /* LCOV_EXCL_START */
+            return NULL;
+            /* LCOV_EXCL_STOP */
+        }
+        Py_BEGIN_CRITICAL_SECTION(self);
+        for (cur = start, i = 0; i < slicelength; cur += step, i++) {
+            mpfr_set(MPFR_ARRAY_GET(result, i), MPFR_ARRAY_GET(self, cur), MPFR_RNDN);
+        }
+        Py_END_CRITICAL_SECTION();
+        return (PyObject*)result;
+    }
+    else {
+        TYPE_ERROR("mpfr_array indices must be integers or slices");
+        return NULL;
+    }
+}
+
+static int
+GMPy_MPFR_Array_Ass_SubScript(MPFR_Array_Object *self, PyObject *item, PyObject *value)
+{
+    if (PyIndex_Check(item)) {
+        Py_ssize_t i;
+
+        i = PyNumber_AsSsize_t(item, PyExc_IndexError);
+        if (i == -1 && PyErr_Occurred()) {
+            return -1;
+        }
+        if (i < 0) {
+            i += self->length;
+        }
+        return GMPy_MPFR_Array_Ass_Item(self, i, value);
+    }
+    else if (PySlice_Check(item)) {
+        MPFR_Array_Object *temp;
+        Py_ssize_t start, stop, step, slicelength, cur, i;
+        CTXT_Object *context = NULL;
+
+        if (!value) {
+            TYPE_ERROR("mpfr_array does not support item deletion");
+            return -1;
+        }
+
+        if (PySlice_GetIndicesEx(item, self->length,
+                                 &start, &stop, &step, &slicelength) < 0) {
+            return -1;
+        }
+
+        CHECK_CONTEXT_M1(context);
+
+        /* The values are converted to the precision of the array first. */
+        if (!(temp = GMPy_MPFR_Array_From_Object(value, self->prec, context))) {
+            return -1;
+        }
+        if (temp->length != slicelength) {
+            PyErr_Format(PyExc_ValueError,
+                         "attempt to assign sequence of size %zd to slice of size %zd",
+                         temp->length, slicelength);
+            Py_DECREF((PyObject*)temp);
+            return -1;
+        }
+        /* Hold the lock so concurrent readers see all or none of the slice. */
+        Py_BEGIN_CRITICAL_SECTION(self);
+        for (cur = start, i = 0; i < slicelength; cur += step, i++) {
+            mpfr_set(MPFR_ARRAY_GET(self, cur), MPFR_ARRAY_GET(temp, i), MPFR_RNDN);
+        }
+        Py_END_CRITICAL_SECTION();
+        Py_DECREF((PyObject*)temp);
+        return 0;
+    }
+    else {
+        TYPE_ERROR("mpfr_array indices must be integers or slices");
+        return -1;
+    }
+}
+
+/* An operand of an elementwise operation is either an mpfr_array or a single
+ * real number that is used for every element.
+ */
+
+typedef struct {
+    MPFR_Array_Object *array;
+    MPFR_Object *scalar;
+} MPFR_Array_Operand;
+
+/* Returns 1 if obj is a valid operand, 0 if the type is not supported, and
+ * -1 if an error occurred.
+ */
+
+static int
+mpfr_array_operand_init(MPFR_Array_Operand *op, PyObject *obj, CTXT_Object *context)
+{
+    int xtype;
+
+    op->array = NULL;
+    op->scalar = NULL;
+
+    if (MPFR_Array_Check(obj)) {
+        op->array = (MPFR_Array_Object*)obj;
+        return 1;
+    }
+
+    xtype = GMPy_ObjectType(obj);
+    if (IS_TYPE_REAL(xtype)) {
+        if (!(op->scalar = GMPy_MPFR_From_RealWithType(obj, xtype, 1, context))) {
+            return -1;
+        }
+        return 1;
+    }
+    return 0;
+}
+
+static void
+mpfr_array_operand_clear(MPFR_Array_Operand *op)
+{
+    Py_XDECREF((PyObject*)op->scalar);
+    op->scalar = NULL;
+    op->array = NULL;
+}
+
+static mpfr_srcptr
+mpfr_array_operand_get(const MPFR_Array_Operand *op, Py_ssize_t i)
+{
+    if (op->array) {
+        return MPFR_ARRAY_GET(op->array, i);
+    }
+    return op->scalar->f;
+}
+
+#define MPFR_ARRAY_OP_ADD     0
+#define MPFR_ARRAY_OP_SUB     1
+#define MPFR_ARRAY_OP_MUL     2
+#define MPFR_ARRAY_OP_DIV     3
+
+/* Apply an elementwise operation. Returns Py_NotImplemented if either of
+ * the operands is not an mpfr_array or a real number.
+ */
+
+static PyObject *
+GMPy_MPFR_Array_Apply(int op, PyObject *x, PyObject *y)
+{
+    MPFR_Array_Operand ops[2] = {{NULL, NULL}, {NULL, NULL}};
+    MPFR_Array_Object *result = NULL;
+    Py_ssize_t i, length = -1;
+    mpfr_prec_t prec = 0;
+    mpfr_flags_t flags;
+    int k, res, rc;
+    CTXT_Object *context = NULL;
+
+    CHECK_CONTEXT(context);
+
+    for (k = 0; k < 2; k++) {
+        res = mpfr_array_operand_init(&ops[k], k ? y : x, context);
+        if (res <= 0) {
+            if (res == 0) {
+                Py_INCREF(Py_NotImplemented);
+                result = (MPFR_Array_Object*)Py_NotImplemented;
+            }
+            goto cleanup;
+        }
+        if (ops[k].array) {
+            if (length >= 0 && length != ops[k].array->length) {
+                VALUE_ERROR("mpfr_array operands must have the same length");
+                goto cleanup;
+            }
+            length = ops[k].array->length;
+            if (ops[k].array->prec > prec) {
+                prec = ops[k].array->prec;
+            }
+        }
+    }
+
+    if (!(result = GMPy_MPFR_Array_New(length, prec))) {
+        /* LCOV_EXCL_START */
+        goto cleanup;
+        /* LCOV_EXCL_STOP */
+    }
+
+    Py_BEGIN_ALLOW_THREADS;
+    mpfr_clear_flags();
+    for (i = 0; i < length; i++) {
+        mpfr_ptr r = MPFR_ARRAY_GET(result, i);
+        mpfr_srcptr a = mpfr_array_operand_get(&ops[0], i);
+        mpfr_srcptr b = mpfr_array_operand_get(&ops[1], i);
+
+        switch (op) {
+        case MPFR_ARRAY_OP_ADD:
+            rc = mpfr_add(r, a, b, GET_MPFR_ROUND(context));
+            break;
+        case MPFR_ARRAY_OP_SUB:
+            rc = mpfr_sub(r, a, b, GET_MPFR_ROUND(context));
+            break;
+        case MPFR_ARRAY_OP_MUL:
+            rc = mpfr_mul(r, a, b, GET_MPFR_ROUND(context));
+            break;
+        default:
+            rc = mpfr_div(r, a, b, GET_MPFR_ROUND(context));
+            break;
+        }
+        _GMPy_MPFR_Range(r, rc, context);
+    }
+    flags = mpfr_flags_save();
+    Py_END_ALLOW_THREADS;
+
+    mpfr_flags_restore(flags, MPFR_FLAGS_ALL);
+    if (_GMPy_MPFR_Merge_Flags(context) < 0) {
+        Py_CLEAR(result);
+    }
+
+  cleanup:
+    mpfr_array_operand_clear(&ops[0]);
+    mpfr_array_operand_clear(&ops[1]);
+    return (PyObject*)result;
+}
+
+static PyObject *
+GMPy_MPFR_Array_Add_Slot(PyObject *x, PyObject *y)
+{
+    return GMPy_MPFR_Array_Apply(MPFR_ARRAY_OP_ADD, x, y);
+}
+
+static PyObject *
+GMPy_MPFR_Array_Sub_Slot(PyObject *x, PyObject *y)
+{
+    return GMPy_MPFR_Array_Apply(MPFR_ARRAY_OP_SUB, x, y);
+}
+
+static PyObject *
+GMPy_MPFR_Array_Mul_Slot(PyObject *x, PyObject *y)
+{
+    return GMPy_MPFR_Array_Apply(MPFR_ARRAY_OP_MUL, x, y);
+}
+
+static PyObject *
+GMPy_MPFR_Array_TrueDiv_Slot(PyObject *x, PyObject *y)
+{
+    return GMPy_MPFR_Array_Apply(MPFR_ARRAY_OP_DIV, x, y);
+}
+
+static PyObject *
+GMPy_MPFR_Array_Neg_Slot(PyObject *x)
+{
+    MPFR_Array_Object *self = (MPFR_Array_Object*)x, *result;
+    Py_ssize_t i;
+
+    if ((result = GMPy_MPFR_Array_New(self->length, self->prec))) {
+        for (i = 0; i < self->length; i++) {
+            mpfr_neg(MPFR_ARRAY_GET(result, i), MPFR_ARRAY_GET(self, i), MPFR_RNDN);
+        }
+    }
+    return (PyObject*)result;
+}
+
+/* Build a table of pointers to the elements for mpfr_sum() and mpfr_dot().
+ * The cast to unsigned long is checked by the callers.
+ */
+
+static mpfr_ptr *
+mpfr_array_pointers(MPFR_Array_Object *self)
+{
+    mpfr_ptr *tab;
+    Py_ssize_t i;
+
+    if (!(tab = PyMem_New(mpfr_ptr, self->length ? self->length : 1))) {
+        /* LCOV_EXCL_START */
+        return (mpfr_ptr*)PyErr_NoMemory();
+        /* LCOV_EXCL_STOP */
+    }
+    for (i = 0; i < self->length; i++) {
+        tab[i] = MPFR_ARRAY_GET(self, i);
+    }
+    return tab;
+}
+
+PyDoc_STRVAR(GMPy_doc_mpfr_array_method_sum,
+"x.sum() -> mpfr\n\n"
+"Return the correctly rounded sum of the elements of x, computed with\n"
+"mpfr_sum() using the precision and rounding mode of the current context.");
+
+static PyObject *
+GMPy_MPFR_Array_Method_Sum(PyObject *self, PyObject *other)
+{
+    MPFR_Array_Object *arr = (MPFR_Array_Object*)self;
+    MPFR_Object *result;
+    mpfr_ptr *tab;
+    CTXT_Object *context = NULL;
+
+    CHECK_CONTEXT(context);
+
+    if ((unsigned long long)arr->length > ULONG_MAX) {
+        /* LCOV_EXCL_START */
+        OVERFLOW_ERROR("temporary array is too large");
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+
+    if (!(tab = mpfr_array_pointers(arr))) {
+        /* LCOV_EXCL_START */
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+    if (!(result = GMPy_MPFR_New(0, context))) {
+        /* LCOV_EXCL_START */
+        PyMem_Free(tab);
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+
+    mpfr_clear_flags();
+    Py_BEGIN_ALLOW_THREADS;
+    result->rc = mpfr_sum(result->f, tab, (unsigned long)arr->length,
+                          GET_MPFR_ROUND(context));
+    Py_END_ALLOW_THREADS;
+    PyMem_Free(tab);
+
+    _GMPy_MPFR_Cleanup(&result, context);
+    return (PyObject*)result;
+}
+
+PyDoc_STRVAR(GMPy_doc_mpfr_array_method_dot,
+"x.dot(y, /) -> mpfr\n\n"
+"Return the correctly rounded sum of x[i]*y[i], computed with mpfr_dot()\n"
+"using the precision and rounding mode of the current context. y must be\n"
+"an mpfr_array with the same length as x.");
+
+static PyObject *
+GMPy_MPFR_Array_Method_Dot(PyObject *self, PyObject *other)
+{
+    MPFR_Array_Object *x = (MPFR_Array_Object*)self, *y;
+    MPFR_Object *result;
+    mpfr_ptr *tabx, *taby;
+    CTXT_Object *context = NULL;
+
+    if (!MPFR_Array_Check(other)) {
+        TYPE_ERROR("dot() argument must be an mpfr_array");
+        return NULL;
+    }
+    y = (MPFR_Array_Object*)other;
+
+    if (x->length != y->length) {
+        VALUE_ERROR("mpfr_array operands must have the same length");
+        return NULL;
+    }
+
+    CHECK_CONTEXT(context);
+
+    if ((unsigned long long)x->length > ULONG_MAX) {
+        /* LCOV_EXCL_START */
+        OVERFLOW_ERROR("temporary array is too large");
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+
+    if (!(tabx = mpfr_array_pointers(x))) {
+        /* LCOV_EXCL_START */
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+    if (!(taby = mpfr_array_pointers(y))) {
+        /* LCOV_EXCL_START */
+        PyMem_Free(tabx);
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+    if (!(result = GMPy_MPFR_New(0, context))) {
+        /* LCOV_EXCL_START */
+        PyMem_Free(tabx);
+        PyMem_Free(taby);
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+
+    mpfr_clear_flags();
+    Py_BEGIN_ALLOW_THREADS;
+    result->rc = mpfr_dot(result->f, tabx, taby, (unsigned long)x->length,
+                          GET_MPFR_ROUND(context));
+    Py_END_ALLOW_THREADS;
+    PyMem_Free(tabx);
+    PyMem_Free(taby);
+
+    _GMPy_MPFR_Cleanup(&result, context);
+    return (PyObject*)result;
+}
+
+PyDoc_STRVAR(GMPy_doc_mpfr_array_method_tolist,
+"x.tolist() -> list[mpfr, ...]\n\n"
+"Return the elements of x as a list of mpfr.");
+
+static PyObject *
+GMPy_MPFR_Array_Method_ToList(PyObject *self, PyObject *other)
+{
+    MPFR_Array_Object *arr = (MPFR_Array_Object*)self;
+    PyObject *result, *temp;
+    Py_ssize_t i;
+
+    if (!(result = PyList_New(arr->length))) {
+        /* LCOV_EXCL_START */
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+    for (i = 0; i < arr->length; i++) {
+        if (!(temp = GMPy_MPFR_Array_Item(arr, i))) {
+            /* LCOV_EXCL_START */
+            Py_DECREF(result);
+            return NULL;
+            /* LCOV_EXCL_STOP */
+        }
+        PyList_SET_ITEM(result, i, temp);
+    }
+    return result;
+}
+
+PyDoc_STRVAR(GMPy_doc_mpfr_array_method_sizeof,
+"x.__sizeof__()\n\n"
+"Returns the amount of memory consumed by x.");
+
+static PyObject *
+GMPy_MPFR_Array_Method_SizeOf(PyObject *self, PyObject *other)
+{
+    MPFR_Array_Object *arr = (MPFR_Array_Object*)self;
+
+    return PyLong_FromSize_t(sizeof(MPFR_Array_Object) +
+                             arr->length * (sizeof(__mpfr_struct) +
+                                            MPFR_ARRAY_LIMBS(arr->prec) * sizeof(mp_limb_t)));
+}
+
+PyDoc_STRVAR(GMPy_doc_mpfr_array_get_precision,
+"precision of the elements of the array");
+
+static PyObject *
+GMPy_MPFR_Array_Get_Precision(MPFR_Array_Object *self, void *closure)
+{
+    return PyLong_FromLong((long)self->prec);
+}
+
+/* Each buffer export has its own copy of the values converted to float64.
+ * The copy is a snapshot that does not follow later changes to the array,
+ * so the buffer is always read-only. The copy is freed when the buffer is
+ * released.
+ */
+
+typedef struct {
+    Py_ssize_t shape;
+    Py_ssize_t stride;
+    double data[1];
+} MPFR_Array_Export;
+
+static int
+GMPy_MPFR_Array_GetBuffer(MPFR_Array_Object *self, Py_buffer *view, int flags)
+{
+    MPFR_Array_Export *export;
+    CTXT_Object *context = NULL;
+    Py_ssize_t i;
+
+    if (flags & PyBUF_WRITABLE) {
+        PyErr_SetString(PyExc_BufferError,
+                        "mpfr_array buffers are read-only copies of the values");
+        view->obj = NULL;
+        return -1;
+    }
+
+    CHECK_CONTEXT_M1(context);
+
+    if (!(export = PyMem_Malloc(sizeof(MPFR_Array_Export) +
+                                self->length * sizeof(double)))) {
+        /* LCOV_EXCL_START */
+        PyErr_NoMemory();
+        view->obj = NULL;
+        return -1;
+        /* LCOV_EXCL_STOP */
+    }
+
+    Py_BEGIN_CRITICAL_SECTION(self);
+    for (i = 0; i < self->length; i++) {
+        export->data[i] = mpfr_get_d(MPFR_ARRAY_GET(self, i), GET_MPFR_ROUND(context));
+    }
+    Py_END_CRITICAL_SECTION();
+    export->shape = self->length;
+    export->stride = sizeof(double);
+
+    view->buf = export->data;
+    view->obj = (PyObject*)self;
+    Py_INCREF(self);
+    view->len = self->length * sizeof(double);
+    view->readonly = 1;
+    view->itemsize = sizeof(double);
+    view->format = (flags & PyBUF_FORMAT) ? "d" : NULL;
+    view->ndim = 1;
+    view->shape = (flags & PyBUF_ND) ? &export->shape : NULL;
+    view->strides = ((flags & PyBUF_STRIDES) == PyBUF_STRIDES) ? &export->stride : NULL;
+    view->suboffsets = NULL;
+    view->internal = export;
+    return 0;
+}
+
+static void
+GMPy_MPFR_Array_ReleaseBuffer(MPFR_Array_Object *self, Py_buffer *view)
+{
+    PyMem_Free(view->internal);
+}
+
+static PyNumberMethods GMPy_MPFR_Array_number_methods = {
+    .nb_add = (binaryfunc) GMPy_MPFR_Array_Add_Slot,
+    .nb_subtract = (binaryfunc) GMPy_MPFR_Array_Sub_Slot,
+    .nb_multiply = (binaryfunc) GMPy_MPFR_Array_Mul_Slot,
+    .nb_negative = (unaryfunc) GMPy_MPFR_Array_Neg_Slot,
+    .nb_true_divide = (binaryfunc) GMPy_MPFR_Array_TrueDiv_Slot,
+};
+
+static PySequenceMethods GMPy_MPFR_Array_sequence_methods = {
+    .sq_length = (lenfunc) GMPy_MPFR_Array_Length,
+    .sq_item = (ssizeargfunc) GMPy_MPFR_Array_Item,
+    .sq_ass_item = (ssizeobjargproc) GMPy_MPFR_Array_Ass_Item,
+};
+
+static PyMappingMethods GMPy_MPFR_Array_mapping_methods = {
+    .mp_length = (lenfunc) GMPy_MPFR_Array_Length,
+    .mp_subscript = (binaryfunc) GMPy_MPFR_Array_SubScript,
+    .mp_ass_subscript = (objobjargproc) GMPy_MPFR_Array_Ass_SubScript,
+};
+
+static PyBufferProcs GMPy_MPFR_Array_buffer_procs = {
+    .bf_getbuffer = (getbufferproc) GMPy_MPFR_Array_GetBuffer,
+    .bf_releasebuffer = (releasebufferproc) GMPy_MPFR_Array_ReleaseBuffer,
+};
+
+static PyGetSetDef GMPy_MPFR_Array_getseters[] = {
+    { "precision", (getter)GMPy_MPFR_Array_Get_Precision, NULL, GMPy_doc_mpfr_array_get_precision, NULL },
+    { NULL }
+};
+
+static PyMethodDef GMPy_MPFR_Array_methods[] = {
+    { "__sizeof__", GMPy_MPFR_Array_Method_SizeOf, METH_NOARGS, GMPy_doc_mpfr_array_method_sizeof },
+    { "dot", GMPy_MPFR_Array_Method_Dot, METH_O, GMPy_doc_mpfr_array_method_dot },
+    { "sum", GMPy_MPFR_Array_Method_Sum, METH_NOARGS, GMPy_doc_mpfr_array_method_sum },
+    { "tolist", GMPy_MPFR_Array_Method_ToList, METH_NOARGS, GMPy_doc_mpfr_array_method_tolist },
+    { NULL }
+};
+
+static PyTypeObject MPFR_Array_Type = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = "gmpy2.mpfr_array",
+    .tp_basicsize = sizeof(MPFR_Array_Object),
+    .tp_dealloc = (destructor) GMPy_MPFR_Array_Dealloc,
+    .tp_repr = (reprfunc) GMPy_MPFR_Array_Repr,
+    .tp_as_number = &GMPy_MPFR_Array_number_methods,
+    .tp_as_sequence = &GMPy_MPFR_Array_sequence_methods,
+    .tp_as_mapping = &GMPy_MPFR_Array_mapping_methods,
+    .tp_as_buffer = &GMPy_MPFR_Array_buffer_procs,
+    .tp_hash = PyObject_HashNotImplemented,
+    .tp_flags = Py_TPFLAGS_DEFAULT,
+    .tp_doc = GMPy_doc_mpfr_array,
+    .tp_getset = GMPy_MPFR_Array_getseters,
+    .tp_methods = GMPy_MPFR_Array_methods,
+    .tp_new = GMPy_MPFR_Array_NewInit,
+};
@@ -0,0 +1,85 @@
+/* * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * *
+ * gmpy2_mpfr_array.h                                                       *
+ * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * *
+ * Python interface to the GMP, MPFR, and MPC multiple precision           *
+ * libraries.                                                              *
+ *                                                                         *
+ * Copyright 2000 - 2009 Alex Martelli                                     *
+ *                                                                         *
+ * Copyright 2008 - 2024 Case Van Horsen                                   *
+ *                                                                         *
+ * This file is part of GMPY2.                                             *
+ *                                                                         *
+ * GMPY2 is free software: you can redistribute it and/or modify it under  *
+ * the terms of the GNU Lesser General Public License as published by the  *
+ * Free Software Foundation, either version 3 of the License, or (at your  *
+ * option) any later version.                                              *
+ *                                                                         *
+ * GMPY2 is distributed in the hope that it will be useful, but WITHOUT    *
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or   *
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public    *
+ * License for more details.                                               *
+ *                                                                         *
+ * You should have received a copy of the GNU Lesser General Public        *
+ * License along with GMPY2; if not, see <http://www.gnu.org/licenses/>    *
+ * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * */
+
+#ifndef GMPY_MPFR_ARRAY_H
+#define GMPY_MPFR_ARRAY_H
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+/* An mpfr_array stores N floating-point numbers with a common precision. The
+ * significands of all the elements are stored back-to-back in one block of
+ * limbs and values[i] is an mpfr_t that was initialized with the custom
+ * interface to use the significand of element i. The elements can be passed
+ * directly to MPFR functions but must never be cleared or resized.
+ */
+
+typedef struct {
+    PyObject_HEAD
+    Py_ssize_t length;          /* number of elements               */
+    mpfr_prec_t prec;           /* precision of every element       */
+    __mpfr_struct *values;      /* length mpfr_t                    */
+    mp_limb_t *limbs;           /* shared significand storage       */
+} MPFR_Array_Object;
+
+static PyTypeObject MPFR_Array_Type;
+#define MPFR_Array_Check(v) (((PyObject*)v)->ob_type == &MPFR_Array_Type)
+
+/* Return an mpfr_ptr to element i of an mpfr_array. */
+
+#define MPFR_ARRAY_GET(a, i) ((a)->values + (i))
+
+static MPFR_Array_Object * GMPy_MPFR_Array_New(Py_ssize_t length, mpfr_prec_t prec);
+static MPFR_Array_Object * GMPy_MPFR_Array_From_Object(PyObject *obj, mpfr_prec_t prec, CTXT_Object *context);
+static PyObject *          GMPy_MPFR_Array_NewInit(PyTypeObject *type, PyObject *args, PyObject *keywds);
+static void                GMPy_MPFR_Array_Dealloc(MPFR_Array_Object *self);
+static PyObject *          GMPy_MPFR_Array_Repr(MPFR_Array_Object *self);
+static Py_ssize_t          GMPy_MPFR_Array_Length(MPFR_Array_Object *self);
+static PyObject *          GMPy_MPFR_Array_Item(MPFR_Array_Object *self, Py_ssize_t i);
+static int                 GMPy_MPFR_Array_Ass_Item(MPFR_Array_Object *self, Py_ssize_t i, PyObject *value);
+static PyObject *          GMPy_MPFR_Array_SubScript(MPFR_Array_Object *self, PyObject *item);
+static int                 GMPy_MPFR_Array_Ass_SubScript(MPFR_Array_Object *self, PyObject *item, PyObject *value);
+
+static PyObject *          GMPy_MPFR_Array_Add_Slot(PyObject *x, PyObject *y);
+static PyObject *          GMPy_MPFR_Array_Sub_Slot(PyObject *x, PyObject *y);
+static PyObject *          GMPy_MPFR_Array_Mul_Slot(PyObject *x, PyObject *y);
+static PyObject *          GMPy_MPFR_Array_TrueDiv_Slot(PyObject *x, PyObject *y);
+static PyObject *          GMPy_MPFR_Array_Neg_Slot(PyObject *x);
+
+static int                 GMPy_MPFR_Array_GetBuffer(MPFR_Array_Object *self, Py_buffer *view, int flags);
+static void                GMPy_MPFR_Array_ReleaseBuffer(MPFR_Array_Object *self, Py_buffer *view);
+
+static PyObject *          GMPy_MPFR_Array_Method_Sum(PyObject *self, PyObject *other);
+static PyObject *          GMPy_MPFR_Array_Method_Dot(PyObject *self, PyObject *other);
+static PyObject *          GMPy_MPFR_Array_Method_ToList(PyObject *self, PyObject *other);
+static PyObject *          GMPy_MPFR_Array_Method_SizeOf(PyObject *self, PyObject *other);
+static PyObject *          GMPy_MPFR_Array_Get_Precision(MPFR_Array_Object *self, void *closure);
+
+#ifdef __cplusplus
+}
+#endif
+#endif
@@ -0,0 +1,1136 @@
+/* * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * *
+ * gmpy2_mpz_array.c                                                       *
+ * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * *
+ * Python interface to the GMP, MPFR, and MPC multiple precision           *
+ * libraries.                                                              *
+ *                                                                         *
+ * Copyright 2000 - 2009 Alex Martelli                                     *
+ *                                                                         *
+ * Copyright 2008 - 2024 Case Van Horsen                                   *
+ *                                                                         *
+ * This file is part of GMPY2.                                             *
+ *                                                                         *
+ * GMPY2 is free software: you can redistribute it and/or modify it under  *
+ * the terms of the GNU Lesser General Public License as published by the  *
+ * Free Software Foundation, either version 3 of the License, or (at your  *
+ * option) any later version.                                              *
+ *                                                                         *
+ * GMPY2 is distributed in the hope that it will be useful, but WITHOUT    *
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or   *
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public    *
+ * License for more details.                                               *
+ *                                                                         *
+ * You should have received a copy of the GNU Lesser General Public        *
+ * License along with GMPY2; if not, see <http://www.gnu.org/licenses/>    *
+ * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * */
+
+/* This file implements the mpz_array type. An mpz_array is an immutable
+ * sequence of integers that are stored in a single limb arena. Elementwise
+ * operations read the elements in-place with mpz_roinit_n(), compute each
+ * result in a scratch mpz_t, and append the result to a new arena. The loops
+ * do not create any Python objects and always release the GIL.
+ */
+
+/* Memory for the arena is allocated with PyMem_Raw* so it may be (re)allocated
+ * while the GIL is released.
+ */
+
+static int
+GMPy_MPZ_Array_Builder_Init(MPZ_Array_Builder *b, Py_ssize_t length,
+                            size_t limbs_hint)
+{
+    b->length = length;
+    b->count = 0;
+    b->limbs_alloc = limbs_hint ? limbs_hint : 1;
+    b->offsets = NULL;
+    b->sizes = NULL;
+    b->limbs = NULL;
+
+    if ((size_t)length >= PY_SSIZE_T_MAX / sizeof(int64_t) ||
+        b->limbs_alloc > PY_SSIZE_T_MAX / sizeof(mp_limb_t)) {
+        PyErr_NoMemory();
+        return -1;
+    }
+
+    b->offsets = PyMem_RawMalloc((length + 1) * sizeof(int64_t));
+    b->sizes = PyMem_RawMalloc((length ? length : 1) * sizeof(int64_t));
+    b->limbs = PyMem_RawMalloc(b->limbs_alloc * sizeof(mp_limb_t));
+    if (!b->offsets || !b->sizes || !b->limbs) {
+        /* LCOV_EXCL_START */
+        GMPy_MPZ_Array_Builder_Clear(b);
+        PyErr_NoMemory();
+        return -1;
+        /* LCOV_EXCL_STOP */
+    }
+    b->offsets[0] = 0;
+    return 0;
+}
+
+/* Append the value of z to the builder. Returns -1 if memory could not be
+ * allocated. Does not set an exception and may be called without the GIL.
+ */
+
+static int
+GMPy_MPZ_Array_Builder_Append(MPZ_Array_Builder *b, mpz_srcptr z)
+{
+    size_t n = mpz_size(z);
+    size_t used = (size_t)b->offsets[b->count];
+
+    if (used + n > b->limbs_alloc) {
+        size_t new_alloc = b->limbs_alloc * 2;
+        mp_limb_t *new_limbs;
+
+        if (new_alloc < used + n) {
+            new_alloc = used + n;
+        }
+        if (new_alloc > PY_SSIZE_T_MAX / sizeof(mp_limb_t)) {
+            return -1;
+        }
+        if (!(new_limbs = PyMem_RawRealloc(b->limbs, new_alloc * sizeof(mp_limb_t)))) {
+            return -1;
+        }
+        b->limbs = new_limbs;
+        b->limbs_alloc = new_alloc;
+    }
+    if (n) {
+        memcpy(b->limbs + used, mpz_limbs_read(z), n * sizeof(mp_limb_t));
+    }
+    b->sizes[b->count] = (mpz_sgn(z) < 0) ? -(int64_t)n : (int64_t)n;
+    b->offsets[b->count + 1] = (int64_t)(used + n);
+    b->count++;
+    return 0;
+}
+
+static void
+GMPy_MPZ_Array_Builder_Clear(MPZ_Array_Builder *b)
+{
+    PyMem_RawFree(b->offsets);
+    PyMem_RawFree(b->sizes);
+    PyMem_RawFree(b->limbs);
+    b->offsets = NULL;
+    b->sizes = NULL;
+    b->limbs = NULL;
+    b->length = b->count = 0;
+    b->limbs_alloc = 0;
+}
+
+/* Create a new mpz_array that takes ownership of the memory in the builder.
+ * The builder is always cleared.
+ */
+
+static MPZ_Array_Object *
+GMPy_MPZ_Array_From_Builder(MPZ_Array_Builder *b)
+{
+    MPZ_Array_Object *result;
+    size_t used = (size_t)b->offsets[b->count];
+    mp_limb_t *limbs;
+
+    if (!(result = PyObject_New(MPZ_Array_Object, &MPZ_Array_Type))) {
+        /* LCOV_EXCL_START */
+        GMPy_MPZ_Array_Builder_Clear(b);
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+
+    /* Return any unused space in the arena. */
+    if (used < b->limbs_alloc &&
+        (limbs = PyMem_RawRealloc(b->limbs, (used ? used : 1) * sizeof(mp_limb_t)))) {
+        b->limbs = limbs;
+    }
+
+    result->length = b->count;
+    result->mapping = NULL;
+    result->offsets = b->offsets;
+    result->sizes = b->sizes;
+    result->limbs = b->limbs;
+    b->offsets = NULL;
+    b->sizes = NULL;
+    b->limbs = NULL;
+    GMPy_MPZ_Array_Builder_Clear(b);
+    return result;
+}
+
+/* Append an arbitrary integer object to the builder. Must be called with
+ * the GIL. Returns -1 and sets an exception on error.
+ */
+
+static int
+mpz_array_append_object(MPZ_Array_Builder *b, PyObject *obj, mpz_t scratch)
+{
+    MPZ_Object *temp;
+    int xtype = GMPy_ObjectType(obj), res;
+
+    if (IS_TYPE_MPZANY(xtype)) {
+        res = GMPy_MPZ_Array_Builder_Append(b, MPZ(obj));
+    }
+    else if (IS_TYPE_PyInteger(xtype)) {
+        if (mpz_set_PyLong(scratch, obj)) {
+            /* LCOV_EXCL_START */
+            return -1;
+            /* LCOV_EXCL_STOP */
+        }
+        res = GMPy_MPZ_Array_Builder_Append(b, scratch);
+    }
+    else if (IS_TYPE_HAS_MPZ(xtype)) {
+        if (!(temp = GMPy_MPZ_From_IntegerWithType(obj, xtype, NULL))) {
+            return -1;
+        }
+        res = GMPy_MPZ_Array_Builder_Append(b, temp->z);
+        Py_DECREF((PyObject*)temp);
+    }
+    else {
+        TYPE_ERROR("all items in iterable must be integers");
+        return -1;
+    }
+
+    if (res < 0) {
+        /* LCOV_EXCL_START */
+        PyErr_NoMemory();
+        /* LCOV_EXCL_STOP */
+    }
+    return res;
+}
+
+static MPZ_Array_Object *
+GMPy_MPZ_Array_From_Iterable(PyObject *obj)
+{
+    MPZ_Array_Builder builder;
+    PyObject *seq;
+    Py_ssize_t i, length;
+    mpz_t scratch;
+
+    if (!(seq = PySequence_Fast(obj, "argument must be an iterable"))) {
+        return NULL;
+    }
+
+    length = PySequence_Fast_GET_SIZE(seq);
+    if (GMPy_MPZ_Array_Builder_Init(&builder, length, (size_t)length) < 0) {
+        /* LCOV_EXCL_START */
+        Py_DECREF(seq);
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+
+    mpz_init(scratch);
+    for (i = 0; i < length; i++) {
+        if (mpz_array_append_object(&builder, PySequence_Fast_GET_ITEM(seq, i), scratch) < 0) {
+            mpz_clear(scratch);
+            GMPy_MPZ_Array_Builder_Clear(&builder);
+            Py_DECREF(seq);
+            return NULL;
+        }
+    }
+    mpz_clear(scratch);
+    Py_DECREF(seq);
+    return GMPy_MPZ_Array_From_Builder(&builder);
+}
+
+PyDoc_STRVAR(GMPy_doc_mpz_array,
+"mpz_array(iterable=(), /)\n\n"
+"Return an immutable sequence of integers stored in a single contiguous\n"
+"block of memory. The arithmetic operators +, -, *, //, %, and ** are\n"
+"applied elementwise to two mpz_array of the same length, or to an\n"
+"mpz_array and an integer. The loops run in C and always release the GIL.\n"
+"== and != compare whole arrays and return a bool. Use cmp() to compare\n"
+"elementwise.");
+
+static PyObject *
+GMPy_MPZ_Array_NewInit(PyTypeObject *type, PyObject *args, PyObject *keywds)
+{
+    PyObject *arg = NULL;
+
+    if (keywds && PyDict_GET_SIZE(keywds)) {
+        TYPE_ERROR("mpz_array() takes no keyword arguments");
+        return NULL;
+    }
+
+    if (!PyArg_UnpackTuple(args, "mpz_array", 0, 1, &arg)) {
+        return NULL;
+    }
+
+    if (!arg) {
+        MPZ_Array_Builder builder;
+
+        if (GMPy_MPZ_Array_Builder_Init(&builder, 0, 0) < 0) {
+            /* LCOV_EXCL_START */
+            return NULL;
+            /* LCOV_EXCL_STOP */
+        }
+        return (PyObject*)GMPy_MPZ_Array_From_Builder(&builder);
+    }
+
+    /* An mpz_array is immutable so it can be shared. */
+    if (MPZ_Array_Check(arg)) {
+        Py_INCREF(arg);
+        return arg;
+    }
+
+    return (PyObject*)GMPy_MPZ_Array_From_Iterable(arg);
+}
+
+static void
+GMPy_MPZ_Array_Dealloc(MPZ_Array_Object *self)
+{
+    if (self->mapping) {
+        PyBuffer_Release(&self->view);
+        Py_DECREF(self->mapping);
+    }
+    else {
+        PyMem_RawFree(self->offsets);
+        PyMem_RawFree(self->sizes);
+        PyMem_RawFree(self->limbs);
+    }
+    PyObject_Free(self);
+}
+
+static PyObject *
+GMPy_MPZ_Array_Repr(MPZ_Array_Object *self)
+{
+    PyObject *parts, *sep, *joined, *result = NULL;
+    void (*freefunc)(void *, size_t);
+    Py_ssize_t i;
+    mpz_t view;
+    char *s;
+
+    if (!(parts = PyList_New(self->length))) {
+        /* LCOV_EXCL_START */
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+
+    mp_get_memory_functions(NULL, NULL, &freefunc);
+    for (i = 0; i < self->length; i++) {
+        PyObject *temp;
+
+        s = mpz_get_str(NULL, 10, MPZ_ARRAY_GET(view, self, i));
+        temp = PyUnicode_FromString(s);
+        freefunc(s, strlen(s) + 1);
+        if (!temp) {
+            /* LCOV_EXCL_START */
+            Py_DECREF(parts);
+            return NULL;
+            /* LCOV_EXCL_STOP */
+        }
+        PyList_SET_ITEM(parts, i, temp);
+    }
+
+    if ((sep = PyUnicode_FromString(", "))) {
+        if ((joined = PyUnicode_Join(sep, parts))) {
+            result = PyUnicode_FromFormat("mpz_array([%U])", joined);
+            Py_DECREF(joined);
+        }
+        Py_DECREF(sep);
+    }
+    Py_DECREF(parts);
+    return result;
+}
+
+static Py_ssize_t
+GMPy_MPZ_Array_Length(MPZ_Array_Object *self)
+{
+    return self->length;
+}
+
+static PyObject *
+GMPy_MPZ_Array_Item(MPZ_Array_Object *self, Py_ssize_t i)
+{
+    MPZ_Object *result;
+    mpz_t view;
+
+    if (i < 0 || i >= self->length) {
+        INDEX_ERROR("mpz_array index out of range");
+        return NULL;
+    }
+
+    if ((result = GMPy_MPZ_New(NULL))) {
+        mpz_set(result->z, MPZ_ARRAY_GET(view, self, i));
+    }
+    return (PyObject*)result;
+}
+
+static PyObject *
+GMPy_MPZ_Array_SubScript(MPZ_Array_Object *self, PyObject *item)
+{
+    if (PyIndex_Check(item)) {
+        Py_ssize_t i;
+
+        i = PyNumber_AsSsize_t(item, PyExc_IndexError);
+        if (i == -1 && PyErr_Occurred()) {
+            return NULL;
+        }
+        if (i < 0) {
+            i += self->length;
+        }
+        return GMPy_MPZ_Array_Item(self, i);
+    }
+    else if (PySlice_Check(item)) {
+        MPZ_Array_Builder builder;
+        Py_ssize_t start, stop, step, slicelength, cur, i;
+        mpz_t view;
+
+        if (PySlice_GetIndicesEx(item, self->length,
+                                 &start, &stop, &step, &slicelength) < 0) {
+            return NULL;
+        }
+
+        if (GMPy_MPZ_Array_Builder_Init(&builder, slicelength, (size_t)slicelength) < 0) {
+            /* LCOV_EXCL_START */
+            return NULL;
+            /* LCOV_EXCL_STOP */
+        }
+        for (cur = start, i = 0; i < slicelength; cur += step, i++) {
+            if (GMPy_MPZ_Array_Builder_Append(&builder, MPZ_ARRAY_GET(view, self, cur)) < 0) {
+                /* LCOV_EXCL_START */
+                GMPy_MPZ_Array_Builder_Clear(&builder);
+                return PyErr_NoMemory();
+                /* LCOV_EXCL_STOP */
+            }
+        }
+        return (PyObject*)GMPy_MPZ_Array_From_Builder(&builder);
+    }
+    else {
+        TYPE_ERROR("mpz_array indices must be integers or slices");
+        return NULL;
+    }
+}
+
+/* An operand of an elementwise operation is either an mpz_array or a single
+ * integer that is used for every element.
+ */
+
+typedef struct {
+    MPZ_Array_Object *array;
+    MPZ_Object *scalar;
+} MPZ_Array_Operand;
+
+/* Returns 1 if obj is a valid operand, 0 if the type is not supported, and
+ * -1 if an error occurred.
+ */
+
+static int
+mpz_array_operand_init(MPZ_Array_Operand *op, PyObject *obj)
+{
+    int xtype;
+
+    op->array = NULL;
+    op->scalar = NULL;
+
+    if (MPZ_Array_Check(obj)) {
+        op->array = (MPZ_Array_Object*)obj;
+        return 1;
+    }
+
+    xtype = GMPy_ObjectType(obj);
+    if (IS_TYPE_INTEGER(xtype)) {
+        if (!(op->scalar = GMPy_MPZ_From_IntegerWithType(obj, xtype, NULL))) {
+            return -1;
+        }
+        return 1;
+    }
+    return 0;
+}
+
+static void
+mpz_array_operand_clear(MPZ_Array_Operand *op)
+{
+    Py_XDECREF((PyObject*)op->scalar);
+    op->scalar = NULL;
+    op->array = NULL;
+}
+
+static mpz_srcptr
+mpz_array_operand_get(const MPZ_Array_Operand *op, Py_ssize_t i, mpz_ptr view)
+{
+    if (op->array) {
+        return MPZ_ARRAY_GET(view, op->array, i);
+    }
+    return op->scalar->z;
+}
+
+/* Returns the common length of the array operands, or -1 with an exception
+ * set if the lengths differ.
+ */
+
+static Py_ssize_t
+mpz_array_operands_length(MPZ_Array_Operand *ops, int nops)
+{
+    Py_ssize_t length = -1;
+    int i;
+
+    for (i = 0; i < nops; i++) {
+        if (ops[i].array) {
+            if (length < 0) {
+                length = ops[i].array->length;
+            }
+            else if (length != ops[i].array->length) {
+                VALUE_ERROR("mpz_array operands must have the same length");
+                return -1;
+            }
+        }
+    }
+    return length;
+}
+
+/* Returns 1 if any value of the operand is 0. */
+
+static int
+mpz_array_operand_has_zero(const MPZ_Array_Operand *op)
+{
+    Py_ssize_t i;
+
+    if (!op->array) {
+        return mpz_sgn(op->scalar->z) == 0;
+    }
+    for (i = 0; i < op->array->length; i++) {
+        if (op->array->sizes[i] == 0) {
+            return 1;
+        }
+    }
+    return 0;
+}
+
+#define MPZ_ARRAY_OP_ADD      0
+#define MPZ_ARRAY_OP_SUB      1
+#define MPZ_ARRAY_OP_MUL      2
+#define MPZ_ARRAY_OP_FLOORDIV 3
+#define MPZ_ARRAY_OP_MOD      4
+#define MPZ_ARRAY_OP_POW      5
+#define MPZ_ARRAY_OP_POWMOD   6
+#define MPZ_ARRAY_OP_GCD      7
+#define MPZ_ARRAY_OP_CMP      8
+
+/* Apply an elementwise operation. Returns Py_NotImplemented if any of the
+ * operands is not an mpz_array or an integer. The modulus m is only used by
+ * MPZ_ARRAY_OP_POWMOD.
+ */
+
+static PyObject *
+GMPy_MPZ_Array_Apply(int op, PyObject *x, PyObject *y, PyObject *m)
+{
+    MPZ_Array_Operand ops[3] = {{NULL, NULL}, {NULL, NULL}, {NULL, NULL}};
+    MPZ_Array_Builder builder;
+    PyObject *result = NULL;
+    Py_ssize_t i, length, bad_index = -1;
+    int nops = (op == MPZ_ARRAY_OP_POWMOD) ? 3 : 2, status = 0, k, res;
+    size_t limbs_hint = 0;
+    mpz_t r, t, view0, view1, view2, view3;
+
+    for (k = 0; k < nops; k++) {
+        res = mpz_array_operand_init(&ops[k], (k == 0) ? x : ((k == 1) ? y : m));
+        if (res <= 0) {
+            if (res == 0) {
+                Py_INCREF(Py_NotImplemented);
+                result = Py_NotImplemented;
+            }
+            goto cleanup;
+        }
+        if (ops[k].array && op != MPZ_ARRAY_OP_CMP) {
+            limbs_hint += (size_t)ops[k].array->offsets[ops[k].array->length];
+        }
+    }
+
+    if ((length = mpz_array_operands_length(ops, nops)) < 0) {
+        goto cleanup;
+    }
+
+    switch (op) {
+    case MPZ_ARRAY_OP_FLOORDIV:
+    case MPZ_ARRAY_OP_MOD:
+        if (mpz_array_operand_has_zero(&ops[1])) {
+            ZERO_ERROR("division or modulo by zero");
+            goto cleanup;
+        }
+        break;
+    case MPZ_ARRAY_OP_POW:
+        for (i = 0; i < (ops[1].array ? length : 1); i++) {
+            mpz_srcptr e = mpz_array_operand_get(&ops[1], i, view1);
+
+            if (mpz_sgn(e) < 0) {
+                VALUE_ERROR("pow() exponent cannot be negative");
+                goto cleanup;
+            }
+            if (!mpz_fits_ulong_p(e)) {
+                VALUE_ERROR("pow() outrageous exponent");
+                goto cleanup;
+            }
+        }
+        break;
+    case MPZ_ARRAY_OP_POWMOD:
+        if (mpz_array_operand_has_zero(&ops[2])) {
+            VALUE_ERROR("pow() 3rd argument cannot be 0");
+            goto cleanup;
+        }
+        break;
+    }
+
+    if (GMPy_MPZ_Array_Builder_Init(&builder, length, limbs_hint + (size_t)length) < 0) {
+        /* LCOV_EXCL_START */
+        goto cleanup;
+        /* LCOV_EXCL_STOP */
+    }
+
+    mpz_init(r);
+    mpz_init(t);
+
+    Py_BEGIN_ALLOW_THREADS;
+    for (i = 0; i < length; i++) {
+        mpz_srcptr a = mpz_array_operand_get(&ops[0], i, view0);
+        mpz_srcptr b = mpz_array_operand_get(&ops[1], i, view1);
+
+        switch (op) {
+        case MPZ_ARRAY_OP_ADD:
+            mpz_add(r, a, b);
+            break;
+        case MPZ_ARRAY_OP_SUB:
+            mpz_sub(r, a, b);
+            break;
+        case MPZ_ARRAY_OP_MUL:
+            mpz_mul(r, a, b);
+            break;
+        case MPZ_ARRAY_OP_FLOORDIV:
+            mpz_fdiv_q(r, a, b);
+            break;
+        case MPZ_ARRAY_OP_MOD:
+            mpz_fdiv_r(r, a, b);
+            break;
+        case MPZ_ARRAY_OP_POW:
+            mpz_pow_ui(r, a, mpz_get_ui(b));
+            break;
+        case MPZ_ARRAY_OP_GCD:
+            mpz_gcd(r, a, b);
+            break;
+        case MPZ_ARRAY_OP_CMP:
+            res = mpz_cmp(a, b);
+            mpz_set_si(r, (res > 0) - (res < 0));
+            break;
+        case MPZ_ARRAY_OP_POWMOD: {
+            mpz_srcptr c = mpz_array_operand_get(&ops[2], i, view2);
+
+            /* Use the same conventions as pow(a, b, c). */
+            mpz_srcptr mm = mpz_roinit_n(view3, mpz_limbs_read(c), (mp_size_t)mpz_size(c));
+
+            if (mpz_sgn(b) < 0) {
+                if (!mpz_invert(r, a, mm)) {
+                    bad_index = i;
+                    break;
+                }
+                mpz_neg(t, b);
+                mpz_powm(r, r, t, mm);
+            }
+            else {
+                mpz_powm(r, a, b, mm);
+            }
+            if ((mpz_sgn(c) < 0) && (mpz_sgn(r) > 0)) {
+                mpz_add(r, r, c);
+            }
+            break;
+        }
+        }
+
+        if (bad_index >= 0) {
+            break;
+        }
+
+        if (GMPy_MPZ_Array_Builder_Append(&builder, r) < 0) {
+            /* LCOV_EXCL_START */
+            status = -1;
+            break;
+            /* LCOV_EXCL_STOP */
+        }
+    }
+    Py_END_ALLOW_THREADS;
+
+    mpz_clear(r);
+    mpz_clear(t);
+
+    if (bad_index >= 0) {
+        PyErr_Format(PyExc_ValueError,
+                     "pow() base not invertible at index %zd", bad_index);
+        GMPy_MPZ_Array_Builder_Clear(&builder);
+    }
+    else if (status < 0) {
+        /* LCOV_EXCL_START */
+        PyErr_NoMemory();
+        GMPy_MPZ_Array_Builder_Clear(&builder);
+        /* LCOV_EXCL_STOP */
+    }
+    else {
+        result = (PyObject*)GMPy_MPZ_Array_From_Builder(&builder);
+    }
+
+  cleanup:
+    for (k = 0; k < nops; k++) {
+        mpz_array_operand_clear(&ops[k]);
+    }
+    return result;
+}
+
+static PyObject *
+GMPy_MPZ_Array_Add_Slot(PyObject *x, PyObject *y)
+{
+    return GMPy_MPZ_Array_Apply(MPZ_ARRAY_OP_ADD, x, y, NULL);
+}
+
+static PyObject *
+GMPy_MPZ_Array_Sub_Slot(PyObject *x, PyObject *y)
+{
+    return GMPy_MPZ_Array_Apply(MPZ_ARRAY_OP_SUB, x, y, NULL);
+}
+
+static PyObject *
+GMPy_MPZ_Array_Mul_Slot(PyObject *x, PyObject *y)
+{
+    return GMPy_MPZ_Array_Apply(MPZ_ARRAY_OP_MUL, x, y, NULL);
+}
+
+static PyObject *
+GMPy_MPZ_Array_FloorDiv_Slot(PyObject *x, PyObject *y)
+{
+    return GMPy_MPZ_Array_Apply(MPZ_ARRAY_OP_FLOORDIV, x, y, NULL);
+}
+
+static PyObject *
+GMPy_MPZ_Array_Mod_Slot(PyObject *x, PyObject *y)
+{
+    return GMPy_MPZ_Array_Apply(MPZ_ARRAY_OP_MOD, x, y, NULL);
+}
+
+static PyObject *
+GMPy_MPZ_Array_Pow_Slot(PyObject *b, PyObject *e, PyObject *m)
+{
+    if (Py_IsNone(m)) {
+        return GMPy_MPZ_Array_Apply(MPZ_ARRAY_OP_POW, b, e, NULL);
+    }
+    return GMPy_MPZ_Array_Apply(MPZ_ARRAY_OP_POWMOD, b, e, m);
+}
+
+PyDoc_STRVAR(GMPy_doc_mpz_array_method_powmod,
+"x.powmod(exp, mod, /) -> mpz_array\n\n"
+"Return mpz_array(powmod(x[i], exp[i], mod[i]) ...). Either exp or mod\n"
+"may be a single integer that is used for every element. A negative\n"
+"exponent is allowed if the inverse exists. Always releases the GIL.");
+
+static PyObject *
+GMPy_MPZ_Array_Method_PowMod(PyObject *self, PyObject *const *args,
+                             Py_ssize_t nargs)
+{
+    PyObject *result;
+
+    if (nargs != 2) {
+        TYPE_ERROR("powmod() requires 2 arguments");
+        return NULL;
+    }
+
+    result = GMPy_MPZ_Array_Apply(MPZ_ARRAY_OP_POWMOD, self, args[0], args[1]);
+    if (result == Py_NotImplemented) {
+        Py_DECREF(result);
+        TYPE_ERROR("powmod() arguments must be integers or mpz_array");
+        return NULL;
+    }
+    return result;
+}
+
+PyDoc_STRVAR(GMPy_doc_mpz_array_method_gcd,
+"x.gcd(other, /) -> mpz_array\n\n"
+"Return mpz_array(gcd(x[i], other[i]) ...). other may be a single\n"
+"integer that is used for every element. Always releases the GIL.");
+
+static PyObject *
+GMPy_MPZ_Array_Method_GCD(PyObject *self, PyObject *other)
+{
+    PyObject *result;
+
+    result = GMPy_MPZ_Array_Apply(MPZ_ARRAY_OP_GCD, self, other, NULL);
+    if (result == Py_NotImplemented) {
+        Py_DECREF(result);
+        TYPE_ERROR("gcd() argument must be an integer or mpz_array");
+        return NULL;
+    }
+    return result;
+}
+
+PyDoc_STRVAR(GMPy_doc_mpz_array_method_cmp,
+"x.cmp(other, /) -> mpz_array\n\n"
+"Return mpz_array(cmp(x[i], other[i]) ...), that is -1, 0, or 1 for each\n"
+"element. other may be a single integer that is used for every element.\n"
+"Always releases the GIL.");
+
+static PyObject *
+GMPy_MPZ_Array_Method_Cmp(PyObject *self, PyObject *other)
+{
+    PyObject *result;
+
+    result = GMPy_MPZ_Array_Apply(MPZ_ARRAY_OP_CMP, self, other, NULL);
+    if (result == Py_NotImplemented) {
+        Py_DECREF(result);
+        TYPE_ERROR("cmp() argument must be an integer or mpz_array");
+        return NULL;
+    }
+    return result;
+}
+
+/* Two arrays are equal if they have the same length and the same elements,
+ * as for a list. Use cmp() for an elementwise comparison. Arrays are not
+ * ordered.
+ */
+
+static PyObject *
+GMPy_MPZ_Array_RichCompare(PyObject *a, PyObject *b, int op)
+{
+    MPZ_Array_Object *x = (MPZ_Array_Object*)a, *y = (MPZ_Array_Object*)b;
+    Py_ssize_t i;
+    mpz_t view0, view1;
+    int equal;
+
+    if ((op != Py_EQ && op != Py_NE) ||
+        !MPZ_Array_Check(a) || !MPZ_Array_Check(b)) {
+        Py_RETURN_NOTIMPLEMENTED;
+    }
+
+    equal = x->length == y->length;
+    for (i = 0; equal && i < x->length; i++) {
+        equal = mpz_cmp(MPZ_ARRAY_GET(view0, x, i), MPZ_ARRAY_GET(view1, y, i)) == 0;
+    }
+    return PyBool_FromLong(equal == (op == Py_EQ));
+}
+
+PyDoc_STRVAR(GMPy_doc_mpz_array_method_tolist,
+"x.tolist() -> list[mpz, ...]\n\n"
+"Return the elements of x as a list of mpz.");
+
+static PyObject *
+GMPy_MPZ_Array_Method_ToList(PyObject *self, PyObject *other)
+{
+    MPZ_Array_Object *arr = (MPZ_Array_Object*)self;
+    PyObject *result, *temp;
+    Py_ssize_t i;
+
+    if (!(result = PyList_New(arr->length))) {
+        /* LCOV_EXCL_START */
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+    for (i = 0; i < arr->length; i++) {
+        if (!(temp = GMPy_MPZ_Array_Item(arr, i))) {
+            /* LCOV_EXCL_START */
+            Py_DECREF(result);
+            return NULL;
+            /* LCOV_EXCL_STOP */
+        }
+        PyList_SET_ITEM(result, i, temp);
+    }
+    return result;
+}
+
+PyDoc_STRVAR(GMPy_doc_mpz_array_method_sizeof,
+"x.__sizeof__()\n\n"
+"Returns the amount of memory consumed by x.");
+
+static PyObject *
+GMPy_MPZ_Array_Method_SizeOf(PyObject *self, PyObject *other)
+{
+    MPZ_Array_Object *arr = (MPZ_Array_Object*)self;
+
+    /* The memory of a mapped file is not counted. */
+    if (arr->mapping) {
+        return PyLong_FromSize_t(sizeof(MPZ_Array_Object));
+    }
+    return PyLong_FromSize_t(sizeof(MPZ_Array_Object) +
+                             (2 * arr->length + 1) * sizeof(int64_t) +
+                             (size_t)arr->offsets[arr->length] * sizeof(mp_limb_t));
+}
+
+PyDoc_STRVAR(GMPy_doc_mpz_array_method_save,
+"x.save(file, /) -> None\n\n"
+"Save x to file, a path or a binary file object. The file can be memory\n"
+"mapped with `mpz_array.open()`. The data is saved in the native byte order\n"
+"and limb size of the platform.");
+
+static PyObject *
+GMPy_MPZ_Array_Method_Save(PyObject *self, PyObject *other)
+{
+    MPZ_Array_Object *arr = (MPZ_Array_Object*)self;
+    unsigned char header[GMPY_MPZ_ARRAY_FILE_HEADER];
+    PyObject *io, *file = NULL, *write, *temp;
+    int64_t n = arr->length, m = arr->offsets[arr->length];
+    const uint16_t one = 1;
+    int res;
+
+    if (PyObject_HasAttrString(other, "write")) {
+        write = PyObject_GetAttrString(other, "write");
+    }
+    else {
+        if (!(io = PyImport_ImportModule("io"))) {
+            /* LCOV_EXCL_START */
+            return NULL;
+            /* LCOV_EXCL_STOP */
+        }
+        file = PyObject_CallMethod(io, "open", "Os", other, "wb");
+        Py_DECREF(io);
+        if (!file) {
+            return NULL;
+        }
+        write = PyObject_GetAttrString(file, "write");
+    }
+    if (!write) {
+        /* LCOV_EXCL_START */
+        Py_XDECREF(file);
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+
+    memset(header, 0, sizeof(header));
+    memcpy(header, GMPY_DUMP_MAGIC, 6);
+    header[6] = 'Z';
+    header[7] = GMPY_MPZ_ARRAY_FILE_VERSION;
+    header[8] = (unsigned char)sizeof(mp_limb_t);
+    header[9] = *(const unsigned char*)&one ? 0 : 1;
+    memcpy(header + 16, &n, sizeof(int64_t));
+    memcpy(header + 24, &m, sizeof(int64_t));
+
+    res = GMPy_Dump_Write(write, (char*)header, sizeof(header));
+    if (res == 0) {
+        res = GMPy_Dump_Write(write, (char*)arr->offsets,
+                              (size_t)(n + 1) * sizeof(int64_t));
+    }
+    if (res == 0) {
+        res = GMPy_Dump_Write(write, (char*)arr->sizes,
+                              (size_t)n * sizeof(int64_t));
+    }
+    if (res == 0) {
+        res = GMPy_Dump_Write(write, (char*)arr->limbs,
+                              (size_t)m * sizeof(mp_limb_t));
+    }
+    Py_DECREF(write);
+
+    if (file) {
+        /* Close the file even if a write failed, keeping the first error. */
+        if (res < 0) {
+            PyObject *type, *value, *traceback;
+
+            PyErr_Fetch(&type, &value, &traceback);
+            temp = PyObject_CallMethod(file, "close", NULL);
+            Py_XDECREF(temp);
+            PyErr_Restore(type, value, traceback);
+        }
+        else if (!(temp = PyObject_CallMethod(file, "close", NULL))) {
+            res = -1;
+        }
+        else {
+            Py_DECREF(temp);
+        }
+        Py_DECREF(file);
+    }
+    if (res < 0) {
+        return NULL;
+    }
+    Py_RETURN_NONE;
+}
+
+/* Check that the index of a mapped file describes limbs that are inside the
+ * file. Does not use the Python API.
+ */
+
+static int
+mpz_array_check_index(const int64_t *offsets, const int64_t *sizes,
+                      int64_t n, int64_t m)
+{
+    int64_t i;
+    uint64_t count;
+
+    if (offsets[0] != 0 || offsets[n] != m) {
+        return -1;
+    }
+    for (i = 0; i < n; i++) {
+        count = sizes[i] < 0 ? -(uint64_t)sizes[i] : (uint64_t)sizes[i];
+        if (offsets[i + 1] < offsets[i] ||
+            (uint64_t)offsets[i + 1] - (uint64_t)offsets[i] != count) {
+            return -1;
+        }
+    }
+    return 0;
+}
+
+PyDoc_STRVAR(GMPy_doc_mpz_array_method_open,
+"mpz_array.open(path, /) -> mpz_array\n\n"
+"Return an mpz_array that uses the file created by `mpz_array.save()` in\n"
+"place. The file is memory mapped and read-only. Elements are read from\n"
+"the file only when they are used, and processes that open the same file\n"
+"share the memory through the page cache. The file must have been saved on\n"
+"a platform with the same byte order and limb size.");
+
+static PyObject *
+GMPy_MPZ_Array_Method_Open(PyObject *type, PyObject *other)
+{
+    MPZ_Array_Object *result;
+    PyObject *io, *file, *fileno, *mmap_module, *mapping = NULL;
+    PyObject *args = NULL, *keywds = NULL, *access = NULL, *temp;
+    unsigned char *buf;
+    int64_t n, m;
+    uint64_t rest;
+    const uint16_t one = 1;
+    int res;
+
+    /* Open the file and map it with mmap.mmap(fileno, 0, access=ACCESS_READ).
+     * The mapping stays valid after the file is closed.
+     */
+    if (!(io = PyImport_ImportModule("io"))) {
+        /* LCOV_EXCL_START */
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+    file = PyObject_CallMethod(io, "open", "Os", other, "rb");
+    Py_DECREF(io);
+    if (!file) {
+        return NULL;
+    }
+    if ((fileno = PyObject_CallMethod(file, "fileno", NULL)) &&
+        (mmap_module = PyImport_ImportModule("mmap"))) {
+        if ((access = PyObject_GetAttrString(mmap_module, "ACCESS_READ")) &&
+            (args = Py_BuildValue("(Oi)", fileno, 0)) &&
+            (keywds = Py_BuildValue("{sO}", "access", access))) {
+            if ((temp = PyObject_GetAttrString(mmap_module, "mmap"))) {
+                mapping = PyObject_Call(temp, args, keywds);
+                Py_DECREF(temp);
+            }
+        }
+        Py_XDECREF(access);
+        Py_XDECREF(args);
+        Py_XDECREF(keywds);
+        Py_DECREF(mmap_module);
+    }
+    Py_XDECREF(fileno);
+    if (mapping) {
+        if (!(temp = PyObject_CallMethod(file, "close", NULL))) {
+            /* LCOV_EXCL_START */
+            Py_CLEAR(mapping);
+            /* LCOV_EXCL_STOP */
+        }
+        Py_XDECREF(temp);
+    }
+    else {
+        PyObject *etype, *evalue, *etraceback;
+
+        PyErr_Fetch(&etype, &evalue, &etraceback);
+        temp = PyObject_CallMethod(file, "close", NULL);
+        Py_XDECREF(temp);
+        PyErr_Restore(etype, evalue, etraceback);
+    }
+    Py_DECREF(file);
+    if (!mapping) {
+        return NULL;
+    }
+
+    if (!(result = PyObject_New(MPZ_Array_Object, &MPZ_Array_Type))) {
+        /* LCOV_EXCL_START */
+        Py_DECREF(mapping);
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+    result->length = 0;
+    result->offsets = result->sizes = NULL;
+    result->limbs = NULL;
+    result->mapping = NULL;
+    if (PyObject_GetBuffer(mapping, &result->view, PyBUF_SIMPLE) < 0) {
+        /* LCOV_EXCL_START */
+        Py_DECREF(mapping);
+        Py_DECREF((PyObject*)result);
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+    result->mapping = mapping;
+
+    buf = (unsigned char*)result->view.buf;
+    if (result->view.len < GMPY_MPZ_ARRAY_FILE_HEADER ||
+        memcmp(buf, GMPY_DUMP_MAGIC, 6) || buf[6] != 'Z') {
+        VALUE_ERROR("file is not a saved mpz_array");
+        goto error;
+    }
+    if (buf[7] != GMPY_MPZ_ARRAY_FILE_VERSION) {
+        VALUE_ERROR("unsupported mpz_array file version");
+        goto error;
+    }
+    if (buf[8] != sizeof(mp_limb_t) || buf[9] != (*(const unsigned char*)&one ? 0 : 1)) {
+        VALUE_ERROR("mpz_array file was saved on an incompatible platform");
+        goto error;
+    }
+    memcpy(&n, buf + 16, sizeof(int64_t));
+    memcpy(&m, buf + 24, sizeof(int64_t));
+
+    /* The file must hold exactly n + 1 offsets, n sizes and m limbs. */
+    rest = (uint64_t)result->view.len - GMPY_MPZ_ARRAY_FILE_HEADER;
+    if (n < 0 || m < 0 || rest < sizeof(int64_t) ||
+        (uint64_t)n > (rest - sizeof(int64_t)) / (2 * sizeof(int64_t))) {
+        goto corrupt;
+    }
+    rest -= (2 * (uint64_t)n + 1) * sizeof(int64_t);
+    if (rest % sizeof(mp_limb_t) || rest / sizeof(mp_limb_t) != (uint64_t)m) {
+        goto corrupt;
+    }
+
+    result->length = (Py_ssize_t)n;
+    result->offsets = (int64_t*)(buf + GMPY_MPZ_ARRAY_FILE_HEADER);
+    result->sizes = result->offsets + n + 1;
+    result->limbs = (mp_limb_t*)(result->sizes + n);
+
+    Py_BEGIN_ALLOW_THREADS
+    res = mpz_array_check_index(result->offsets, result->sizes, n, m);
+    Py_END_ALLOW_THREADS
+    if (res < 0) {
+        goto corrupt;
+    }
+    return (PyObject*)result;
+
+  corrupt:
+    VALUE_ERROR("mpz_array file is corrupt");
+  error:
+    Py_DECREF((PyObject*)result);
+    return NULL;
+}
+
+static PyNumberMethods GMPy_MPZ_Array_number_methods = {
+    .nb_add = (binaryfunc) GMPy_MPZ_Array_Add_Slot,
+    .nb_subtract = (binaryfunc) GMPy_MPZ_Array_Sub_Slot,
+    .nb_multiply = (binaryfunc) GMPy_MPZ_Array_Mul_Slot,
+    .nb_remainder = (binaryfunc) GMPy_MPZ_Array_Mod_Slot,
+    .nb_power = (ternaryfunc) GMPy_MPZ_Array_Pow_Slot,
+    .nb_floor_divide = (binaryfunc) GMPy_MPZ_Array_FloorDiv_Slot,
+};
+
+static PySequenceMethods GMPy_MPZ_Array_sequence_methods = {
+    .sq_length = (lenfunc) GMPy_MPZ_Array_Length,
+    .sq_item = (ssizeargfunc) GMPy_MPZ_Array_Item,
+};
+
+static PyMappingMethods GMPy_MPZ_Array_mapping_methods = {
+    .mp_length = (lenfunc) GMPy_MPZ_Array_Length,
+    .mp_subscript = (binaryfunc) GMPy_MPZ_Array_SubScript,
+};
+
+static PyMethodDef GMPy_MPZ_Array_methods[] = {
+    { "__sizeof__", GMPy_MPZ_Array_Method_SizeOf, METH_NOARGS, GMPy_doc_mpz_array_method_sizeof },
+    { "cmp", GMPy_MPZ_Array_Method_Cmp, METH_O, GMPy_doc_mpz_array_method_cmp },
+    { "gcd", GMPy_MPZ_Array_Method_GCD, METH_O, GMPy_doc_mpz_array_method_gcd },
+    { "open", GMPy_MPZ_Array_Method_Open, METH_O | METH_CLASS, GMPy_doc_mpz_array_method_open },
+    { "powmod", (PyCFunction)GMPy_MPZ_Array_Method_PowMod, METH_FASTCALL, GMPy_doc_mpz_array_method_powmod },
+    { "save", GMPy_MPZ_Array_Method_Save, METH_O, GMPy_doc_mpz_array_method_save },
+    { "tolist", GMPy_MPZ_Array_Method_ToList, METH_NOARGS, GMPy_doc_mpz_array_method_tolist },
+    { NULL }
+};
+
+static PyTypeObject MPZ_Array_Type = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = "gmpy2.mpz_array",
+    .tp_basicsize = sizeof(MPZ_Array_Object),
+    .tp_dealloc = (destructor) GMPy_MPZ_Array_Dealloc,
+    .tp_repr = (reprfunc) GMPy_MPZ_Array_Repr,
+    .tp_as_number = &GMPy_MPZ_Array_number_methods,
+    .tp_as_sequence = &GMPy_MPZ_Array_sequence_methods,
+    .tp_as_mapping = &GMPy_MPZ_Array_mapping_methods,
+    .tp_hash = PyObject_HashNotImplemented,
+    .tp_flags = Py_TPFLAGS_DEFAULT,
+    .tp_doc = GMPy_doc_mpz_array,
+    .tp_richcompare = (richcmpfunc) GMPy_MPZ_Array_RichCompare,
+    .tp_methods = GMPy_MPZ_Array_methods,
+    .tp_new = GMPy_MPZ_Array_NewInit,
+};
@@ -0,0 +1,122 @@
+/* * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * *
+ * gmpy2_mpz_array.h                                                       *
+ * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * *
+ * Python interface to the GMP, MPFR, and MPC multiple precision           *
+ * libraries.                                                              *
+ *                                                                         *
+ * Copyright 2000 - 2009 Alex Martelli                                     *
+ *                                                                         *
+ * Copyright 2008 - 2024 Case Van Horsen                                   *
+ *                                                                         *
+ * This file is part of GMPY2.                                             *
+ *                                                                         *
+ * GMPY2 is free software: you can redistribute it and/or modify it under  *
+ * the terms of the GNU Lesser General Public License as published by the  *
+ * Free Software Foundation, either version 3 of the License, or (at your  *
+ * option) any later version.                                              *
+ *                                                                         *
+ * GMPY2 is distributed in the hope that it will be useful, but WITHOUT    *
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or   *
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public    *
+ * License for more details.                                               *
+ *                                                                         *
+ * You should have received a copy of the GNU Lesser General Public        *
+ * License along with GMPY2; if not, see <http://www.gnu.org/licenses/>    *
+ * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * */
+
+#ifndef GMPY_MPZ_ARRAY_H
+#define GMPY_MPZ_ARRAY_H
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+/* An mpz_array stores N integers in a single block of memory. The limbs of
+ * all the elements are stored back-to-back in one arena. Element i uses the
+ * limbs starting at limbs[offsets[i]] and sizes[i] is the signed limb count
+ * (the same convention as the _mp_size field of an mpz_t). The offsets and
+ * sizes use fixed-width types so the layout does not depend on the platform.
+ */
+
+typedef struct {
+    PyObject_HEAD
+    Py_ssize_t length;          /* number of elements               */
+    int64_t *offsets;           /* length + 1 offsets into limbs    */
+    int64_t *sizes;             /* signed limb count of each element */
+    mp_limb_t *limbs;           /* shared limb arena                */
+    PyObject *mapping;          /* mmap holding the data, or NULL   */
+    Py_buffer view;             /* buffer of mapping                */
+} MPZ_Array_Object;
+
+/* Format of a file written by mpz_array.save(). The offsets, sizes and limbs
+ * are saved in the native byte order so the file can be memory mapped by
+ * mpz_array.open() and used in place. All the sections are 8 byte aligned.
+ *
+ * byte[0:6]:   magic bytes b"GMPY2\x1a"
+ * byte[6]:     'Z'
+ * byte[7]:     version
+ * byte[8]:     number of bytes in a limb
+ * byte[9]:     0 => little-endian, 1 => big-endian
+ * byte[10:16]: reserved, 0
+ * byte[16:24]: number of elements (n)
+ * byte[24:32]: number of limbs (m)
+ * byte[32]+:   n + 1 offsets, n sizes, m limbs
+ */
+
+#define GMPY_MPZ_ARRAY_FILE_VERSION 1
+#define GMPY_MPZ_ARRAY_FILE_HEADER  32
+
+/* Used to build a new mpz_array one element at a time. The append function
+ * does not use the Python API so it can be called without holding the GIL.
+ */
+
+typedef struct {
+    Py_ssize_t length;          /* number of elements reserved      */
+    Py_ssize_t count;           /* number of elements appended      */
+    int64_t *offsets;
+    int64_t *sizes;
+    mp_limb_t *limbs;
+    size_t limbs_alloc;         /* number of limbs allocated        */
+} MPZ_Array_Builder;
+
+static PyTypeObject MPZ_Array_Type;
+#define MPZ_Array_Check(v) (((PyObject*)v)->ob_type == &MPZ_Array_Type)
+
+/* Initialize a read-only mpz_t that refers to element i of an mpz_array. */
+
+#define MPZ_ARRAY_GET(z, a, i) \
+    mpz_roinit_n(z, (a)->limbs + (a)->offsets[i], (mp_size_t)(a)->sizes[i])
+
+static int                GMPy_MPZ_Array_Builder_Init(MPZ_Array_Builder *b, Py_ssize_t length, size_t limbs_hint);
+static int                GMPy_MPZ_Array_Builder_Append(MPZ_Array_Builder *b, mpz_srcptr z);
+static void               GMPy_MPZ_Array_Builder_Clear(MPZ_Array_Builder *b);
+static MPZ_Array_Object * GMPy_MPZ_Array_From_Builder(MPZ_Array_Builder *b);
+
+static MPZ_Array_Object * GMPy_MPZ_Array_From_Iterable(PyObject *obj);
+static PyObject *         GMPy_MPZ_Array_NewInit(PyTypeObject *type, PyObject *args, PyObject *keywds);
+static void               GMPy_MPZ_Array_Dealloc(MPZ_Array_Object *self);
+static PyObject *         GMPy_MPZ_Array_Repr(MPZ_Array_Object *self);
+static Py_ssize_t         GMPy_MPZ_Array_Length(MPZ_Array_Object *self);
+static PyObject *         GMPy_MPZ_Array_Item(MPZ_Array_Object *self, Py_ssize_t i);
+static PyObject *         GMPy_MPZ_Array_SubScript(MPZ_Array_Object *self, PyObject *item);
+static PyObject *         GMPy_MPZ_Array_RichCompare(PyObject *a, PyObject *b, int op);
+
+static PyObject *         GMPy_MPZ_Array_Add_Slot(PyObject *x, PyObject *y);
+static PyObject *         GMPy_MPZ_Array_Sub_Slot(PyObject *x, PyObject *y);
+static PyObject *         GMPy_MPZ_Array_Mul_Slot(PyObject *x, PyObject *y);
+static PyObject *         GMPy_MPZ_Array_FloorDiv_Slot(PyObject *x, PyObject *y);
+static PyObject *         GMPy_MPZ_Array_Mod_Slot(PyObject *x, PyObject *y);
+static PyObject *         GMPy_MPZ_Array_Pow_Slot(PyObject *b, PyObject *e, PyObject *m);
+
+static PyObject *         GMPy_MPZ_Array_Method_PowMod(PyObject *self, PyObject *const *args, Py_ssize_t nargs);
+static PyObject *         GMPy_MPZ_Array_Method_GCD(PyObject *self, PyObject *other);
+static PyObject *         GMPy_MPZ_Array_Method_Cmp(PyObject *self, PyObject *other);
+static PyObject *         GMPy_MPZ_Array_Method_ToList(PyObject *self, PyObject *other);
+static PyObject *         GMPy_MPZ_Array_Method_SizeOf(PyObject *self, PyObject *other);
+static PyObject *         GMPy_MPZ_Array_Method_Open(PyObject *type, PyObject *other);
+static PyObject *         GMPy_MPZ_Array_Method_Save(PyObject *self, PyObject *other);
+
+#ifdef __cplusplus
+}
+#endif
+#endif
@@ -1006,6 +1006,123 @@ GMPy_MPZ_Function_Invert(PyObject *self, PyObject * const *args,
     return (PyObject*)result;
 }
 
+PyDoc_STRVAR(GMPy_doc_mpz_function_invert_list,
+"invert_list(values, m, /) -> list[mpz, ...]\n\n"
+"Return [invert(x, m) for x in values]. Uses Montgomery's trick so only\n"
+"one modular inverse and 3*(len(values) - 1) multiplications are needed.\n"
+"Raises `ZeroDivisionError` with the index of the first value that has\n"
+"no inverse. Will always release the GIL.");
+
+static PyObject *
+GMPy_MPZ_Function_InvertList(PyObject *self, PyObject * const *args,
+                             Py_ssize_t nargs)
+{
+    MPZ_Object *tempm = NULL;
+    PyObject *result = NULL;
+    Py_ssize_t i, n, bad_index = -1;
+    mpz_t *prefix = NULL, inv, t, m;
+
+    if (nargs != 2) {
+        TYPE_ERROR("invert_list() requires 2 arguments");
+        return NULL;
+    }
+
+    if (!IS_TYPE_INTEGER(GMPy_ObjectType(args[1]))) {
+        TYPE_ERROR("invert_list() requires an integer modulus");
+        return NULL;
+    }
+
+    if (!(tempm = GMPy_MPZ_From_Integer(args[1], NULL))) {
+        /* LCOV_EXCL_START */
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+
+    if (mpz_sgn(tempm->z) == 0) {
+        ZERO_ERROR("invert_list() division by 0");
+        goto done;
+    }
+
+    if (!(result = GMPy_Integer_PowModList_Copy(args[0]))) {
+        goto done;
+    }
+
+    n = PyList_GET_SIZE(result);
+    if (n == 0) {
+        goto done;
+    }
+
+    if (!(prefix = PyMem_New(mpz_t, n))) {
+        /* LCOV_EXCL_START */
+        Py_CLEAR(result);
+        PyErr_NoMemory();
+        goto done;
+        /* LCOV_EXCL_STOP */
+    }
+
+    Py_BEGIN_ALLOW_THREADS;
+    mpz_init(m);
+    mpz_abs(m, tempm->z);
+
+    /* prefix[i] = values[0] * ... * values[i] mod m */
+    for (i = 0; i < n; i++) {
+        mpz_ptr x = MPZ(PyList_GET_ITEM(result, i));
+
+        mpz_mod(x, x, m);
+        mpz_init(prefix[i]);
+        if (i == 0) {
+            mpz_set(prefix[i], x);
+        }
+        else {
+            mpz_mul(prefix[i], prefix[i - 1], x);
+            mpz_mod(prefix[i], prefix[i], m);
+        }
+    }
+
+    mpz_init(inv);
+    mpz_init(t);
+    if (mpz_invert(inv, prefix[n - 1], m)) {
+        /* inv = 1 / (values[0] * ... * values[i]) at the start of each step. */
+        for (i = n - 1; i > 0; i--) {
+            mpz_ptr x = MPZ(PyList_GET_ITEM(result, i));
+
+            mpz_mul(t, inv, prefix[i - 1]);
+            mpz_mul(inv, inv, x);
+            mpz_mod(inv, inv, m);
+            mpz_mod(x, t, m);
+        }
+        mpz_set(MPZ(PyList_GET_ITEM(result, 0)), inv);
+    }
+    else {
+        for (i = 0; i < n; i++) {
+            mpz_gcd(t, MPZ(PyList_GET_ITEM(result, i)), m);
+            if (mpz_cmp_ui(t, 1) != 0) {
+                bad_index = i;
+                break;
+            }
+        }
+    }
+    mpz_clear(inv);
+    mpz_clear(t);
+    mpz_clear(m);
+    for (i = 0; i < n; i++) {
+        mpz_clear(prefix[i]);
+    }
+    Py_END_ALLOW_THREADS;
+
+    PyMem_Free(prefix);
+
+    if (bad_index >= 0) {
+        PyErr_Format(PyExc_ZeroDivisionError,
+                     "invert_list() no inverse exists at index %zd", bad_index);
+        Py_CLEAR(result);
+    }
+
+  done:
+    Py_DECREF((PyObject*)tempm);
+    return result;
+}
+
 PyDoc_STRVAR(GMPy_doc_mpz_function_divexact,
 "divexact(x, y, /) -> mpz\n\n"
 "Return the quotient of x divided by y. Faster than standard\n"
@@ -1314,17 +1431,80 @@ GMPy_MPZ_Method_IsPower(PyObject *self, PyObject *other)
         Py_RETURN_FALSE;
 }
 
+/* Return 1 if n is a proven prime or 0 if n is composite. The APR-CL test
+ * is only run if n passes a BPSW test that does not already prove that n is
+ * prime. Returns -1 with an exception set if the test could not be
+ * completed. Always releases the GIL.
+ */
+
+static int
+GMPy_MPZ_IsPrimeProven(mpz_srcptr n)
+{
+    int res;
+
+    Py_BEGIN_ALLOW_THREADS;
+    res = mpz_probab_prime_p(n, 1);
+    if (res == 1) {
+        PyThread_acquire_lock(aprcl_lock, WAIT_LOCK);
+        res = mpz_aprcl(n);
+        PyThread_release_lock(aprcl_lock);
+    }
+    else {
+        res = res ? APRCL_PRIME : APRCL_COMPOSITE;
+    }
+    Py_END_ALLOW_THREADS;
+
+    if (res == APRCL_TOO_LARGE) {
+        VALUE_ERROR("is_prime_proven() value too large to test");
+        return -1;
+    }
+    if (res == APRCL_ERROR) {
+        /* LCOV_EXCL_START */
+        SYSTEM_ERROR("is_prime_proven() APR-CL test failed");
+        return -1;
+        /* LCOV_EXCL_STOP */
+    }
+    return res == APRCL_PRIME;
+}
+
+/* Parse the keyword argument "proof" of is_prime(). Returns 0 or 1, or -1
+ * with an exception set.
+ */
+
+static int
+GMPy_MPZ_Parse_Proof(PyObject * const *args, Py_ssize_t nargs,
+                     PyObject *kwnames)
+{
+    Py_ssize_t i, nkws = 0;
+    int proof = 0;
+
+    if (kwnames) {
+        nkws = PyTuple_GET_SIZE(kwnames);
+    }
+    for (i = 0; i < nkws; i++) {
+        if (PyUnicode_CompareWithASCIIString(PyTuple_GET_ITEM(kwnames, i), "proof")) {
+            TYPE_ERROR("got an invalid keyword argument for is_prime()");
+            return -1;
+        }
+        if ((proof = PyObject_IsTrue(args[nargs + i])) < 0) {
+            return -1;
+        }
+    }
+    return proof;
+}
+
 PyDoc_STRVAR(GMPy_doc_mpz_function_is_prime,
-"is_prime(x, n=25, /) -> bool\n\n"
+"is_prime(x, n=25, /, *, proof=False) -> bool\n\n"
 "Return `True` if x is *probably* prime, else `False` if x is\n"
 "definitely composite. x is checked for small divisors and up\n"
-"to n Miller-Rabin tests are performed.");
+"to n Miller-Rabin tests are performed. If proof is `True`, the\n"
+"result is proven with is_prime_proven() and n is ignored.");
 
 static PyObject *
 GMPy_MPZ_Function_IsPrime(PyObject *self, PyObject * const *args,
-                          Py_ssize_t nargs)
+                          Py_ssize_t nargs, PyObject *kwnames)
 {
-    int i;
+    int i, proof;
     unsigned long reps = 25;
     MPZ_Object* tempx;
 
@@ -1333,6 +1513,10 @@ GMPy_MPZ_Function_IsPrime(PyObject *self, PyObject * const *args,
         return NULL;
     }
 
+    if ((proof = GMPy_MPZ_Parse_Proof(args, nargs, kwnames)) < 0) {
+        return NULL;
+    }
+
     if (nargs == 2) {
         reps = GMPy_Integer_AsUnsignedLong(args[1]);
         if (reps == (unsigned long)(-1) && PyErr_Occurred()) {
@@ -1353,9 +1537,16 @@ GMPy_MPZ_Function_IsPrime(PyObject *self, PyObject * const *args,
         Py_RETURN_FALSE;
     }
 
-    i = mpz_probab_prime_p(tempx->z, (int)reps);
+    if (proof) {
+        i = GMPy_MPZ_IsPrimeProven(tempx->z);
+    }
+    else {
+        i = mpz_probab_prime_p(tempx->z, (int)reps);
+    }
     Py_DECREF((PyObject*)tempx);
 
+    if (i < 0)
+        return NULL;
     if (i)
         Py_RETURN_TRUE;
     else
@@ -1363,16 +1554,17 @@ GMPy_MPZ_Function_IsPrime(PyObject *self, PyObject * const *args,
 }
 
 PyDoc_STRVAR(GMPy_doc_mpz_method_is_prime,
-"x.is_prime(n=25, /) -> bool\n\n"
+"x.is_prime(n=25, /, *, proof=False) -> bool\n\n"
 "Return `True` if x is *probably* prime, else `False` if x is\n"
 "definitely composite. x is checked for small divisors and up\n"
-"to n Miller-Rabin tests are performed.");
+"to n Miller-Rabin tests are performed. If proof is `True`, the\n"
+"result is proven with is_prime_proven() and n is ignored.");
 
 static PyObject *
 GMPy_MPZ_Method_IsPrime(PyObject *self, PyObject * const *args,
-                        Py_ssize_t nargs)
+                        Py_ssize_t nargs, PyObject *kwnames)
 {
-    int i;
+    int i, proof;
     unsigned long reps = 25;
 
     if (nargs > 1) {
@@ -1380,6 +1572,10 @@ GMPy_MPZ_Method_IsPrime(PyObject *self, PyObject * const *args,
         return NULL;
     }
 
+    if ((proof = GMPy_MPZ_Parse_Proof(args, nargs, kwnames)) < 0) {
+        return NULL;
+    }
+
     if (nargs == 1) {
         reps = GMPy_Integer_AsUnsignedLong(args[0]);
         if (reps == (unsigned long)(-1) && PyErr_Occurred()) {
@@ -1395,8 +1591,57 @@ GMPy_MPZ_Method_IsPrime(PyObject *self, PyObject * const *args,
         Py_RETURN_FALSE;
     }
 
-    i = mpz_probab_prime_p(MPZ(self), (int)reps);
+    if (proof) {
+        i = GMPy_MPZ_IsPrimeProven(MPZ(self));
+    }
+    else {
+        i = mpz_probab_prime_p(MPZ(self), (int)reps);
+    }
+
+    if (i < 0)
+        return NULL;
+    if (i)
+        Py_RETURN_TRUE;
+    else
+        Py_RETURN_FALSE;
+}
+
+PyDoc_STRVAR(GMPy_doc_mpz_function_is_prime_proven,
+"is_prime_proven(x, /) -> bool\n\n"
+"Return `True` if x is prime, else `False`. Unlike is_prime(), the\n"
+"result is always correct: a number that passes a BPSW test is proven\n"
+"prime with the APR-CL test. Values with more than "
+Py_STRINGIFY(APRCL_MAX_DIGITS) " digits\n"
+"are too large for the APR-CL tables and raise `ValueError`. Will\n"
+"always release the GIL.");
+
+static PyObject *
+GMPy_MPZ_Function_IsPrimeProven(PyObject *self, PyObject *other)
+{
+    MPZ_Object* tempx;
+    int i;
 
+    if (!IS_TYPE_INTEGER(GMPy_ObjectType(other))) {
+        TYPE_ERROR("is_prime_proven() requires 'mpz' argument");
+        return NULL;
+    }
+
+    if (!(tempx = GMPy_MPZ_From_Integer(other, NULL))) {
+        /* LCOV_EXCL_START */
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+
+    if (mpz_sgn(tempx->z) == -1) {
+        Py_DECREF((PyObject*)tempx);
+        Py_RETURN_FALSE;
+    }
+
+    i = GMPy_MPZ_IsPrimeProven(tempx->z);
+    Py_DECREF((PyObject*)tempx);
+
+    if (i < 0)
+        return NULL;
     if (i)
         Py_RETURN_TRUE;
     else
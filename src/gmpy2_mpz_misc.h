@@ -54,7 +54,7 @@ static PyObject * GMPy_MPZ_Method_IsSquare(PyObject *self, PyObject *other);
 static PyObject * GMPy_MPZ_Method_IsDivisible(PyObject *self, PyObject *other);
 static PyObject * GMPy_MPZ_Method_IsCongruent(PyObject *self, PyObject *const *args, Py_ssize_t nargs);
 static PyObject * GMPy_MPZ_Method_IsPower(PyObject *self, PyObject *other);
-static PyObject * GMPy_MPZ_Method_IsPrime(PyObject *self, PyObject *const *args, Py_ssize_t nargs);
+static PyObject * GMPy_MPZ_Method_IsPrime(PyObject *self, PyObject *const *args, Py_ssize_t nargs, PyObject *kwnames);
 static PyObject * GMPy_MPZ_Method_IsProbabPrime(PyObject *self, PyObject *const *args, Py_ssize_t nargs);
 static PyObject * GMPy_MPZ_Method_IsEven(PyObject *self, PyObject *other);
 static PyObject * GMPy_MPZ_Method_IsOdd(PyObject *self, PyObject *other);
@@ -81,12 +81,14 @@ static PyObject * GMPy_MPZ_Function_Isqrt(PyObject *self, PyObject *other);
 static PyObject * GMPy_MPZ_Function_IsqrtRem(PyObject *self, PyObject *other);
 static PyObject * GMPy_MPZ_Function_Remove(PyObject *self, PyObject * const *args, Py_ssize_t nargs);
 static PyObject * GMPy_MPZ_Function_Invert(PyObject *self, PyObject * const *args, Py_ssize_t nargs);
+static PyObject * GMPy_MPZ_Function_InvertList(PyObject *self, PyObject * const *args, Py_ssize_t nargs);
 static PyObject * GMPy_MPZ_Function_Divexact(PyObject *self, PyObject * const *args, Py_ssize_t nargs);
 static PyObject * GMPy_MPZ_Function_IsSquare(PyObject *self, PyObject *other);
 static PyObject * GMPy_MPZ_Function_IsDivisible(PyObject *self, PyObject * const *args, Py_ssize_t nargs);
 static PyObject * GMPy_MPZ_Function_IsCongruent(PyObject *self, PyObject * const *args, Py_ssize_t nargs);
 static PyObject * GMPy_MPZ_Function_IsPower(PyObject *self, PyObject *other);
-static PyObject * GMPy_MPZ_Function_IsPrime(PyObject *self, PyObject * const *args, Py_ssize_t nargs);
+static PyObject * GMPy_MPZ_Function_IsPrime(PyObject *self, PyObject * const *args, Py_ssize_t nargs, PyObject *kwnames);
+static PyObject * GMPy_MPZ_Function_IsPrimeProven(PyObject *self, PyObject *other);
 static PyObject * GMPy_MPZ_Function_IsProbabPrime(PyObject *self, PyObject *const *args, Py_ssize_t nargs);
 static PyObject * GMPy_MPZ_Function_NextPrime(PyObject *self, PyObject *other);
 #if (__GNU_MP_VERSION > 6) || (__GNU_MP_VERSION == 6 &&  __GNU_MP_VERSION_MINOR >= 3)
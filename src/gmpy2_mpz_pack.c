@@ -245,3 +245,358 @@ GMPy_MPZ_unpack(PyObject *self, PyObject *args)
     mpz_clear(temp);
     return result;
 }
+
+/*
+ **************************************************************************
+ * pack_bytes and unpack_bytes
+ *
+ * Each integer is stored in a field of width bytes. When width is a multiple
+ * of the limb size, the limbs are copied with mpz_export()/mpz_import() one
+ * limb at a time; otherwise one byte at a time. Negative values are stored
+ * in two's complement by writing ~x = -x-1 and complementing the bytes.
+ **************************************************************************
+ */
+
+/* Write z into the width bytes at dst. Returns 0 on success, 1 if z is
+ * negative and signed is false, and 2 if z does not fit. Does not use the
+ * Python API.
+ */
+
+static int
+pack_bytes_one(unsigned char *dst, mpz_srcptr z, size_t width, int is_big,
+               int is_signed, mpz_ptr tmp)
+{
+    size_t bits, word, nwords, used, count, i;
+    int is_negative = mpz_sgn(z) < 0;
+
+    if (is_negative) {
+        if (!is_signed) {
+            return 1;
+        }
+        mpz_com(tmp, z);
+        z = tmp;
+    }
+
+    bits = mpz_sgn(z) ? mpz_sizeinbase(z, 2) : 0;
+    if (bits > 8 * width - (is_signed ? 1 : 0)) {
+        return 2;
+    }
+
+    word = (width % sizeof(mp_limb_t) == 0) ? sizeof(mp_limb_t) : 1;
+    nwords = width / word;
+    used = (bits + 8 * word - 1) / (8 * word);
+
+    if (is_big) {
+        memset(dst, 0, (nwords - used) * word);
+        mpz_export(dst + (nwords - used) * word, &count, 1, word, 1, 0, z);
+    }
+    else {
+        mpz_export(dst, &count, -1, word, -1, 0, z);
+        memset(dst + used * word, 0, (nwords - used) * word);
+    }
+
+    if (is_negative) {
+        for (i = 0; i < width; i++) {
+            dst[i] ^= 0xFF;
+        }
+    }
+    return 0;
+}
+
+/* Read the integer stored in the width bytes at src into z. modulus must be
+ * 2**(8*width) if signed is true. Does not use the Python API.
+ */
+
+static void
+unpack_bytes_one(mpz_ptr z, const unsigned char *src, size_t width, int is_big,
+                 int is_signed, mpz_srcptr modulus)
+{
+    size_t word = (width % sizeof(mp_limb_t) == 0) ? sizeof(mp_limb_t) : 1;
+
+    mpz_import(z, width / word, is_big ? 1 : -1, word, is_big ? 1 : -1, 0, src);
+    if (is_signed && (src[is_big ? 0 : width - 1] & 0x80)) {
+        mpz_sub(z, z, modulus);
+    }
+}
+
+static int
+pack_bytes_byteorder(const char *byteorder)
+{
+    if (strcmp(byteorder, "big") == 0) {
+        return 1;
+    }
+    if (strcmp(byteorder, "little") == 0) {
+        return 0;
+    }
+    VALUE_ERROR("byteorder must be either 'little' or 'big'");
+    return -1;
+}
+
+static void
+pack_bytes_error(int err)
+{
+    if (err == 1) {
+        OVERFLOW_ERROR("can't convert negative mpz to unsigned");
+    }
+    else {
+        OVERFLOW_ERROR("mpz too big to convert");
+    }
+}
+
+PyDoc_STRVAR(doc_pack_bytes,
+"pack_bytes(values, width, byteorder='big', *, signed=False, out=None)\n\n"
+"Store each integer in values in width bytes and return the concatenated\n"
+"bytes. values may be any iterable of integers or an `mpz_array`. The\n"
+"result is the same as joining x.to_bytes(width, byteorder, signed=signed)\n"
+"for each x. If out is given, the bytes are written to the start of the\n"
+"writable buffer out (for example a `bytearray` or `mmap`) and the number\n"
+"of bytes written is returned.");
+
+static PyObject *
+GMPy_MPZ_pack_bytes(PyObject *self, PyObject *args, PyObject *keywds)
+{
+    static char *kwlist[] = {"values", "width", "byteorder", "signed", "out", NULL};
+    PyObject *values, *out = Py_None, *seq = NULL, *result = NULL, *item;
+    MPZ_Array_Object *array = NULL;
+    MPZ_Object *temp;
+    Py_ssize_t width, n, i;
+    Py_buffer view;
+    const char *byteorder = "big";
+    unsigned char *dst;
+    int is_big, is_signed = 0, err = 0, xtype;
+    mpz_t tmp, z, elem;
+
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "On|s$pO:pack_bytes", kwlist,
+                                     &values, &width, &byteorder, &is_signed, &out)) {
+        return NULL;
+    }
+    if (width <= 0) {
+        VALUE_ERROR("width must be positive");
+        return NULL;
+    }
+    if ((is_big = pack_bytes_byteorder(byteorder)) < 0) {
+        return NULL;
+    }
+
+    if (MPZ_Array_Check(values)) {
+        array = (MPZ_Array_Object*)values;
+        n = array->length;
+    }
+    else {
+        if (!(seq = PySequence_Fast(values, "pack_bytes() requires an iterable of integers"))) {
+            return NULL;
+        }
+        n = PySequence_Fast_GET_SIZE(seq);
+    }
+    if (n && width > PY_SSIZE_T_MAX / n) {
+        Py_XDECREF(seq);
+        return PyErr_NoMemory();
+    }
+
+    if (out == Py_None) {
+        if (!(result = PyBytes_FromStringAndSize(NULL, n * width))) {
+            /* LCOV_EXCL_START */
+            Py_XDECREF(seq);
+            return NULL;
+            /* LCOV_EXCL_STOP */
+        }
+        dst = (unsigned char*)PyBytes_AS_STRING(result);
+    }
+    else {
+        if (PyObject_GetBuffer(out, &view, PyBUF_WRITABLE) < 0) {
+            Py_XDECREF(seq);
+            return NULL;
+        }
+        if (view.len < n * width) {
+            PyBuffer_Release(&view);
+            Py_XDECREF(seq);
+            VALUE_ERROR("output buffer is too small");
+            return NULL;
+        }
+        dst = (unsigned char*)view.buf;
+    }
+
+    mpz_init(tmp);
+    mpz_init(z);
+    if (array) {
+        Py_BEGIN_ALLOW_THREADS;
+        for (i = 0; i < n && !err; i++) {
+            MPZ_ARRAY_GET(elem, array, i);
+            err = pack_bytes_one(dst + i * width, elem, (size_t)width, is_big, is_signed, tmp);
+        }
+        Py_END_ALLOW_THREADS;
+        if (err) {
+            pack_bytes_error(err);
+        }
+    }
+    else {
+        for (i = 0; i < n && !err; i++) {
+            item = PySequence_Fast_GET_ITEM(seq, i);
+            xtype = GMPy_ObjectType(item);
+            if (IS_TYPE_MPZANY(xtype)) {
+                err = pack_bytes_one(dst + i * width, MPZ(item), (size_t)width,
+                                     is_big, is_signed, tmp);
+            }
+            else if (IS_TYPE_PyInteger(xtype)) {
+                if (mpz_set_PyLong(z, item)) {
+                    /* LCOV_EXCL_START */
+                    err = -1;
+                    break;
+                    /* LCOV_EXCL_STOP */
+                }
+                err = pack_bytes_one(dst + i * width, z, (size_t)width,
+                                     is_big, is_signed, tmp);
+            }
+            else if (IS_TYPE_HAS_MPZ(xtype)) {
+                if (!(temp = GMPy_MPZ_From_IntegerWithType(item, xtype, NULL))) {
+                    err = -1;
+                    break;
+                }
+                err = pack_bytes_one(dst + i * width, temp->z, (size_t)width,
+                                     is_big, is_signed, tmp);
+                Py_DECREF((PyObject*)temp);
+            }
+            else {
+                TYPE_ERROR("pack_bytes() requires an iterable of integers");
+                err = -1;
+            }
+        }
+        if (err > 0) {
+            pack_bytes_error(err);
+        }
+    }
+    mpz_clear(tmp);
+    mpz_clear(z);
+    Py_XDECREF(seq);
+
+    if (out != Py_None) {
+        PyBuffer_Release(&view);
+        if (!err) {
+            result = PyLong_FromSsize_t(n * width);
+        }
+    }
+    else if (err) {
+        Py_CLEAR(result);
+    }
+    return result;
+}
+
+PyDoc_STRVAR(doc_unpack_bytes,
+"unpack_bytes(buffer, width, count=None, byteorder='big', *, signed=False,\n"
+"             array=False)\n\n"
+"Return a list of the count integers stored in width bytes each at the\n"
+"start of buffer. The inverse of `pack_bytes()`. If count is None, the\n"
+"length of buffer must be a multiple of width and all the integers are\n"
+"returned. If array is True, an `mpz_array` is returned instead of a list;\n"
+"the integers are then read without holding the GIL.");
+
+static PyObject *
+GMPy_MPZ_unpack_bytes(PyObject *self, PyObject *args, PyObject *keywds)
+{
+    static char *kwlist[] = {"buffer", "width", "count", "byteorder", "signed", "array", NULL};
+    PyObject *buffer, *count_obj = Py_None, *result = NULL;
+    MPZ_Object *item;
+    MPZ_Array_Builder builder;
+    Py_ssize_t width, count, i;
+    Py_buffer view;
+    const char *byteorder = "big";
+    const unsigned char *src;
+    int is_big, is_signed = 0, as_array = 0, err = 0;
+    mpz_t modulus, z;
+    CTXT_Object *context = NULL;
+
+    if (!PyArg_ParseTupleAndKeywords(args, keywds, "On|Os$pp:unpack_bytes", kwlist,
+                                     &buffer, &width, &count_obj, &byteorder,
+                                     &is_signed, &as_array)) {
+        return NULL;
+    }
+    if (width <= 0) {
+        VALUE_ERROR("width must be positive");
+        return NULL;
+    }
+    if ((is_big = pack_bytes_byteorder(byteorder)) < 0) {
+        return NULL;
+    }
+
+    CHECK_CONTEXT(context);
+
+    if (PyObject_GetBuffer(buffer, &view, PyBUF_SIMPLE) < 0) {
+        return NULL;
+    }
+
+    if (count_obj == Py_None) {
+        if (view.len % width) {
+            PyBuffer_Release(&view);
+            VALUE_ERROR("buffer length must be a multiple of width");
+            return NULL;
+        }
+        count = view.len / width;
+    }
+    else {
+        count = PyLong_AsSsize_t(count_obj);
+        if (count == -1 && PyErr_Occurred()) {
+            PyBuffer_Release(&view);
+            return NULL;
+        }
+        if (count < 0) {
+            PyBuffer_Release(&view);
+            VALUE_ERROR("count must be non-negative");
+            return NULL;
+        }
+        if (count > view.len / width) {
+            PyBuffer_Release(&view);
+            VALUE_ERROR("buffer is too small");
+            return NULL;
+        }
+    }
+    src = (const unsigned char*)view.buf;
+
+    mpz_init(modulus);
+    if (is_signed) {
+        mpz_setbit(modulus, 8 * (mp_bitcnt_t)width);
+    }
+
+    if (as_array) {
+        if (GMPy_MPZ_Array_Builder_Init(&builder, count,
+                (size_t)count * (((size_t)width + sizeof(mp_limb_t) - 1) / sizeof(mp_limb_t))) < 0) {
+            /* LCOV_EXCL_START */
+            mpz_clear(modulus);
+            PyBuffer_Release(&view);
+            return NULL;
+            /* LCOV_EXCL_STOP */
+        }
+        mpz_init(z);
+        Py_BEGIN_ALLOW_THREADS;
+        for (i = 0; i < count && !err; i++) {
+            unpack_bytes_one(z, src + i * width, (size_t)width, is_big, is_signed, modulus);
+            err = GMPy_MPZ_Array_Builder_Append(&builder, z);
+        }
+        Py_END_ALLOW_THREADS;
+        mpz_clear(z);
+        if (err) {
+            /* LCOV_EXCL_START */
+            GMPy_MPZ_Array_Builder_Clear(&builder);
+            PyErr_NoMemory();
+            /* LCOV_EXCL_STOP */
+        }
+        else {
+            result = (PyObject*)GMPy_MPZ_Array_From_Builder(&builder);
+        }
+    }
+    else if ((result = PyList_New(count))) {
+        for (i = 0; i < count; i++) {
+            if (!(item = GMPy_MPZ_New(context))) {
+                /* LCOV_EXCL_START */
+                Py_CLEAR(result);
+                break;
+                /* LCOV_EXCL_STOP */
+            }
+            unpack_bytes_one(item->z, src + i * width, (size_t)width, is_big, is_signed, modulus);
+            PyList_SET_ITEM(result, i, (PyObject*)item);
+        }
+    }
+
+    mpz_clear(modulus);
+    PyBuffer_Release(&view);
+    return result;
+}
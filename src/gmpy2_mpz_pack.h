@@ -33,6 +33,8 @@ extern "C" {
 
 static PyObject * GMPy_MPZ_pack(PyObject *self, PyObject *args);
 static PyObject * GMPy_MPZ_unpack(PyObject *self, PyObject *args);
+static PyObject * GMPy_MPZ_pack_bytes(PyObject *self, PyObject *args, PyObject *keywds);
+static PyObject * GMPy_MPZ_unpack_bytes(PyObject *self, PyObject *args, PyObject *keywds);
 
 #ifdef __cplusplus
 }
@@ -0,0 +1,433 @@
+/* * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * *
+ * gmpy2_mpz_tree.c                                                         *
+ * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * *
+ * Python interface to the GMP, MPFR, and MPC multiple precision           *
+ * libraries.                                                              *
+ *                                                                         *
+ * Copyright 2000 - 2009 Alex Martelli                                     *
+ *                                                                         *
+ * Copyright 2008 - 2024 Case Van Horsen                                   *
+ *                                                                         *
+ * This file is part of GMPY2.                                             *
+ *                                                                         *
+ * GMPY2 is free software: you can redistribute it and/or modify it under  *
+ * the terms of the GNU Lesser General Public License as published by the  *
+ * Free Software Foundation, either version 3 of the License, or (at your  *
+ * option) any later version.                                              *
+ *                                                                         *
+ * GMPY2 is distributed in the hope that it will be useful, but WITHOUT    *
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or   *
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public    *
+ * License for more details.                                               *
+ *                                                                         *
+ * You should have received a copy of the GNU Lesser General Public        *
+ * License along with GMPY2; if not, see <http://www.gnu.org/licenses/>    *
+ * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * */
+
+
+/* This file implements prod(), product_tree(), and remainder_tree(). The
+ * product of many values is computed by multiplying pairs of values of
+ * similar size so GMP can use its fast multiplication algorithms. The
+ * remainders of one value modulo many moduli are computed by reducing the
+ * value down a product tree of the moduli.
+ */
+
+/* Convert the items in obj to a new array of mpz_t. Returns NULL with an
+ * exception set on error. Must be called with the GIL.
+ */
+
+static mpz_t *
+GMPy_MPZ_Tree_Leaves(PyObject *obj, Py_ssize_t *length)
+{
+    PyObject *seq;
+    MPZ_Object *temp;
+    mpz_t *result;
+    Py_ssize_t i;
+
+    if (!(seq = PySequence_Fast(obj, "argument must be an iterable"))) {
+        return NULL;
+    }
+
+    *length = PySequence_Fast_GET_SIZE(seq);
+    if (!(result = PyMem_RawMalloc((*length ? *length : 1) * sizeof(mpz_t)))) {
+        /* LCOV_EXCL_START */
+        Py_DECREF(seq);
+        PyErr_NoMemory();
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+
+    for (i = 0; i < *length; i++) {
+        if (!(temp = GMPy_MPZ_From_Integer(PySequence_Fast_GET_ITEM(seq, i), NULL))) {
+            GMPy_MPZ_Tree_Free_Leaves(result, i);
+            Py_DECREF(seq);
+            TYPE_ERROR("all items in iterable must be integers");
+            return NULL;
+        }
+        mpz_init_set(result[i], temp->z);
+        Py_DECREF((PyObject*)temp);
+    }
+
+    Py_DECREF(seq);
+    return result;
+}
+
+static void
+GMPy_MPZ_Tree_Free_Leaves(mpz_t *leaves, Py_ssize_t length)
+{
+    Py_ssize_t i;
+
+    for (i = 0; i < length; i++) {
+        mpz_clear(leaves[i]);
+    }
+    PyMem_RawFree(leaves);
+}
+
+/* Replace values[0] with the product of all the values. The other values
+ * are overwritten. length must be > 0.
+ */
+
+static void
+GMPy_MPZ_Tree_Prod(mpz_t *values, Py_ssize_t length)
+{
+    Py_ssize_t i;
+
+    while (length > 1) {
+        for (i = 0; i < length / 2; i++) {
+            mpz_mul(values[i], values[2 * i], values[2 * i + 1]);
+        }
+        if (length & 1) {
+            mpz_swap(values[i], values[length - 1]);
+        }
+        length = (length + 1) / 2;
+    }
+}
+
+/* Allocate the levels of a product tree. The tree takes ownership of the
+ * leaves, which are freed by GMPy_Product_Tree_Clear(). If an error occurs,
+ * the leaves are freed and -1 is returned with an exception set. Must be
+ * called with the GIL.
+ */
+
+static int
+GMPy_Product_Tree_Init(GMPy_Product_Tree *tree, mpz_t *leaves, Py_ssize_t length)
+{
+    Py_ssize_t i, n;
+
+    tree->length = length;
+    tree->levels = 1;
+    tree->count[0] = length;
+    tree->nodes[0] = leaves;
+
+    for (n = length; n > 1; tree->levels++) {
+        n = (n + 1) / 2;
+        if (!(tree->nodes[tree->levels] = PyMem_RawMalloc(n * sizeof(mpz_t)))) {
+            /* LCOV_EXCL_START */
+            GMPy_Product_Tree_Clear(tree);
+            PyErr_NoMemory();
+            return -1;
+            /* LCOV_EXCL_STOP */
+        }
+        for (i = 0; i < n; i++) {
+            mpz_init(tree->nodes[tree->levels][i]);
+        }
+        tree->count[tree->levels] = n;
+    }
+    return 0;
+}
+
+/* Compute the nodes above the leaves. */
+
+static void
+GMPy_Product_Tree_Build(GMPy_Product_Tree *tree)
+{
+    Py_ssize_t i;
+    int k;
+
+    for (k = 1; k < tree->levels; k++) {
+        for (i = 0; i < tree->count[k]; i++) {
+            if (2 * i + 1 < tree->count[k - 1]) {
+                mpz_mul(tree->nodes[k][i], tree->nodes[k - 1][2 * i],
+                        tree->nodes[k - 1][2 * i + 1]);
+            }
+            else {
+                mpz_set(tree->nodes[k][i], tree->nodes[k - 1][2 * i]);
+            }
+        }
+    }
+}
+
+static void
+GMPy_Product_Tree_Clear(GMPy_Product_Tree *tree)
+{
+    Py_ssize_t i;
+    int k;
+
+    for (k = 0; k < tree->levels; k++) {
+        for (i = 0; i < tree->count[k]; i++) {
+            mpz_clear(tree->nodes[k][i]);
+        }
+        PyMem_RawFree(tree->nodes[k]);
+    }
+    tree->levels = 0;
+}
+
+/* tmp[k] contains n modulo node idx on level k. */
+
+static void
+GMPy_Product_Tree_Descend(GMPy_Product_Tree *tree, int k, Py_ssize_t idx,
+                          mpz_t *tmp, mpz_ptr *out)
+{
+    Py_ssize_t i;
+
+    for (i = 2 * idx; i <= 2 * idx + 1 && i < tree->count[k - 1]; i++) {
+        if (k == 1) {
+            mpz_tdiv_r(out[i], tmp[1], tree->nodes[0][i]);
+        }
+        else {
+            mpz_tdiv_r(tmp[k - 1], tmp[k], tree->nodes[k - 1][i]);
+            GMPy_Product_Tree_Descend(tree, k - 1, i, tmp, out);
+        }
+    }
+}
+
+/* Set out[i] to n modulo leaf i for all the leaves. The tree must be built
+ * and the leaves must be positive. The remainders are >= 0.
+ */
+
+static void
+GMPy_Product_Tree_Remainders(GMPy_Product_Tree *tree, mpz_srcptr n, mpz_ptr *out)
+{
+    mpz_t tmp[GMPY_TREE_MAX_LEVELS];
+    int k, top = tree->levels - 1;
+
+    if (tree->length == 0) {
+        return;
+    }
+
+    for (k = 0; k <= top; k++) {
+        mpz_init(tmp[k]);
+    }
+
+    mpz_fdiv_r(tmp[top], n, tree->nodes[top][0]);
+    if (top == 0) {
+        mpz_swap(out[0], tmp[0]);
+    }
+    else {
+        GMPy_Product_Tree_Descend(tree, top, 0, tmp, out);
+    }
+
+    for (k = 0; k <= top; k++) {
+        mpz_clear(tmp[k]);
+    }
+}
+
+PyDoc_STRVAR(GMPy_doc_mpz_function_prod,
+"prod(values, /) -> mpz\n\n"
+"Return the product of the integers in values. Pairs of values of\n"
+"similar size are multiplied so the time used grows almost linearly\n"
+"with the size of the result. Returns 1 if values is empty. Will always\n"
+"release the GIL.");
+
+static PyObject *
+GMPy_MPZ_Function_Prod(PyObject *self, PyObject *other)
+{
+    MPZ_Object *result;
+    mpz_t *values;
+    Py_ssize_t length;
+
+    if (!(values = GMPy_MPZ_Tree_Leaves(other, &length))) {
+        return NULL;
+    }
+
+    if (!(result = GMPy_MPZ_New(NULL))) {
+        /* LCOV_EXCL_START */
+        GMPy_MPZ_Tree_Free_Leaves(values, length);
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+
+    if (length == 0) {
+        mpz_set_ui(result->z, 1);
+    }
+    else {
+        Py_BEGIN_ALLOW_THREADS;
+        GMPy_MPZ_Tree_Prod(values, length);
+        mpz_swap(result->z, values[0]);
+        Py_END_ALLOW_THREADS;
+    }
+
+    GMPy_MPZ_Tree_Free_Leaves(values, length);
+    return (PyObject*)result;
+}
+
+PyDoc_STRVAR(GMPy_doc_mpz_function_product_tree,
+"product_tree(values, /) -> list[list[mpz, ...], ...]\n\n"
+"Return the product tree of the integers in values as a list of levels.\n"
+"The first level contains the values and each following level contains\n"
+"the products of adjacent pairs of the previous level. If a level has\n"
+"an odd length, its last item is copied to the next level. The last\n"
+"level contains the product of all the values. Will always release the\n"
+"GIL.");
+
+static PyObject *
+GMPy_MPZ_Function_ProductTree(PyObject *self, PyObject *other)
+{
+    GMPy_Product_Tree tree;
+    PyObject *result, *level;
+    MPZ_Object *temp;
+    mpz_t *leaves;
+    Py_ssize_t i, length;
+    int k;
+
+    if (!(leaves = GMPy_MPZ_Tree_Leaves(other, &length))) {
+        return NULL;
+    }
+
+    if (length == 0) {
+        GMPy_MPZ_Tree_Free_Leaves(leaves, length);
+        VALUE_ERROR("product_tree() requires at least one value");
+        return NULL;
+    }
+
+    if (GMPy_Product_Tree_Init(&tree, leaves, length) < 0) {
+        /* LCOV_EXCL_START */
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+
+    Py_BEGIN_ALLOW_THREADS;
+    GMPy_Product_Tree_Build(&tree);
+    Py_END_ALLOW_THREADS;
+
+    if (!(result = PyList_New(tree.levels))) {
+        /* LCOV_EXCL_START */
+        GMPy_Product_Tree_Clear(&tree);
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+
+    for (k = 0; k < tree.levels; k++) {
+        if (!(level = PyList_New(tree.count[k]))) {
+            /* LCOV_EXCL_START */
+            goto error;
+            /* LCOV_EXCL_STOP */
+        }
+        PyList_SET_ITEM(result, k, level);
+        for (i = 0; i < tree.count[k]; i++) {
+            if (!(temp = GMPy_MPZ_New(NULL))) {
+                /* LCOV_EXCL_START */
+                goto error;
+                /* LCOV_EXCL_STOP */
+            }
+            mpz_swap(temp->z, tree.nodes[k][i]);
+            PyList_SET_ITEM(level, i, (PyObject*)temp);
+        }
+    }
+
+    GMPy_Product_Tree_Clear(&tree);
+    return result;
+
+  error:
+    /* LCOV_EXCL_START */
+    GMPy_Product_Tree_Clear(&tree);
+    Py_DECREF(result);
+    return NULL;
+    /* LCOV_EXCL_STOP */
+}
+
+PyDoc_STRVAR(GMPy_doc_mpz_function_remainder_tree,
+"remainder_tree(n, moduli, /) -> list[mpz, ...]\n\n"
+"Return [f_mod(n, m) for m in moduli]. n is reduced down a product tree\n"
+"of the moduli so the time used grows almost linearly with the total\n"
+"size of n and the moduli. Will always release the GIL.");
+
+static PyObject *
+GMPy_MPZ_Function_RemainderTree(PyObject *self, PyObject *const *args,
+                                Py_ssize_t nargs)
+{
+    GMPy_Product_Tree tree;
+    MPZ_Object *tempn, *temp;
+    PyObject *result = NULL;
+    mpz_t *leaves;
+    mpz_ptr *out = NULL;
+    char *negative = NULL;
+    Py_ssize_t i, length;
+
+    if (nargs != 2) {
+        TYPE_ERROR("remainder_tree() requires 2 arguments");
+        return NULL;
+    }
+
+    if (!(tempn = GMPy_MPZ_From_Integer(args[0], NULL))) {
+        TYPE_ERROR("remainder_tree() requires an integer 'n'");
+        return NULL;
+    }
+
+    if (!(leaves = GMPy_MPZ_Tree_Leaves(args[1], &length))) {
+        Py_DECREF((PyObject*)tempn);
+        return NULL;
+    }
+
+    if (!(negative = PyMem_Malloc(length ? length : 1)) ||
+        !(out = PyMem_New(mpz_ptr, length ? length : 1))) {
+        /* LCOV_EXCL_START */
+        GMPy_MPZ_Tree_Free_Leaves(leaves, length);
+        PyErr_NoMemory();
+        goto done;
+        /* LCOV_EXCL_STOP */
+    }
+
+    for (i = 0; i < length; i++) {
+        if (mpz_sgn(leaves[i]) == 0) {
+            GMPy_MPZ_Tree_Free_Leaves(leaves, length);
+            ZERO_ERROR("remainder_tree() division by 0");
+            goto done;
+        }
+        negative[i] = mpz_sgn(leaves[i]) < 0;
+        mpz_abs(leaves[i], leaves[i]);
+    }
+
+    if (GMPy_Product_Tree_Init(&tree, leaves, length) < 0) {
+        /* LCOV_EXCL_START */
+        goto done;
+        /* LCOV_EXCL_STOP */
+    }
+
+    if (!(result = PyList_New(length))) {
+        /* LCOV_EXCL_START */
+        GMPy_Product_Tree_Clear(&tree);
+        goto done;
+        /* LCOV_EXCL_STOP */
+    }
+    for (i = 0; i < length; i++) {
+        if (!(temp = GMPy_MPZ_New(NULL))) {
+            /* LCOV_EXCL_START */
+            GMPy_Product_Tree_Clear(&tree);
+            Py_CLEAR(result);
+            goto done;
+            /* LCOV_EXCL_STOP */
+        }
+        PyList_SET_ITEM(result, i, (PyObject*)temp);
+        out[i] = temp->z;
+    }
+
+    Py_BEGIN_ALLOW_THREADS;
+    GMPy_Product_Tree_Build(&tree);
+    GMPy_Product_Tree_Remainders(&tree, tempn->z, out);
+    /* f_mod() returns a result with the same sign as the modulus. */
+    for (i = 0; i < length; i++) {
+        if (negative[i] && mpz_sgn(out[i])) {
+            mpz_sub(out[i], out[i], tree.nodes[0][i]);
+        }
+    }
+    Py_END_ALLOW_THREADS;
+
+    GMPy_Product_Tree_Clear(&tree);
+
+  done:
+    Py_DECREF((PyObject*)tempn);
+    PyMem_Free(negative);
+    PyMem_Free(out);
+    return result;
+}
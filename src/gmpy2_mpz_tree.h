@@ -0,0 +1,67 @@
+/* * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * *
+ * gmpy2_mpz_tree.h                                                         *
+ * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * *
+ * Python interface to the GMP, MPFR, and MPC multiple precision           *
+ * libraries.                                                              *
+ *                                                                         *
+ * Copyright 2000 - 2009 Alex Martelli                                     *
+ *                                                                         *
+ * Copyright 2008 - 2024 Case Van Horsen                                   *
+ *                                                                         *
+ * This file is part of GMPY2.                                             *
+ *                                                                         *
+ * GMPY2 is free software: you can redistribute it and/or modify it under  *
+ * the terms of the GNU Lesser General Public License as published by the  *
+ * Free Software Foundation, either version 3 of the License, or (at your  *
+ * option) any later version.                                              *
+ *                                                                         *
+ * GMPY2 is distributed in the hope that it will be useful, but WITHOUT    *
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or   *
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public    *
+ * License for more details.                                               *
+ *                                                                         *
+ * You should have received a copy of the GNU Lesser General Public        *
+ * License along with GMPY2; if not, see <http://www.gnu.org/licenses/>    *
+ * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * */
+
+#ifndef GMPY_MPZ_TREE_H
+#define GMPY_MPZ_TREE_H
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+/* A product tree stores the leaves on level 0. Node i on level k is the
+ * product of nodes 2*i and 2*i+1 on level k-1. If level k-1 has an odd
+ * number of nodes, the last node is copied to level k. The last level
+ * contains the product of all the leaves. The GMPy_Product_Tree functions
+ * other than GMPy_Product_Tree_Init do not use the Python API and may be
+ * called without the GIL.
+ */
+
+#define GMPY_TREE_MAX_LEVELS 64
+
+typedef struct {
+    Py_ssize_t length;                      /* number of leaves         */
+    int levels;                             /* number of levels         */
+    Py_ssize_t count[GMPY_TREE_MAX_LEVELS]; /* number of nodes per level */
+    mpz_t *nodes[GMPY_TREE_MAX_LEVELS];
+} GMPy_Product_Tree;
+
+static mpz_t *    GMPy_MPZ_Tree_Leaves(PyObject *obj, Py_ssize_t *length);
+static void       GMPy_MPZ_Tree_Free_Leaves(mpz_t *leaves, Py_ssize_t length);
+static void       GMPy_MPZ_Tree_Prod(mpz_t *values, Py_ssize_t length);
+
+static int        GMPy_Product_Tree_Init(GMPy_Product_Tree *tree, mpz_t *leaves, Py_ssize_t length);
+static void       GMPy_Product_Tree_Build(GMPy_Product_Tree *tree);
+static void       GMPy_Product_Tree_Clear(GMPy_Product_Tree *tree);
+static void       GMPy_Product_Tree_Remainders(GMPy_Product_Tree *tree, mpz_srcptr n, mpz_ptr *out);
+
+static PyObject * GMPy_MPZ_Function_Prod(PyObject *self, PyObject *other);
+static PyObject * GMPy_MPZ_Function_ProductTree(PyObject *self, PyObject *other);
+static PyObject * GMPy_MPZ_Function_RemainderTree(PyObject *self, PyObject *const *args, Py_ssize_t nargs);
+
+#ifdef __cplusplus
+}
+#endif
+#endif
@@ -327,11 +327,11 @@ PyDoc_STRVAR(GMPy_doc_context_mul,
 "Return x * y.");
 
 static PyObject *
-GMPy_Context_Mul(PyObject *self, PyObject *args)
+GMPy_Context_Mul(PyObject *self, PyObject *const *args, Py_ssize_t nargs)
 {
     CTXT_Object *context = NULL;
 
-    if (PyTuple_GET_SIZE(args) != 2) {
+    if (nargs != 2) {
         TYPE_ERROR("mul() requires 2 arguments");
         return NULL;
     }
@@ -343,7 +343,5 @@ GMPy_Context_Mul(PyObject *self, PyObject *args)
         CHECK_CONTEXT(context);
     }
 
-    return GMPy_Number_Mul(PyTuple_GET_ITEM(args, 0),
-                           PyTuple_GET_ITEM(args, 1),
-                           context);
+    return GMPy_Number_Mul(args[0], args[1], context);
 }
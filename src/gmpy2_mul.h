@@ -42,7 +42,7 @@ static PyObject * GMPy_Rational_MulWithType(PyObject *x, int xtype, PyObject *y,
 static PyObject * GMPy_Real_MulWithType(PyObject *x, int xtype, PyObject *y, int ytype, CTXT_Object *context);
 static PyObject * GMPy_Complex_MulWithType(PyObject *x, int xtype, PyObject *y, int ytype, CTXT_Object *context);
 static PyObject * GMPy_Number_Mul_Slot(PyObject *x, PyObject *y);
-static PyObject * GMPy_Context_Mul(PyObject *self, PyObject *args);
+static PyObject * GMPy_Context_Mul(PyObject *self, PyObject *const *args, Py_ssize_t nargs);
 
 #ifdef __cplusplus
 }
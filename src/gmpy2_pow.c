@@ -198,92 +198,138 @@ GMPy_Integer_PowWithType(PyObject *b, int btype, PyObject *e, int etype,
     return NULL;
 }
 
-static PyObject *
-GMPy_Integer_PowModBaseListWithType(PyObject *base_lst,
-                                    PyObject *e, int etype,
-                                    PyObject *m, int mtype)
-{
-    MPZ_Object *tempe = NULL, *tempm = NULL, *tempres = NULL;
-    PyObject *result = NULL, *temp = NULL;
-    Py_ssize_t i, seq_length;
+/* Arguments for GMPy_Integer_PowModList_Work. Each item of lst is an
+ * MPZ_Object that is replaced by the result. If base is NULL, the items are
+ * the bases; otherwise the items are the exponents.
+ */
 
-    if (!(tempm = GMPy_MPZ_From_IntegerWithType(m, mtype, NULL)) ||
-        !(tempe = GMPy_MPZ_From_IntegerWithType(e, etype, NULL))) {
-        return NULL;
-    }
+typedef struct {
+    PyObject *lst;
+    mpz_srcptr base;
+    mpz_srcptr exp;
+    mpz_srcptr mod;
+} GMPy_PowModList_Args;
 
-    if (mpz_sgn(tempm->z) < 1) {
-        VALUE_ERROR("powmod_base_list() 'mod' must be > 0");
-        Py_DECREF((PyObject*)tempm);
-        Py_DECREF((PyObject*)tempe);
-        return NULL;
+static void
+GMPy_Integer_PowModList_Work(void *arg, Py_ssize_t start, Py_ssize_t stop)
+{
+    GMPy_PowModList_Args *args = (GMPy_PowModList_Args*)arg;
+    PyObject *temp;
+    Py_ssize_t i;
+
+    for (i = start; i < stop; i++) {
+        temp = PySequence_Fast_GET_ITEM(args->lst, i);
+        if (args->base) {
+            mpz_powm(MPZ(temp), args->base, MPZ(temp), args->mod);
+        }
+        else {
+            mpz_powm(MPZ(temp), MPZ(temp), args->exp, args->mod);
+        }
     }
+}
+
+/* Convert all items of lst to new mpz objects that can be changed in-place.
+ *
+ * Note: MUST USE GMPy_MPZ_From_IntegerAndCopy()
+ *       since the value is changed in-place.
+ */
+
+static PyObject *
+GMPy_Integer_PowModList_Copy(PyObject *lst)
+{
+    MPZ_Object *tempres = NULL;
+    PyObject *result = NULL;
+    Py_ssize_t i, seq_length;
 
-    /* Convert base_lst to a true list. */
+    /* Convert lst to a true list. */
 
-    if (!(base_lst = PySequence_Fast(base_lst, "argument must be an iterable"))) {
+    if (!(lst = PySequence_Fast(lst, "argument must be an iterable"))) {
         return NULL;
     }
 
-    /* Try to convert all items of base_lst to an mpz.
-     * 
-     * Note: MUST USE GMPy_MPZ_From_IntegerAndCopy()
-     *       since the value is changed in-place.
-     */
-
-    seq_length = PySequence_Fast_GET_SIZE(base_lst);
+    seq_length = PySequence_Fast_GET_SIZE(lst);
     if (!(result = PyList_New(seq_length))) {
-        Py_DECREF((PyObject*)tempe);
-        Py_DECREF((PyObject*)tempm);
-        Py_DECREF((PyObject*)base_lst);
+        Py_DECREF(lst);
         return NULL;
     }
 
     for (i=0; i < seq_length; i++) {
-        if (!(tempres = GMPy_MPZ_From_IntegerAndCopy(PySequence_Fast_GET_ITEM(base_lst, i), NULL))) {
-            Py_DECREF((PyObject*)tempe);
-            Py_DECREF((PyObject*)tempm);
-            Py_DECREF(base_lst);
+        if (!(tempres = GMPy_MPZ_From_IntegerAndCopy(PySequence_Fast_GET_ITEM(lst, i), NULL))) {
+            Py_DECREF(lst);
             Py_DECREF(result);
             TYPE_ERROR("all items in iterable must be integers");
             return NULL;
         }
+        PyList_SET_ITEM(result, i, (PyObject*)tempres);
+    }
 
-        if (PyList_SetItem(result, i, (PyObject*)tempres) < 0) {
-            Py_DECREF((PyObject*)tempe);
-            Py_DECREF((PyObject*)tempm);
-            Py_DECREF(base_lst);
-            Py_DECREF(result);
-            return NULL;
-        }
+    Py_DECREF(lst);
+    return result;
+}
+
+static PyObject *
+GMPy_Integer_PowModBaseListWithType(PyObject *base_lst,
+                                    PyObject *e, int etype,
+                                    PyObject *m, int mtype,
+                                    int threads)
+{
+    MPZ_Object *tempe = NULL, *tempm = NULL;
+    PyObject *result = NULL;
+    GMPy_PowModList_Args args;
+
+    if (!(tempm = GMPy_MPZ_From_IntegerWithType(m, mtype, NULL)) ||
+        !(tempe = GMPy_MPZ_From_IntegerWithType(e, etype, NULL))) {
+        Py_XDECREF((PyObject*)tempm);
+        return NULL;
     }
 
-    Py_BEGIN_ALLOW_THREADS;
-    for (i=0; i < seq_length; i++) {
-        temp = PySequence_Fast_GET_ITEM(result, i);
-        mpz_powm(MPZ(temp), MPZ(temp), tempe->z, tempm->z);
+    if (mpz_sgn(tempm->z) < 1) {
+        VALUE_ERROR("powmod_base_list() 'mod' must be > 0");
+        goto done;
+    }
+
+    if (!(result = GMPy_Integer_PowModList_Copy(base_lst))) {
+        goto done;
     }
-    Py_END_ALLOW_THREADS;
 
+    args.lst = result;
+    args.base = NULL;
+    args.exp = tempe->z;
+    args.mod = tempm->z;
+    if (GMPy_Parallel_For(PyList_GET_SIZE(result), threads,
+                          GMPy_Integer_PowModList_Work, &args) < 0) {
+        /* LCOV_EXCL_START */
+        Py_CLEAR(result);
+        /* LCOV_EXCL_STOP */
+    }
+
+  done:
     Py_DECREF((PyObject*)tempe);
     Py_DECREF((PyObject*)tempm);
-    Py_DECREF((PyObject*)base_lst);
-    return (PyObject*)result;
+    return result;
 }
 
 PyDoc_STRVAR(GMPy_doc_integer_powmod_base_list,
-"powmod_base_list(base_lst, exp, mod, /) -> list[mpz, ...]\n\n"
+"powmod_base_list(base_lst, exp, mod, /, *, threads=1) -> list[mpz, ...]\n\n"
 "Returns list(powmod(i, exp, mod) for i in base_lst). Will always release\n"
-"the GIL. (Experimental in gmpy2 2.1.x).");
+"the GIL. If threads is greater than 1, the work is split across that\n"
+"many native threads. The order of the results is not changed.\n"
+"(Experimental in gmpy2 2.1.x).");
 
 static PyObject *
-GMPy_Integer_PowMod_Base_List(PyObject *self, PyObject *args)
+GMPy_Integer_PowMod_Base_List(PyObject *self, PyObject *args, PyObject *keywds)
 {
+    int threads;
+
     if (PyTuple_GET_SIZE(args) != 3) {
         TYPE_ERROR("powmod_base_list requires 3 arguments");
         return NULL;
     }
 
+    if ((threads = GMPy_Parse_Threads(keywds, "powmod_base_list")) < 0) {
+        return NULL;
+    }
+
     if (!PySequence_Check(PyTuple_GET_ITEM(args, 0))) {
         TYPE_ERROR("the first argument to powmod_base_list must be a sequence");
         return NULL;
@@ -295,7 +341,8 @@ GMPy_Integer_PowMod_Base_List(PyObject *self, PyObject *args)
     if (IS_TYPE_INTEGER(etype) && IS_TYPE_INTEGER(mtype))
         return GMPy_Integer_PowModBaseListWithType(PyTuple_GET_ITEM(args, 0),
                                                    PyTuple_GET_ITEM(args, 1), etype,
-                                                   PyTuple_GET_ITEM(args, 2), mtype);
+                                                   PyTuple_GET_ITEM(args, 2), mtype,
+                                                   threads);
 
     TYPE_ERROR("powmod_base_list() requires integer arguments");
     return NULL;
@@ -304,89 +351,66 @@ GMPy_Integer_PowMod_Base_List(PyObject *self, PyObject *args)
 static PyObject *
 GMPy_Integer_PowModExpListWithType(PyObject *b, int btype,
                                    PyObject *exp_lst,
-                                   PyObject *m, int mtype)
+                                   PyObject *m, int mtype,
+                                   int threads)
 {
-    MPZ_Object *tempb = NULL, *tempm = NULL, *tempres = NULL;
-    PyObject *result = NULL, *temp = NULL;
-    Py_ssize_t i, seq_length;
+    MPZ_Object *tempb = NULL, *tempm = NULL;
+    PyObject *result = NULL;
+    GMPy_PowModList_Args args;
 
     if (!(tempm = GMPy_MPZ_From_IntegerWithType(m, mtype, NULL)) ||
         !(tempb = GMPy_MPZ_From_IntegerWithType(b, btype, NULL))) {
+        Py_XDECREF((PyObject*)tempm);
         return NULL;
     }
 
     if (mpz_sgn(tempm->z) < 1) {
         VALUE_ERROR("powmod_exp_list() 'mod' must be > 0");
-        Py_DECREF((PyObject*)tempm);
-        Py_DECREF((PyObject*)tempb);
-        return NULL;
-    }
-
-    /* Convert exp_lst to a true list. */
-
-    if (!(exp_lst = PySequence_Fast(exp_lst, "argument must be an iterable"))) {
-        return NULL;
-    }
-
-    /* Try to convert all items of exp_lst to an mpz.
-     *
-     * Note: MUST USE GMPy_MPZ_From_IntegerAndCopy()
-     *       since the value it changes in-place.
-     */
-
-    seq_length = PySequence_Fast_GET_SIZE(exp_lst);
-    if (!(result = PyList_New(seq_length))) {
-        Py_DECREF((PyObject*)tempb);
-        Py_DECREF((PyObject*)tempm);
-        Py_DECREF((PyObject*)exp_lst);
-        return NULL;
+        goto done;
     }
 
-    for (i=0; i < seq_length; i++) {
-        if (!(tempres = GMPy_MPZ_From_IntegerAndCopy(PySequence_Fast_GET_ITEM(exp_lst, i), NULL))) {
-            Py_DECREF((PyObject*)tempb);
-            Py_DECREF((PyObject*)tempm);
-            Py_DECREF(exp_lst);
-            Py_DECREF(result);
-            TYPE_ERROR("all items in iterable must be integers");
-            return NULL;
-        }
-
-        if (PyList_SetItem(result, i, (PyObject*)tempres) < 0) {
-            Py_DECREF((PyObject*)tempb);
-            Py_DECREF((PyObject*)tempm);
-            Py_DECREF(exp_lst);
-            Py_DECREF(result);
-            return NULL;
-        }
+    if (!(result = GMPy_Integer_PowModList_Copy(exp_lst))) {
+        goto done;
     }
 
-    Py_BEGIN_ALLOW_THREADS;
-    for (i=0; i < seq_length; i++) {
-        temp = PySequence_Fast_GET_ITEM(result, i);
-        mpz_powm(MPZ(temp), tempb->z, MPZ(temp), tempm->z);
+    args.lst = result;
+    args.base = tempb->z;
+    args.exp = NULL;
+    args.mod = tempm->z;
+    if (GMPy_Parallel_For(PyList_GET_SIZE(result), threads,
+                          GMPy_Integer_PowModList_Work, &args) < 0) {
+        /* LCOV_EXCL_START */
+        Py_CLEAR(result);
+        /* LCOV_EXCL_STOP */
     }
-    Py_END_ALLOW_THREADS;
 
+  done:
     Py_DECREF((PyObject*)tempb);
     Py_DECREF((PyObject*)tempm);
-    Py_DECREF((PyObject*)exp_lst);
-    return (PyObject*)result;
+    return result;
 }
 
 PyDoc_STRVAR(GMPy_doc_integer_powmod_exp_list,
-"powmod_exp_list(base, exp_lst, mod, /) -> list[mpz, ...]\n\n"
+"powmod_exp_list(base, exp_lst, mod, /, *, threads=1) -> list[mpz, ...]\n\n"
 "Returns list(powmod(base, i, mod) for i in exp_lst). Will always release\n"
-"the GIL. (Experimental in gmpy2 2.1.x).");
+"the GIL. If threads is greater than 1, the work is split across that\n"
+"many native threads. The order of the results is not changed.\n"
+"(Experimental in gmpy2 2.1.x).");
 
 static PyObject *
-GMPy_Integer_PowMod_Exp_List(PyObject *self, PyObject *args)
+GMPy_Integer_PowMod_Exp_List(PyObject *self, PyObject *args, PyObject *keywds)
 {
+    int threads;
+
     if (PyTuple_GET_SIZE(args) != 3) {
         TYPE_ERROR("powmod_exp_list requires 3 arguments");
         return NULL;
     }
 
+    if ((threads = GMPy_Parse_Threads(keywds, "powmod_exp_list")) < 0) {
+        return NULL;
+    }
+
     if (!PySequence_Check(PyTuple_GET_ITEM(args, 1))) {
         TYPE_ERROR("the second argument to powmod_exp_list must be a sequence");
         return NULL;
@@ -398,7 +422,8 @@ GMPy_Integer_PowMod_Exp_List(PyObject *self, PyObject *args)
     if (IS_TYPE_INTEGER(btype) && IS_TYPE_INTEGER(mtype))
         return GMPy_Integer_PowModExpListWithType(PyTuple_GET_ITEM(args, 0), btype,
                                                   PyTuple_GET_ITEM(args, 1),
-                                                  PyTuple_GET_ITEM(args, 2), mtype);
+                                                  PyTuple_GET_ITEM(args, 2), mtype,
+                                                  threads);
 
     TYPE_ERROR("powmod_exp_list() requires integer arguments");
     return NULL;
@@ -675,6 +700,294 @@ GMPy_Integer_PowMod(PyObject *self, PyObject *args)
     return NULL;
 }
 
+/* Set r to prod(b[i]**e[i]) mod m using Straus' interleaved method. All the
+ * exponents share a single chain of squarings. Each base has its own table
+ * of odd powers and each exponent is scanned with a sliding window. The
+ * items of bases and exps must be mpz objects that may be changed in-place
+ * and the exponents must be >= 0. Returns 0 on success or -1 if memory could
+ * not be allocated. Does not use the Python API.
+ */
+
+typedef struct {
+    Py_ssize_t bit;         /* multiply after squaring down to this bit */
+    size_t index;           /* index into the table of odd powers       */
+} GMPy_PowMulti_Event;
+
+static int
+GMPy_Integer_PowMulti_Mont(const GMPy_Mont *mt, mpz_ptr r, PyObject *bases,
+                           PyObject *exps, Py_ssize_t k)
+{
+    mp_size_t n = mt->n;
+    mp_limb_t *limbs, *tables, *tp, *a2, *acc;
+    GMPy_PowMulti_Event *events;
+    Py_ssize_t i, j, l, bit, bits, maxbits = 0, nevents = 0;
+    Py_ssize_t *first, *count;
+    size_t *table_offset, tsize, ntable = 0, w;
+    int *window, started = 0;
+
+    /* Each exponent gets at most one event per bit. */
+    for (i = 0; i < k; i++) {
+        nevents += (Py_ssize_t)mpz_sizeinbase(MPZ(PyList_GET_ITEM(exps, i)), 2);
+    }
+
+    limbs = NULL;
+    events = PyMem_RawMalloc((nevents + 1) * sizeof(GMPy_PowMulti_Event));
+    first = PyMem_RawMalloc(2 * (k + 1) * sizeof(Py_ssize_t));
+    table_offset = PyMem_RawMalloc((k + 1) * sizeof(size_t));
+    window = PyMem_RawMalloc((k + 1) * sizeof(int));
+    if (!events || !first || !table_offset || !window) {
+        /* LCOV_EXCL_START */
+        goto nomem;
+        /* LCOV_EXCL_STOP */
+    }
+    count = first + k + 1;
+
+    for (i = 0; i < k; i++) {
+        mpz_srcptr e = MPZ(PyList_GET_ITEM(exps, i));
+
+        bits = mpz_sgn(e) ? (Py_ssize_t)mpz_sizeinbase(e, 2) : 0;
+        if (bits > maxbits) {
+            maxbits = bits;
+        }
+        window[i] = GMPy_Mont_Window((mp_bitcnt_t)bits);
+        if (window[i] > 6) {
+            window[i] = 6;
+        }
+        table_offset[i] = ntable;
+        ntable += ((size_t)1 << (window[i] - 1)) * n;
+    }
+
+    if (!(limbs = PyMem_RawMalloc((ntable + 5 * n) * sizeof(mp_limb_t)))) {
+        /* LCOV_EXCL_START */
+        goto nomem;
+        /* LCOV_EXCL_STOP */
+    }
+    tables = limbs;
+    tp = tables + ntable;
+    a2 = tp + 2 * n;
+    acc = a2 + n;
+
+    /* Build the tables of odd powers and list where each window ends. */
+    nevents = 0;
+    for (i = 0; i < k; i++) {
+        mpz_srcptr e = MPZ(PyList_GET_ITEM(exps, i));
+        mp_limb_t *table = tables + table_offset[i];
+
+        tsize = (size_t)1 << (window[i] - 1);
+        GMPy_Mont_Load(mt, table, MPZ(PyList_GET_ITEM(bases, i)), r);
+        GMPy_Mont_To(mt, table, table, tp);
+        if (tsize > 1) {
+            GMPy_Mont_Sqr(mt, a2, table, tp);
+            for (w = 1; w < tsize; w++) {
+                GMPy_Mont_Mul(mt, table + w * n, table + (w - 1) * n, a2, tp);
+            }
+        }
+
+        first[i] = nevents;
+        bit = mpz_sgn(e) ? (Py_ssize_t)mpz_sizeinbase(e, 2) - 1 : -1;
+        while (bit >= 0) {
+            if (!mpz_tstbit(e, bit)) {
+                bit--;
+                continue;
+            }
+            j = (bit >= window[i] - 1) ? bit - window[i] + 1 : 0;
+            while (!mpz_tstbit(e, j)) {
+                j++;
+            }
+            for (w = 0, l = bit; l >= j; l--) {
+                w = (w << 1) | (size_t)mpz_tstbit(e, l);
+            }
+            events[nevents].bit = j;
+            events[nevents].index = w >> 1;
+            nevents++;
+            bit = j - 1;
+        }
+        count[i] = nevents - first[i];
+    }
+
+    /* One shared chain of squarings. */
+    for (bit = maxbits - 1; bit >= 0; bit--) {
+        if (started) {
+            GMPy_Mont_Sqr(mt, acc, acc, tp);
+        }
+        for (i = 0; i < k; i++) {
+            if (count[i] && events[first[i]].bit == bit) {
+                mp_limb_t *entry = tables + table_offset[i] + events[first[i]].index * n;
+
+                if (started) {
+                    GMPy_Mont_Mul(mt, acc, acc, entry, tp);
+                }
+                else {
+                    memcpy(acc, entry, n * sizeof(mp_limb_t));
+                    started = 1;
+                }
+                first[i]++;
+                count[i]--;
+            }
+        }
+    }
+
+    if (started) {
+        GMPy_Mont_From(mt, acc, acc, tp);
+        GMPy_Mont_Store(mt, r, acc);
+    }
+    else {
+        mpz_set_ui(r, 1);
+    }
+
+    PyMem_RawFree(limbs);
+    PyMem_RawFree(events);
+    PyMem_RawFree(first);
+    PyMem_RawFree(table_offset);
+    PyMem_RawFree(window);
+    return 0;
+
+  nomem:
+    /* LCOV_EXCL_START */
+    PyMem_RawFree(limbs);
+    PyMem_RawFree(events);
+    PyMem_RawFree(first);
+    PyMem_RawFree(table_offset);
+    PyMem_RawFree(window);
+    return -1;
+    /* LCOV_EXCL_STOP */
+}
+
+PyDoc_STRVAR(GMPy_doc_integer_powmod_multi,
+"powmod_multi(bases, exps, mod, /) -> mpz\n\n"
+"Return the product of powmod(b, e, mod) for b, e in zip(bases, exps).\n"
+"The powers are computed together, sharing one chain of squarings, so\n"
+"the result is much faster than separate calls to powmod(). A negative\n"
+"exponent is allowed if the inverse of the base exists. Will always\n"
+"release the GIL.");
+
+static PyObject *
+GMPy_Integer_PowMod_Multi(PyObject *self, PyObject *const *args, Py_ssize_t nargs)
+{
+    MPZ_Object *result = NULL, *tempm = NULL;
+    PyObject *bases = NULL, *exps = NULL;
+    Py_ssize_t i, k, bad_index = -1;
+    GMPy_Mont mt;
+    mpz_t mm, t;
+    int sign, mtype, res = 0;
+
+    if (nargs != 3) {
+        TYPE_ERROR("powmod_multi() requires 3 arguments");
+        return NULL;
+    }
+
+    mtype = GMPy_ObjectType(args[2]);
+    if (!IS_TYPE_INTEGER(mtype)) {
+        TYPE_ERROR("powmod_multi() requires integer arguments");
+        return NULL;
+    }
+
+    if (!(tempm = GMPy_MPZ_From_IntegerWithType(args[2], mtype, NULL))) {
+        /* LCOV_EXCL_START */
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+
+    sign = mpz_sgn(tempm->z);
+    if (sign == 0) {
+        VALUE_ERROR("pow() 3rd argument cannot be 0");
+        goto done;
+    }
+
+    if (!(bases = GMPy_Integer_PowModList_Copy(args[0])) ||
+        !(exps = GMPy_Integer_PowModList_Copy(args[1])) ||
+        !(result = GMPy_MPZ_New(NULL))) {
+        goto done;
+    }
+
+    k = PyList_GET_SIZE(bases);
+    if (PyList_GET_SIZE(exps) != k) {
+        VALUE_ERROR("powmod_multi() 'bases' and 'exps' must have the same length");
+        Py_CLEAR(result);
+        goto done;
+    }
+
+    mpz_init(mm);
+    mpz_abs(mm, tempm->z);
+
+    if (mpz_odd_p(mm) && mpz_cmp_ui(mm, 1) > 0 && GMPy_Mont_Init(&mt, mm) < 0) {
+        /* LCOV_EXCL_START */
+        mpz_clear(mm);
+        Py_CLEAR(result);
+        PyErr_NoMemory();
+        goto done;
+        /* LCOV_EXCL_STOP */
+    }
+
+    Py_BEGIN_ALLOW_THREADS;
+    /* A negative exponent uses the inverse of the base. */
+    for (i = 0; i < k; i++) {
+        mpz_ptr b = MPZ(PyList_GET_ITEM(bases, i));
+        mpz_ptr e = MPZ(PyList_GET_ITEM(exps, i));
+
+        if (mpz_sgn(e) < 0) {
+            if (!mpz_invert(b, b, mm)) {
+                bad_index = i;
+                break;
+            }
+            mpz_neg(e, e);
+        }
+    }
+
+    if (bad_index < 0) {
+        if (mpz_cmp_ui(mm, 1) == 0) {
+            mpz_set_ui(result->z, 0);
+        }
+        else if (mpz_odd_p(mm)) {
+            res = GMPy_Integer_PowMulti_Mont(&mt, result->z, bases, exps, k);
+        }
+        else {
+            /* Montgomery reduction requires an odd modulus. */
+            mpz_init(t);
+            mpz_set_ui(result->z, 1);
+            for (i = 0; i < k; i++) {
+                mpz_powm(t, MPZ(PyList_GET_ITEM(bases, i)),
+                         MPZ(PyList_GET_ITEM(exps, i)), mm);
+                mpz_mul(result->z, result->z, t);
+                mpz_mod(result->z, result->z, mm);
+            }
+            mpz_clear(t);
+        }
+
+        /* Python uses a rather peculiar convention for negative modulos
+         * If the modulo is negative, result should be in the interval
+         * m < r <= 0 .
+         */
+        if ((sign < 0) && (mpz_sgn(result->z) > 0)) {
+            mpz_add(result->z, result->z, tempm->z);
+        }
+    }
+    Py_END_ALLOW_THREADS;
+
+    if (mpz_odd_p(mm) && mpz_cmp_ui(mm, 1) > 0) {
+        GMPy_Mont_Clear(&mt);
+    }
+    mpz_clear(mm);
+
+    if (bad_index >= 0) {
+        PyErr_Format(PyExc_ValueError,
+                     "pow() base not invertible at index %zd", bad_index);
+        Py_CLEAR(result);
+    }
+    else if (res < 0) {
+        /* LCOV_EXCL_START */
+        PyErr_NoMemory();
+        Py_CLEAR(result);
+        /* LCOV_EXCL_STOP */
+    }
+
+  done:
+    Py_XDECREF(bases);
+    Py_XDECREF(exps);
+    Py_DECREF((PyObject*)tempm);
+    return (PyObject*)result;
+}
+
 
 PyDoc_STRVAR(GMPy_doc_integer_powmod_sec,
 "powmod_sec(x, y, m, /) -> mpz\n\n"
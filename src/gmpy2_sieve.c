@@ -0,0 +1,839 @@
+/* * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * *
+ * gmpy2_sieve.c                                                            *
+ * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * *
+ * Python interface to the GMP, MPFR, and MPC multiple precision           *
+ * libraries.                                                              *
+ *                                                                         *
+ * Copyright 2000 - 2009 Alex Martelli                                     *
+ *                                                                         *
+ * Copyright 2008 - 2024 Case Van Horsen                                   *
+ *                                                                         *
+ * This file is part of GMPY2.                                             *
+ *                                                                         *
+ * GMPY2 is free software: you can redistribute it and/or modify it under  *
+ * the terms of the GNU Lesser General Public License as published by the  *
+ * Free Software Foundation, either version 3 of the License, or (at your  *
+ * option) any later version.                                              *
+ *                                                                         *
+ * GMPY2 is distributed in the hope that it will be useful, but WITHOUT    *
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or   *
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public    *
+ * License for more details.                                               *
+ *                                                                         *
+ * You should have received a copy of the GNU Lesser General Public        *
+ * License along with GMPY2; if not, see <http://www.gnu.org/licenses/>    *
+ * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * */
+
+
+/* This file implements prime_sieve() and the primes iterator. Both use a
+ * segmented sieve of Eratosthenes so the memory used does not depend on the
+ * size of the range. Arguments must be <= 2^64. Since 2^64 - 1 is not a
+ * prime, a stop value of 2^64 is replaced by 2^64 - 1 so all values fit in
+ * a uint64_t.
+ *
+ * It also implements is_prime_list() and is_bpsw_prp_list(). They remove
+ * values with a small factor using a product tree of small primes before
+ * running the more expensive tests.
+ */
+
+/* The largest prime used for sieving. Survivors that are larger than the
+ * square of the bound are checked with a Miller-Rabin test.
+ */
+
+#define GMPY_SIEVE_MAX_BOUND ((uint64_t)1 << 20)
+
+/* Number of integers sieved at a time. */
+
+#define GMPY_SIEVE_SEGMENT ((uint64_t)1 << 18)
+
+static void
+GMPy_Sieve_Set64(mpz_ptr z, uint64_t v)
+{
+#if ULONG_MAX >= 0xffffffffffffffffULL
+    mpz_set_ui(z, (unsigned long)v);
+#else
+    mpz_set_ui(z, (unsigned long)(v >> 32));
+    mpz_mul_2exp(z, z, 32);
+    mpz_add_ui(z, z, (unsigned long)(v & 0xffffffffUL));
+#endif
+}
+
+/* Return min(isqrt(n), GMPY_SIEVE_MAX_BOUND). */
+
+static uint64_t
+GMPy_Sieve_Bound(uint64_t n)
+{
+    uint64_t r;
+
+    if (n >= GMPY_SIEVE_MAX_BOUND * GMPY_SIEVE_MAX_BOUND) {
+        return GMPY_SIEVE_MAX_BOUND;
+    }
+    r = (uint64_t)sqrt((double)n);
+    while (r * r > n) {
+        r--;
+    }
+    while ((r + 1) * (r + 1) <= n) {
+        r++;
+    }
+    return r;
+}
+
+/* Miller-Rabin test with the bases found by Jim Sinclair. The result is
+ * correct for all n < 2^64. n must be odd and > 2.
+ */
+
+static int
+GMPy_Sieve_IsPrime64(GMPy_Sieve *sv, uint64_t value)
+{
+    static const unsigned long bases[] = {2, 325, 9375, 28178, 450775,
+                                          9780504, 1795265022};
+    mp_bitcnt_t s, r;
+    size_t i;
+
+    GMPy_Sieve_Set64(sv->n, value);
+    mpz_sub_ui(sv->nm1, sv->n, 1);
+    s = mpz_scan1(sv->nm1, 0);
+    mpz_tdiv_q_2exp(sv->d, sv->nm1, s);
+
+    for (i = 0; i < sizeof(bases) / sizeof(bases[0]); i++) {
+        mpz_set_ui(sv->x, bases[i]);
+        mpz_mod(sv->x, sv->x, sv->n);
+        if (mpz_sgn(sv->x) == 0) {
+            continue;
+        }
+        mpz_powm(sv->x, sv->x, sv->d, sv->n);
+        if (mpz_cmp_ui(sv->x, 1) == 0 || mpz_cmp(sv->x, sv->nm1) == 0) {
+            continue;
+        }
+        for (r = 1; r < s; r++) {
+            mpz_mul(sv->x, sv->x, sv->x);
+            mpz_mod(sv->x, sv->x, sv->n);
+            if (mpz_cmp(sv->x, sv->nm1) == 0) {
+                break;
+            }
+        }
+        if (r == s) {
+            return 0;
+        }
+    }
+    return 1;
+}
+
+/* Find the odd primes up to min(isqrt(stop - 1), GMPY_SIEVE_MAX_BOUND).
+ * Returns 0 on success or -1 if memory could not be allocated. The sieve
+ * must be cleared in either case.
+ */
+
+static int
+GMPy_Sieve_Init(GMPy_Sieve *sv, uint64_t stop)
+{
+    unsigned char *flags;
+    uint64_t i, j, half;
+
+    sv->primes = NULL;
+    sv->nprimes = 0;
+    sv->bound = stop > 1 ? GMPy_Sieve_Bound(stop - 1) : 1;
+    mpz_init(sv->n);
+    mpz_init(sv->d);
+    mpz_init(sv->x);
+    mpz_init(sv->nm1);
+
+    /* flags[i] refers to 2*i + 1 */
+    half = sv->bound / 2 + 1;
+    if (!(flags = PyMem_RawMalloc(half)) ||
+        !(sv->primes = PyMem_RawMalloc(half * sizeof(uint32_t)))) {
+        /* LCOV_EXCL_START */
+        PyMem_RawFree(flags);
+        return -1;
+        /* LCOV_EXCL_STOP */
+    }
+
+    memset(flags, 1, half);
+    for (i = 1; i < half; i++) {
+        if (!flags[i]) {
+            continue;
+        }
+        sv->primes[sv->nprimes++] = (uint32_t)(2 * i + 1);
+        for (j = 2 * i * (i + 1); j < half; j += 2 * i + 1) {
+            flags[j] = 0;
+        }
+    }
+    /* Only the values up to the bound are primes. */
+    while (sv->nprimes && sv->primes[sv->nprimes - 1] > sv->bound) {
+        sv->nprimes--;
+    }
+    PyMem_RawFree(flags);
+    return 0;
+}
+
+static void
+GMPy_Sieve_Clear(GMPy_Sieve *sv)
+{
+    PyMem_RawFree(sv->primes);
+    sv->primes = NULL;
+    mpz_clear(sv->n);
+    mpz_clear(sv->d);
+    mpz_clear(sv->x);
+    mpz_clear(sv->nm1);
+}
+
+/* Store the primes in [lo, hi) in out and return the number of primes. hi
+ * must not be larger than the stop value used to create the sieve and
+ * hi - lo must not be larger than GMPY_SIEVE_SEGMENT. buf must have room
+ * for (hi - lo) / 2 + 1 bytes and out for (hi - lo) / 2 + 2 values.
+ */
+
+static Py_ssize_t
+GMPy_Sieve_Segment(GMPy_Sieve *sv, uint64_t lo, uint64_t hi,
+                   unsigned char *buf, uint64_t *out)
+{
+    uint64_t o, m, p, j, k, value;
+    Py_ssize_t count = 0;
+    size_t i;
+
+    if (lo <= 2 && hi > 2) {
+        out[count++] = 2;
+    }
+
+    /* buf[j] refers to o + 2*j */
+    o = lo | 1;
+    if (o >= hi) {
+        return count;
+    }
+    m = (hi - o + 1) / 2;
+    memset(buf, 1, m);
+
+    for (i = 0; i < sv->nprimes; i++) {
+        p = sv->primes[i];
+        if (p * p >= hi) {
+            break;
+        }
+        /* Find the first odd multiple of p that is >= max(o, p*p). */
+        if (p * p > o) {
+            j = (p * p - o) / 2;
+        }
+        else {
+            k = (p - o % p) % p;
+            if (k & 1) {
+                k += p;
+            }
+            j = k / 2;
+        }
+        for (; j < m; j += p) {
+            buf[j] = 0;
+        }
+    }
+
+    for (j = 0; j < m; j++) {
+        if (!buf[j]) {
+            continue;
+        }
+        value = o + 2 * j;
+        if (value == 1) {
+            continue;
+        }
+        if (value / sv->bound > sv->bound && !GMPy_Sieve_IsPrime64(sv, value)) {
+            continue;
+        }
+        out[count++] = value;
+    }
+    return count;
+}
+
+/* Convert obj to a value in [0, 2^64]. 2^64 is returned as 2^64 - 1.
+ * Returns 0 on success or -1 with an exception set.
+ */
+
+static int
+GMPy_Sieve_Arg(PyObject *obj, const char *fname, uint64_t *value)
+{
+    MPZ_Object *temp;
+    size_t i;
+
+    if (!IS_TYPE_INTEGER(GMPy_ObjectType(obj))) {
+        PyErr_Format(PyExc_TypeError, "%s() requires integer arguments", fname);
+        return -1;
+    }
+    if (!(temp = GMPy_MPZ_From_Integer(obj, NULL))) {
+        /* LCOV_EXCL_START */
+        return -1;
+        /* LCOV_EXCL_STOP */
+    }
+
+    if (mpz_sgn(temp->z) < 0) {
+        PyErr_Format(PyExc_ValueError, "%s() arguments must be >= 0", fname);
+        Py_DECREF((PyObject*)temp);
+        return -1;
+    }
+    if (mpz_sizeinbase(temp->z, 2) > 64) {
+        if (mpz_sizeinbase(temp->z, 2) > 65 || mpz_scan1(temp->z, 0) != 64) {
+            PyErr_Format(PyExc_OverflowError,
+                         "%s() arguments must be <= 2**64", fname);
+            Py_DECREF((PyObject*)temp);
+            return -1;
+        }
+        *value = UINT64_MAX;
+        Py_DECREF((PyObject*)temp);
+        return 0;
+    }
+
+    *value = 0;
+    for (i = 0; i < mpz_size(temp->z); i++) {
+        *value |= (uint64_t)mpz_getlimbn(temp->z, i) << (i * GMP_NUMB_BITS);
+    }
+    Py_DECREF((PyObject*)temp);
+    return 0;
+}
+
+/* Parse ([start,] stop) like range(). Returns 0 on success or -1 with an
+ * exception set.
+ */
+
+static int
+GMPy_Sieve_Args(PyObject *const *args, Py_ssize_t nargs, const char *fname,
+                uint64_t *start, uint64_t *stop)
+{
+    if (nargs < 1 || nargs > 2) {
+        PyErr_Format(PyExc_TypeError, "%s() requires 1 or 2 arguments", fname);
+        return -1;
+    }
+    *start = 0;
+    if (nargs == 2 && GMPy_Sieve_Arg(args[0], fname, start) < 0) {
+        return -1;
+    }
+    if (GMPy_Sieve_Arg(args[nargs - 1], fname, stop) < 0) {
+        return -1;
+    }
+    return 0;
+}
+
+PyDoc_STRVAR(GMPy_doc_mpz_function_prime_sieve,
+"prime_sieve(stop, /) -> xmpz\n"
+"prime_sieve(start, stop, /) -> xmpz\n\n"
+"Return an xmpz x such that bit i of x is set if start + i is a prime\n"
+"in the range [start, stop). start defaults to 0. The range is sieved\n"
+"in segments so the memory used is one bit per value in the range.\n"
+"The arguments must be <= 2**64. Will always release the GIL.");
+
+static PyObject *
+GMPy_MPZ_Function_PrimeSieve(PyObject *self, PyObject *const *args,
+                             Py_ssize_t nargs)
+{
+    XMPZ_Object *result;
+    GMPy_Sieve sv;
+    uint64_t start, stop, lo, hi, *out = NULL;
+    unsigned char *buf = NULL;
+    mp_limb_t *limbs = NULL;
+    size_t nlimbs = 0, seglen;
+    Py_ssize_t i, count;
+
+    if (GMPy_Sieve_Args(args, nargs, "prime_sieve", &start, &stop) < 0) {
+        return NULL;
+    }
+
+    if (!(result = GMPy_XMPZ_New(NULL))) {
+        /* LCOV_EXCL_START */
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+
+    if (stop <= start) {
+        return (PyObject*)result;
+    }
+
+    if ((stop - start) / GMP_NUMB_BITS >= (uint64_t)(PY_SSIZE_T_MAX / sizeof(mp_limb_t))) {
+        Py_DECREF((PyObject*)result);
+        return PyErr_NoMemory();
+    }
+    nlimbs = (size_t)((stop - start) / GMP_NUMB_BITS + 1);
+    seglen = (size_t)(stop - start < GMPY_SIEVE_SEGMENT ? stop - start : GMPY_SIEVE_SEGMENT);
+
+    if (GMPy_Sieve_Init(&sv, stop) < 0 ||
+        !(limbs = PyMem_RawCalloc(nlimbs, sizeof(mp_limb_t))) ||
+        !(buf = PyMem_RawMalloc(seglen / 2 + 1)) ||
+        !(out = PyMem_RawMalloc((seglen / 2 + 2) * sizeof(uint64_t)))) {
+        GMPy_Sieve_Clear(&sv);
+        PyMem_RawFree(limbs);
+        PyMem_RawFree(buf);
+        Py_DECREF((PyObject*)result);
+        return PyErr_NoMemory();
+    }
+
+    Py_BEGIN_ALLOW_THREADS;
+    for (lo = start; lo < stop; lo = hi) {
+        hi = stop - lo < GMPY_SIEVE_SEGMENT ? stop : lo + GMPY_SIEVE_SEGMENT;
+        count = GMPy_Sieve_Segment(&sv, lo, hi, buf, out);
+        for (i = 0; i < count; i++) {
+            uint64_t bit = out[i] - start;
+
+            limbs[bit / GMP_NUMB_BITS] |= (mp_limb_t)1 << (bit % GMP_NUMB_BITS);
+        }
+    }
+    memcpy(mpz_limbs_write(result->z, (mp_size_t)nlimbs), limbs,
+           nlimbs * sizeof(mp_limb_t));
+    mpz_limbs_finish(result->z, (mp_size_t)nlimbs);
+    Py_END_ALLOW_THREADS;
+
+    GMPy_Sieve_Clear(&sv);
+    PyMem_RawFree(limbs);
+    PyMem_RawFree(buf);
+    PyMem_RawFree(out);
+    return (PyObject*)result;
+}
+
+PyDoc_STRVAR(GMPy_doc_primes,
+"primes(stop, /)\n"
+"primes(start, stop, /)\n\n"
+"Return an iterator over the primes in the range [start, stop) in\n"
+"increasing order. start defaults to 0. The primes are found with a\n"
+"segmented sieve, which is much faster than repeated calls to\n"
+"next_prime(). The arguments must be <= 2**64.");
+
+static PyObject *
+GMPy_Primes_NewInit(PyTypeObject *type, PyObject *args, PyObject *keywds)
+{
+    Primes_Object *result;
+    uint64_t start, stop;
+    size_t seglen;
+
+    if (keywds && PyDict_GET_SIZE(keywds)) {
+        TYPE_ERROR("primes() takes no keyword arguments");
+        return NULL;
+    }
+
+    if (GMPy_Sieve_Args(&PyTuple_GET_ITEM(args, 0), PyTuple_GET_SIZE(args),
+                        "primes", &start, &stop) < 0) {
+        return NULL;
+    }
+
+    if (!(result = PyObject_New(Primes_Object, &Primes_Type))) {
+        /* LCOV_EXCL_START */
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+    result->next = start;
+    result->stop = stop;
+    result->nfound = result->pos = 0;
+    result->buf = NULL;
+    result->found = NULL;
+
+    seglen = (size_t)(stop <= start ? 0 :
+                      stop - start < GMPY_SIEVE_SEGMENT ? stop - start : GMPY_SIEVE_SEGMENT);
+    if (GMPy_Sieve_Init(&result->sieve, stop) < 0 ||
+        !(result->buf = PyMem_RawMalloc(seglen / 2 + 1)) ||
+        !(result->found = PyMem_RawMalloc((seglen / 2 + 2) * sizeof(uint64_t)))) {
+        /* LCOV_EXCL_START */
+        Py_DECREF((PyObject*)result);
+        return PyErr_NoMemory();
+        /* LCOV_EXCL_STOP */
+    }
+    return (PyObject*)result;
+}
+
+static void
+GMPy_Primes_Dealloc(Primes_Object *self)
+{
+    GMPy_Sieve_Clear(&self->sieve);
+    PyMem_RawFree(self->buf);
+    PyMem_RawFree(self->found);
+    PyObject_Free(self);
+}
+
+/* The GIL is held while a segment is sieved so that two threads can not
+ * advance the same iterator at the same time.
+ */
+
+static PyObject *
+GMPy_Primes_Next(Primes_Object *self)
+{
+    MPZ_Object *result;
+    uint64_t hi;
+
+    while (self->pos == self->nfound) {
+        if (self->next >= self->stop) {
+            return NULL;
+        }
+        hi = self->stop - self->next < GMPY_SIEVE_SEGMENT ?
+             self->stop : self->next + GMPY_SIEVE_SEGMENT;
+        self->nfound = GMPy_Sieve_Segment(&self->sieve, self->next, hi,
+                                          self->buf, self->found);
+        self->pos = 0;
+        self->next = hi;
+    }
+
+    if ((result = GMPy_MPZ_New(NULL))) {
+        GMPy_Sieve_Set64(result->z, self->found[self->pos++]);
+    }
+    return (PyObject*)result;
+}
+
+static PyTypeObject Primes_Type = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = "gmpy2.primes",
+    .tp_basicsize = sizeof(Primes_Object),
+    .tp_dealloc = (destructor) GMPy_Primes_Dealloc,
+    .tp_flags = Py_TPFLAGS_DEFAULT,
+    .tp_doc = GMPy_doc_primes,
+    .tp_iter = PyObject_SelfIter,
+    .tp_iternext = (iternextfunc) GMPy_Primes_Next,
+    .tp_new = GMPy_Primes_NewInit,
+};
+
+/* Trial division uses the nodes of the product tree that are no larger than
+ * GMPY_TRIAL_SCALE times the size of the value that is tested.
+ */
+
+#define GMPY_TRIAL_SCALE 64
+
+/* Values below GMPY_TRIAL_MIN may be one of the primes in the tree so they
+ * are not trial divided.
+ */
+
+#define GMPY_TRIAL_MIN 65536
+
+/* The tree is created on first use and is freed when the module is freed. */
+
+static GMPy_Trial_Tree *GMPy_Trial_Tree_Cache = NULL;
+
+static void
+GMPy_Trial_Tree_Free(GMPy_Trial_Tree *tree)
+{
+    Py_ssize_t i;
+    int k;
+
+    for (k = 1; k <= tree->levels; k++) {
+        for (i = 0; i < tree->count[k]; i++) {
+            mpz_clear(tree->nodes[k][i]);
+        }
+        PyMem_RawFree(tree->nodes[k]);
+    }
+    PyMem_RawFree(tree->leaves);
+    PyMem_RawFree(tree);
+}
+
+/* Create the product tree or return NULL with an exception set. */
+
+static GMPy_Trial_Tree *
+GMPy_Trial_Tree_Create(void)
+{
+    GMPy_Trial_Tree *tree;
+    GMPy_Sieve sv;
+    unsigned long leaf = 1;
+    Py_ssize_t i, n = 0;
+    int k;
+
+    if (!(tree = PyMem_RawCalloc(1, sizeof(GMPy_Trial_Tree)))) {
+        /* LCOV_EXCL_START */
+        PyErr_NoMemory();
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+
+    /* The sieve for values < 2^32 contains the odd primes < 2^16. */
+    if (GMPy_Sieve_Init(&sv, (uint64_t)1 << 32) < 0 ||
+        !(tree->leaves = PyMem_RawMalloc(sv.nprimes * sizeof(unsigned long)))) {
+        /* LCOV_EXCL_START */
+        GMPy_Sieve_Clear(&sv);
+        GMPy_Trial_Tree_Free(tree);
+        PyErr_NoMemory();
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+    for (i = 0; i < (Py_ssize_t)sv.nprimes; i++) {
+        if (leaf > ULONG_MAX / sv.primes[i]) {
+            tree->leaves[n++] = leaf;
+            leaf = 1;
+        }
+        leaf *= sv.primes[i];
+    }
+    tree->leaves[n++] = leaf;
+    tree->count[0] = n;
+    GMPy_Sieve_Clear(&sv);
+
+    for (k = 1; tree->count[k - 1] > 1 && k <= GMPY_TRIAL_MAX_LEVELS; k++) {
+        n = (tree->count[k - 1] + 1) / 2;
+        if (!(tree->nodes[k] = PyMem_RawMalloc(n * sizeof(mpz_t)))) {
+            /* LCOV_EXCL_START */
+            GMPy_Trial_Tree_Free(tree);
+            PyErr_NoMemory();
+            return NULL;
+            /* LCOV_EXCL_STOP */
+        }
+        for (i = 0; i < n; i++) {
+            mpz_init(tree->nodes[k][i]);
+            if (k == 1) {
+                mpz_set_ui(tree->nodes[k][i], tree->leaves[2 * i]);
+                if (2 * i + 1 < tree->count[0]) {
+                    mpz_mul_ui(tree->nodes[k][i], tree->nodes[k][i],
+                               tree->leaves[2 * i + 1]);
+                }
+            }
+            else if (2 * i + 1 < tree->count[k - 1]) {
+                mpz_mul(tree->nodes[k][i], tree->nodes[k - 1][2 * i],
+                        tree->nodes[k - 1][2 * i + 1]);
+            }
+            else {
+                mpz_set(tree->nodes[k][i], tree->nodes[k - 1][2 * i]);
+            }
+        }
+        tree->count[k] = n;
+        tree->bits[k] = mpz_sizeinbase(tree->nodes[k][0], 2);
+        tree->levels = k;
+    }
+
+    return tree;
+}
+
+/* Return the shared product tree or NULL with an exception set. The lock
+ * ensures only one thread creates the tree on the free-threaded build.
+ */
+
+static GMPy_Trial_Tree *
+GMPy_Trial_Tree_Get(void)
+{
+    GMPy_Trial_Tree *tree;
+
+    PyThread_acquire_lock(trial_tree_lock, WAIT_LOCK);
+    if (!GMPy_Trial_Tree_Cache) {
+        GMPy_Trial_Tree_Cache = GMPy_Trial_Tree_Create();
+    }
+    tree = GMPy_Trial_Tree_Cache;
+    PyThread_release_lock(trial_tree_lock);
+    return tree;
+}
+
+/* Free the shared product tree. Called when the module is freed. */
+
+static void
+GMPy_Trial_Tree_Clear(void)
+{
+    if (GMPy_Trial_Tree_Cache) {
+        GMPy_Trial_Tree_Free(GMPy_Trial_Tree_Cache);
+        GMPy_Trial_Tree_Cache = NULL;
+    }
+}
+
+/* tmp[k] contains n modulo node idx at level k. Returns 1 if one of the
+ * primes below that node divides n.
+ */
+
+static int
+GMPy_Trial_Descend(GMPy_Trial_Tree *tree, int k, Py_ssize_t idx, mpz_t *tmp)
+{
+    Py_ssize_t i;
+
+    for (i = 2 * idx; i <= 2 * idx + 1 && i < tree->count[k - 1]; i++) {
+        if (k == 1) {
+            if (mpz_gcd_ui(NULL, tmp[1], tree->leaves[i]) != 1) {
+                return 1;
+            }
+        }
+        else {
+            mpz_tdiv_r(tmp[k - 1], tmp[k], tree->nodes[k - 1][i]);
+            if (GMPy_Trial_Descend(tree, k - 1, i, tmp)) {
+                return 1;
+            }
+        }
+    }
+    return 0;
+}
+
+/* Return 1 if n has a factor in the first leaves of the tree, else 0. The
+ * number of leaves that are used grows with the size of n. n must be >=
+ * GMPY_TRIAL_MIN and tmp must have room for tree->levels + 1 values. Does
+ * not use the Python API.
+ */
+
+static int
+GMPy_Trial_Divide(GMPy_Trial_Tree *tree, mpz_srcptr n, mpz_t *tmp)
+{
+    size_t limit = mpz_sizeinbase(n, 2);
+    int k = 0;
+
+    limit = limit * limit / GMPY_TRIAL_SCALE;
+
+    while (k < tree->levels && tree->bits[k + 1] <= limit) {
+        k++;
+    }
+    if (k == 0) {
+        return mpz_gcd_ui(NULL, n, tree->leaves[0]) != 1;
+    }
+    mpz_tdiv_r(tmp[k], n, tree->nodes[k][0]);
+    return GMPy_Trial_Descend(tree, k, 0, tmp);
+}
+
+typedef struct {
+    MPZ_Object **values;
+    char *result;
+    GMPy_Trial_Tree *tree;
+    int bpsw;                   /* use BPSW instead of Miller-Rabin */
+    int reps;
+} GMPy_PrimeList_Args;
+
+static void
+GMPy_PrimeList_Work(void *arg, Py_ssize_t start, Py_ssize_t stop)
+{
+    GMPy_PrimeList_Args *args = (GMPy_PrimeList_Args*)arg;
+    mpz_t tmp[GMPY_TRIAL_MAX_LEVELS + 1];
+    mpz_srcptr n;
+    Py_ssize_t i;
+    int k;
+
+    for (k = 0; k <= args->tree->levels; k++) {
+        mpz_init(tmp[k]);
+    }
+
+    for (i = start; i < stop; i++) {
+        n = args->values[i]->z;
+        if (mpz_sgn(n) <= 0) {
+            args->result[i] = 0;
+        }
+        else if (mpz_even_p(n)) {
+            args->result[i] = (mpz_cmp_ui(n, 2) == 0);
+        }
+        else if (mpz_cmp_ui(n, GMPY_TRIAL_MIN) >= 0 &&
+                 GMPy_Trial_Divide(args->tree, n, tmp)) {
+            args->result[i] = 0;
+        }
+        else if (args->bpsw) {
+            args->result[i] = (GMPy_MPZ_BPSW_PRP(n) > 0);
+        }
+        else {
+            args->result[i] = (mpz_probab_prime_p(n, args->reps) > 0);
+        }
+    }
+
+    for (k = 0; k <= args->tree->levels; k++) {
+        mpz_clear(tmp[k]);
+    }
+}
+
+static PyObject *
+GMPy_MPZ_PrimeList(PyObject *values, int bpsw, int reps, int threads,
+                   const char *fname)
+{
+    PyObject *seq, *result = NULL;
+    GMPy_PrimeList_Args args;
+    Py_ssize_t i, count = 0, length;
+
+    if (!(seq = PySequence_Fast(values, "argument must be an iterable"))) {
+        return NULL;
+    }
+    length = PySequence_Fast_GET_SIZE(seq);
+
+    args.result = NULL;
+    args.bpsw = bpsw;
+    args.reps = reps;
+    if (!(args.values = PyMem_New(MPZ_Object*, length)) ||
+        !(args.result = PyMem_Malloc(length ? length : 1))) {
+        /* LCOV_EXCL_START */
+        PyErr_NoMemory();
+        goto done;
+        /* LCOV_EXCL_STOP */
+    }
+
+    for (count = 0; count < length; count++) {
+        if (!(args.values[count] = GMPy_MPZ_From_Integer(PySequence_Fast_GET_ITEM(seq, count), NULL))) {
+            TYPE_ERROR("all items in iterable must be integers");
+            goto done;
+        }
+        if (bpsw && mpz_sgn(args.values[count]->z) <= 0) {
+            Py_DECREF((PyObject*)args.values[count]);
+            PyErr_Format(PyExc_ValueError,
+                         "%s() requires all values be greater than 0", fname);
+            goto done;
+        }
+    }
+
+    if (!(args.tree = GMPy_Trial_Tree_Get())) {
+        /* LCOV_EXCL_START */
+        goto done;
+        /* LCOV_EXCL_STOP */
+    }
+
+    if (GMPy_Parallel_For(length, threads, GMPy_PrimeList_Work, &args) < 0) {
+        /* LCOV_EXCL_START */
+        goto done;
+        /* LCOV_EXCL_STOP */
+    }
+
+    if (!(result = PyList_New(length))) {
+        /* LCOV_EXCL_START */
+        goto done;
+        /* LCOV_EXCL_STOP */
+    }
+    for (i = 0; i < length; i++) {
+        PyList_SET_ITEM(result, i, PyBool_FromLong(args.result[i]));
+    }
+
+  done:
+    for (i = 0; i < count; i++) {
+        Py_DECREF((PyObject*)args.values[i]);
+    }
+    PyMem_Free(args.values);
+    PyMem_Free(args.result);
+    Py_DECREF(seq);
+    return result;
+}
+
+PyDoc_STRVAR(GMPy_doc_mpz_function_is_prime_list,
+"is_prime_list(values, n=25, /, *, threads=1) -> list[bool, ...]\n\n"
+"Returns [is_prime(x, n) for x in values]. The values are first checked\n"
+"for small divisors using a product tree of small primes that is shared\n"
+"by all the values. Will always release the GIL. If threads is greater\n"
+"than 1, the work is split across that many native threads.");
+
+static PyObject *
+GMPy_MPZ_Function_IsPrimeList(PyObject *self, PyObject *args, PyObject *keywds)
+{
+    unsigned long reps = 25;
+    int threads;
+
+    if (PyTuple_GET_SIZE(args) == 0 || PyTuple_GET_SIZE(args) > 2) {
+        TYPE_ERROR("is_prime_list() requires 1 or 2 arguments");
+        return NULL;
+    }
+
+    if ((threads = GMPy_Parse_Threads(keywds, "is_prime_list")) < 0) {
+        return NULL;
+    }
+
+    if (PyTuple_GET_SIZE(args) == 2) {
+        reps = GMPy_Integer_AsUnsignedLong(PyTuple_GET_ITEM(args, 1));
+        if (reps == (unsigned long)(-1) && PyErr_Occurred()) {
+            return NULL;
+        }
+        /* Silently limit n to a reasonable value. */
+        if (reps > 1000) {
+            reps = 1000;
+        }
+    }
+
+    return GMPy_MPZ_PrimeList(PyTuple_GET_ITEM(args, 0), 0, (int)reps,
+                              threads, "is_prime_list");
+}
+
+PyDoc_STRVAR(GMPy_doc_mpz_function_is_bpsw_prp_list,
+"is_bpsw_prp_list(values, /, *, threads=1) -> list[bool, ...]\n\n"
+"Returns [is_bpsw_prp(x) for x in values]. The values are first checked\n"
+"for small divisors using a product tree of small primes that is shared\n"
+"by all the values. Will always release the GIL. If threads is greater\n"
+"than 1, the work is split across that many native threads.");
+
+static PyObject *
+GMPy_MPZ_Function_IsBPSWPRPList(PyObject *self, PyObject *args, PyObject *keywds)
+{
+    int threads;
+
+    if (PyTuple_GET_SIZE(args) != 1) {
+        TYPE_ERROR("is_bpsw_prp_list() requires 1 argument");
+        return NULL;
+    }
+
+    if ((threads = GMPy_Parse_Threads(keywds, "is_bpsw_prp_list")) < 0) {
+        return NULL;
+    }
+
+    return GMPy_MPZ_PrimeList(PyTuple_GET_ITEM(args, 0), 1, 0, threads,
+                              "is_bpsw_prp_list");
+}
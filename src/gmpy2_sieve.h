@@ -0,0 +1,97 @@
+/* * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * *
+ * gmpy2_sieve.h                                                            *
+ * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * *
+ * Python interface to the GMP, MPFR, and MPC multiple precision           *
+ * libraries.                                                              *
+ *                                                                         *
+ * Copyright 2000 - 2009 Alex Martelli                                     *
+ *                                                                         *
+ * Copyright 2008 - 2024 Case Van Horsen                                   *
+ *                                                                         *
+ * This file is part of GMPY2.                                             *
+ *                                                                         *
+ * GMPY2 is free software: you can redistribute it and/or modify it under  *
+ * the terms of the GNU Lesser General Public License as published by the  *
+ * Free Software Foundation, either version 3 of the License, or (at your  *
+ * option) any later version.                                              *
+ *                                                                         *
+ * GMPY2 is distributed in the hope that it will be useful, but WITHOUT    *
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or   *
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public    *
+ * License for more details.                                               *
+ *                                                                         *
+ * You should have received a copy of the GNU Lesser General Public        *
+ * License along with GMPY2; if not, see <http://www.gnu.org/licenses/>    *
+ * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * */
+
+#ifndef GMPY_SIEVE_H
+#define GMPY_SIEVE_H
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+/* Support for a segmented sieve of Eratosthenes for values less than 2^64.
+ * Only odd values are stored in the sieve. Values are sieved by the primes
+ * up to bound; survivors larger than bound^2 are checked with a Miller-Rabin
+ * test that is deterministic for values less than 2^64. The GMPy_Sieve
+ * functions do not use the Python API and may be called without the GIL.
+ */
+
+typedef struct {
+    uint32_t *primes;           /* odd primes <= bound              */
+    size_t nprimes;
+    uint64_t bound;
+    mpz_t n, d, x, nm1;         /* temporaries for Miller-Rabin     */
+} GMPy_Sieve;
+
+typedef struct {
+    PyObject_HEAD
+    GMPy_Sieve sieve;
+    uint64_t next;              /* start of the next segment        */
+    uint64_t stop;
+    uint64_t *found;            /* primes in the current segment    */
+    Py_ssize_t nfound;
+    Py_ssize_t pos;
+    unsigned char *buf;         /* sieve for the current segment    */
+} Primes_Object;
+
+/* A product tree of the odd primes below 2^16 that is shared by all the
+ * calls to is_prime_list() and is_bpsw_prp_list(). Each leaf is a product
+ * of consecutive primes that fits in an unsigned long. Node i at level k
+ * is the product of nodes 2*i and 2*i+1 at level k-1, so node 0 at level k
+ * is the product of the first 2^k leaves.
+ */
+
+#define GMPY_TRIAL_MAX_LEVELS 24
+
+typedef struct {
+    int levels;                             /* levels above the leaves  */
+    Py_ssize_t count[GMPY_TRIAL_MAX_LEVELS + 1];
+    unsigned long *leaves;
+    mpz_t *nodes[GMPY_TRIAL_MAX_LEVELS + 1];
+    size_t bits[GMPY_TRIAL_MAX_LEVELS + 1]; /* bits in node 0 of a level */
+} GMPy_Trial_Tree;
+
+static PyTypeObject Primes_Type;
+#define Primes_Check(v) (((PyObject*)v)->ob_type == &Primes_Type)
+
+static int        GMPy_Sieve_Init(GMPy_Sieve *sv, uint64_t stop);
+static void       GMPy_Sieve_Clear(GMPy_Sieve *sv);
+static Py_ssize_t GMPy_Sieve_Segment(GMPy_Sieve *sv, uint64_t lo, uint64_t hi, unsigned char *buf, uint64_t *out);
+
+static PyObject * GMPy_Primes_NewInit(PyTypeObject *type, PyObject *args, PyObject *keywds);
+static void       GMPy_Primes_Dealloc(Primes_Object *self);
+static PyObject * GMPy_Primes_Next(Primes_Object *self);
+static PyObject * GMPy_MPZ_Function_PrimeSieve(PyObject *self, PyObject *const *args, Py_ssize_t nargs);
+
+static GMPy_Trial_Tree * GMPy_Trial_Tree_Get(void);
+static void       GMPy_Trial_Tree_Clear(void);
+static int        GMPy_Trial_Divide(GMPy_Trial_Tree *tree, mpz_srcptr n, mpz_t *tmp);
+static PyObject * GMPy_MPZ_Function_IsPrimeList(PyObject *self, PyObject *args, PyObject *keywds);
+static PyObject * GMPy_MPZ_Function_IsBPSWPRPList(PyObject *self, PyObject *args, PyObject *keywds);
+
+#ifdef __cplusplus
+}
+#endif
+#endif
@@ -354,11 +354,11 @@ PyDoc_STRVAR(GMPy_doc_context_sub,
 "Return x - y.");
 
 static PyObject *
-GMPy_Context_Sub(PyObject *self, PyObject *args)
+GMPy_Context_Sub(PyObject *self, PyObject *const *args, Py_ssize_t nargs)
 {
     CTXT_Object *context = NULL;
 
-    if (PyTuple_GET_SIZE(args) != 2) {
+    if (nargs != 2) {
         TYPE_ERROR("sub() requires 2 arguments");
         return NULL;
     }
@@ -370,7 +370,5 @@ GMPy_Context_Sub(PyObject *self, PyObject *args)
         CHECK_CONTEXT(context);
     }
 
-    return GMPy_Number_Sub(PyTuple_GET_ITEM(args, 0),
-                           PyTuple_GET_ITEM(args, 1),
-                           context);
+    return GMPy_Number_Sub(args[0], args[1], context);
 }
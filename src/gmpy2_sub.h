@@ -42,7 +42,7 @@ static PyObject * GMPy_Rational_SubWithType(PyObject *x, int xtype, PyObject *y,
 static PyObject * GMPy_Real_SubWithType(PyObject *x, int xtype, PyObject *y, int ytype, CTXT_Object *context);
 static PyObject * GMPy_Complex_SubWithType(PyObject *x, int xtype, PyObject *y, int ytype, CTXT_Object *context);
 static PyObject * GMPy_Number_Sub_Slot(PyObject *x, PyObject *y);
-static PyObject * GMPy_Context_Sub(PyObject *self, PyObject *args);
+static PyObject * GMPy_Context_Sub(PyObject *self, PyObject *const *args, Py_ssize_t nargs);
 
 #ifdef __cplusplus
 }
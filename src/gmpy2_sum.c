@@ -0,0 +1,1131 @@
+/* * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * *
+ * gmpy2_sum.c                                                              *
+ * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * *
+ * Python interface to the GMP, MPFR, and MPC multiple precision           *
+ * libraries.                                                              *
+ *                                                                         *
+ * Copyright 2000 - 2009 Alex Martelli                                     *
+ *                                                                         *
+ * Copyright 2008 - 2024 Case Van Horsen                                   *
+ *                                                                         *
+ * This file is part of GMPY2.                                             *
+ *                                                                         *
+ * GMPY2 is free software: you can redistribute it and/or modify it under  *
+ * the terms of the GNU Lesser General Public License as published by the  *
+ * Free Software Foundation, either version 3 of the License, or (at your  *
+ * option) any later version.                                              *
+ *                                                                         *
+ * GMPY2 is distributed in the hope that it will be useful, but WITHOUT    *
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or   *
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public    *
+ * License for more details.                                               *
+ *                                                                         *
+ * You should have received a copy of the GNU Lesser General Public        *
+ * License along with GMPY2; if not, see <http://www.gnu.org/licenses/>    *
+ * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * */
+
+/* This file implements fsum(), dot() and the Accumulator type. All of them
+ * use a GMPy_Sum_State. Both functions read the values one
+ * at a time and collect them in chunks of GMPY_SUM_CHUNK values. Each chunk
+ * is summed exactly with mpfr_sum() or mpfr_dot() using a precision that is
+ * large enough for the exact result, and the chunk sum is added exactly to a
+ * running sum. The only rounding happens when the running sum is converted to
+ * the precision of the context, so the result is correctly rounded.
+ *
+ * Floats and integers are converted into a fixed pool of mpfr_t, so no Python
+ * objects are created for them. An mpfr is used in-place.
+ *
+ * The chunks are summed with MPFR_RNDN; the sums are exact so the rounding
+ * mode only matters for the sign of a zero. The kinds of the values seen are
+ * recorded instead, so a state does not depend on the rounding mode until
+ * the result is computed.
+ *
+ * The precision of the running sum depends on the range of the exponents of
+ * the values. If it would exceed GMPY_SUM_MAX_PREC bits, the remaining values
+ * are kept as mpfr objects and are all summed by a single call to mpfr_sum()
+ * at the end.
+ */
+
+#define GMPY_SUM_CHUNK 256
+#define GMPY_SUM_MAX_PREC ((mpfr_prec_t)1 << 24)
+
+typedef struct GMPy_Sum_State {
+    mpfr_t acc;                 /* exact sum of the chunks              */
+    mpfr_t chunk;               /* exact sum of the current chunk       */
+    mpfr_t temp;
+    int nan, pinf, ninf;        /* kinds of chunk sums seen             */
+    int poszero, negzero, regular;
+    int dot;                    /* sum x[i]*y[i] instead of x[i]        */
+    int nogil;                  /* release the GIL while summing        */
+    int count;                  /* number of values in the chunk        */
+    int xinit, yinit;           /* number of initialized pool entries   */
+    int nrefs;
+    mpfr_ptr xtab[GMPY_SUM_CHUNK];
+    mpfr_ptr ytab[GMPY_SUM_CHUNK];
+    mpfr_t xpool[GMPY_SUM_CHUNK];
+    mpfr_t ypool[GMPY_SUM_CHUNK];
+    PyObject *refs[2 * GMPY_SUM_CHUNK];  /* objects used by the chunk   */
+    PyObject *kept;             /* values kept once acc is too large    */
+    mpz_t scratch;
+    mpfr_exp_t emin, emax;      /* saved exponent range                 */
+    CTXT_Object *context;
+} GMPy_Sum_State;
+
+static void
+sum_state_init(GMPy_Sum_State *st, int dot, CTXT_Object *context)
+{
+    mpfr_init2(st->acc, MPFR_PREC_MIN);
+    mpfr_init2(st->chunk, MPFR_PREC_MIN);
+    mpfr_init2(st->temp, MPFR_PREC_MIN);
+    mpfr_set_zero(st->acc, 1);
+    st->nan = st->pinf = st->ninf = 0;
+    st->poszero = st->negzero = st->regular = 0;
+    st->dot = dot;
+    st->nogil = 1;
+    st->count = st->xinit = st->yinit = st->nrefs = 0;
+    st->kept = NULL;
+    mpz_init(st->scratch);
+    st->context = context;
+}
+
+/* The exact sums may need exponents outside of the current range. The range
+ * is extended by sum_range_enter() and restored by sum_range_exit().
+ */
+
+static void
+sum_range_enter(GMPy_Sum_State *st)
+{
+    st->emin = mpfr_get_emin();
+    st->emax = mpfr_get_emax();
+    mpfr_set_emin(mpfr_get_emin_min());
+    mpfr_set_emax(mpfr_get_emax_max());
+}
+
+static void
+sum_range_exit(GMPy_Sum_State *st)
+{
+    mpfr_set_emin(st->emin);
+    mpfr_set_emax(st->emax);
+}
+
+static void
+sum_state_release(GMPy_Sum_State *st)
+{
+    while (st->nrefs) {
+        Py_DECREF(st->refs[--(st->nrefs)]);
+    }
+}
+
+static void
+sum_state_clear(GMPy_Sum_State *st)
+{
+    int i;
+
+    sum_state_release(st);
+    for (i = 0; i < st->xinit; i++) {
+        mpfr_clear(st->xpool[i]);
+    }
+    for (i = 0; i < st->yinit; i++) {
+        mpfr_clear(st->ypool[i]);
+    }
+    mpfr_clear(st->acc);
+    mpfr_clear(st->chunk);
+    mpfr_clear(st->temp);
+    mpz_clear(st->scratch);
+    Py_CLEAR(st->kept);
+}
+
+/* Return the pool entry used for the next x (or y) value of the chunk. */
+
+static mpfr_ptr
+sum_state_slot(GMPy_Sum_State *st, int y)
+{
+    mpfr_t *pool = y ? st->ypool : st->xpool;
+    int *init = y ? &st->yinit : &st->xinit;
+
+    /* Entries are initialized on first use. Entries used by an mpfr are
+     * skipped, so there may be several to initialize.
+     */
+    while (*init <= st->count) {
+        mpfr_init2(pool[*init], DBL_MANT_DIG);
+        (*init)++;
+    }
+    return pool[st->count];
+}
+
+static void
+sum_set_z(mpfr_ptr slot, mpz_srcptr z)
+{
+    size_t bits = mpz_sizeinbase(z, 2);
+
+    mpfr_set_prec(slot, bits < 2 ? 2 : (mpfr_prec_t)bits);
+    mpfr_set_z(slot, z, MPFR_RNDN);
+}
+
+/* Store a pointer to the value of obj in the x (or y) table of the chunk.
+ * Floats and integers are converted exactly into the pool. Rationals and
+ * other real numbers are converted to the precision of the context. Returns
+ * -1 with an exception set on error.
+ */
+
+static int
+sum_state_value(GMPy_Sum_State *st, PyObject *obj, int y)
+{
+    MPFR_Object *temp;
+    mpfr_ptr value;
+    int xtype = GMPy_ObjectType(obj);
+
+    if (IS_TYPE_MPFR(xtype)) {
+        Py_INCREF(obj);
+        st->refs[st->nrefs++] = obj;
+        value = MPFR(obj);
+    }
+    else if (IS_TYPE_PyFloat(xtype)) {
+        value = sum_state_slot(st, y);
+        mpfr_set_prec(value, DBL_MANT_DIG);
+        mpfr_set_d(value, PyFloat_AS_DOUBLE(obj), MPFR_RNDN);
+    }
+    else if (IS_TYPE_MPZANY(xtype)) {
+        value = sum_state_slot(st, y);
+        sum_set_z(value, MPZ(obj));
+    }
+    else if (IS_TYPE_PyInteger(xtype)) {
+        if (mpz_set_PyLong(st->scratch, obj)) {
+            /* LCOV_EXCL_START */
+            return -1;
+            /* LCOV_EXCL_STOP */
+        }
+        value = sum_state_slot(st, y);
+        sum_set_z(value, st->scratch);
+    }
+    else if (IS_TYPE_REAL(xtype)) {
+        /* The conversion may run arbitrary code, so the chunk is only
+         * changed after it returns.
+         */
+        if (!(temp = GMPy_MPFR_From_RealWithType(obj, xtype, 1, st->context))) {
+            return -1;
+        }
+        st->refs[st->nrefs++] = (PyObject*)temp;
+        value = temp->f;
+    }
+    else {
+        TYPE_ERROR("all items in iterable must be real numbers");
+        return -1;
+    }
+    (y ? st->ytab : st->xtab)[st->count] = value;
+    return 0;
+}
+
+static int
+sum_ceil_log2(int n)
+{
+    int k = 0;
+
+    while ((1 << k) < n) {
+        k++;
+    }
+    return k;
+}
+
+/* Record the kinds of the finite values in the chunk and compute the
+ * precision needed for the exact sum of the chunk. Returns -1 if it is
+ * larger than GMPY_SUM_MAX_PREC.
+ */
+
+static int
+sum_state_chunk_prec(GMPy_Sum_State *st, mpfr_prec_t *prec)
+{
+    mpfr_exp_t hi = 0, lo = 0, e, l;
+    int i, found = 0;
+
+    for (i = 0; i < st->count; i++) {
+        mpfr_srcptr x = st->xtab[i];
+
+        if (st->dot) {
+            mpfr_srcptr y = st->ytab[i];
+
+            if (!mpfr_regular_p(x) || !mpfr_regular_p(y)) {
+                if (mpfr_number_p(x) && mpfr_number_p(y)) {
+                    if (mpfr_signbit(x) != mpfr_signbit(y)) {
+                        st->negzero = 1;
+                    }
+                    else {
+                        st->poszero = 1;
+                    }
+                }
+                continue;
+            }
+            e = mpfr_get_exp(x) + mpfr_get_exp(y);
+            l = e - (mpfr_exp_t)(mpfr_min_prec(x) + mpfr_min_prec(y));
+        }
+        else {
+            if (!mpfr_regular_p(x)) {
+                if (mpfr_zero_p(x)) {
+                    if (mpfr_signbit(x)) {
+                        st->negzero = 1;
+                    }
+                    else {
+                        st->poszero = 1;
+                    }
+                }
+                continue;
+            }
+            e = mpfr_get_exp(x);
+            l = e - (mpfr_exp_t)mpfr_min_prec(x);
+        }
+        if (!found || e > hi) {
+            hi = e;
+        }
+        if (!found || l < lo) {
+            lo = l;
+        }
+        found = 1;
+    }
+
+    if (!found) {
+        *prec = MPFR_PREC_MIN;
+        return 0;
+    }
+    st->regular = 1;
+    if (hi - lo > GMPY_SUM_MAX_PREC) {
+        return -1;
+    }
+    *prec = (mpfr_prec_t)(hi - lo) + sum_ceil_log2(st->count) + 1;
+    return 0;
+}
+
+/* Add the exact sum of a chunk to the running sum. Returns -1 without
+ * changing the running sum if the result would need more than
+ * GMPY_SUM_MAX_PREC bits. Does not use the Python API.
+ */
+
+static int
+sum_state_add_chunk(GMPy_Sum_State *st)
+{
+    mpfr_exp_t hi, lo, lsb_acc, lsb_chunk;
+
+    if (mpfr_nan_p(st->chunk)) {
+        st->nan = 1;
+        return 0;
+    }
+    if (mpfr_inf_p(st->chunk)) {
+        if (mpfr_signbit(st->chunk)) {
+            st->ninf = 1;
+        }
+        else {
+            st->pinf = 1;
+        }
+        return 0;
+    }
+    if (mpfr_zero_p(st->chunk)) {
+        return 0;
+    }
+
+    if (mpfr_zero_p(st->acc)) {
+        mpfr_swap(st->acc, st->chunk);
+        return 0;
+    }
+
+    lsb_acc = mpfr_get_exp(st->acc) - (mpfr_exp_t)mpfr_min_prec(st->acc);
+    lsb_chunk = mpfr_get_exp(st->chunk) - (mpfr_exp_t)mpfr_min_prec(st->chunk);
+    hi = (mpfr_get_exp(st->acc) > mpfr_get_exp(st->chunk)) ? mpfr_get_exp(st->acc)
+                                                           : mpfr_get_exp(st->chunk);
+    lo = (lsb_acc < lsb_chunk) ? lsb_acc : lsb_chunk;
+    if (hi + 1 - lo > GMPY_SUM_MAX_PREC) {
+        return -1;
+    }
+
+    mpfr_set_prec(st->temp, (mpfr_prec_t)(hi + 1 - lo));
+    mpfr_add(st->temp, st->acc, st->chunk, MPFR_RNDN);
+    mpfr_swap(st->acc, st->temp);
+    return 0;
+}
+
+/* Append an mpfr with the exact value of v to the list of kept values. */
+
+static int
+sum_state_keep(GMPy_Sum_State *st, mpfr_srcptr x, mpfr_srcptr y)
+{
+    MPFR_Object *temp;
+    int res;
+
+    if (y) {
+        temp = GMPy_MPFR_New(mpfr_get_prec(x) + mpfr_get_prec(y), st->context);
+    }
+    else {
+        temp = GMPy_MPFR_New(mpfr_get_prec(x) < 2 ? 2 : mpfr_get_prec(x), st->context);
+    }
+    if (!temp) {
+        /* LCOV_EXCL_START */
+        return -1;
+        /* LCOV_EXCL_STOP */
+    }
+    if (y) {
+        mpfr_mul(temp->f, x, y, MPFR_RNDN);
+    }
+    else {
+        mpfr_set(temp->f, x, MPFR_RNDN);
+    }
+    res = PyList_Append(st->kept, (PyObject*)temp);
+    Py_DECREF((PyObject*)temp);
+    return res;
+}
+
+/* Sum the values in the current chunk. Must be called with the GIL. The GIL
+ * is released while the chunk is summed unless the state is shared.
+ */
+
+static int
+sum_state_flush(GMPy_Sum_State *st)
+{
+    mpfr_prec_t prec;
+    int i, res = 0;
+
+    if (!st->count) {
+        return 0;
+    }
+
+    if (!st->kept) {
+        if (sum_state_chunk_prec(st, &prec) == 0) {
+            PyThreadState *_save = st->nogil ? PyEval_SaveThread() : NULL;
+
+            mpfr_set_prec(st->chunk, prec);
+            if (st->dot) {
+                mpfr_dot(st->chunk, st->xtab, st->ytab, (unsigned long)st->count,
+                         MPFR_RNDN);
+            }
+            else {
+                mpfr_sum(st->chunk, st->xtab, (unsigned long)st->count,
+                         MPFR_RNDN);
+            }
+            res = sum_state_add_chunk(st);
+            if (_save) {
+                PyEval_RestoreThread(_save);
+            }
+
+            if (res == 0) {
+                sum_state_release(st);
+                st->count = 0;
+                return 0;
+            }
+        }
+        if (!(st->kept = PyList_New(0))) {
+            /* LCOV_EXCL_START */
+            return -1;
+            /* LCOV_EXCL_STOP */
+        }
+        if (res < 0) {
+            /* Only the running sum is too large. Keep the chunk sum. */
+            res = sum_state_keep(st, st->chunk, NULL);
+            sum_state_release(st);
+            st->count = 0;
+            return res;
+        }
+    }
+
+    for (i = 0; i < st->count && res == 0; i++) {
+        res = sum_state_keep(st, st->xtab[i], st->dot ? st->ytab[i] : NULL);
+    }
+    sum_state_release(st);
+    st->count = 0;
+    return res;
+}
+
+/* Set r to the sum of the chunks, rounded with rnd. Returns the ternary
+ * value. The sign of a zero result follows the IEEE 754 rules.
+ */
+
+static int
+sum_state_round(GMPy_Sum_State *st, mpfr_ptr r, mpfr_rnd_t rnd)
+{
+    int neg;
+
+    if (st->nan || (st->pinf && st->ninf)) {
+        /* mpfr_set_nan() keeps the sign of r, which may be a cached mpfr. */
+        mpfr_set_nan(r);
+        mpfr_setsign(r, r, 0, MPFR_RNDN);
+        return 0;
+    }
+    if (st->pinf || st->ninf) {
+        mpfr_set_inf(r, st->ninf ? -1 : 1);
+        return 0;
+    }
+    if (!mpfr_zero_p(st->acc)) {
+        return mpfr_set(r, st->acc, rnd);
+    }
+
+    neg = (st->negzero && !st->poszero && !st->regular) ||
+          ((rnd == MPFR_RNDD) && (st->regular || (st->negzero && st->poszero)));
+    mpfr_set_zero(r, neg ? -1 : 1);
+    return 0;
+}
+
+/* Return the correctly rounded sum as a new mpfr. Must be called after
+ * sum_range_enter(); the exponent range is restored before the result is
+ * checked. The sum in the state is not changed.
+ */
+
+static PyObject *
+sum_state_result(GMPy_Sum_State *st)
+{
+    MPFR_Object *result = NULL, *head;
+    mpfr_ptr *tab;
+    Py_ssize_t i, n;
+
+    if (sum_state_flush(st) < 0 ||
+        !(result = GMPy_MPFR_New(0, st->context))) {
+        goto done;
+    }
+
+    mpfr_clear_flags();
+    if (!st->kept) {
+        result->rc = sum_state_round(st, result->f, GET_MPFR_ROUND(st->context));
+    }
+    else {
+        n = PyList_GET_SIZE(st->kept);
+        if ((unsigned long long)n >= ULONG_MAX) {
+            /* LCOV_EXCL_START */
+            OVERFLOW_ERROR("temporary array is too large");
+            Py_CLEAR(result);
+            goto done;
+            /* LCOV_EXCL_STOP */
+        }
+        if (!(head = GMPy_MPFR_New(mpfr_get_prec(st->acc) < 2 ? 2 : mpfr_get_prec(st->acc),
+                                   st->context))) {
+            /* LCOV_EXCL_START */
+            Py_CLEAR(result);
+            goto done;
+            /* LCOV_EXCL_STOP */
+        }
+        sum_state_round(st, head->f, GET_MPFR_ROUND(st->context));
+        if (!(tab = PyMem_New(mpfr_ptr, n + 1))) {
+            /* LCOV_EXCL_START */
+            Py_DECREF((PyObject*)head);
+            Py_CLEAR(result);
+            PyErr_NoMemory();
+            goto done;
+            /* LCOV_EXCL_STOP */
+        }
+        tab[0] = head->f;
+        for (i = 0; i < n; i++) {
+            tab[i + 1] = MPFR(PyList_GET_ITEM(st->kept, i));
+        }
+        mpfr_clear_flags();
+        result->rc = mpfr_sum(result->f, tab, (unsigned long)(n + 1),
+                              GET_MPFR_ROUND(st->context));
+        PyMem_Free(tab);
+        Py_DECREF((PyObject*)head);
+    }
+
+  done:
+    {
+        mpfr_flags_t flags = mpfr_flags_save();
+
+        sum_range_exit(st);
+        mpfr_flags_restore(flags, MPFR_FLAGS_ALL);
+        if (result) {
+            _GMPy_MPFR_Cleanup(&result, st->context);
+        }
+    }
+    return (PyObject*)result;
+}
+
+/* The values are read from an mpfr_array, a buffer of doubles, or any
+ * iterable.
+ */
+
+typedef struct {
+    MPFR_Array_Object *array;
+    Py_buffer view;
+    int has_view;
+    PyObject *iter;
+    Py_ssize_t pos, length;
+} GMPy_Sum_Source;
+
+static int
+sum_source_init(GMPy_Sum_Source *src, PyObject *obj)
+{
+    src->array = NULL;
+    src->has_view = 0;
+    src->iter = NULL;
+    src->pos = src->length = 0;
+
+    if (MPFR_Array_Check(obj)) {
+        src->array = (MPFR_Array_Object*)obj;
+        src->length = src->array->length;
+    }
+    else if (mpfr_array_get_double_buffer(obj, &src->view)) {
+        src->has_view = 1;
+        src->length = src->view.shape[0];
+    }
+    else if (!(src->iter = PyObject_GetIter(obj))) {
+        TYPE_ERROR("argument must be an iterable");
+        return -1;
+    }
+    return 0;
+}
+
+static void
+sum_source_clear(GMPy_Sum_Source *src)
+{
+    if (src->has_view) {
+        PyBuffer_Release(&src->view);
+        src->has_view = 0;
+    }
+    Py_CLEAR(src->iter);
+}
+
+/* Store a pointer to the next value in the x (or y) table of the chunk.
+ * Returns 1 if a value was stored, 0 at the end of the values, and -1 with an
+ * exception set on error.
+ */
+
+static int
+sum_source_next(GMPy_Sum_Source *src, GMPy_Sum_State *st, int y)
+{
+    PyObject *item;
+    mpfr_ptr value;
+    int res;
+
+    if (src->array) {
+        if (src->pos >= src->length) {
+            return 0;
+        }
+        (y ? st->ytab : st->xtab)[st->count] = MPFR_ARRAY_GET(src->array, src->pos);
+        src->pos++;
+        return 1;
+    }
+
+    if (src->has_view) {
+        if (src->pos >= src->length) {
+            return 0;
+        }
+        value = sum_state_slot(st, y);
+        mpfr_set_prec(value, DBL_MANT_DIG);
+        mpfr_set_d(value, ((const double*)src->view.buf)[src->pos], MPFR_RNDN);
+        (y ? st->ytab : st->xtab)[st->count] = value;
+        src->pos++;
+        return 1;
+    }
+
+    if (!(item = PyIter_Next(src->iter))) {
+        return PyErr_Occurred() ? -1 : 0;
+    }
+    res = sum_state_value(st, item, y);
+    Py_DECREF(item);
+    return res < 0 ? -1 : 1;
+}
+
+/* Count a value that was stored in the chunk and sum the chunk if it is
+ * full. Once the running sum is too large, every value is kept.
+ */
+
+static int
+sum_state_push(GMPy_Sum_State *st)
+{
+    st->count++;
+    if (st->count == GMPY_SUM_CHUNK || st->kept) {
+        return sum_state_flush(st);
+    }
+    return 0;
+}
+
+/* Add all the values from a source. Values that are read from an mpfr_array
+ * or a buffer are not owned by the state, so the chunk is summed before
+ * returning. Returns -1 with an exception set on error.
+ */
+
+static int
+sum_state_extend(GMPy_Sum_State *st, GMPy_Sum_Source *src)
+{
+    int res;
+
+    while ((res = sum_source_next(src, st, 0)) > 0) {
+        if ((res = sum_state_push(st)) < 0) {
+            return -1;
+        }
+    }
+    if (res == 0 && (src->array || src->has_view)) {
+        res = sum_state_flush(st);
+    }
+    return res;
+}
+
+PyDoc_STRVAR(GMPy_doc_function_fsum,
+"fsum(iterable, /) -> mpfr\n\n"
+"Return the correctly rounded sum of the values in the iterable. The values\n"
+"are read one at a time and summed exactly, so the iterable does not need\n"
+"to fit in memory. An mpfr_array and a buffer of float64 values, like a\n"
+"NumPy array, are read directly.");
+
+PyDoc_STRVAR(GMPy_doc_context_fsum,
+"context.fsum(iterable, /) -> mpfr\n\n"
+"Return the correctly rounded sum of the values in the iterable. The values\n"
+"are read one at a time and summed exactly, so the iterable does not need\n"
+"to fit in memory. An mpfr_array and a buffer of float64 values, like a\n"
+"NumPy array, are read directly.");
+
+static PyObject *
+GMPy_Context_Fsum(PyObject *self, PyObject *other)
+{
+    GMPy_Sum_State st;
+    GMPy_Sum_Source src;
+    CTXT_Object *context = NULL;
+    PyObject *result = NULL;
+    int res;
+
+    if (self && CTXT_Check(self)) {
+        context = (CTXT_Object*)self;
+    }
+    else {
+        CHECK_CONTEXT(context);
+    }
+
+    if (sum_source_init(&src, other) < 0) {
+        return NULL;
+    }
+
+    sum_state_init(&st, 0, context);
+    sum_range_enter(&st);
+    res = sum_state_extend(&st, &src);
+    sum_source_clear(&src);
+
+    if (res < 0) {
+        sum_range_exit(&st);
+    }
+    else {
+        result = sum_state_result(&st);
+    }
+    sum_state_clear(&st);
+    return result;
+}
+
+PyDoc_STRVAR(GMPy_doc_function_dot,
+"dot(x, y, /) -> mpfr\n\n"
+"Return the correctly rounded sum of x[i]*y[i]. x and y may be any\n"
+"iterables of real numbers with the same length. The products are computed\n"
+"exactly and summed with mpfr_dot() one chunk at a time, so the values do\n"
+"not need to fit in memory. An mpfr_array and a buffer of float64 values,\n"
+"like a NumPy array, are read directly.");
+
+PyDoc_STRVAR(GMPy_doc_context_dot,
+"context.dot(x, y, /) -> mpfr\n\n"
+"Return the correctly rounded sum of x[i]*y[i]. x and y may be any\n"
+"iterables of real numbers with the same length. The products are computed\n"
+"exactly and summed with mpfr_dot() one chunk at a time, so the values do\n"
+"not need to fit in memory. An mpfr_array and a buffer of float64 values,\n"
+"like a NumPy array, are read directly.");
+
+static PyObject *
+GMPy_Context_Dot(PyObject *self, PyObject *const *args, Py_ssize_t nargs)
+{
+    GMPy_Sum_State st;
+    GMPy_Sum_Source xsrc, ysrc;
+    CTXT_Object *context = NULL;
+    PyObject *result = NULL;
+    int xres, yres;
+
+    if (nargs != 2) {
+        TYPE_ERROR("dot() requires 2 arguments");
+        return NULL;
+    }
+
+    if (self && CTXT_Check(self)) {
+        context = (CTXT_Object*)self;
+    }
+    else {
+        CHECK_CONTEXT(context);
+    }
+
+    if (sum_source_init(&xsrc, args[0]) < 0) {
+        return NULL;
+    }
+    if (sum_source_init(&ysrc, args[1]) < 0) {
+        sum_source_clear(&xsrc);
+        return NULL;
+    }
+
+    sum_state_init(&st, 1, context);
+    sum_range_enter(&st);
+    while (1) {
+        xres = sum_source_next(&xsrc, &st, 0);
+        yres = (xres < 0) ? -1 : sum_source_next(&ysrc, &st, 1);
+        if (xres < 0 || yres < 0) {
+            break;
+        }
+        if (xres != yres) {
+            VALUE_ERROR("dot() arguments must have the same length");
+            xres = -1;
+            break;
+        }
+        if (xres == 0 || (xres = sum_state_push(&st)) < 0) {
+            break;
+        }
+    }
+    sum_source_clear(&xsrc);
+    sum_source_clear(&ysrc);
+
+    if (xres < 0 || yres < 0) {
+        sum_range_exit(&st);
+    }
+    else {
+        result = sum_state_result(&st);
+    }
+    sum_state_clear(&st);
+    return result;
+}
+
+/* An Accumulator keeps a GMPy_Sum_State between calls. The GIL is not
+ * released while a chunk is summed, and each method holds a critical
+ * section on the Accumulator (and on the other Accumulator in merge()), so
+ * an Accumulator can be shared by several threads on a free-threaded build
+ * too.
+ */
+
+static PyObject *
+GMPy_Accumulator_NewInit(PyTypeObject *type, PyObject *args, PyObject *keywds)
+{
+    Accumulator_Object *result;
+    PyObject *context = Py_None;
+
+    if (keywds && PyDict_Size(keywds)) {
+        TYPE_ERROR("Accumulator() takes no keyword arguments");
+        return NULL;
+    }
+    if (!PyArg_ParseTuple(args, "|O:Accumulator", &context)) {
+        return NULL;
+    }
+    if (context != Py_None && !CTXT_Check(context)) {
+        TYPE_ERROR("Accumulator() argument must be a context or None");
+        return NULL;
+    }
+
+    if (!(result = PyObject_New(Accumulator_Object, &Accumulator_Type))) {
+        /* LCOV_EXCL_START */
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+    if (!(result->state = PyMem_Malloc(sizeof(GMPy_Sum_State)))) {
+        /* LCOV_EXCL_START */
+        result->context = NULL;
+        Py_DECREF((PyObject*)result);
+        return PyErr_NoMemory();
+        /* LCOV_EXCL_STOP */
+    }
+    sum_state_init(result->state, 0, NULL);
+    result->state->nogil = 0;
+    if (context == Py_None) {
+        result->context = NULL;
+    }
+    else {
+        Py_INCREF(context);
+        result->context = (CTXT_Object*)context;
+    }
+    return (PyObject*)result;
+}
+
+static void
+GMPy_Accumulator_Dealloc(Accumulator_Object *self)
+{
+    if (self->state) {
+        sum_state_clear(self->state);
+        PyMem_Free(self->state);
+    }
+    Py_XDECREF((PyObject*)self->context);
+    PyObject_Free(self);
+}
+
+/* Set the context used by the state of an Accumulator for the current call.
+ * Returns -1 with an exception set on error.
+ */
+
+static int
+accumulator_set_context(Accumulator_Object *self)
+{
+    CTXT_Object *context = self->context;
+
+    CHECK_CONTEXT_M1(context);
+    self->state->context = context;
+    return 0;
+}
+
+PyDoc_STRVAR(GMPy_doc_accumulator_add,
+"x.add(value, /) -> None\n\n"
+"Add a real number to the sum.");
+
+static PyObject *
+GMPy_Accumulator_Method_Add(PyObject *self, PyObject *other)
+{
+    GMPy_Sum_State *st = ((Accumulator_Object*)self)->state;
+    int res = -1;
+
+    Py_BEGIN_CRITICAL_SECTION(self);
+    if (accumulator_set_context((Accumulator_Object*)self) == 0) {
+        sum_range_enter(st);
+        res = sum_state_value(st, other, 0);
+        if (res == 0) {
+            res = sum_state_push(st);
+        }
+        sum_range_exit(st);
+    }
+    Py_END_CRITICAL_SECTION();
+
+    if (res < 0) {
+        return NULL;
+    }
+    Py_RETURN_NONE;
+}
+
+PyDoc_STRVAR(GMPy_doc_accumulator_extend,
+"x.extend(iterable, /) -> None\n\n"
+"Add all the values in the iterable to the sum. An mpfr_array and a buffer\n"
+"of float64 values are read directly. If an error occurs, the values read\n"
+"before the error remain in the sum.");
+
+static PyObject *
+GMPy_Accumulator_Method_Extend(PyObject *self, PyObject *other)
+{
+    GMPy_Sum_State *st = ((Accumulator_Object*)self)->state;
+    GMPy_Sum_Source src;
+    int res = -1;
+
+    if (sum_source_init(&src, other) < 0) {
+        return NULL;
+    }
+
+    Py_BEGIN_CRITICAL_SECTION(self);
+    if (accumulator_set_context((Accumulator_Object*)self) == 0) {
+        sum_range_enter(st);
+        res = sum_state_extend(st, &src);
+        sum_range_exit(st);
+    }
+    Py_END_CRITICAL_SECTION();
+    sum_source_clear(&src);
+
+    if (res < 0) {
+        return NULL;
+    }
+    Py_RETURN_NONE;
+}
+
+/* Add the running sum and the kept values of other to st. Both states must
+ * have been flushed.
+ */
+
+static int
+sum_state_merge(GMPy_Sum_State *st, GMPy_Sum_State *other)
+{
+    PyObject *kept = other->kept;
+
+    st->nan |= other->nan;
+    st->pinf |= other->pinf;
+    st->ninf |= other->ninf;
+    st->poszero |= other->poszero;
+    st->negzero |= other->negzero;
+    st->regular |= other->regular;
+
+    if (!mpfr_zero_p(other->acc)) {
+        mpfr_set_prec(st->chunk, mpfr_get_prec(other->acc));
+        mpfr_set(st->chunk, other->acc, MPFR_RNDN);
+        if (sum_state_add_chunk(st) < 0) {
+            if (!st->kept && !(st->kept = PyList_New(0))) {
+                /* LCOV_EXCL_START */
+                return -1;
+                /* LCOV_EXCL_STOP */
+            }
+            if (sum_state_keep(st, st->chunk, NULL) < 0) {
+                /* LCOV_EXCL_START */
+                return -1;
+                /* LCOV_EXCL_STOP */
+            }
+        }
+    }
+
+    if (kept) {
+        if (!st->kept && !(st->kept = PyList_New(0))) {
+            /* LCOV_EXCL_START */
+            return -1;
+            /* LCOV_EXCL_STOP */
+        }
+        if (PyList_SetSlice(st->kept, PY_SSIZE_T_MAX, PY_SSIZE_T_MAX, kept) < 0) {
+            /* LCOV_EXCL_START */
+            return -1;
+            /* LCOV_EXCL_STOP */
+        }
+    }
+    return 0;
+}
+
+PyDoc_STRVAR(GMPy_doc_accumulator_merge,
+"x.merge(other, /) -> None\n\n"
+"Add the sum of the Accumulator other to the sum. other is not changed.");
+
+static PyObject *
+GMPy_Accumulator_Method_Merge(PyObject *self, PyObject *other)
+{
+    GMPy_Sum_State *st = ((Accumulator_Object*)self)->state;
+    GMPy_Sum_State *ost;
+    int res = -1;
+
+    if (!Accumulator_Check(other)) {
+        TYPE_ERROR("merge() argument must be an Accumulator");
+        return NULL;
+    }
+    ost = ((Accumulator_Object*)other)->state;
+
+    Py_BEGIN_CRITICAL_SECTION2(self, other);
+    if (accumulator_set_context((Accumulator_Object*)self) == 0) {
+        ost->context = st->context;
+        sum_range_enter(st);
+        res = sum_state_flush(st);
+        if (res == 0) {
+            res = sum_state_flush(ost);
+        }
+        if (res == 0) {
+            res = sum_state_merge(st, ost);
+        }
+        sum_range_exit(st);
+    }
+    Py_END_CRITICAL_SECTION2();
+
+    if (res < 0) {
+        return NULL;
+    }
+    Py_RETURN_NONE;
+}
+
+PyDoc_STRVAR(GMPy_doc_accumulator_result,
+"x.result() -> mpfr\n\n"
+"Return the sum, correctly rounded to the precision of the context. The\n"
+"sum is not changed.");
+
+static PyObject *
+GMPy_Accumulator_Method_Result(PyObject *self, PyObject *other)
+{
+    GMPy_Sum_State *st = ((Accumulator_Object*)self)->state;
+    PyObject *result = NULL;
+
+    Py_BEGIN_CRITICAL_SECTION(self);
+    if (accumulator_set_context((Accumulator_Object*)self) == 0) {
+        sum_range_enter(st);
+        result = sum_state_result(st);
+    }
+    Py_END_CRITICAL_SECTION();
+    return result;
+}
+
+/* An Accumulator is pickled as the exact running sum, the kinds of the values
+ * seen, and the list of kept values. The context is not pickled.
+ */
+
+static PyObject *
+GMPy_Accumulator_Method_Reduce(PyObject *self, PyObject *other)
+{
+    GMPy_Sum_State *st = ((Accumulator_Object*)self)->state;
+    MPFR_Object *acc = NULL;
+    PyObject *kept = NULL;
+    int kinds = 0;
+
+    Py_BEGIN_CRITICAL_SECTION(self);
+    if (accumulator_set_context((Accumulator_Object*)self) == 0) {
+        sum_range_enter(st);
+        if (sum_state_flush(st) == 0) {
+            if ((acc = GMPy_MPFR_New(mpfr_get_prec(st->acc) < 2 ? 2 : mpfr_get_prec(st->acc),
+                                     st->context))) {
+                mpfr_set(acc->f, st->acc, MPFR_RNDN);
+            }
+        }
+        sum_range_exit(st);
+        if (acc) {
+            kinds = st->nan | st->pinf << 1 | st->ninf << 2 |
+                    st->poszero << 3 | st->negzero << 4 | st->regular << 5;
+            kept = st->kept ? PyList_AsTuple(st->kept) : (Py_INCREF(Py_None), Py_None);
+        }
+    }
+    Py_END_CRITICAL_SECTION();
+
+    if (!acc) {
+        /* LCOV_EXCL_START */
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+    if (!kept) {
+        /* LCOV_EXCL_START */
+        Py_DECREF((PyObject*)acc);
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+    return Py_BuildValue("(O()(NiN))", (PyObject*)&Accumulator_Type, acc, kinds, kept);
+}
+
+static PyObject *
+GMPy_Accumulator_Method_SetState(PyObject *self, PyObject *other)
+{
+    GMPy_Sum_State *st = ((Accumulator_Object*)self)->state;
+    PyObject *acc, *kept, *list = NULL;
+    Py_ssize_t i;
+    int kinds;
+
+    if (!PyArg_ParseTuple(other, "O!iO", &MPFR_Type, &acc, &kinds, &kept)) {
+        return NULL;
+    }
+    if (kept != Py_None) {
+        if (!(list = PySequence_List(kept))) {
+            return NULL;
+        }
+        for (i = 0; i < PyList_GET_SIZE(list); i++) {
+            if (!MPFR_Check(PyList_GET_ITEM(list, i))) {
+                Py_DECREF(list);
+                TYPE_ERROR("invalid Accumulator state");
+                return NULL;
+            }
+        }
+    }
+
+    Py_BEGIN_CRITICAL_SECTION(self);
+    sum_state_release(st);
+    st->count = 0;
+    Py_XSETREF(st->kept, list);
+    mpfr_set_prec(st->acc, mpfr_get_prec(MPFR(acc)));
+    mpfr_set(st->acc, MPFR(acc), MPFR_RNDN);
+    st->nan = kinds & 1;
+    st->pinf = (kinds >> 1) & 1;
+    st->ninf = (kinds >> 2) & 1;
+    st->poszero = (kinds >> 3) & 1;
+    st->negzero = (kinds >> 4) & 1;
+    st->regular = (kinds >> 5) & 1;
+    Py_END_CRITICAL_SECTION();
+    Py_RETURN_NONE;
+}
+
+static PyMethodDef GMPy_Accumulator_methods[] = {
+    { "__reduce__", GMPy_Accumulator_Method_Reduce, METH_NOARGS, NULL },
+    { "__setstate__", GMPy_Accumulator_Method_SetState, METH_O, NULL },
+    { "add", GMPy_Accumulator_Method_Add, METH_O, GMPy_doc_accumulator_add },
+    { "extend", GMPy_Accumulator_Method_Extend, METH_O, GMPy_doc_accumulator_extend },
+    { "merge", GMPy_Accumulator_Method_Merge, METH_O, GMPy_doc_accumulator_merge },
+    { "result", GMPy_Accumulator_Method_Result, METH_NOARGS, GMPy_doc_accumulator_result },
+    { NULL }
+};
+
+PyDoc_STRVAR(GMPy_doc_accumulator,
+"Accumulator(context=None, /)\n\n"
+"Return an object that keeps the exact sum of the real numbers added to\n"
+"it. Values can be added one at a time with add() or from an iterable with\n"
+"extend(), and the sums of several Accumulators can be combined with\n"
+"merge(). result() returns the sum correctly rounded to the precision of\n"
+"the context. If context is None, the current context is used.\n\n"
+"An Accumulator can be pickled to send a partial sum to another process.\n"
+"The context is not pickled.");
+
+static PyTypeObject Accumulator_Type = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = "gmpy2.Accumulator",
+    .tp_basicsize = sizeof(Accumulator_Object),
+    .tp_dealloc = (destructor) GMPy_Accumulator_Dealloc,
+    .tp_hash = PyObject_HashNotImplemented,
+    .tp_flags = Py_TPFLAGS_DEFAULT,
+    .tp_doc = GMPy_doc_accumulator,
+    .tp_methods = GMPy_Accumulator_methods,
+    .tp_new = GMPy_Accumulator_NewInit,
+};
@@ -0,0 +1,56 @@
+/* * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * *
+ * gmpy2_sum.h                                                              *
+ * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * *
+ * Python interface to the GMP, MPFR, and MPC multiple precision           *
+ * libraries.                                                              *
+ *                                                                         *
+ * Copyright 2000 - 2009 Alex Martelli                                     *
+ *                                                                         *
+ * Copyright 2008 - 2024 Case Van Horsen                                   *
+ *                                                                         *
+ * This file is part of GMPY2.                                             *
+ *                                                                         *
+ * GMPY2 is free software: you can redistribute it and/or modify it under  *
+ * the terms of the GNU Lesser General Public License as published by the  *
+ * Free Software Foundation, either version 3 of the License, or (at your  *
+ * option) any later version.                                              *
+ *                                                                         *
+ * GMPY2 is distributed in the hope that it will be useful, but WITHOUT    *
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or   *
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public    *
+ * License for more details.                                               *
+ *                                                                         *
+ * You should have received a copy of the GNU Lesser General Public        *
+ * License along with GMPY2; if not, see <http://www.gnu.org/licenses/>    *
+ * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * */
+
+#ifndef GMPY_SUM_H
+#define GMPY_SUM_H
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+/* An Accumulator keeps the exact sum of the values added to it. The state is
+ * defined in gmpy2_sum.c.
+ */
+
+typedef struct {
+    PyObject_HEAD
+    CTXT_Object *context;           /* NULL to use the current context  */
+    struct GMPy_Sum_State *state;
+} Accumulator_Object;
+
+static PyTypeObject Accumulator_Type;
+#define Accumulator_Check(v) (((PyObject*)v)->ob_type == &Accumulator_Type)
+
+static PyObject * GMPy_Context_Fsum(PyObject *self, PyObject *other);
+static PyObject * GMPy_Context_Dot(PyObject *self, PyObject *const *args, Py_ssize_t nargs);
+
+static PyObject * GMPy_Accumulator_NewInit(PyTypeObject *type, PyObject *args, PyObject *keywds);
+static void       GMPy_Accumulator_Dealloc(Accumulator_Object *self);
+
+#ifdef __cplusplus
+}
+#endif
+#endif
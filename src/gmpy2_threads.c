@@ -0,0 +1,208 @@
+/* * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * *
+ * gmpy2_threads.c                                                          *
+ * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * *
+ * Python interface to the GMP, MPFR, and MPC multiple precision           *
+ * libraries.                                                              *
+ *                                                                         *
+ * Copyright 2000 - 2009 Alex Martelli                                     *
+ *                                                                         *
+ * Copyright 2008 - 2024 Case Van Horsen                                   *
+ *                                                                         *
+ * This file is part of GMPY2.                                             *
+ *                                                                         *
+ * GMPY2 is free software: you can redistribute it and/or modify it under  *
+ * the terms of the GNU Lesser General Public License as published by the  *
+ * Free Software Foundation, either version 3 of the License, or (at your  *
+ * option) any later version.                                              *
+ *                                                                         *
+ * GMPY2 is distributed in the hope that it will be useful, but WITHOUT    *
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or   *
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public    *
+ * License for more details.                                               *
+ *                                                                         *
+ * You should have received a copy of the GNU Lesser General Public        *
+ * License along with GMPY2; if not, see <http://www.gnu.org/licenses/>    *
+ * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * */
+
+
+/* This file provides a minimal thread pool that is used by the functions
+ * that operate on lists of values. GMP and MPFR do not need the GIL so each
+ * worker thread processes chunks of indices until no work is left. Results
+ * are written by index so the order of the results does not depend on the
+ * scheduling of the threads.
+ */
+
+#include "pythread.h"
+
+/* Maximum number of threads that may be requested. */
+
+#define GMPY_MAX_THREADS 1024
+
+/* Parse the optional keyword argument "threads". Returns the number of
+ * threads (default 1) or -1 with an exception set.
+ */
+
+static int
+GMPy_Parse_Threads(PyObject *keywds, const char *fname)
+{
+    PyObject *key, *value;
+    Py_ssize_t pos = 0;
+    long threads = 1;
+
+    if (!keywds) {
+        return 1;
+    }
+
+    while (PyDict_Next(keywds, &pos, &key, &value)) {
+        if (!PyUnicode_Check(key) ||
+            PyUnicode_CompareWithASCIIString(key, "threads")) {
+            PyErr_Format(PyExc_TypeError,
+                         "%s() got an unexpected keyword argument '%S'",
+                         fname, key);
+            return -1;
+        }
+        threads = PyLong_AsLong(value);
+        if (threads == -1 && PyErr_Occurred()) {
+            return -1;
+        }
+    }
+
+    if (threads < 1 || threads > GMPY_MAX_THREADS) {
+        PyErr_Format(PyExc_ValueError,
+                     "%s() 'threads' must be in the range [1, %d]",
+                     fname, GMPY_MAX_THREADS);
+        return -1;
+    }
+    return (int)threads;
+}
+
+typedef struct {
+    PyThread_type_lock lock;        /* protects next                 */
+    Py_ssize_t next;                /* first index not yet claimed   */
+    Py_ssize_t n;
+    Py_ssize_t chunk;
+    GMPy_Parallel_Func func;
+    void *arg;
+} GMPy_Parallel_State;
+
+typedef struct {
+    GMPy_Parallel_State *state;
+    PyThread_type_lock done;        /* released when the worker exits */
+} GMPy_Parallel_Worker;
+
+static void
+GMPy_Parallel_Run(GMPy_Parallel_State *state)
+{
+    Py_ssize_t start, stop;
+
+    while (1) {
+        PyThread_acquire_lock(state->lock, WAIT_LOCK);
+        start = state->next;
+        state->next = (start < state->n) ? start + state->chunk : state->n;
+        PyThread_release_lock(state->lock);
+
+        if (start >= state->n) {
+            break;
+        }
+        stop = (state->n - start > state->chunk) ? start + state->chunk : state->n;
+        state->func(state->arg, start, stop);
+    }
+}
+
+static void
+GMPy_Parallel_Worker_Main(void *arg)
+{
+    GMPy_Parallel_Worker *worker = (GMPy_Parallel_Worker*)arg;
+
+    GMPy_Parallel_Run(worker->state);
+    PyThread_release_lock(worker->done);
+}
+
+/* Call func(arg, start, stop) for consecutive ranges covering [0, n) using
+ * up to threads threads, including the calling thread. Must be called with
+ * the GIL; the GIL is released while func is running. If threads cannot be
+ * created, the remaining work is done by the threads that are running.
+ * Returns 0 on success or -1 with an exception set.
+ */
+
+static int
+GMPy_Parallel_For(Py_ssize_t n, int threads, GMPy_Parallel_Func func, void *arg)
+{
+    GMPy_Parallel_State state;
+    GMPy_Parallel_Worker *workers = NULL;
+    int i, started = 0;
+
+    if (threads > n) {
+        threads = (int)n;
+    }
+
+    if (threads <= 1) {
+        Py_BEGIN_ALLOW_THREADS;
+        if (n > 0) {
+            func(arg, 0, n);
+        }
+        Py_END_ALLOW_THREADS;
+        return 0;
+    }
+
+    /* Use several chunks per thread so a slow chunk doesn't stall the
+     * other threads at the end.
+     */
+    state.next = 0;
+    state.n = n;
+    state.chunk = n / ((Py_ssize_t)threads * 8);
+    if (state.chunk < 1) {
+        state.chunk = 1;
+    }
+    state.func = func;
+    state.arg = arg;
+
+    if (!(state.lock = PyThread_allocate_lock())) {
+        /* LCOV_EXCL_START */
+        PyErr_NoMemory();
+        return -1;
+        /* LCOV_EXCL_STOP */
+    }
+
+    if (!(workers = PyMem_New(GMPy_Parallel_Worker, threads - 1))) {
+        /* LCOV_EXCL_START */
+        PyThread_free_lock(state.lock);
+        PyErr_NoMemory();
+        return -1;
+        /* LCOV_EXCL_STOP */
+    }
+
+    for (i = 0; i < threads - 1; i++) {
+        workers[started].state = &state;
+        if (!(workers[started].done = PyThread_allocate_lock())) {
+            /* LCOV_EXCL_START */
+            break;
+            /* LCOV_EXCL_STOP */
+        }
+        PyThread_acquire_lock(workers[started].done, WAIT_LOCK);
+        if (PyThread_start_new_thread(GMPy_Parallel_Worker_Main,
+                                      &workers[started]) == PYTHREAD_INVALID_THREAD_ID) {
+            /* LCOV_EXCL_START */
+            PyThread_release_lock(workers[started].done);
+            PyThread_free_lock(workers[started].done);
+            break;
+            /* LCOV_EXCL_STOP */
+        }
+        started++;
+    }
+
+    Py_BEGIN_ALLOW_THREADS;
+    GMPy_Parallel_Run(&state);
+    for (i = 0; i < started; i++) {
+        PyThread_acquire_lock(workers[i].done, WAIT_LOCK);
+    }
+    Py_END_ALLOW_THREADS;
+
+    for (i = 0; i < started; i++) {
+        PyThread_release_lock(workers[i].done);
+        PyThread_free_lock(workers[i].done);
+    }
+    PyMem_Free(workers);
+    PyThread_free_lock(state.lock);
+    return 0;
+}
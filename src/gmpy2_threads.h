@@ -0,0 +1,49 @@
+/* * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * *
+ * gmpy2_threads.h                                                          *
+ * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * *
+ * Python interface to the GMP, MPFR, and MPC multiple precision           *
+ * libraries.                                                              *
+ *                                                                         *
+ * Copyright 2000 - 2009 Alex Martelli                                     *
+ *                                                                         *
+ * Copyright 2008 - 2024 Case Van Horsen                                   *
+ *                                                                         *
+ * This file is part of GMPY2.                                             *
+ *                                                                         *
+ * GMPY2 is free software: you can redistribute it and/or modify it under  *
+ * the terms of the GNU Lesser General Public License as published by the  *
+ * Free Software Foundation, either version 3 of the License, or (at your  *
+ * option) any later version.                                              *
+ *                                                                         *
+ * GMPY2 is distributed in the hope that it will be useful, but WITHOUT    *
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or   *
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public    *
+ * License for more details.                                               *
+ *                                                                         *
+ * You should have received a copy of the GNU Lesser General Public        *
+ * License along with GMPY2; if not, see <http://www.gnu.org/licenses/>    *
+ * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * */
+
+
+#ifndef GMPY_THREADS_H
+#define GMPY_THREADS_H
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+/* Support for splitting a loop across native threads.
+ *
+ * The work function is called with a range [start, stop) of indices. It is
+ * always called without the GIL and must not use the Python API.
+ */
+
+typedef void (*GMPy_Parallel_Func)(void *arg, Py_ssize_t start, Py_ssize_t stop);
+
+static int GMPy_Parse_Threads(PyObject *keywds, const char *fname);
+static int GMPy_Parallel_For(Py_ssize_t n, int threads, GMPy_Parallel_Func func, void *arg);
+
+#ifdef __cplusplus
+}
+#endif
+#endif
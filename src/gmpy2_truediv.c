@@ -319,11 +319,11 @@ PyDoc_STRVAR(GMPy_doc_context_truediv,
 "Return x / y; uses true division.");
 
 static PyObject *
-GMPy_Context_TrueDiv(PyObject *self, PyObject *args)
+GMPy_Context_TrueDiv(PyObject *self, PyObject *const *args, Py_ssize_t nargs)
 {
     CTXT_Object *context = NULL;
 
-    if (PyTuple_GET_SIZE(args) != 2) {
+    if (nargs != 2) {
         TYPE_ERROR("div() requires 2 arguments.");
         return NULL;
     }
@@ -335,7 +335,5 @@ GMPy_Context_TrueDiv(PyObject *self, PyObject *args)
         CHECK_CONTEXT(context);
     }
 
-    return GMPy_Number_TrueDiv(PyTuple_GET_ITEM(args, 0),
-                               PyTuple_GET_ITEM(args, 1),
-                               context);
+    return GMPy_Number_TrueDiv(args[0], args[1], context);
 }
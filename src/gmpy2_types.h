@@ -40,6 +40,7 @@ typedef struct {
 typedef struct {
     PyObject_HEAD
     mpz_t z;
+    Py_ssize_t exports;     /* number of exports of the limbs */
 } XMPZ_Object;
 
 typedef struct {
@@ -24,88 +24,211 @@
  * License along with GMPY2; if not, see <http://www.gnu.org/licenses/>    *
  * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * */
 
-/* The following code was a test case for creating a gmpy2 function that would
- * apply an MPFR function to all the elements of a list. It was slightly faster
- * than map(gmpy2.list, <<list>>) but not enough to justify the effort. The
- * code is left for possible future use.
- */
-
-PyDoc_STRVAR(GMPy_doc_function_vector,
-"vector(iterable, /) -> list\n\n"
-"Template for applying a function to an iterable.");
 
-PyDoc_STRVAR(GMPy_doc_context_vector,
-"vector(iterable, /) -> list\n\n"
-"Template for applying a function to an iterable.");
+/* vmap() applies one of the unary MPFR functions to every element of an
+ * iterable. The arguments are converted and the result objects are created
+ * while holding the GIL. The MPFR function is then called for all the
+ * elements without the GIL, optionally split across several threads. The
+ * MPFR flags are saved for each element so the exponent range checks, the
+ * context flags, and the traps can be handled in order, exactly as if the
+ * function had been called for each element.
+ */
 
-static PyObject *
-GMPy_Context_Vector(PyObject *self, PyObject *other)
+typedef int (*GMPy_MPFR_UnaryFunc)(mpfr_ptr, mpfr_srcptr, mpfr_rnd_t);
+
+typedef struct {
+    const char *name;
+    GMPy_MPFR_UnaryFunc func;
+} GMPy_VMap_Entry;
+
+static GMPy_VMap_Entry vmap_functions[] = {
+    { "acos", mpfr_acos },
+    { "acosh", mpfr_acosh },
+    { "ai", mpfr_ai },
+    { "asin", mpfr_asin },
+    { "asinh", mpfr_asinh },
+    { "atan", mpfr_atan },
+    { "atanh", mpfr_atanh },
+    { "cbrt", mpfr_cbrt },
+    { "cos", mpfr_cos },
+    { "cosh", mpfr_cosh },
+    { "cot", mpfr_cot },
+    { "coth", mpfr_coth },
+    { "csc", mpfr_csc },
+    { "csch", mpfr_csch },
+    { "digamma", mpfr_digamma },
+    { "eint", mpfr_eint },
+    { "erf", mpfr_erf },
+    { "erfc", mpfr_erfc },
+    { "exp", mpfr_exp },
+    { "exp10", mpfr_exp10 },
+    { "exp2", mpfr_exp2 },
+    { "expm1", mpfr_expm1 },
+    { "frac", mpfr_frac },
+    { "gamma", mpfr_gamma },
+    { "j0", mpfr_j0 },
+    { "j1", mpfr_j1 },
+    { "li2", mpfr_li2 },
+    { "lngamma", mpfr_lngamma },
+    { "log", mpfr_log },
+    { "log10", mpfr_log10 },
+    { "log1p", mpfr_log1p },
+    { "log2", mpfr_log2 },
+    { "rec_sqrt", mpfr_rec_sqrt },
+    { "rint", mpfr_rint },
+    { "rint_ceil", mpfr_rint_ceil },
+    { "rint_floor", mpfr_rint_floor },
+    { "rint_round", mpfr_rint_round },
+    { "rint_trunc", mpfr_rint_trunc },
+    { "sec", mpfr_sec },
+    { "sech", mpfr_sech },
+    { "sin", mpfr_sin },
+    { "sinh", mpfr_sinh },
+    { "sqrt", mpfr_sqrt },
+    { "square", mpfr_sqr },
+    { "tan", mpfr_tan },
+    { "tanh", mpfr_tanh },
+    { "y0", mpfr_y0 },
+    { "y1", mpfr_y1 },
+    { "zeta", mpfr_zeta },
+    { NULL, NULL }
+};
+
+typedef struct {
+    GMPy_MPFR_UnaryFunc func;
+    mpfr_rnd_t round;
+    MPFR_Object **args;
+    MPFR_Object **results;
+    MPFR_Array_Object *xarray;  /* used instead of args and results */
+    MPFR_Array_Object *rarray;
+    CTXT_Object *context;
+    mpfr_flags_t *flags;
+    unsigned long caller;       /* thread that called vmap()        */
+} GMPy_VMap_Args;
+
+static void
+GMPy_VMap_Work(void *arg, Py_ssize_t start, Py_ssize_t stop)
 {
-    PyObject *result, *tempres;
-    Py_ssize_t i, seq_length;
+    GMPy_VMap_Args *a = (GMPy_VMap_Args*)arg;
+    Py_ssize_t i;
 
-    CTXT_Object *context = NULL;
+    for (i = start; i < stop; i++) {
+        mpfr_clear_flags();
+        if (a->xarray) {
+            mpfr_ptr r = MPFR_ARRAY_GET(a->rarray, i);
 
-    if (self && CTXT_Check(self)) {
-        context = (CTXT_Object*)self;
+            _GMPy_MPFR_Range(r, a->func(r, MPFR_ARRAY_GET(a->xarray, i), a->round),
+                             a->context);
+        }
+        else {
+            a->results[i]->rc = a->func(a->results[i]->f, a->args[i]->f, a->round);
+        }
+        a->flags[i] = mpfr_flags_save();
     }
-    else {
-        CHECK_CONTEXT(context);
+
+    /* MPFR keeps the constant caches in thread-local storage. Free them in
+     * the worker threads since they are not reused after the thread exits.
+     */
+    if (PyThread_get_thread_ident() != a->caller) {
+        mpfr_free_cache2(MPFR_FREE_LOCAL_CACHE);
     }
+}
 
-    if (!(other = PySequence_List(other))) {
-        TYPE_ERROR("argument must be an iterable");
+static GMPy_MPFR_UnaryFunc
+GMPy_VMap_Lookup(PyObject *name)
+{
+    GMPy_VMap_Entry *entry;
+
+    if (!PyUnicode_Check(name)) {
+        TYPE_ERROR("vmap() argument 'func' must be a str");
         return NULL;
     }
 
-    /* other contains a new list containing all the values from the
-     * iterable. Create a list to store the results.
-     */
+    for (entry = vmap_functions; entry->name; entry++) {
+        if (!PyUnicode_CompareWithASCIIString(name, entry->name)) {
+            return entry->func;
+        }
+    }
+
+    PyErr_Format(PyExc_ValueError,
+                 "vmap() does not support the function '%U'", name);
+    return NULL;
+}
 
-    seq_length = PyList_GET_SIZE(other);
-    if (!(result = PyList_New(seq_length))) {
-        Py_DECREF(other);
+/* Apply the function to every element of an mpfr_array. The result is an
+ * mpfr_array with the precision of the context.
+ */
+
+static PyObject *
+GMPy_VMap_Array(GMPy_VMap_Args *vargs, MPFR_Array_Object *x, int threads)
+{
+    MPFR_Array_Object *result;
+    mpfr_flags_t flags = 0;
+    Py_ssize_t i;
+
+    if (!(result = GMPy_MPFR_Array_New(x->length, GET_MPFR_PREC(vargs->context)))) {
         return NULL;
     }
 
-    /* Iterate through the list. */
-
-    for (i=0; i < seq_length; i++) {
-        if (!(tempres = GMPy_Number_Sin(PyList_GET_ITEM(other, i), context))) {
-            Py_DECREF(other);
-            Py_DECREF(result);
-            TYPE_ERROR("all items in iterable must be numbers");
-            return NULL;
-        }
+    if (!(vargs->flags = PyMem_New(mpfr_flags_t, x->length + 1))) {
+        /* LCOV_EXCL_START */
+        Py_DECREF((PyObject*)result);
+        return PyErr_NoMemory();
+        /* LCOV_EXCL_STOP */
+    }
 
-        if (PyList_SetItem(result, i, tempres) < 0) {
-            Py_DECREF(other);
-            Py_DECREF(result);
-            return NULL;
-        }
+    vargs->xarray = x;
+    vargs->rarray = result;
+    if (GMPy_Parallel_For(x->length, threads, GMPy_VMap_Work, vargs) < 0) {
+        /* LCOV_EXCL_START */
+        PyMem_Free(vargs->flags);
+        Py_DECREF((PyObject*)result);
+        return NULL;
+        /* LCOV_EXCL_STOP */
     }
 
-    Py_DECREF(other);
+    for (i = 0; i < x->length; i++) {
+        flags |= vargs->flags[i];
+    }
+    PyMem_Free(vargs->flags);
 
+    mpfr_flags_restore(flags, MPFR_FLAGS_ALL);
+    if (_GMPy_MPFR_Merge_Flags(vargs->context) < 0) {
+        Py_CLEAR(result);
+    }
     return (PyObject*)result;
 }
 
-PyDoc_STRVAR(GMPy_doc_function_vector2,
-"vector2(iterable, iterable, /) -> list\n\n"
-"Template for applying a function to a pair of iterables.");
-
-PyDoc_STRVAR(GMPy_doc_context_vector2,
-"vector2(iterable, /) -> list\n\n"
-"Template for applying a function to a pair of iterables.");
+PyDoc_STRVAR(GMPy_doc_function_vmap,
+"vmap(func, iterable, /, *, threads=1) -> list[mpfr, ...]\n\n"
+"Return [func(x) for x in iterable] where func is the name of a real\n"
+"function of one argument, for example 'sin', 'exp', or 'log'. The values\n"
+"must be real numbers. Each result is the same as calling the function\n"
+"in gmpy2 with a real argument except that complex results are not\n"
+"created; NaN is returned instead. Will always release the GIL. If threads\n"
+"is greater than 1, the work is split across that many native threads.\n"
+"The order of the results is not changed. If iterable is an mpfr_array,\n"
+"the result is an mpfr_array with the precision of the context.");
+
+PyDoc_STRVAR(GMPy_doc_context_vmap,
+"context.vmap(func, iterable, /, *, threads=1) -> list[mpfr, ...]\n\n"
+"Return [func(x) for x in iterable] where func is the name of a real\n"
+"function of one argument, for example 'sin', 'exp', or 'log'. The values\n"
+"must be real numbers. Each result is the same as calling the function\n"
+"in gmpy2 with a real argument except that complex results are not\n"
+"created; NaN is returned instead. Will always release the GIL. If threads\n"
+"is greater than 1, the work is split across that many native threads.\n"
+"The order of the results is not changed. If iterable is an mpfr_array,\n"
+"the result is an mpfr_array with the precision of the context.");
 
 static PyObject *
-GMPy_Context_Vector2(PyObject *self, PyObject *args)
+GMPy_Context_VMap(PyObject *self, PyObject *args, PyObject *keywds)
 {
-    PyObject *arg1, *arg2, *result;
-    MPFR_Object *tempres;
-
-    Py_ssize_t i, seq_length;
-
+    PyObject *seq, *result = NULL, **items;
+    GMPy_VMap_Args vargs;
+    MPFR_Object **temps = NULL;
+    Py_ssize_t i, n, done = 0;
+    int threads, xtype;
     CTXT_Object *context = NULL;
 
     if (self && CTXT_Check(self)) {
@@ -116,69 +239,113 @@ GMPy_Context_Vector2(PyObject *self, PyObject *args)
     }
 
     if (PyTuple_GET_SIZE(args) != 2) {
-        TYPE_ERROR("vector2() requires 2 arguments");
+        TYPE_ERROR("vmap() requires 2 arguments");
         return NULL;
     }
 
-    if (!(arg1 = PySequence_List(PyTuple_GET_ITEM(args, 0)))) {
-        TYPE_ERROR("argument must be an iterable");
+    if ((threads = GMPy_Parse_Threads(keywds, "vmap")) < 0) {
         return NULL;
     }
 
-    if (!(arg2 = PySequence_List(PyTuple_GET_ITEM(args, 1)))) {
-        Py_DECREF(arg1);
-        TYPE_ERROR("argument must be an iterable");
+    if (!(vargs.func = GMPy_VMap_Lookup(PyTuple_GET_ITEM(args, 0)))) {
         return NULL;
     }
 
+    vargs.round = GET_MPFR_ROUND(context);
+    vargs.context = context;
+    vargs.caller = PyThread_get_thread_ident();
 
-    /* other contains a new list containing all the values from the
-     * iterable. Create a list to store the results.
-     */
+    if (MPFR_Array_Check(PyTuple_GET_ITEM(args, 1))) {
+        return GMPy_VMap_Array(&vargs, (MPFR_Array_Object*)PyTuple_GET_ITEM(args, 1),
+                               threads);
+    }
+
+    vargs.xarray = vargs.rarray = NULL;
 
-    if (PyList_GET_SIZE(arg1) != PyList_GET_SIZE(arg2)) {
-        Py_DECREF(arg1);
-        Py_DECREF(arg2);
-        TYPE_ERROR("arguments must be the same length");
+    if (!(seq = PySequence_Fast(PyTuple_GET_ITEM(args, 1),
+                                "vmap() argument must be an iterable"))) {
         return NULL;
     }
 
-    seq_length = PyList_GET_SIZE(arg1);
-    if (!(result = PyList_New(seq_length))) {
-        Py_DECREF(arg1);
-        Py_DECREF(arg2);
-        return NULL;
+    n = PySequence_Fast_GET_SIZE(seq);
+    items = PySequence_Fast_ITEMS(seq);
+
+    /* temps holds the n converted arguments followed by the n results. */
+
+    if (!(temps = PyMem_New(MPFR_Object*, 2 * n + 1)) ||
+        !(vargs.flags = PyMem_New(mpfr_flags_t, n + 1))) {
+        /* LCOV_EXCL_START */
+        PyMem_Free(temps);
+        Py_DECREF(seq);
+        return PyErr_NoMemory();
+        /* LCOV_EXCL_STOP */
     }
 
-    /* Iterate through the list. */
-
-    for (i=0; i < seq_length; i++) {
-        //~ if (!(tempres = GMPy_Number_Mul(PyList_GET_ITEM(arg1, i),
-                                        //~ PyList_GET_ITEM(arg2, i),
-                                        //~ context))) {
-            //~ Py_DECREF(arg1);
-            //~ Py_DECREF(arg2);
-            //~ Py_DECREF(result);
-            //~ TYPE_ERROR("all items in iterable must be numbers");
-            //~ return NULL;
-        //~ }
-
-        tempres = GMPy_MPFR_New(0, context);
-        tempres->rc = mpfr_mul(tempres->f,
-                               MPFR(PyList_GET_ITEM(arg1, i)),
-                               MPFR(PyList_GET_ITEM(arg2, i)),
-                               GET_MPFR_ROUND(context));
-
-        if (PyList_SetItem(result, i, (PyObject*)tempres) < 0) {
-            Py_DECREF(arg1);
-            Py_DECREF(arg2);
-            Py_DECREF(result);
-            return NULL;
+    for (done = 0; done < n; done++) {
+        xtype = GMPy_ObjectType(items[done]);
+        if (!IS_TYPE_REAL(xtype)) {
+            TYPE_ERROR("vmap() requires real number arguments");
+            goto error;
+        }
+        if (!(temps[done] = GMPy_MPFR_From_RealWithType(items[done], xtype,
+                                                        1, context))) {
+            goto error;
+        }
+        if (!(temps[n + done] = GMPy_MPFR_New(0, context))) {
+            /* LCOV_EXCL_START */
+            Py_DECREF((PyObject*)temps[done]);
+            goto error;
+            /* LCOV_EXCL_STOP */
         }
     }
 
-    Py_DECREF(arg1);
-    Py_DECREF(arg2);
+    vargs.args = temps;
+    vargs.results = temps + n;
 
-    return (PyObject*)result;
+    if (GMPy_Parallel_For(n, threads, GMPy_VMap_Work, &vargs) < 0) {
+        /* LCOV_EXCL_START */
+        goto error;
+        /* LCOV_EXCL_STOP */
+    }
+
+    if (!(result = PyList_New(n))) {
+        /* LCOV_EXCL_START */
+        goto error;
+        /* LCOV_EXCL_STOP */
+    }
+
+    /* Check the exponent range and update the context for each result in
+     * order. The first result that raises an exception stops the loop.
+     */
+
+    for (i = 0; i < n; i++) {
+        Py_DECREF((PyObject*)temps[i]);
+        temps[i] = NULL;
+        mpfr_flags_restore(vargs.flags[i], MPFR_FLAGS_ALL);
+        _GMPy_MPFR_Cleanup(&temps[n + i], context);
+        if (!temps[n + i]) {
+            Py_CLEAR(result);
+            for (i++; i < n; i++) {
+                Py_DECREF((PyObject*)temps[i]);
+                Py_DECREF((PyObject*)temps[n + i]);
+            }
+            break;
+        }
+        PyList_SET_ITEM(result, i, (PyObject*)temps[n + i]);
+    }
+
+    PyMem_Free(vargs.flags);
+    PyMem_Free(temps);
+    Py_DECREF(seq);
+    return result;
+
+  error:
+    for (i = 0; i < done; i++) {
+        Py_DECREF((PyObject*)temps[i]);
+        Py_DECREF((PyObject*)temps[n + i]);
+    }
+    PyMem_Free(vargs.flags);
+    PyMem_Free(temps);
+    Py_DECREF(seq);
+    return NULL;
 }
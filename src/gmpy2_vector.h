@@ -24,6 +24,7 @@
  * License along with GMPY2; if not, see <http://www.gnu.org/licenses/>    *
  * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * */
 
+
 #ifndef GMPY_VECTOR_H
 #define GMPY_VECTOR_H
 
@@ -31,8 +32,7 @@
 extern "C" {
 #endif
 
-static PyObject * GMPy_Context_Vector(PyObject *self, PyObject *other);
-static PyObject * GMPy_Context_Vector2(PyObject *self, PyObject *args);
+static PyObject * GMPy_Context_VMap(PyObject *self, PyObject *args, PyObject *keywds);
 
 #ifdef __cplusplus
 }
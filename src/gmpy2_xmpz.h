@@ -36,6 +36,30 @@ static PyTypeObject XMPZ_Type;
 #define XMPZ_Check(v) (((PyObject*)v)->ob_type == &XMPZ_Type)
 #define CHECK_MPZANY(v) (MPZ_Check(v) || XMPZ_Check(v))
 
+/* The limbs of an xmpz must not be reallocated while they are exported by
+ * x.limbs(). Every function that changes an xmpz in-place checks first.
+ */
+
+#define XMPZ_CHECK_EXPORTS(x, err) \
+    if (((XMPZ_Object*)(x))->exports) { \
+        PyErr_SetString(PyExc_BufferError, \
+                        "cannot change an xmpz while its limbs are exported"); \
+        return err; \
+    }
+
+/* On a free-threaded build, functions that change an xmpz in-place hold its
+ * per-object lock. Detaching the thread state would release that lock, so the
+ * GIL is only released when the build has one.
+ */
+
+#ifdef Py_GIL_DISABLED
+#define XMPZ_MAYBE_BEGIN_ALLOW_THREADS(context) {
+#define XMPZ_MAYBE_END_ALLOW_THREADS(context) }
+#else
+#define XMPZ_MAYBE_BEGIN_ALLOW_THREADS(context) GMPY_MAYBE_BEGIN_ALLOW_THREADS(context)
+#define XMPZ_MAYBE_END_ALLOW_THREADS(context) GMPY_MAYBE_END_ALLOW_THREADS(context)
+#endif
+
 typedef struct {
     PyObject_HEAD
     XMPZ_Object *bitmap;
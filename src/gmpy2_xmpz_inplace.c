@@ -32,12 +32,13 @@
 /* Inplace xmpz addition. */
 
 static PyObject *
-GMPy_XMPZ_IAdd_Slot(PyObject *self, PyObject *other)
+GMPy_XMPZ_IAdd(PyObject *self, PyObject *other)
 {
     /* Try to make mpz + small_int faster */
 
     CTXT_Object *context = NULL;
     CHECK_CONTEXT(context);
+    XMPZ_CHECK_EXPORTS(self, NULL);
 
     int ytype = GMPy_ObjectType(other);
 
@@ -62,9 +63,9 @@ GMPy_XMPZ_IAdd_Slot(PyObject *self, PyObject *other)
                 return NULL;
                 /* LCOV_EXCL_STOP */
             }
-            GMPY_MAYBE_BEGIN_ALLOW_THREADS(context);
+            XMPZ_MAYBE_BEGIN_ALLOW_THREADS(context);
             mpz_add(MPZ(self), MPZ(self), tempz);
-            GMPY_MAYBE_END_ALLOW_THREADS(context);
+            XMPZ_MAYBE_END_ALLOW_THREADS(context);
             mpz_clear(tempz);
         }
         Py_INCREF(self);
@@ -72,9 +73,9 @@ GMPy_XMPZ_IAdd_Slot(PyObject *self, PyObject *other)
     }
 
     if (IS_TYPE_MPZANY(ytype)) {
-        GMPY_MAYBE_BEGIN_ALLOW_THREADS(context);
+        XMPZ_MAYBE_BEGIN_ALLOW_THREADS(context);
         mpz_add(MPZ(self), MPZ(self), MPZ(other));
-        GMPY_MAYBE_END_ALLOW_THREADS(context);
+        XMPZ_MAYBE_END_ALLOW_THREADS(context);
         Py_INCREF(self);
         return self;
     }
@@ -86,10 +87,11 @@ GMPy_XMPZ_IAdd_Slot(PyObject *self, PyObject *other)
  */
 
 static PyObject *
-GMPy_XMPZ_ISub_Slot(PyObject *self, PyObject *other)
+GMPy_XMPZ_ISub(PyObject *self, PyObject *other)
 {
     CTXT_Object *context = NULL;
     CHECK_CONTEXT(context);
+    XMPZ_CHECK_EXPORTS(self, NULL);
 
     int ytype = GMPy_ObjectType(other);
 
@@ -114,9 +116,9 @@ GMPy_XMPZ_ISub_Slot(PyObject *self, PyObject *other)
                 return NULL;
                 /* LCOV_EXCL_STOP */
             }
-            GMPY_MAYBE_BEGIN_ALLOW_THREADS(context);
+            XMPZ_MAYBE_BEGIN_ALLOW_THREADS(context);
             mpz_sub(MPZ(self), MPZ(self), tempz);
-            GMPY_MAYBE_END_ALLOW_THREADS(context);
+            XMPZ_MAYBE_END_ALLOW_THREADS(context);
             mpz_clear(tempz);
         }
         Py_INCREF(self);
@@ -124,9 +126,9 @@ GMPy_XMPZ_ISub_Slot(PyObject *self, PyObject *other)
     }
 
     if (IS_TYPE_MPZANY(ytype)) {
-        GMPY_MAYBE_BEGIN_ALLOW_THREADS(context);
+        XMPZ_MAYBE_BEGIN_ALLOW_THREADS(context);
         mpz_sub(MPZ(self), MPZ(self), MPZ(other));
-        GMPY_MAYBE_END_ALLOW_THREADS(context);
+        XMPZ_MAYBE_END_ALLOW_THREADS(context);
         Py_INCREF(self);
         return self;
     }
@@ -138,10 +140,11 @@ GMPy_XMPZ_ISub_Slot(PyObject *self, PyObject *other)
  */
 
 static PyObject *
-GMPy_XMPZ_IMul_Slot(PyObject *self, PyObject *other)
+GMPy_XMPZ_IMul(PyObject *self, PyObject *other)
 {
     CTXT_Object *context = NULL;
     CHECK_CONTEXT(context);
+    XMPZ_CHECK_EXPORTS(self, NULL);
 
     int ytype = GMPy_ObjectType(other);
 
@@ -161,9 +164,9 @@ GMPy_XMPZ_IMul_Slot(PyObject *self, PyObject *other)
                 return NULL;
                 /* LCOV_EXCL_STOP */
             }
-            GMPY_MAYBE_BEGIN_ALLOW_THREADS(context);
+            XMPZ_MAYBE_BEGIN_ALLOW_THREADS(context);
             mpz_mul(MPZ(self), MPZ(self), tempz);
-            GMPY_MAYBE_END_ALLOW_THREADS(context);
+            XMPZ_MAYBE_END_ALLOW_THREADS(context);
             mpz_clear(tempz);
         }
         Py_INCREF(self);
@@ -171,9 +174,9 @@ GMPy_XMPZ_IMul_Slot(PyObject *self, PyObject *other)
     }
 
     if (IS_TYPE_MPZANY(ytype)) {
-        GMPY_MAYBE_BEGIN_ALLOW_THREADS(context);
+        XMPZ_MAYBE_BEGIN_ALLOW_THREADS(context);
         mpz_mul(MPZ(self), MPZ(self), MPZ(other));
-        GMPY_MAYBE_END_ALLOW_THREADS(context);
+        XMPZ_MAYBE_END_ALLOW_THREADS(context);
         Py_INCREF(self);
         return self;
     }
@@ -187,10 +190,11 @@ GMPy_XMPZ_IMul_Slot(PyObject *self, PyObject *other)
  */
 
 static PyObject *
-GMPy_XMPZ_IFloorDiv_Slot(PyObject *self, PyObject *other)
+GMPy_XMPZ_IFloorDiv(PyObject *self, PyObject *other)
 {
     CTXT_Object *context = NULL;
     CHECK_CONTEXT(context);
+    XMPZ_CHECK_EXPORTS(self, NULL);
 
     int ytype = GMPy_ObjectType(other);
 
@@ -220,9 +224,9 @@ GMPy_XMPZ_IFloorDiv_Slot(PyObject *self, PyObject *other)
                 return NULL;
                 /* LCOV_EXCL_STOP */
             }
-            GMPY_MAYBE_BEGIN_ALLOW_THREADS(context);
+            XMPZ_MAYBE_BEGIN_ALLOW_THREADS(context);
             mpz_fdiv_q(MPZ(self), MPZ(self), tempz);
-            GMPY_MAYBE_END_ALLOW_THREADS(context);
+            XMPZ_MAYBE_END_ALLOW_THREADS(context);
             mpz_clear(tempz);
         }
         Py_INCREF(self);
@@ -234,9 +238,9 @@ GMPy_XMPZ_IFloorDiv_Slot(PyObject *self, PyObject *other)
             ZERO_ERROR("xmpz division by zero");
             return NULL;
         }
-        GMPY_MAYBE_BEGIN_ALLOW_THREADS(context);
+        XMPZ_MAYBE_BEGIN_ALLOW_THREADS(context);
         mpz_fdiv_q(MPZ(self), MPZ(self), MPZ(other));
-        GMPY_MAYBE_END_ALLOW_THREADS(context);
+        XMPZ_MAYBE_END_ALLOW_THREADS(context);
         Py_INCREF(self);
         return self;
     }
@@ -248,10 +252,11 @@ GMPy_XMPZ_IFloorDiv_Slot(PyObject *self, PyObject *other)
  */
 
 static PyObject *
-GMPy_XMPZ_IRem_Slot(PyObject *self, PyObject *other)
+GMPy_XMPZ_IRem(PyObject *self, PyObject *other)
 {
     CTXT_Object *context = NULL;
     CHECK_CONTEXT(context);
+    XMPZ_CHECK_EXPORTS(self, NULL);
 
     int ytype = GMPy_ObjectType(other);
 
@@ -280,9 +285,9 @@ GMPy_XMPZ_IRem_Slot(PyObject *self, PyObject *other)
                 return NULL;
                 /* LCOV_EXCL_STOP */
             }
-            GMPY_MAYBE_BEGIN_ALLOW_THREADS(context);
+            XMPZ_MAYBE_BEGIN_ALLOW_THREADS(context);
             mpz_fdiv_r(MPZ(self), MPZ(self), tempz);
-            GMPY_MAYBE_END_ALLOW_THREADS(context);
+            XMPZ_MAYBE_END_ALLOW_THREADS(context);
             mpz_clear(tempz);
         }
         Py_INCREF(self);
@@ -294,9 +299,9 @@ GMPy_XMPZ_IRem_Slot(PyObject *self, PyObject *other)
             ZERO_ERROR("xmpz modulo by zero");
             return NULL;
         }
-        GMPY_MAYBE_BEGIN_ALLOW_THREADS(context);
+        XMPZ_MAYBE_BEGIN_ALLOW_THREADS(context);
         mpz_fdiv_r(MPZ(self), MPZ(self), MPZ(other));
-        GMPY_MAYBE_END_ALLOW_THREADS(context);
+        XMPZ_MAYBE_END_ALLOW_THREADS(context);
         Py_INCREF(self);
         return self;
     }
@@ -308,12 +313,14 @@ GMPy_XMPZ_IRem_Slot(PyObject *self, PyObject *other)
  */
 
 static PyObject *
-GMPy_XMPZ_IRshift_Slot(PyObject *self, PyObject *other)
+GMPy_XMPZ_IRshift(PyObject *self, PyObject *other)
 {
     mp_bitcnt_t shift = GMPy_Integer_AsMpBitCnt(other);
     if (shift == (mp_bitcnt_t)(-1) && PyErr_Occurred())
         return NULL;
 
+    XMPZ_CHECK_EXPORTS(self, NULL);
+
     mpz_fdiv_q_2exp(MPZ(self), MPZ(self), shift);
     Py_INCREF(self);
     return self;
@@ -325,12 +332,14 @@ GMPy_XMPZ_IRshift_Slot(PyObject *self, PyObject *other)
  */
 
 static PyObject *
-GMPy_XMPZ_ILshift_Slot(PyObject *self, PyObject *other)
+GMPy_XMPZ_ILshift(PyObject *self, PyObject *other)
 {
     mp_bitcnt_t shift = GMPy_Integer_AsMpBitCnt(other);
     if (shift == (mp_bitcnt_t)(-1) && PyErr_Occurred())
         return NULL;
 
+    XMPZ_CHECK_EXPORTS(self, NULL);
+
     mpz_mul_2exp(MPZ(self), MPZ(self), shift);
     Py_INCREF(self);
     return self;
@@ -342,12 +351,14 @@ GMPy_XMPZ_ILshift_Slot(PyObject *self, PyObject *other)
  */
 
 static PyObject *
-GMPy_XMPZ_IPow_Slot(PyObject *self, PyObject *other, PyObject *mod)
+GMPy_XMPZ_IPow(PyObject *self, PyObject *other, PyObject *mod)
 {
     unsigned long exp = GMPy_Integer_AsUnsignedLong(other);
     if (exp == (unsigned long)(-1) && PyErr_Occurred())
         return NULL;
 
+    XMPZ_CHECK_EXPORTS(self, NULL);
+
     mpz_pow_ui(MPZ(self), MPZ(self), exp);
     Py_INCREF((PyObject*)self);
     return self;
@@ -359,15 +370,16 @@ GMPy_XMPZ_IPow_Slot(PyObject *self, PyObject *other, PyObject *mod)
  */
 
 static PyObject *
-GMPy_XMPZ_IAnd_Slot(PyObject *self, PyObject *other)
+GMPy_XMPZ_IAnd(PyObject *self, PyObject *other)
 {
     CTXT_Object *context = NULL;
     CHECK_CONTEXT(context);
+    XMPZ_CHECK_EXPORTS(self, NULL);
 
     if (CHECK_MPZANY(other)) {
-        GMPY_MAYBE_BEGIN_ALLOW_THREADS(context);
+        XMPZ_MAYBE_BEGIN_ALLOW_THREADS(context);
         mpz_and(MPZ(self), MPZ(self), MPZ(other));
-        GMPY_MAYBE_END_ALLOW_THREADS(context);
+        XMPZ_MAYBE_END_ALLOW_THREADS(context);
         Py_INCREF(self);
         return self;
     }
@@ -381,9 +393,9 @@ GMPy_XMPZ_IAnd_Slot(PyObject *self, PyObject *other)
             return NULL;
             /* LCOV_EXCL_STOP */
         }
-        GMPY_MAYBE_BEGIN_ALLOW_THREADS(context);
+        XMPZ_MAYBE_BEGIN_ALLOW_THREADS(context);
         mpz_and(MPZ(self), MPZ(self), tempz);
-        GMPY_MAYBE_END_ALLOW_THREADS(context);
+        XMPZ_MAYBE_END_ALLOW_THREADS(context);
         mpz_clear(tempz);
         Py_INCREF(self);
         return self;
@@ -396,15 +408,16 @@ GMPy_XMPZ_IAnd_Slot(PyObject *self, PyObject *other)
  */
 
 static PyObject *
-GMPy_XMPZ_IXor_Slot(PyObject *self, PyObject *other)
+GMPy_XMPZ_IXor(PyObject *self, PyObject *other)
 {
     CTXT_Object *context = NULL;
     CHECK_CONTEXT(context);
+    XMPZ_CHECK_EXPORTS(self, NULL);
 
     if(CHECK_MPZANY(other)) {
-        GMPY_MAYBE_BEGIN_ALLOW_THREADS(context);
+        XMPZ_MAYBE_BEGIN_ALLOW_THREADS(context);
         mpz_xor(MPZ(self), MPZ(self), MPZ(other));
-        GMPY_MAYBE_END_ALLOW_THREADS(context);
+        XMPZ_MAYBE_END_ALLOW_THREADS(context);
         Py_INCREF(self);
         return self;
     }
@@ -418,9 +431,9 @@ GMPy_XMPZ_IXor_Slot(PyObject *self, PyObject *other)
             return NULL;
             /* LCOV_EXCL_STOP */
         }
-        GMPY_MAYBE_BEGIN_ALLOW_THREADS(context);
+        XMPZ_MAYBE_BEGIN_ALLOW_THREADS(context);
         mpz_xor(MPZ(self), MPZ(self), tempz);
-        GMPY_MAYBE_END_ALLOW_THREADS(context);
+        XMPZ_MAYBE_END_ALLOW_THREADS(context);
         mpz_clear(tempz);
         Py_INCREF(self);
         return self;
@@ -433,15 +446,16 @@ GMPy_XMPZ_IXor_Slot(PyObject *self, PyObject *other)
  */
 
 static PyObject *
-GMPy_XMPZ_IIor_Slot(PyObject *self, PyObject *other)
+GMPy_XMPZ_IIor(PyObject *self, PyObject *other)
 {
     CTXT_Object *context = NULL;
     CHECK_CONTEXT(context);
+    XMPZ_CHECK_EXPORTS(self, NULL);
 
     if(CHECK_MPZANY(other)) {
-        GMPY_MAYBE_BEGIN_ALLOW_THREADS(context);
+        XMPZ_MAYBE_BEGIN_ALLOW_THREADS(context);
         mpz_ior(MPZ(self), MPZ(self), MPZ(other));
-        GMPY_MAYBE_END_ALLOW_THREADS(context);
+        XMPZ_MAYBE_END_ALLOW_THREADS(context);
         Py_INCREF(self);
         return self;
     }
@@ -455,9 +469,9 @@ GMPy_XMPZ_IIor_Slot(PyObject *self, PyObject *other)
             return NULL;
             /* LCOV_EXCL_STOP */
         }
-        GMPY_MAYBE_BEGIN_ALLOW_THREADS(context);
+        XMPZ_MAYBE_BEGIN_ALLOW_THREADS(context);
         mpz_ior(MPZ(self), MPZ(self), tempz);
-        GMPY_MAYBE_END_ALLOW_THREADS(context);
+        XMPZ_MAYBE_END_ALLOW_THREADS(context);
         mpz_clear(tempz);
         Py_INCREF(self);
         return self;
@@ -466,3 +480,39 @@ GMPy_XMPZ_IIor_Slot(PyObject *self, PyObject *other)
     Py_RETURN_NOTIMPLEMENTED;
 }
 
+/* On a free-threaded build, the in-place operations hold the per-object lock
+ * of both operands so that concurrent updates of a shared xmpz do not race.
+ */
+
+#define XMPZ_LOCKED_SLOT(name) \
+static PyObject * \
+GMPy_XMPZ_##name##_Slot(PyObject *self, PyObject *other) \
+{ \
+    PyObject *result; \
+    Py_BEGIN_CRITICAL_SECTION2(self, other); \
+    result = GMPy_XMPZ_##name(self, other); \
+    Py_END_CRITICAL_SECTION2(); \
+    return result; \
+}
+
+XMPZ_LOCKED_SLOT(IAdd)
+XMPZ_LOCKED_SLOT(ISub)
+XMPZ_LOCKED_SLOT(IMul)
+XMPZ_LOCKED_SLOT(IFloorDiv)
+XMPZ_LOCKED_SLOT(IRem)
+XMPZ_LOCKED_SLOT(IRshift)
+XMPZ_LOCKED_SLOT(ILshift)
+XMPZ_LOCKED_SLOT(IAnd)
+XMPZ_LOCKED_SLOT(IXor)
+XMPZ_LOCKED_SLOT(IIor)
+
+static PyObject *
+GMPy_XMPZ_IPow_Slot(PyObject *self, PyObject *other, PyObject *mod)
+{
+    PyObject *result;
+
+    Py_BEGIN_CRITICAL_SECTION2(self, other);
+    result = GMPy_XMPZ_IPow(self, other, mod);
+    Py_END_CRITICAL_SECTION2();
+    return result;
+}
@@ -48,8 +48,9 @@ PyDoc_STRVAR(GMPy_doc_xmpz_method_limbs_write,
 "the returned address in order for the changes to take effect.\n"
 "WARNING: this operation is destructive and may destroy the old\n"
 "value of x.");
-static PyObject* GMPy_XMPZ_Method_LimbsWrite(PyObject* obj, PyObject* other)
+static PyObject* GMPy_XMPZ_LimbsWrite(PyObject* obj, PyObject* other)
 {
+    XMPZ_CHECK_EXPORTS(obj, NULL);
 
     if (!PyLong_Check(other)) {
         TYPE_ERROR("number of limbs must be an int or a long");
@@ -62,14 +63,26 @@ static PyObject* GMPy_XMPZ_Method_LimbsWrite(PyObject* obj, PyObject* other)
     }
 }
 
+static PyObject* GMPy_XMPZ_Method_LimbsWrite(PyObject* obj, PyObject* other)
+{
+    PyObject *result;
+
+    Py_BEGIN_CRITICAL_SECTION(obj);
+    result = GMPy_XMPZ_LimbsWrite(obj, other);
+    Py_END_CRITICAL_SECTION();
+    return result;
+}
+
 PyDoc_STRVAR(GMPy_doc_xmpz_method_limbs_modify,
 "x.limbs_modify(n, /) -> int\n\n"
 "Returns the address of a mutable buffer representing the limbs\n"
 "of x, resized so that it may hold at least n limbs.\n"
 "Must be followed by a call to x.limbs_finish(n) after writing to\n"
 "the returned address in order for the changes to take effect.");
-static PyObject* GMPy_XMPZ_Method_LimbsModify(PyObject* obj, PyObject* other)
+static PyObject* GMPy_XMPZ_LimbsModify(PyObject* obj, PyObject* other)
 {
+    XMPZ_CHECK_EXPORTS(obj, NULL);
+
     if (!PyLong_Check(other)) {
         TYPE_ERROR("number of limbs must be an int or a long");
         return NULL;
@@ -81,13 +94,25 @@ static PyObject* GMPy_XMPZ_Method_LimbsModify(PyObject* obj, PyObject* other)
     }
 }
 
+static PyObject* GMPy_XMPZ_Method_LimbsModify(PyObject* obj, PyObject* other)
+{
+    PyObject *result;
+
+    Py_BEGIN_CRITICAL_SECTION(obj);
+    result = GMPy_XMPZ_LimbsModify(obj, other);
+    Py_END_CRITICAL_SECTION();
+    return result;
+}
+
 PyDoc_STRVAR(GMPy_doc_xmpz_method_limbs_finish,
 "x.limbs_finish(n, /) -> None\n\n"
 "Must be called after writing to the address returned by\n"
 "x.limbs_write(n) or x.limbs_modify(n) to update\n"
 "the limbs of x.");
-static PyObject* GMPy_XMPZ_Method_LimbsFinish(PyObject* obj, PyObject* other)
+static PyObject* GMPy_XMPZ_LimbsFinish(PyObject* obj, PyObject* other)
 {
+    XMPZ_CHECK_EXPORTS(obj, NULL);
+
     if (!PyLong_Check(other)) {
         TYPE_ERROR("number of limbs must be an int or long");
         return NULL;
@@ -98,3 +123,143 @@ static PyObject* GMPy_XMPZ_Method_LimbsFinish(PyObject* obj, PyObject* other)
         Py_RETURN_NONE;
     }
 }
+
+static PyObject* GMPy_XMPZ_Method_LimbsFinish(PyObject* obj, PyObject* other)
+{
+    PyObject *result;
+
+    Py_BEGIN_CRITICAL_SECTION(obj);
+    result = GMPy_XMPZ_LimbsFinish(obj, other);
+    Py_END_CRITICAL_SECTION();
+    return result;
+}
+
+/* x.limbs() returns a memoryview of the limbs of abs(x). The buffer is
+ * exported by a separate GMPy_Limbs_Object so that mpz and xmpz do not
+ * support the buffer protocol themselves; otherwise numpy would convert an
+ * mpz to an array of limbs instead of an integer.
+ */
+
+#define GMPY_LIMB_FORMAT (sizeof(mp_limb_t) == sizeof(unsigned long) ? "L" : "Q")
+
+static int
+GMPy_Limbs_GetBuffer(GMPy_Limbs_Object *self, Py_buffer *view, int flags)
+{
+    PyObject *owner = self->owner;
+    int readonly = !XMPZ_Check(owner);
+
+    if ((flags & PyBUF_WRITABLE) && readonly) {
+        PyErr_SetString(PyExc_BufferError, "the limbs of an mpz are read-only");
+        return -1;
+    }
+
+    view->obj = (PyObject*)self;
+    Py_INCREF((PyObject*)self);
+    if (readonly) {
+        view->buf = (void*)self->limbs;
+    }
+    else {
+        Py_BEGIN_CRITICAL_SECTION(owner);
+        self->shape[0] = (Py_ssize_t)mpz_size(MPZ(owner));
+        view->buf = (void*)mpz_limbs_modify(MPZ(owner), self->shape[0] ? self->shape[0] : 1);
+        ((XMPZ_Object*)owner)->exports++;
+        Py_END_CRITICAL_SECTION();
+    }
+    view->len = self->shape[0] * sizeof(mp_limb_t);
+    view->readonly = readonly;
+    view->itemsize = sizeof(mp_limb_t);
+    view->format = (flags & PyBUF_FORMAT) ? (char*)GMPY_LIMB_FORMAT : NULL;
+    view->ndim = 1;
+    view->shape = (flags & PyBUF_ND) ? self->shape : NULL;
+    view->strides = (flags & PyBUF_STRIDES) ? self->strides : NULL;
+    view->suboffsets = NULL;
+    view->internal = NULL;
+    return 0;
+}
+
+/* When the last export of the limbs of an xmpz is released, the value is
+ * normalized since the most significant limbs may have been set to 0.
+ */
+
+static void
+GMPy_Limbs_ReleaseBuffer(GMPy_Limbs_Object *self, Py_buffer *view)
+{
+    XMPZ_Object *owner = (XMPZ_Object*)self->owner;
+    mp_size_t size;
+
+    if (XMPZ_Check(owner)) {
+        Py_BEGIN_CRITICAL_SECTION(owner);
+        if (--(owner->exports) == 0) {
+            size = (mp_size_t)mpz_size(owner->z);
+            mpz_limbs_finish(owner->z, mpz_sgn(owner->z) < 0 ? -size : size);
+        }
+        Py_END_CRITICAL_SECTION();
+    }
+}
+
+static void
+GMPy_Limbs_Dealloc(GMPy_Limbs_Object *self)
+{
+    Py_DECREF(self->owner);
+    PyObject_Free(self);
+}
+
+static PyBufferProcs GMPy_Limbs_buffer_procs = {
+    (getbufferproc) GMPy_Limbs_GetBuffer,
+    (releasebufferproc) GMPy_Limbs_ReleaseBuffer,
+};
+
+static PyTypeObject GMPy_Limbs_Type = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = "gmpy2.limbs",
+    .tp_basicsize = sizeof(GMPy_Limbs_Object),
+    .tp_dealloc = (destructor) GMPy_Limbs_Dealloc,
+    .tp_as_buffer = &GMPy_Limbs_buffer_procs,
+    .tp_flags = Py_TPFLAGS_DEFAULT,
+    .tp_doc = "Exports the limbs of a gmpy2 object.",
+};
+
+PyDoc_STRVAR(GMPy_doc_mpz_method_limbs,
+"x.limbs() -> memoryview\n\n"
+"Return a memoryview of the limbs of abs(x) without copying them. The\n"
+"least significant limb is first and each limb is an unsigned integer of\n"
+"xmpz.limb_size bytes in native byte order. The memoryview is read-only\n"
+"for an mpz. For an xmpz it is writable and x cannot be changed in any\n"
+"other way until the memoryview is released.");
+
+/* Return an object that exports size limbs owned by owner. If owner is an
+ * xmpz, limbs and size are ignored.
+ */
+
+static PyObject *
+GMPy_Limbs_New(PyObject *owner, const mp_limb_t *limbs, size_t size)
+{
+    GMPy_Limbs_Object *result;
+
+    if (!(result = PyObject_New(GMPy_Limbs_Object, &GMPy_Limbs_Type))) {
+        /* LCOV_EXCL_START */
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+    Py_INCREF(owner);
+    result->owner = owner;
+    result->limbs = limbs;
+    result->shape[0] = (Py_ssize_t)size;
+    result->strides[0] = sizeof(mp_limb_t);
+    return (PyObject*)result;
+}
+
+static PyObject *
+GMPy_MPZ_Method_Limbs(PyObject *self, PyObject *other)
+{
+    PyObject *limbs, *result;
+
+    if (!(limbs = GMPy_Limbs_New(self, mpz_limbs_read(MPZ(self)), mpz_size(MPZ(self))))) {
+        /* LCOV_EXCL_START */
+        return NULL;
+        /* LCOV_EXCL_STOP */
+    }
+    result = PyMemoryView_FromObject(limbs);
+    Py_DECREF(limbs);
+    return result;
+}
@@ -29,6 +29,23 @@
 extern "C" {
 #endif
 
+/* Exports limbs as a buffer. The limbs of an xmpz are found each time the
+ * buffer is requested. Otherwise the owner is immutable and limbs points to
+ * shape[0] limbs that belong to it.
+ */
+
+typedef struct {
+    PyObject_HEAD
+    PyObject *owner;            /* the object that owns the limbs   */
+    const mp_limb_t *limbs;
+    Py_ssize_t shape[1];
+    Py_ssize_t strides[1];
+} GMPy_Limbs_Object;
+
+static PyTypeObject GMPy_Limbs_Type;
+
+static PyObject* GMPy_Limbs_New(PyObject *owner, const mp_limb_t *limbs, size_t size);
+static PyObject* GMPy_MPZ_Method_Limbs(PyObject* self, PyObject* other);
 static PyObject* GMPy_XMPZ_Method_NumLimbs(PyObject* obj, PyObject* other);
 static PyObject* GMPy_XMPZ_Method_LimbsRead(PyObject* obj, PyObject* other);
 static PyObject* GMPy_XMPZ_Method_LimbsWrite(PyObject* obj, PyObject* other);
@@ -63,19 +63,45 @@ GMPy_XMPZ_Function_XbitMask(PyObject *self, PyObject *other)
 }
 
 static PyObject *
-GMPy_XMPZ_Abs_Slot(XMPZ_Object *x)
+GMPy_XMPZ_Abs(XMPZ_Object *x)
 {
+    XMPZ_CHECK_EXPORTS(x, NULL);
+
     mpz_abs(x->z, x->z);
     Py_RETURN_NONE;
 }
 
 static PyObject *
-GMPy_XMPZ_Neg_Slot(XMPZ_Object *x)
+GMPy_XMPZ_Abs_Slot(XMPZ_Object *x)
 {
+    PyObject *result;
+
+    Py_BEGIN_CRITICAL_SECTION(x);
+    result = GMPy_XMPZ_Abs(x);
+    Py_END_CRITICAL_SECTION();
+    return result;
+}
+
+static PyObject *
+GMPy_XMPZ_Neg(XMPZ_Object *x)
+{
+    XMPZ_CHECK_EXPORTS(x, NULL);
+
     mpz_neg(x->z, x->z);
     Py_RETURN_NONE;
 }
 
+static PyObject *
+GMPy_XMPZ_Neg_Slot(XMPZ_Object *x)
+{
+    PyObject *result;
+
+    Py_BEGIN_CRITICAL_SECTION(x);
+    result = GMPy_XMPZ_Neg(x);
+    Py_END_CRITICAL_SECTION();
+    return result;
+}
+
 static PyObject *
 GMPy_XMPZ_Pos_Slot(XMPZ_Object *x)
 {
@@ -91,23 +117,37 @@ GMPy_XMPZ_NonZero_Slot(XMPZ_Object *x)
 /* BIT OPERATIONS */
 
 static PyObject *
-GMPy_XMPZ_Com_Slot(XMPZ_Object *x)
+GMPy_XMPZ_Com(XMPZ_Object *x)
 {
+    XMPZ_CHECK_EXPORTS(x, NULL);
+
     mpz_com(x->z, x->z);
     Py_RETURN_NONE;
 }
 
+static PyObject *
+GMPy_XMPZ_Com_Slot(XMPZ_Object *x)
+{
+    PyObject *result;
+
+    Py_BEGIN_CRITICAL_SECTION(x);
+    result = GMPy_XMPZ_Com(x);
+    Py_END_CRITICAL_SECTION();
+    return result;
+}
+
 PyDoc_STRVAR(GMPy_doc_xmpz_method_make_mpz,
 "x.make_mpz() -> mpz\n\n"
 "Return an `mpz` by converting x as quickly as possible.\n\n"
 "NOTE: Optimized for speed so the original `xmpz` value is set to 0!");
 
 static PyObject *
-GMPy_XMPZ_Method_MakeMPZ(PyObject *self, PyObject *other)
+GMPy_XMPZ_MakeMPZ(PyObject *self)
 {
     MPZ_Object* result;
     CTXT_Object *context = NULL;
 
+    XMPZ_CHECK_EXPORTS(self, NULL);
     CHECK_CONTEXT(context);
 
     if (!(result = GMPy_MPZ_New(context))) {
@@ -118,6 +158,17 @@ GMPy_XMPZ_Method_MakeMPZ(PyObject *self, PyObject *other)
     return (PyObject*)result;
 }
 
+static PyObject *
+GMPy_XMPZ_Method_MakeMPZ(PyObject *self, PyObject *other)
+{
+    PyObject *result;
+
+    Py_BEGIN_CRITICAL_SECTION(self);
+    result = GMPy_XMPZ_MakeMPZ(self);
+    Py_END_CRITICAL_SECTION();
+    return result;
+}
+
 PyDoc_STRVAR(GMPy_doc_xmpz_method_copy,
 "x.copy() -> xmpz\n\n"
 "Return a copy of a x.");
@@ -197,10 +248,11 @@ GMPy_XMPZ_Method_SubScript(XMPZ_Object* self, PyObject* item)
 }
 
 static int
-GMPy_XMPZ_Method_AssignSubScript(XMPZ_Object* self, PyObject* item, PyObject* value)
+GMPy_XMPZ_AssignSubScript(XMPZ_Object* self, PyObject* item, PyObject* value)
 {
     CTXT_Object *context = NULL;
 
+    XMPZ_CHECK_EXPORTS(self, -1);
     CHECK_CONTEXT_M1(context);
 
     if (PyIndex_Check(item)) {
@@ -306,6 +358,17 @@ GMPy_XMPZ_Method_AssignSubScript(XMPZ_Object* self, PyObject* item, PyObject* va
     return -1;
 }
 
+static int
+GMPy_XMPZ_Method_AssignSubScript(XMPZ_Object* self, PyObject* item, PyObject* value)
+{
+    int result;
+
+    Py_BEGIN_CRITICAL_SECTION(self);
+    result = GMPy_XMPZ_AssignSubScript(self, item, value);
+    Py_END_CRITICAL_SECTION();
+    return result;
+}
+
 /* Implement a multi-purpose iterator object that iterates over the bits in
  * an xmpz. Three different iterators can be created:
  *   1) xmpz.iter_bits(start=0, stop=-1) will return True/False for each bit
@@ -229,6 +229,52 @@ GMPY_mpz_is_euler_prp(PyObject *self, PyObject *args)
  * either a^s == 1 mod n, or a^((2^t)*s) == -1 mod n, for some integer t, with 0 <= t < r.
  * *********************************************************************************************/
 
+/* Return 1 if n is a strong probable prime to the base a, else 0. n must be
+ * odd and > 1 and gcd(n,a) must be 1. Does not use the Python API.
+ */
+
+static int
+GMPy_MPZ_Strong_PRP(mpz_srcptr n, mpz_srcptr a)
+{
+    mpz_t s, nm1, mpz_test;
+    mp_bitcnt_t r = 0;
+    int result = 0;
+
+    mpz_init(s);
+    mpz_init(nm1);
+    mpz_init(mpz_test);
+
+    mpz_sub_ui(nm1, n, 1);
+
+    /* Find s and r satisfying: n-1=(2^r)*s, s odd */
+    r = mpz_scan1(nm1, 0);
+    mpz_fdiv_q_2exp(s, nm1, r);
+
+    /* Check a^((2^t)*s) mod n for 0 <= t < r */
+    mpz_powm(mpz_test, a, s, n);
+    if ((mpz_cmp_ui(mpz_test, 1) == 0) || (mpz_cmp(mpz_test, nm1) == 0)) {
+        result = 1;
+        goto cleanup;
+    }
+
+    while (--r) {
+        /* mpz_test = mpz_test^2%n */
+        mpz_mul(mpz_test, mpz_test, mpz_test);
+        mpz_mod(mpz_test, mpz_test, n);
+
+        if (mpz_cmp(mpz_test, nm1) == 0) {
+            result = 1;
+            goto cleanup;
+        }
+    }
+
+  cleanup:
+    mpz_clear(s);
+    mpz_clear(nm1);
+    mpz_clear(mpz_test);
+    return result;
+}
+
 PyDoc_STRVAR(doc_mpz_is_strong_prp,
 "is_strong_prp(n,a,/) -> bool\n\n"
 "Return `True` if n is a strong (also known as Miller-Rabin)\n"
@@ -247,8 +293,7 @@ GMPY_mpz_is_strong_prp(PyObject *self, PyObject *args)
 {
     MPZ_Object *a = NULL, *n = NULL;
     PyObject *result = NULL;
-    mpz_t s, nm1, mpz_test;
-    mp_bitcnt_t r = 0;
+    mpz_t s;
 
     if (PyTuple_Size(args) != 2) {
         TYPE_ERROR("is_strong_prp() requires 2 integer arguments");
@@ -256,8 +301,6 @@ GMPY_mpz_is_strong_prp(PyObject *self, PyObject *args)
     }
 
     mpz_init(s);
-    mpz_init(nm1);
-    mpz_init(mpz_test);
 
     n = GMPy_MPZ_From_Integer(PyTuple_GET_ITEM(args, 0), NULL);
     a = GMPy_MPZ_From_Integer(PyTuple_GET_ITEM(args, 1), NULL);
@@ -300,38 +343,11 @@ GMPY_mpz_is_strong_prp(PyObject *self, PyObject *args)
         goto cleanup;
     }
 
-    mpz_set(nm1, n->z);
-    mpz_sub_ui(nm1, nm1, 1);
-
-    /* Find s and r satisfying: n-1=(2^r)*s, s odd */
-    r = mpz_scan1(nm1, 0);
-    mpz_fdiv_q_2exp(s, nm1, r);
-
+    result = GMPy_MPZ_Strong_PRP(n->z, a->z) ? Py_True : Py_False;
 
-    /* Check a^((2^t)*s) mod n for 0 <= t < r */
-    mpz_powm(mpz_test, a->z, s, n->z);
-    if ((mpz_cmp_ui(mpz_test, 1) == 0) || (mpz_cmp(mpz_test, nm1) == 0)) {
-        result = Py_True;
-        goto cleanup;
-    }
-
-    while (--r) {
-        /* mpz_test = mpz_test^2%n */
-        mpz_mul(mpz_test, mpz_test, mpz_test);
-        mpz_mod(mpz_test, mpz_test, n->z);
-
-        if (mpz_cmp(mpz_test, nm1) == 0) {
-            result = Py_True;
-            goto cleanup;
-        }
-    }
-
-    result = Py_False;
   cleanup:
     Py_XINCREF(result);
     mpz_clear(s);
-    mpz_clear(nm1);
-    mpz_clear(mpz_test);
     Py_XDECREF((PyObject*)a);
     Py_XDECREF((PyObject*)n);
     return result;
@@ -527,34 +543,21 @@ GMPY_mpz_is_fibonacci_prp(PyObject *self, PyObject *args)
  * (n,2QD)=1 such that U_(n-(D/n)) == 0 mod n [(D/n) is the Jacobi symbol]
  * *******************************************************************************/
 
-PyDoc_STRVAR(doc_mpz_is_lucas_prp,
-"is_lucas_prp(n,p,q,/) -> bool\n\n"
-"Return `True` if n is a Lucas probable prime with parameters (p,q).\n"
-"Assuming:\n\n"
-"    n is odd\n"
-"    D = p*p - 4*q, D != 0\n"
-"    gcd(n, 2*q*D) == 1\n\n"
-"Then a Lucas probable prime requires:\n\n"
-"    lucasu(p,q,n - Jacobi(D,n)) == 0 (mod n)");
+/* Return 1 if n is a Lucas probable prime with parameters (p,q), else 0. n
+ * must be odd and > 1, p*p - 4*q must not be 0, and gcd(n, 2*q*D) must be 1
+ * or n. Does not use the Python API.
+ */
 
-static PyObject *
-GMPY_mpz_is_lucas_prp(PyObject *self, PyObject *args)
+static int
+GMPy_MPZ_Lucas_PRP(mpz_srcptr n, mpz_srcptr p, mpz_srcptr q)
 {
-    MPZ_Object *n = NULL, *p = NULL, *q = NULL;
-    PyObject *result = NULL;
-    mpz_t zD, res, index;
+    mpz_t zD, index;
     /* used for calculating the Lucas U sequence */
     mpz_t uh, vl, vh, ql, qh, tmp;
     mp_bitcnt_t s = 0, j = 0;
-    int ret;
-
-    if (PyTuple_Size(args) != 3) {
-        TYPE_ERROR("is_lucas_prp() requires 3 integer arguments");
-        return NULL;
-    }
+    int ret, result;
 
     mpz_init(zD);
-    mpz_init(res);
     mpz_init(index);
     mpz_init(uh);
     mpz_init(vl);
@@ -563,56 +566,14 @@ GMPY_mpz_is_lucas_prp(PyObject *self, PyObject *args)
     mpz_init(qh);
     mpz_init(tmp);
 
-    n = GMPy_MPZ_From_Integer(PyTuple_GET_ITEM(args, 0), NULL);
-    p = GMPy_MPZ_From_Integer(PyTuple_GET_ITEM(args, 1), NULL);
-    q = GMPy_MPZ_From_Integer(PyTuple_GET_ITEM(args, 2), NULL);
-    if (!n || !p || !q) {
-        TYPE_ERROR("is_lucas_prp() requires 3 integer arguments");
-        goto cleanup;
-    }
-
-    /* Check if p*p - 4*q == 0. */
-    mpz_mul(zD, p->z, p->z);
-    mpz_mul_ui(tmp, q->z, 4);
+    /* D = p*p - 4*q */
+    mpz_mul(zD, p, p);
+    mpz_mul_ui(tmp, q, 4);
     mpz_sub(zD, zD, tmp);
-    if (mpz_sgn(zD) == 0) {
-        VALUE_ERROR("invalid values for p,q in is_lucas_prp()");
-        goto cleanup;
-    }
-
-    /* Require n > 0. */
-    if (mpz_sgn(n->z) <= 0) {
-        VALUE_ERROR("is_lucas_prp() requires 'n' be greater than 0");
-        goto cleanup;
-    }
-
-    /* Check for n == 1 */
-    if (mpz_cmp_ui(n->z, 1) == 0) {
-        result = Py_False;
-        goto cleanup;
-    }
-
-    /* Handle n even. */
-    if (mpz_divisible_ui_p(n->z, 2)) {
-        if (mpz_cmp_ui(n->z, 2) == 0)
-            result = Py_True;
-        else
-            result = Py_False;
-        goto cleanup;
-    }
-
-    /* Check GCD */
-    mpz_mul(res, zD, q->z);
-    mpz_mul_ui(res, res, 2);
-    mpz_gcd(res, res, n->z);
-    if ((mpz_cmp(res, n->z) != 0) && (mpz_cmp_ui(res, 1) > 0)) {
-        VALUE_ERROR("is_lucas_prp() requires gcd(n,2*q*D) == 1");
-        goto cleanup;
-    }
 
     /* index = n-(D/n), where (D/n) is the Jacobi symbol */
-    mpz_set(index, n->z);
-    ret = mpz_jacobi(zD, n->z);
+    mpz_set(index, n);
+    ret = mpz_jacobi(zD, n);
     if (ret == -1)
         mpz_add_ui(index, index, 1);
     else if (ret == 1)
@@ -621,7 +582,7 @@ GMPY_mpz_is_lucas_prp(PyObject *self, PyObject *args)
     /* mpz_lucasumod(res, p, q, index, n); */
     mpz_set_si(uh, 1);
     mpz_set_si(vl, 2);
-    mpz_set(vh, p->z);
+    mpz_set(vh, p);
     mpz_set_si(ql, 1);
     mpz_set_si(qh, 1);
     mpz_set_si(tmp,0);
@@ -630,26 +591,26 @@ GMPY_mpz_is_lucas_prp(PyObject *self, PyObject *args)
     for (j = mpz_sizeinbase(index,2)-1; j >= s+1; j--) {
         /* ql = ql*qh (mod n) */
         mpz_mul(ql, ql, qh);
-        mpz_mod(ql, ql, n->z);
+        mpz_mod(ql, ql, n);
         if (mpz_tstbit(index,j) == 1) {
             /* qh = ql*q */
-            mpz_mul(qh, ql, q->z);
+            mpz_mul(qh, ql, q);
 
             /* uh = uh*vh (mod n) */
             mpz_mul(uh, uh, vh);
-            mpz_mod(uh, uh, n->z);
+            mpz_mod(uh, uh, n);
 
             /* vl = vh*vl - p*ql (mod n) */
             mpz_mul(vl, vh, vl);
-            mpz_mul(tmp, ql, p->z);
+            mpz_mul(tmp, ql, p);
             mpz_sub(vl, vl, tmp);
-            mpz_mod(vl, vl, n->z);
+            mpz_mod(vl, vl, n);
 
             /* vh = vh*vh - 2*qh (mod n) */
             mpz_mul(vh, vh, vh);
             mpz_mul_si(tmp, qh, 2);
             mpz_sub(vh, vh, tmp);
-            mpz_mod(vh, vh, n->z);
+            mpz_mod(vh, vh, n);
         }
         else {
             /* qh = ql */
@@ -658,26 +619,26 @@ GMPY_mpz_is_lucas_prp(PyObject *self, PyObject *args)
             /* uh = uh*vl - ql (mod n) */
             mpz_mul(uh, uh, vl);
             mpz_sub(uh, uh, ql);
-            mpz_mod(uh, uh, n->z);
+            mpz_mod(uh, uh, n);
 
             /* vh = vh*vl - p*ql (mod n) */
             mpz_mul(vh, vh, vl);
-            mpz_mul(tmp, ql, p->z);
+            mpz_mul(tmp, ql, p);
             mpz_sub(vh, vh, tmp);
-            mpz_mod(vh, vh, n->z);
+            mpz_mod(vh, vh, n);
 
             /* vl = vl*vl - 2*ql (mod n) */
             mpz_mul(vl, vl, vl);
             mpz_mul_si(tmp, ql, 2);
             mpz_sub(vl, vl, tmp);
-            mpz_mod(vl, vl, n->z);
+            mpz_mod(vl, vl, n);
         }
     }
     /* ql = ql*qh */
     mpz_mul(ql, ql, qh);
 
     /* qh = ql*q */
-    mpz_mul(qh, ql, q->z);
+    mpz_mul(qh, ql, q);
 
     /* uh = uh*vl - ql */
     mpz_mul(uh, uh, vl);
@@ -685,7 +646,7 @@ GMPY_mpz_is_lucas_prp(PyObject *self, PyObject *args)
 
     /* vl = vh*vl - p*ql */
     mpz_mul(vl, vh, vl);
-    mpz_mul(tmp, ql, p->z);
+    mpz_mul(tmp, ql, p);
     mpz_sub(vl, vl, tmp);
 
     /* ql = ql*qh */
@@ -694,30 +655,24 @@ GMPY_mpz_is_lucas_prp(PyObject *self, PyObject *args)
     for (j = 1; j <= s; j++) {
         /* uh = uh*vl (mod n) */
         mpz_mul(uh, uh, vl);
-        mpz_mod(uh, uh, n->z);
+        mpz_mod(uh, uh, n);
 
         /* vl = vl*vl - 2*ql (mod n) */
         mpz_mul(vl, vl, vl);
         mpz_mul_si(tmp, ql, 2);
         mpz_sub(vl, vl, tmp);
-        mpz_mod(vl, vl, n->z);
+        mpz_mod(vl, vl, n);
 
         /* ql = ql*ql (mod n) */
         mpz_mul(ql, ql, ql);
-        mpz_mod(ql, ql, n->z);
+        mpz_mod(ql, ql, n);
     }
 
     /* uh contains our return value */
-    mpz_mod(res, uh, n->z);
-    if (mpz_cmp_ui(res, 0) == 0)
-        result = Py_True;
-    else
-        result = Py_False;
+    mpz_mod(uh, uh, n);
+    result = (mpz_sgn(uh) == 0);
 
-  cleanup:
-    Py_XINCREF(result);
     mpz_clear(zD);
-    mpz_clear(res);
     mpz_clear(index);
     mpz_clear(uh);
     mpz_clear(vl);
@@ -725,6 +680,89 @@ GMPY_mpz_is_lucas_prp(PyObject *self, PyObject *args)
     mpz_clear(ql);
     mpz_clear(qh);
     mpz_clear(tmp);
+    return result;
+}
+
+PyDoc_STRVAR(doc_mpz_is_lucas_prp,
+"is_lucas_prp(n,p,q,/) -> bool\n\n"
+"Return `True` if n is a Lucas probable prime with parameters (p,q).\n"
+"Assuming:\n\n"
+"    n is odd\n"
+"    D = p*p - 4*q, D != 0\n"
+"    gcd(n, 2*q*D) == 1\n\n"
+"Then a Lucas probable prime requires:\n\n"
+"    lucasu(p,q,n - Jacobi(D,n)) == 0 (mod n)");
+
+static PyObject *
+GMPY_mpz_is_lucas_prp(PyObject *self, PyObject *args)
+{
+    MPZ_Object *n = NULL, *p = NULL, *q = NULL;
+    PyObject *result = NULL;
+    mpz_t zD, res, tmp;
+
+    if (PyTuple_Size(args) != 3) {
+        TYPE_ERROR("is_lucas_prp() requires 3 integer arguments");
+        return NULL;
+    }
+
+    mpz_init(zD);
+    mpz_init(res);
+    mpz_init(tmp);
+
+    n = GMPy_MPZ_From_Integer(PyTuple_GET_ITEM(args, 0), NULL);
+    p = GMPy_MPZ_From_Integer(PyTuple_GET_ITEM(args, 1), NULL);
+    q = GMPy_MPZ_From_Integer(PyTuple_GET_ITEM(args, 2), NULL);
+    if (!n || !p || !q) {
+        TYPE_ERROR("is_lucas_prp() requires 3 integer arguments");
+        goto cleanup;
+    }
+
+    /* Check if p*p - 4*q == 0. */
+    mpz_mul(zD, p->z, p->z);
+    mpz_mul_ui(tmp, q->z, 4);
+    mpz_sub(zD, zD, tmp);
+    if (mpz_sgn(zD) == 0) {
+        VALUE_ERROR("invalid values for p,q in is_lucas_prp()");
+        goto cleanup;
+    }
+
+    /* Require n > 0. */
+    if (mpz_sgn(n->z) <= 0) {
+        VALUE_ERROR("is_lucas_prp() requires 'n' be greater than 0");
+        goto cleanup;
+    }
+
+    /* Check for n == 1 */
+    if (mpz_cmp_ui(n->z, 1) == 0) {
+        result = Py_False;
+        goto cleanup;
+    }
+
+    /* Handle n even. */
+    if (mpz_divisible_ui_p(n->z, 2)) {
+        if (mpz_cmp_ui(n->z, 2) == 0)
+            result = Py_True;
+        else
+            result = Py_False;
+        goto cleanup;
+    }
+
+    /* Check GCD */
+    mpz_mul(res, zD, q->z);
+    mpz_mul_ui(res, res, 2);
+    mpz_gcd(res, res, n->z);
+    if ((mpz_cmp(res, n->z) != 0) && (mpz_cmp_ui(res, 1) > 0)) {
+        VALUE_ERROR("is_lucas_prp() requires gcd(n,2*q*D) == 1");
+        goto cleanup;
+    }
+
+    result = GMPy_MPZ_Lucas_PRP(n->z, p->z, q->z) ? Py_True : Py_False;
+
+  cleanup:
+    Py_XINCREF(result);
+    mpz_clear(zD);
+    mpz_clear(res);
+    mpz_clear(tmp);
     Py_XDECREF((PyObject*)p);
     Py_XDECREF((PyObject*)q);
     Py_XDECREF((PyObject*)n);
@@ -1196,6 +1234,78 @@ GMPY_mpz_is_extrastronglucas_prp(PyObject *self, PyObject *args)
  * Make sure n is not a perfect square, otherwise the search for D will only stop when D=n.
  * ***********************************************************************************************/
 
+/* Return 1 if n is a Lucas probable prime with the Selfridge parameters,
+ * 0 if it is not, and -1 if no value of D was found. n must be odd and > 1.
+ * Does not use the Python API.
+ */
+
+static int
+GMPy_MPZ_Selfridge_PRP(mpz_srcptr n)
+{
+    long d = 5, q = 0, max_d = 1000000;
+    int jacobi = 0, result = 0;
+    mpz_t zD, zP, zQ;
+
+    mpz_init(zD);
+    mpz_init(zP);
+    mpz_init(zQ);
+
+    mpz_set_ui(zD, d);
+
+    while (1) {
+        jacobi = mpz_jacobi(zD, n);
+
+        /* if jacobi == 0, d is a factor of n, therefore n is composite... */
+        /* if d == n, then either n is either prime or 9... */
+        if (jacobi == 0) {
+            result = (mpz_cmpabs(zD, n) == 0) && (mpz_cmp_ui(zD, 9) != 0);
+            goto cleanup;
+        }
+        if (jacobi == -1)
+            break;
+
+        /* if we get to the 5th d, make sure we aren't dealing with a square... */
+        if (d == 13 && mpz_perfect_square_p(n))
+            goto cleanup;
+
+        if (d < 0) {
+            d *= -1;
+            d += 2;
+        }
+        else {
+            d += 2;
+            d *= -1;
+        }
+
+        /* make sure we don't search forever */
+        if (d >= max_d) {
+            result = -1;
+            goto cleanup;
+        }
+
+        mpz_set_si(zD, d);
+    }
+
+    q = (1-d)/4;
+
+    /* Since (D/n) == -1, a factor shared with 2*q*D is a factor of q and
+     * means n is composite.
+     */
+    mpz_set_si(zQ, q);
+    mpz_gcd(zD, zQ, n);
+    if ((mpz_cmp(zD, n) != 0) && (mpz_cmp_ui(zD, 1) > 0))
+        goto cleanup;
+
+    mpz_set_ui(zP, 1);
+    result = GMPy_MPZ_Lucas_PRP(n, zP, zQ);
+
+  cleanup:
+    mpz_clear(zD);
+    mpz_clear(zP);
+    mpz_clear(zQ);
+    return result;
+}
+
 PyDoc_STRVAR(doc_mpz_is_selfridge_prp,
 "is_selfridge_prp(n, /) -> bool\n\n"
 "Return `True` if n is a Lucas probable prime with Selfidge parameters\n"
@@ -1208,22 +1318,18 @@ static PyObject *
 GMPY_mpz_is_selfridge_prp(PyObject *self, PyObject *args)
 {
     MPZ_Object *n = NULL;
-    PyObject *result = NULL, *temp = NULL;
-    long d = 5, p = 1, q = 0, max_d = 1000000;
-    int jacobi = 0;
-    mpz_t zD;
+    PyObject *result = NULL;
+    int ret;
 
     if (PyTuple_Size(args) != 1) {
         TYPE_ERROR("is_selfridge_prp() requires 1 integer argument");
         return NULL;
     }
 
-    mpz_init(zD);
-
     n = GMPy_MPZ_From_Integer(PyTuple_GET_ITEM(args, 0), NULL);
     if (!n) {
         TYPE_ERROR("is_selfridge_prp() requires 1 integer argument");
-        goto cleanup;
+        return NULL;
     }
 
     /* Require n > 0. */
@@ -1247,68 +1353,17 @@ GMPY_mpz_is_selfridge_prp(PyObject *self, PyObject *args)
         goto cleanup;
     }
 
-    mpz_set_ui(zD, d);
-
-    while (1) {
-        jacobi = mpz_jacobi(zD, n->z);
-
-        /* if jacobi == 0, d is a factor of n, therefore n is composite... */
-        /* if d == n, then either n is either prime or 9... */
-        if (jacobi == 0) {
-            if ((mpz_cmpabs(zD, n->z) == 0) && (mpz_cmp_ui(zD, 9) != 0)) {
-                result = Py_True;
-                goto cleanup;
-            }
-            else {
-                result = Py_False;
-                goto cleanup;
-            }
-        }
-        if (jacobi == -1)
-            break;
-
-        /* if we get to the 5th d, make sure we aren't dealing with a square... */
-        if (d == 13) {
-            if (mpz_perfect_square_p(n->z)) {
-                result = Py_False;
-                goto cleanup;
-            }
-        }
-
-        if (d < 0) {
-            d *= -1;
-            d += 2;
-        }
-        else {
-            d += 2;
-            d *= -1;
-        }
-
-        /* make sure we don't search forever */
-        if (d >= max_d) {
-            VALUE_ERROR("appropriate value for D cannot be found in is_selfridge_prp()");
-            goto cleanup;
-        }
-
-        mpz_set_si(zD, d);
-    }
-
-    q = (1-d)/4;
-
-    /* Since "O" is used, the refcount for n is incremented so deleting
-     * temp will not delete n.
-     */
-    temp = Py_BuildValue("Oll", n, p, q);
-    if (!temp)
+    ret = GMPy_MPZ_Selfridge_PRP(n->z);
+    if (ret < 0) {
+        /* LCOV_EXCL_START */
+        VALUE_ERROR("appropriate value for D cannot be found in is_selfridge_prp()");
         goto cleanup;
-    result = GMPY_mpz_is_lucas_prp(NULL, temp);
-    Py_DECREF(temp);
-    goto return_result;
+        /* LCOV_EXCL_STOP */
+    }
+    result = ret ? Py_True : Py_False;
 
   cleanup:
     Py_XINCREF(result);
-  return_result:
-    mpz_clear(zD);
     Py_DECREF((PyObject*)n);
     return result;
 }
@@ -1456,7 +1511,8 @@ static PyObject *
 GMPY_mpz_is_bpsw_prp(PyObject *self, PyObject *args)
 {
     MPZ_Object *n = NULL;
-    PyObject *result = NULL, *temp = NULL;
+    PyObject *result = NULL;
+    int ret;
 
     if (PyTuple_Size(args) != 1) {
         TYPE_ERROR("is_bpsw_prp() requires 1 integer argument");
@@ -1466,7 +1522,7 @@ GMPY_mpz_is_bpsw_prp(PyObject *self, PyObject *args)
     n = GMPy_MPZ_From_Integer(PyTuple_GET_ITEM(args, 0), NULL);
     if (!n) {
         TYPE_ERROR("is_bpsw_prp() requires 1 integer argument");
-        goto cleanup;
+        return NULL;
     }
 
     /* Require n > 0. */
@@ -1475,44 +1531,17 @@ GMPY_mpz_is_bpsw_prp(PyObject *self, PyObject *args)
         goto cleanup;
     }
 
-    /* Check for n == 1 */
-    if (mpz_cmp_ui(n->z, 1) == 0) {
-        result = Py_False;
+    ret = GMPy_MPZ_BPSW_PRP(n->z);
+    if (ret < 0) {
+        /* LCOV_EXCL_START */
+        VALUE_ERROR("appropriate value for D cannot be found in is_selfridge_prp()");
         goto cleanup;
+        /* LCOV_EXCL_STOP */
     }
-
-    /* Handle n even. */
-    if (mpz_divisible_ui_p(n->z, 2)) {
-        if (mpz_cmp_ui(n->z, 2) == 0)
-            result = Py_True;
-        else
-            result = Py_False;
-        goto cleanup;
-    }
-
-    /* "O" is used to increment the reference to n so deleting temp won't
-     * delete n.
-     */
-    temp = Py_BuildValue("Oi", n, 2);
-    if (!temp)
-        goto cleanup;
-    result = GMPY_mpz_is_strong_prp(NULL, temp);
-    Py_DECREF(temp);
-    if (Py_IsFalse(result))
-        goto return_result;
-    /* Remember to ignore the preceding result */
-    Py_DECREF(result);
-
-    temp = PyTuple_Pack(1, n);
-    if (!temp)
-        goto cleanup;
-    result = GMPY_mpz_is_selfridge_prp(NULL, temp);
-    Py_DECREF(temp);
-    goto return_result;
+    result = ret ? Py_True : Py_False;
 
   cleanup:
     Py_XINCREF(result);
-  return_result:
     Py_DECREF((PyObject*)n);
     return result;
 }
@@ -1595,3 +1624,30 @@ GMPY_mpz_is_strongbpsw_prp(PyObject *self, PyObject *args)
     Py_DECREF((PyObject*)n);
     return result;
 }
+
+/* The following function performs the same test as is_bpsw_prp() but does
+ * not use the Python API so it can be called without holding the GIL. It
+ * returns 1 if n is a BPSW probable prime, 0 if it is not, and -1 if no
+ * Selfridge parameters were found. n must be > 0.
+ */
+
+static int
+GMPy_MPZ_BPSW_PRP(mpz_srcptr n)
+{
+    mpz_t two;
+    int result;
+
+    if (mpz_cmp_ui(n, 1) == 0)
+        return 0;
+
+    if (mpz_even_p(n))
+        return mpz_cmp_ui(n, 2) == 0;
+
+    mpz_init_set_ui(two, 2);
+    result = GMPy_MPZ_Strong_PRP(n, two);
+    mpz_clear(two);
+    if (!result)
+        return 0;
+
+    return GMPy_MPZ_Selfridge_PRP(n);
+}
@@ -41,6 +41,11 @@ static PyObject * GMPY_mpz_is_strongselfridge_prp(PyObject *self, PyObject *args
 static PyObject * GMPY_mpz_is_bpsw_prp(PyObject *self, PyObject *args);
 static PyObject * GMPY_mpz_is_strongbpsw_prp(PyObject *self, PyObject *args);
 
+static int        GMPy_MPZ_Strong_PRP(mpz_srcptr n, mpz_srcptr a);
+static int        GMPy_MPZ_Lucas_PRP(mpz_srcptr n, mpz_srcptr p, mpz_srcptr q);
+static int        GMPy_MPZ_Selfridge_PRP(mpz_srcptr n);
+static int        GMPy_MPZ_BPSW_PRP(mpz_srcptr n);
+
 #ifdef __cplusplus
 }
 #endif
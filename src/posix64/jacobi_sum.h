@@ -17,10 +17,12 @@
 #ifndef __JACOBI_SUM__
 #define __JACOBI_SUM__
 
+#include <stdint.h>
+
 #ifndef HAVE_U64_T
 #define HAVE_U64_T
-typedef long s64_t;
-typedef unsigned long u64_t;
+typedef int64_t s64_t;
+typedef uint64_t u64_t;
 #endif
 
 /* The idea to hard code the J(p,q) values is thanks to Jason Moxham.
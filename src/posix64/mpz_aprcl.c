@@ -22,6 +22,11 @@
  *  - gmpy2 already includes modified copies of the PRP functions that were
  *    included in this file. They have been removed.
  *  - All declarations are marked static.
+ *  - The 64 bit integer type is int64_t.
+ *  - The Python interface has been moved to gmpy2_mpz_misc.c. mpz_aprcl()
+ *    does not use the Python API so it can be called without the GIL. It
+ *    uses static variables so the caller must ensure that only one thread
+ *    calls it at a time.
  *
  * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * *
  */
@@ -47,12 +52,7 @@
 #include <stdlib.h>
 #include <gmp.h>
 
-/* The follow typedefs will need to change on 64-bit Windows. */
-
-typedef long s64_t;
-typedef unsigned long u64_t;
-
-#include "jacobi_sum.h"
+#include "mpz_aprcl.h"
 
 /***********************************/
 /***********************************/
@@ -239,17 +239,19 @@ static mpz_t TestNbr;
 
 /* ============================================================================================== */
 
-static void allocate_vars(void)
+static int allocate_vars(void)
 {
   int i = 0;
-  aiJS = malloc(PWmax * sizeof(mpz_t));
-  aiJW = malloc(PWmax * sizeof(mpz_t));
-  aiJX = malloc(PWmax * sizeof(mpz_t));
-  aiJ0 = malloc(PWmax * sizeof(mpz_t));
-  aiJ1 = malloc(PWmax * sizeof(mpz_t));
-  aiJ2 = malloc(PWmax * sizeof(mpz_t));
-  aiJ00 = malloc(PWmax * sizeof(mpz_t));
-  aiJ01 = malloc(PWmax * sizeof(mpz_t));
+  aiJS = malloc(8 * PWmax * sizeof(mpz_t));
+  if (aiJS == NULL)
+    return -1;
+  aiJW = aiJS + PWmax;
+  aiJX = aiJW + PWmax;
+  aiJ0 = aiJX + PWmax;
+  aiJ1 = aiJ0 + PWmax;
+  aiJ2 = aiJ1 + PWmax;
+  aiJ00 = aiJ2 + PWmax;
+  aiJ01 = aiJ00 + PWmax;
   for (i = 0 ; i < PWmax; i++)
   {
     mpz_init(aiJS[i]);
@@ -269,6 +271,7 @@ static void allocate_vars(void)
   mpz_init(biT);
   mpz_init(biExp);
   mpz_init(biTmp);
+  return 0;
 }
 
 /* ============================================================================================== */
@@ -288,13 +291,6 @@ static void free_vars(void)
     mpz_clear(aiJ01[i]);
   }
   free(aiJS);
-  free(aiJW);
-  free(aiJX);
-  free(aiJ0);
-  free(aiJ1);
-  free(aiJ2);
-  free(aiJ00);
-  free(aiJ01);
 
   mpz_clear(TestNbr);
   mpz_clear(biN);
@@ -500,61 +496,57 @@ static void JacobiSum(int mode, int P, int PL, int Q)
     mpz_set_si(aiJ0[I], sls[jpqs[a].index+I]);
 }
 
-PyDoc_STRVAR(doc_mpz_is_aprcl_prime,
-"is_aprcl_prime(n) -> boolean\n\n"
-"Return True if n is a proven prime number verified by the APRCL test.\n"
-"Return False if n is composite. An exception is be raised if n is too\n"
-"large for this implementation of APRCL test.");
+/* Return APRCL_PRIME if N is a proven prime, APRCL_COMPOSITE if N is
+ * composite, APRCL_TOO_LARGE if N is too large for the tables, or
+ * APRCL_ERROR if memory could not be allocated or an internal check failed.
+ */
 
-static PyObject *
-GMPy_MPZ_is_aprcl_prime(PyObject *self, PyObject *other)
+static int
+mpz_aprcl(mpz_srcptr N)
 {
-  mpz_t N;
   s64_t T, U;
   int i, j, H, I, J, K, P, Q, W, X;
   int IV, InvX, LEVELnow, NP, PK, PL, PM, SW, VK, TestedQs, TestingQs;
   int QQ, T1, T3, U1, U3, V1, V3;
   int break_this = 0;
-  MPZ_Object *tempx;
-
-  if (!(tempx = GMPy_MPZ_From_Integer(other, NULL))) {
-    TYPE_ERROR("is_aprcl_prime() requires 'mpz' argument");
-    return NULL;
-  }
-
-  mpz_init(N);
-  mpz_set(N, tempx->z);
-  Py_DECREF(tempx);
 
-  /* make sure the input is >= 2 and odd */
   if (mpz_cmp_ui(N, 2) < 0)
-    Py_RETURN_FALSE;
+    return APRCL_COMPOSITE;
 
   if (mpz_divisible_ui_p(N, 2)) {
     if (mpz_cmp_ui(N, 2) == 0)
-      Py_RETURN_TRUE;
+      return APRCL_PRIME;
     else
-      Py_RETURN_FALSE;
+      return APRCL_COMPOSITE;
   }
 
   /* only three small exceptions for this implementation */
   /* with this set of P and Q primes */
   if (mpz_cmp_ui(N, 3) == 0)
-    Py_RETURN_TRUE;
+    return APRCL_PRIME;
   if (mpz_cmp_ui(N, 7) == 0)
-    Py_RETURN_TRUE;
+    return APRCL_PRIME;
   if (mpz_cmp_ui(N, 11) == 0)
-    Py_RETURN_TRUE;
+    return APRCL_PRIME;
 
-  /* If the input number is larger than 7000 decimal digits
-     we will just return whether it is a BPSW (probable) prime */
+  /* The largest S in the tables is e(t) = 7.4712E3010 and S^2 must be
+     greater than N, so N must be less than 10^APRCL_MAX_DIGITS. Since
+     mpz_sizeinbase() may be 1 too large, the limit is checked exactly. */
   NumberLength = mpz_sizeinbase(N, 10);
-  if (NumberLength > 7000) {
-      VALUE_ERROR("value too large to test");
-      return NULL;
+  if (NumberLength > APRCL_MAX_DIGITS) {
+      mpz_t limit;
+      int too_large;
+
+      mpz_init(limit);
+      mpz_ui_pow_ui(limit, 10, APRCL_MAX_DIGITS);
+      too_large = (mpz_cmp(N, limit) >= 0);
+      mpz_clear(limit);
+      if (too_large)
+          return APRCL_TOO_LARGE;
   }
 
-  allocate_vars();
+  if (allocate_vars() < 0)
+    return APRCL_ERROR;
 
   mpz_set(TestNbr, N);
   mpz_set_si(biS, 0);
@@ -595,8 +587,7 @@ GMPy_MPZ_is_aprcl_prime(PyObject *self, PyObject *other)
   if (i == LEVELmax)
   { /* too big */
     free_vars();
-    VALUE_ERROR("value too large to test");
-    return NULL;
+    return APRCL_TOO_LARGE;
   }
   LEVELnow = i;
   TestingQs = j;
@@ -1026,7 +1017,7 @@ MainStart:
             {
               /* Not prime */
               free_vars();
-              Py_RETURN_FALSE;
+              return APRCL_COMPOSITE;
             }
             for (I = 0; I < PM; I++)
             {
@@ -1042,7 +1033,7 @@ MainStart:
             {
               /* Not prime */
               free_vars();
-              Py_RETURN_FALSE;
+              return APRCL_COMPOSITE;
             }
             for (J = 1; J <= P - 2; J++)
             {
@@ -1053,7 +1044,7 @@ MainStart:
               {
                 /* Not prime */
                 free_vars();
-                Py_RETURN_FALSE;
+                return APRCL_COMPOSITE;
               }
             }
             H = I + PL;
@@ -1094,7 +1085,7 @@ MainStart:
           {
             /* Not prime */
             free_vars();
-            Py_RETURN_FALSE;
+            return APRCL_COMPOSITE;
           }
           SW = 1;
         } /* end for j */
@@ -1121,8 +1112,7 @@ MainStart:
           {
             free_vars();
             // return mpz_bpsw_prp(N); /* Cannot tell */
-            VALUE_ERROR("maximum levels reached");
-            return NULL;
+            return APRCL_TOO_LARGE;
           }
           T = aiT[LEVELnow];
           NP = aiNP[LEVELnow];
@@ -1148,8 +1138,7 @@ MainStart:
             }
           } /* end for J */
           free_vars();
-          VALUE_ERROR("internal failure");
-          return NULL;
+          return APRCL_ERROR;
         } /* end if */
         break;
       } /* end for (;;) */
@@ -1171,19 +1160,18 @@ MainStart:
       {
         /* Number is prime */
         free_vars();
-        Py_RETURN_TRUE;
+        return APRCL_PRIME;
       }
       if (mpz_divisible_p(TestNbr, biR) && mpz_cmp(biR, TestNbr) < 0) /* biR < N and biR | TestNbr */
       {
         /* Number is composite */
         free_vars();
-        Py_RETURN_FALSE;
+        return APRCL_COMPOSITE;
       }
     } /* End for U */
     /* This should never be reached. */
     free_vars();
-    SYSTEM_ERROR("Internal error: APR-CL error with final test.");
-    return NULL;
+    return APRCL_ERROR;
   }
 }
 
@@ -21,7 +21,9 @@
  * Summary of changes:
  *  - gmpy2 already includes modified copies of the PRP functions that were
  *    included in this file. They have been removed.
- *  - The 64 bit integer type is a "long".
+ *  - The 64 bit integer type is int64_t.
+ *  - mpz_aprcl() does not use the Python API. It uses static variables so
+ *    the caller must ensure that only one thread calls it at a time.
  *
  * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * * *
  */
@@ -29,10 +31,12 @@
 #ifndef __MPZ_APRCL__
 #define __MPZ_APRCL__
 
+#include <stdint.h>
+
 #ifndef HAVE_U64_T
 #define HAVE_U64_T
-typedef long s64_t;
-typedef unsigned long u64_t;
+typedef int64_t s64_t;
+typedef uint64_t u64_t;
 #endif
 
 #include "jacobi_sum.h"
@@ -79,13 +83,19 @@ typedef unsigned long u64_t;
  *
  * *********************************************************************************/
 
-PyDoc_STRVAR(doc_mpz_is_aprcl_prime,
-"is_aprcl_prime(n) -> boolean\n\n"
-"Return True if n is a proven prime number verified by the APRCL test.\n"
-"Return False if n is composite. An exception is be raised if n is too\n"
-"large for this implementation of APRCL test.");
+/* Return values of mpz_aprcl(). */
+
+#define APRCL_COMPOSITE   0
+#define APRCL_PRIME       1
+#define APRCL_TOO_LARGE  -1
+#define APRCL_ERROR      -2
+
+/* The tables can test any N with at most APRCL_MAX_DIGITS decimal digits.
+ * mpz_aprcl() returns APRCL_TOO_LARGE for larger values.
+ */
+
+#define APRCL_MAX_DIGITS  6021
 
-static PyObject *
-GMPY_mpz_is_aprcl_prime(PyObject *self, PyObject *other)
+static int mpz_aprcl(mpz_srcptr N);
 
 #endif
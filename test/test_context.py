@@ -283,3 +283,28 @@ def test_local_context():
 
     pytest.raises(ValueError, lambda: local_context(1, 2))
     pytest.raises(ValueError, lambda: local_context(spam=123))
+
+
+def test_context_arithmetic():
+    ctx = context(precision=20)
+    add, sub, mul, div = ctx.add, ctx.sub, ctx.mul, ctx.div
+
+    assert add(mpfr(1)/3, 1).precision == 20
+    assert sub(mpfr(1)/3, 1).precision == 20
+    assert mul(mpfr(1)/3, 3).precision == 20
+    assert div(1, mpfr(3)) == mpfr(1/3, 20)
+    assert ctx.floor_div(mpfr('7.5'), 2) == mpfr(3)
+    assert ctx.mod(mpfr('7.5'), 2) == mpfr('1.5')
+    assert ctx.divmod(mpfr('7.5'), 2) == (mpfr(3), mpfr('1.5'))
+    assert add(2, 3) == mpz(5)
+
+    assert gmpy2.add(mpfr(1), 2) == mpfr(3)
+    assert gmpy2.floor_div(mpfr('7.5'), 2) == mpfr(3)
+    assert gmpy2.floor_div(7, 2) == mpz(3)
+    assert gmpy2.mod(mpfr('7.5'), 2) == mpfr('1.5')
+
+    for f in (add, sub, mul, div, ctx.floor_div, ctx.mod, ctx.divmod,
+              gmpy2.add, gmpy2.sub, gmpy2.mul, gmpy2.div, gmpy2.floor_div,
+              gmpy2.mod):
+        pytest.raises(TypeError, lambda: f(1))
+        pytest.raises(TypeError, lambda: f(1, 2, 3))
@@ -0,0 +1,89 @@
+import pickle
+
+import pytest
+
+from gmpy2 import CRTBasis, crt, invert, mpz, next_prime, prod, xmpz
+
+
+def naive_crt(residues, moduli):
+    M = prod(moduli)
+    x = 0
+    for r, m in zip(residues, moduli):
+        x += r * (M // m) * invert(M // m, m)
+    return x % M
+
+
+def test_crt():
+    assert crt([2, 3, 2], [3, 5, 7]) == 23
+    assert type(crt([2, 3, 2], [3, 5, 7])) is mpz
+    assert crt([5], [7]) == 5
+    assert crt([-1], [7]) == 6
+    assert crt([0], [1]) == 0
+    assert crt([3, 4], [1, 5]) == 4
+    assert crt(iter([xmpz(1), mpz(2)]), (mpz(3), xmpz(4))) == 10
+
+    pytest.raises(TypeError, lambda: crt([1]))
+    pytest.raises(TypeError, lambda: crt(1, [3]))
+    pytest.raises(TypeError, lambda: crt([1.5], [3]))
+    pytest.raises(TypeError, lambda: crt([1], [3.0]))
+    pytest.raises(ValueError, lambda: crt([], []))
+    pytest.raises(ValueError, lambda: crt([1], [0]))
+    pytest.raises(ValueError, lambda: crt([1], [-3]))
+    pytest.raises(ValueError, lambda: crt([1], [2, 3]))
+    with pytest.raises(ValueError, match='index 1 and index 2'):
+        crt([1, 2, 3], [5, 6, 4])
+    with pytest.raises(ValueError, match='index 0 and index 1'):
+        crt([1, 1], [2, 4])
+    with pytest.raises(ValueError, match='index 1 and index 4'):
+        crt([0] * 5, [7, 9, 11, 13, 15])
+
+
+def test_crt_many():
+    for n in range(1, 40):
+        moduli = [next_prime(2**(i + 2) + 3*i) for i in range(n)]
+        residues = [(-1)**i * 7**(i + 5) for i in range(n)]
+        x = crt(residues, moduli)
+        assert x == naive_crt(residues, moduli)
+        assert 0 <= x < prod(moduli)
+        assert all((x - r) % m == 0 for r, m in zip(residues, moduli))
+
+
+def test_crtbasis_init():
+    B = CRTBasis([3, 5, 7])
+    assert len(B) == 3
+    assert B.moduli == (3, 5, 7)
+    assert all(type(m) is mpz for m in B.moduli)
+    assert B.modulus == 105
+    assert repr(B) == 'CRTBasis([3, 5, 7])'
+
+    pytest.raises(TypeError, lambda: CRTBasis())
+    pytest.raises(TypeError, lambda: CRTBasis(3))
+    pytest.raises(TypeError, lambda: CRTBasis([3], moduli=[3]))
+    pytest.raises(ValueError, lambda: CRTBasis([]))
+    pytest.raises(ValueError, lambda: CRTBasis([3, 0]))
+    pytest.raises(ValueError, lambda: CRTBasis([6, 35, 10]))
+
+    B2 = pickle.loads(pickle.dumps(B))
+    assert type(B2) is CRTBasis
+    assert B2.moduli == B.moduli
+    assert B2.combine([1, 2, 3]) == B.combine([1, 2, 3])
+
+
+def test_crtbasis_combine():
+    moduli = [next_prime(2**64 + 1000*i) for i in range(100)]
+    B = CRTBasis(moduli)
+    rows = [[(i * j)**3 - j for j in range(100)] for i in range(20)]
+    expected = [naive_crt(r, moduli) for r in rows]
+
+    assert [B.combine(r) for r in rows] == expected
+    assert B.combine_batch(rows) == expected
+    assert B.combine_batch(rows, threads=4) == expected
+    assert B.combine_batch([]) == []
+
+    pytest.raises(TypeError, lambda: B.combine(1))
+    pytest.raises(TypeError, lambda: B.combine(['a'] * 100))
+    pytest.raises(ValueError, lambda: B.combine([1, 2]))
+    pytest.raises(TypeError, lambda: B.combine_batch())
+    pytest.raises(TypeError, lambda: B.combine_batch(rows, foo=1))
+    pytest.raises(ValueError, lambda: B.combine_batch(rows, threads=0))
+    pytest.raises(ValueError, lambda: B.combine_batch(rows + [[1]]))
@@ -1,4 +1,9 @@
+import array
 import ctypes
+import io
+import math
+import pickle
+import threading
 from fractions import Fraction
 
 import pytest
@@ -8,25 +13,30 @@ from gmpy2 import (acos, acosh, asin, asinh, atan, atan2, atanh, bincoef,
                    c_div, c_div_2exp, c_divmod, c_divmod_2exp, c_mod,
                    c_mod_2exp, can_round, check_range, comb, context,
                    copy_sign, cos, cosh, cot, coth, csc, csch, degrees,
-                   divexact, divm, double_fac, f2q, f_div, f_div_2exp,
+                   divexact, divm, double_fac, dump, f2q, f_div, f_div_2exp,
                    f_divmod, f_divmod_2exp, f_mod, f_mod_2exp, fac, fib, fib2,
                    fma, fmma, fmms, fms, free_cache, from_binary, gcd, gcdext,
                    get_context, get_emax_max, get_emin_min, get_exp, ieee, inf,
-                   invert, iroot, iroot_rem, is_bpsw_prp, is_euler_prp,
-                   is_extra_strong_lucas_prp, is_fermat_prp, is_fibonacci_prp,
-                   is_finite, is_infinite, is_integer, is_lessgreater,
-                   is_lucas_prp, is_nan, is_regular, is_selfridge_prp,
-                   is_signed, is_strong_bpsw_prp, is_strong_lucas_prp,
+                   invert, invert_list, iroot, iroot_rem, is_bpsw_prp,
+                   is_bpsw_prp_list, is_euler_prp, is_extra_strong_lucas_prp,
+                   is_fermat_prp,
+                   is_fibonacci_prp, is_finite, is_infinite, is_integer,
+                   is_lessgreater, is_lucas_prp, is_nan, is_prime,
+                   is_prime_list, is_regular,
+                   is_selfridge_prp, is_signed, is_strong_bpsw_prp, is_strong_lucas_prp,
                    is_strong_prp, is_strong_selfridge_prp, is_unordered,
                    is_zero, isqrt, isqrt_rem, jacobi, kronecker, lcm, legendre,
-                   lucas, lucas2, maxnum, minnum, mpc, mpfr,
+                   load, lucas, lucas2, maxnum, minnum, mpc, mpfr,
                    mpfr_from_old_binary, mpq, mpq_from_old_binary, mpz,
-                   mpz_from_old_binary, multi_fac, nan, next_prime, norm,
-                   phase, polar, powmod, powmod_sec, primorial, proj, radians,
-                   rect, remove, root, root_of_unity, rootn, sec, sech,
+                   mpz_array, mpz_from_old_binary, multi_fac, nan, next_prime, norm,
+                   phase, polar, powmod, powmod_base_list,
+                   powmod_exp_list, powmod_multi, powmod_sec, prime_sieve,
+                   primes, primorial, prod, product_tree, proj,
+                   radians, rect, remainder_tree, remove, root, root_of_unity,
+                   rootn, sec, sech,
                    set_context, set_exp, set_sign, sign, sin, sin_cos, sinh,
                    sinh_cosh, t_div, t_div_2exp, t_divmod, t_divmod_2exp,
-                   t_mod, t_mod_2exp, tan, tanh, zero)
+                   t_mod, t_mod_2exp, tan, tanh, to_binary, xmpz, zero)
 
 
 def test_exp():
@@ -284,6 +294,54 @@ def test_powmod():
     pytest.raises(TypeError, lambda: powmod(z1, q, 4))
 
 
+def test_powmod_list():
+    bases = list(range(-50, 200)) + [mpz(2)**100]
+    exps = list(range(300))
+
+    res = [powmod(b, 65537, 1009) for b in bases]
+    assert powmod_base_list(bases, 65537, 1009) == res
+    for threads in (2, 3, 8, 1000):
+        assert powmod_base_list(bases, 65537, 1009, threads=threads) == res
+    assert powmod_base_list([], 3, 7, threads=4) == []
+
+    res = [powmod(3, e, 1009) for e in exps]
+    assert powmod_exp_list(3, exps, 1009) == res
+    for threads in (2, 3, 8, 1000):
+        assert powmod_exp_list(3, exps, 1009, threads=threads) == res
+
+    pytest.raises(TypeError, lambda: powmod_base_list(bases, 3))
+    pytest.raises(TypeError, lambda: powmod_base_list(bases, 3, 7, thread=2))
+    pytest.raises(TypeError, lambda: powmod_base_list(bases, 3, 7, threads=2.0))
+    pytest.raises(ValueError, lambda: powmod_base_list(bases, 3, 7, threads=0))
+    pytest.raises(ValueError, lambda: powmod_exp_list(3, exps, 0, threads=2))
+    pytest.raises(TypeError, lambda: powmod_exp_list(3, [1, 2.0], 7, threads=2))
+
+
+def test_powmod_multi():
+    bases = [3, mpz(2)**200 + 7, -5, 10**40]
+    exps = [65537, 12345678901234567890, 3, mpz(2)**128 - 1]
+
+    for m in (1009, mpz(2)**521 - 1, -1009, 1024, -1000, 1, -1, 2):
+        res = 1
+        for b, e in zip(bases, exps):
+            res = res * pow(b, e, m) % m
+        assert powmod_multi(bases, exps, m) == res
+
+    assert powmod_multi([3, 5], [-1, 2], 7) == (5 * 25) % 7
+    assert powmod_multi([], [], 7) == 1
+    assert powmod_multi([], [], -7) == -6
+    assert powmod_multi([2, 3], [0, 0], 7) == 1
+    assert powmod_multi([0], [5], 7) == 0
+
+    pytest.raises(TypeError, lambda: powmod_multi(bases, exps))
+    pytest.raises(TypeError, lambda: powmod_multi(bases, exps, 7.0))
+    pytest.raises(TypeError, lambda: powmod_multi([1.5], [1], 7))
+    pytest.raises(ValueError, lambda: powmod_multi(bases, exps[:2], 7))
+    pytest.raises(ValueError, lambda: powmod_multi(bases, exps, 0))
+    pytest.raises(ValueError, lambda: powmod_multi([3, 7], [1, -1], 7))
+    pytest.raises(ValueError, lambda: powmod_multi([4, 6], [1, -1], 8))
+
+
 def test_powmod_sec():
     assert powmod_sec(3,3,7) == mpz(6)
     assert powmod_sec(-3,3,7) == mpz(1)
@@ -381,6 +439,15 @@ def test_is_selfridge_prp():
     assert is_selfridge_prp(12345) is False
     assert is_selfridge_prp(113)
 
+    # Lucas-Selfridge pseudoprimes below 20000
+    pseudoprimes = [323, 377, 1159, 1829, 3827, 5459, 5777, 9071, 9179, 10877,
+                    11419, 11663, 13919, 14839, 16109, 16211, 18407, 18971,
+                    19043]
+    assert [n for n in range(1, 20000)
+            if is_selfridge_prp(n) and not is_prime(n)] == pseudoprimes
+    assert [n for n in range(1, 20000) if is_bpsw_prp(n)] == \
+        [n for n in range(1, 20000) if is_prime(n)]
+
 
 def test_is_strong_selfridge_prp():
     assert is_strong_selfridge_prp(12345) is False
@@ -397,6 +464,49 @@ def test_is_strong_bpsw_prp():
     assert is_strong_bpsw_prp(113)
 
 
+def test_is_bpsw_prp_list():
+    pytest.raises(TypeError, lambda: is_bpsw_prp_list())
+    pytest.raises(TypeError, lambda: is_bpsw_prp_list(1))
+    pytest.raises(TypeError, lambda: is_bpsw_prp_list([1, 'a']))
+    pytest.raises(TypeError, lambda: is_bpsw_prp_list([3], foo=1))
+    pytest.raises(ValueError, lambda: is_bpsw_prp_list([3, 0]))
+    pytest.raises(ValueError, lambda: is_bpsw_prp_list([3], threads=0))
+
+    assert is_bpsw_prp_list([]) == []
+    assert is_bpsw_prp_list([12345, 113]) == [False, True]
+
+    # strong base 2 and Lucas pseudoprimes, squares, and values with a
+    # factor near the end of the trial division tree
+    values = [2047, 3277, 4033, 5459, 5777, 10877, 3825123056546413051,
+              9, 25, (2**61 - 1)**2, 65521 * next_prime(10**30),
+              65537 * next_prime(10**30)]
+    values += list(range(1, 70000, 7))
+    values += [xmpz(2)**127 - 1, mpz(2)**521 - 1, 2**607 - 3]
+    expected = [is_bpsw_prp(v) for v in values]
+    assert is_bpsw_prp_list(values) == expected
+    assert is_bpsw_prp_list(values, threads=4) == expected
+
+
+def test_is_prime_list():
+    pytest.raises(TypeError, lambda: is_prime_list())
+    pytest.raises(TypeError, lambda: is_prime_list([1], 2, 3))
+    pytest.raises(TypeError, lambda: is_prime_list([1.5]))
+    pytest.raises(TypeError, lambda: is_prime_list([3], 'a'))
+    pytest.raises(ValueError, lambda: is_prime_list([3], threads=2000))
+
+    assert is_prime_list([]) == []
+    assert is_prime_list(iter([-7, 0, 1, 2, 3, 4])) == [False, False, False,
+                                                        True, True, False]
+
+    values = list(range(-10, 70000, 3))
+    values += [next_prime(2**k) + d for k in range(16, 600, 23) for d in (0, 2)]
+    values += [65521 * 65537, 3 * next_prime(2**200), mpz(2)**1279 - 1]
+    assert is_prime_list(values) == [is_prime(v) for v in values]
+    assert is_prime_list(values, 1) == [is_prime(v, 1) for v in values]
+    assert (is_prime_list(values, threads=3) ==
+            [is_prime(v) for v in values])
+
+
 def test_mpz_from_old_binary():
     assert gmpy2.mpz_from_old_binary(b'\x15\xcd[\x07') == mpz(123456789)
     assert gmpy2.mpz_from_old_binary(b'\x15\xcd[\x07\xff') == mpz(-123456789)
@@ -429,6 +539,64 @@ def test_from_binary():
     pytest.raises(ValueError, lambda: from_binary(b'a'))
 
 
+def test_dump_load():
+    values = [mpz(0), mpz(-5), mpz(2)**100000, xmpz(7), mpq(-3,7), mpfr('nan'),
+              mpfr('-0'), mpfr(1)/3, mpfr('1.5', 200), mpc('1+2j'),
+              mpc('-inf-3j', (70, 200))]
+
+    f = io.BytesIO()
+    assert dump(values, f) is None
+    dump([], f)
+    dump(mpz_array(range(-500, 500)), f)
+    data = f.getvalue()
+    assert data[:8] == b'GMPY2\x1a\x01\x00'
+
+    f.seek(0)
+    result = list(load(f))
+    assert [type(x) for x in result] == [type(x) for x in values]
+    assert [repr(x) for x in result] == [repr(x) for x in values]
+    assert [to_binary(x) for x in result] == [to_binary(x) for x in values]
+    assert list(load(f)) == []
+    assert list(load(f)) == list(range(-500, 500))
+    pytest.raises(EOFError, lambda: next(load(f)))
+
+    # Many values are split across several frames.
+    values = [mpz(3)**i * (-1)**i for i in range(20000)]
+    f = io.BytesIO()
+    dump(iter(values), f)
+    f.seek(0)
+    assert list(load(f)) == values
+
+    for cut in range(1, len(data[:400])):
+        with pytest.raises(ValueError):
+            list(load(io.BytesIO(data[:cut])))
+    pytest.raises(ValueError, lambda: next(load(io.BytesIO(b'GMPY2\x1a\x02\x00'))))
+    pytest.raises(ValueError, lambda: next(load(io.BytesIO(b'not gmpy2 data'))))
+    pytest.raises(ValueError, lambda: next(load(io.BytesIO(data[:8] + b'\x01' + bytes(15)))))
+
+    pytest.raises(TypeError, lambda: dump([1], io.BytesIO()))
+    pytest.raises(TypeError, lambda: dump([mpz(1)]))
+    pytest.raises(AttributeError, lambda: dump([mpz(1)], object()))
+    pytest.raises(AttributeError, lambda: load(object()))
+    pytest.raises(TypeError, lambda: load())
+
+    class NonBlocking:
+        # A raw file in non-blocking mode: None means nothing was written.
+        def __init__(self):
+            self.data = b''
+
+        def write(self, b):
+            if self.data:
+                return None
+            self.data = bytes(b[:5])
+            return 5
+
+    f = NonBlocking()
+    with pytest.raises(BlockingIOError) as e:
+        dump([mpz(1)], f)
+    assert e.value.characters_written == 5
+
+
 def test_phase():
     pytest.raises(TypeError, lambda: phase())
     pytest.raises(TypeError, lambda: phase(3))
@@ -1525,6 +1693,89 @@ def test_invert():
     assert invert(123,100) == mpz(87)
 
 
+def test_invert_list():
+    m = mpz(2)**255 - 19
+    xs = [mpz(3)**i - 7 * i for i in range(1, 60)] + [-5, xmpz(12)]
+
+    assert invert_list(xs, m) == [invert(x, m) for x in xs]
+    assert invert_list(xs, -m) == [invert(x, -m) for x in xs]
+    assert invert_list([123, 7], 100) == [mpz(87), mpz(43)]
+    assert invert_list([], 100) == []
+    assert invert_list([0, 5], 1) == [mpz(0), mpz(0)]
+
+    m = mpz(100)
+    assert invert_list([3], m) == [mpz(67)]
+    assert m == 100
+
+    with pytest.raises(ZeroDivisionError, match="at index 2"):
+        invert_list([1, 3, 456, 5, 10], 100)
+    pytest.raises(ZeroDivisionError, lambda: invert_list([1, 0], 7))
+    pytest.raises(ZeroDivisionError, lambda: invert_list([1, 2], 0))
+    pytest.raises(TypeError, lambda: invert_list([1, 2.0], 7))
+    pytest.raises(TypeError, lambda: invert_list([1, 2], 'a'))
+    pytest.raises(TypeError, lambda: invert_list([1, 2]))
+    pytest.raises(TypeError, lambda: invert_list(1, 7))
+
+
+def test_prod():
+    pytest.raises(TypeError, lambda: prod())
+    pytest.raises(TypeError, lambda: prod(1))
+    pytest.raises(TypeError, lambda: prod([1, 'a']))
+    pytest.raises(TypeError, lambda: prod([1, 2.0]))
+
+    assert prod([]) == 1
+    assert type(prod([])) is mpz
+    assert prod([5]) == 5
+    assert prod(iter([2, mpz(3), xmpz(4)])) == 24
+    assert prod([-3, 5, -7]) == 105
+    assert prod([3, 0, 5]) == 0
+
+    values = [(-1)**i * (2**i + 1) for i in range(300)]
+    expected = 1
+    for v in values:
+        expected *= v
+    assert prod(values) == expected
+
+
+def test_product_tree():
+    pytest.raises(TypeError, lambda: product_tree(1))
+    pytest.raises(TypeError, lambda: product_tree([1, 'a']))
+    pytest.raises(ValueError, lambda: product_tree([]))
+
+    assert product_tree([7]) == [[mpz(7)]]
+    assert product_tree([2, 3, 5]) == [[2, 3, 5], [6, 5], [30]]
+    assert product_tree([1, 2, 3, 4]) == [[1, 2, 3, 4], [2, 12], [24]]
+
+    for n in range(1, 40):
+        values = [(-1)**i * (i**5 + 3) for i in range(n)]
+        tree = product_tree(values)
+        assert tree[0] == values
+        assert tree[-1] == [prod(values)]
+        for lower, upper in zip(tree, tree[1:]):
+            assert len(upper) == (len(lower) + 1) // 2
+            assert upper == [prod(lower[2*i:2*i+2]) for i in range(len(upper))]
+
+
+def test_remainder_tree():
+    pytest.raises(TypeError, lambda: remainder_tree(1))
+    pytest.raises(TypeError, lambda: remainder_tree(1.5, [3]))
+    pytest.raises(TypeError, lambda: remainder_tree(5, 3))
+    pytest.raises(TypeError, lambda: remainder_tree(5, [3, 'a']))
+    pytest.raises(ZeroDivisionError, lambda: remainder_tree(5, [3, 0]))
+
+    assert remainder_tree(5, []) == []
+    assert remainder_tree(17, [5]) == [2]
+    assert remainder_tree(-17, [5, -5, 1, -1, 17]) == [3, -2, 0, 0, 0]
+
+    n = 3**2000 - 7**700
+    for k in range(1, 40):
+        moduli = [(-1)**i * (i**7 + 11) for i in range(k)]
+        assert remainder_tree(n, moduli) == [f_mod(n, m) for m in moduli]
+        assert remainder_tree(-n, moduli) == [-n % m for m in moduli]
+    moduli = [2**64 + i for i in range(1000)]
+    assert remainder_tree(mpz(n), moduli) == [n % m for m in moduli]
+
+
 def test_divexact():
     a = mpz(123)
 
@@ -1556,6 +1807,47 @@ def test_next_prime():
     assert next_prime(2357*7069-1) != 2357*7069
 
 
+def test_prime_sieve():
+    pytest.raises(TypeError, lambda: prime_sieve())
+    pytest.raises(TypeError, lambda: prime_sieve(1, 2, 3))
+    pytest.raises(TypeError, lambda: prime_sieve(1.0))
+    pytest.raises(ValueError, lambda: prime_sieve(-1, 5))
+    pytest.raises(OverflowError, lambda: prime_sieve(0, 2**64 + 1))
+
+    x = prime_sieve(100)
+    assert isinstance(x, xmpz)
+    assert list(x.iter_set()) == [n for n in range(100) if is_prime(n)]
+    assert prime_sieve(10, 10) == 0
+    assert prime_sieve(20, 10) == 0
+
+    for start in (10**6, 2**32 - 500, 2**40 + 1, 2**64 - 1000):
+        stop = start + 1000
+        expected = [n for n in range(start, stop) if is_prime(n)]
+        assert [start + i for i in prime_sieve(start, stop).iter_set()] == expected
+
+
+def test_primes():
+    pytest.raises(TypeError, lambda: primes())
+    pytest.raises(TypeError, lambda: primes('a'))
+    pytest.raises(ValueError, lambda: primes(-5))
+    pytest.raises(OverflowError, lambda: primes(2**65))
+
+    assert list(primes(30)) == [2, 3, 5, 7, 11, 13, 17, 19, 23, 29]
+    assert list(primes(0)) == []
+    assert list(primes(2**64, 2**64)) == []
+    assert all(type(p) is mpz for p in primes(10))
+    assert sum(1 for _ in primes(10**6)) == 78498
+
+    it = primes(1000, 2000)
+    assert iter(it) is it
+    assert next(it) == 1009
+
+    start = 2**63 - 2000
+    expected = [n for n in range(start, start + 2000) if is_prime(n)]
+    assert list(primes(start, start + 2000)) == expected
+    assert list(primes(2**64 - 100, 2**64)) == [2**64 - 95, 2**64 - 83, 2**64 - 59]
+
+
 def test_iroot():
     a = mpz(123)
     b = mpz(456)
@@ -1633,6 +1925,157 @@ def test_fsum():
     assert gmpy2.fsum(range(13)) == mpfr('78.0')
 
     pytest.raises(TypeError, lambda: gmpy2.fsum(1))
+    pytest.raises(TypeError, lambda: gmpy2.fsum([1, 'a']))
+
+    xs = [0.1]*1000 + [1e100, 1.0, -1e100]
+    assert gmpy2.fsum(xs) == mpfr(math.fsum(xs))
+    assert gmpy2.fsum(x for x in xs) == mpfr(math.fsum(xs))
+    assert gmpy2.fsum(array.array('d', xs)) == mpfr(math.fsum(xs))
+    assert gmpy2.fsum(gmpy2.mpfr_array(xs)) == mpfr(math.fsum(xs))
+    assert gmpy2.fsum([mpfr(1), 2, 0.5, mpz(3), Fraction(1, 2)]) == mpfr(7)
+    assert gmpy2.fsum([2**2000, 1.5, -2**2000]) == mpfr('1.5')
+
+    big = gmpy2.mul_2exp(mpfr(1), 1 << 25)
+    assert gmpy2.fsum([big, mpfr(3), -big] + [0.25]*300) == mpfr(78)
+
+    assert is_signed(gmpy2.fsum([-0.0]))
+    assert not is_signed(gmpy2.fsum([-0.0, 0.0]))
+    with gmpy2.context(round=gmpy2.RoundDown):
+        assert is_signed(gmpy2.fsum([1, -1]))
+    with gmpy2.context() as ctx:
+        assert is_nan(gmpy2.fsum([inf(), -inf()]))
+        assert ctx.invalid
+
+    ctx = gmpy2.context(precision=10)
+    assert ctx.fsum([1, 2**-20]) == mpfr(1)
+    assert ctx.fsum([1, 2**-20]).precision == 10
+
+    # A NaN result is positive even if a negative mpfr was just recycled.
+    x = mpfr(-1.5)
+    del x
+    assert repr(gmpy2.fsum([math.inf, -math.inf])) == "mpfr('nan')"
+    x = mpfr(-1.5)
+    del x
+    assert repr(gmpy2.fsum([math.nan])) == "mpfr('nan')"
+    x = mpfr(-1.5)
+    del x
+    assert repr(gmpy2.dot([math.inf], [0])) == "mpfr('nan')"
+    a = gmpy2.Accumulator()
+    a.add(math.nan)
+    x = mpfr(-1.5)
+    del x
+    assert repr(a.result()) == "mpfr('nan')"
+
+
+def test_dot():
+    xs = [0.1*i for i in range(1000)]
+    ys = [1/(i + 1) for i in range(1000)]
+    exact = sum(Fraction(x)*Fraction(y) for x, y in zip(xs, ys))
+    assert gmpy2.dot(xs, ys) == mpfr(exact)
+    assert gmpy2.dot(iter(xs), iter(ys)) == mpfr(exact)
+    assert gmpy2.dot(array.array('d', xs), gmpy2.mpfr_array(ys)) == mpfr(exact)
+    assert gmpy2.dot([], []) == mpfr(0)
+    assert gmpy2.dot([2, mpz(3)], [mpfr(0.5), 4]) == mpfr(13)
+    assert gmpy2.dot([1e300, 1, -1e300], [1e300, 1, 1e300]) == mpfr(1)
+
+    pytest.raises(TypeError, lambda: gmpy2.dot([1]))
+    pytest.raises(TypeError, lambda: gmpy2.dot(1, [1]))
+    pytest.raises(TypeError, lambda: gmpy2.dot([1], ['a']))
+    pytest.raises(ValueError, lambda: gmpy2.dot([1, 2], [1]))
+    pytest.raises(ValueError, lambda: gmpy2.dot([1], [1, 2]))
+
+    with gmpy2.context() as ctx:
+        assert is_nan(gmpy2.dot([inf()], [0]))
+        assert ctx.invalid
+    assert gmpy2.context(precision=10).dot([3], [1/3]).precision == 10
+
+
+def test_accumulator():
+    xs = [0.1*i*(-1)**i for i in range(3000)] + [1e100, 1.0, -1e100]
+
+    a = gmpy2.Accumulator()
+    for x in xs[:100]:
+        a.add(x)
+    a.extend(xs[100:1000])
+    a.extend(x for x in xs[1000:2000])
+    a.extend(array.array('d', xs[2000:2500]))
+    b = gmpy2.Accumulator()
+    b.extend(gmpy2.mpfr_array(xs[2500:]))
+    a.merge(b)
+    assert a.result() == mpfr(math.fsum(xs))
+    assert a.result() == mpfr(math.fsum(xs))
+    assert b.result() == mpfr(math.fsum(xs[2500:]))
+
+    c = pickle.loads(pickle.dumps(a))
+    assert c.result() == a.result()
+    a.merge(a)
+    assert a.result() == mpfr(math.fsum(xs + xs))
+
+    assert gmpy2.Accumulator().result() == 0
+    assert gmpy2.Accumulator(gmpy2.context(precision=10)).result().precision == 10
+
+    a = gmpy2.Accumulator()
+    a.extend([1, -1])
+    assert not is_signed(a.result())
+    a = gmpy2.Accumulator(gmpy2.context(round=gmpy2.RoundDown))
+    a.extend([1, -1])
+    assert is_signed(a.result())
+    a = gmpy2.Accumulator()
+    a.add(-0.0)
+    assert is_signed(pickle.loads(pickle.dumps(a)).result())
+
+    a, b = gmpy2.Accumulator(), gmpy2.Accumulator()
+    a.add(inf())
+    b.add(-inf())
+    a.merge(b)
+    with gmpy2.context() as ctx:
+        assert is_nan(a.result())
+        assert ctx.invalid
+
+    big = gmpy2.mul_2exp(mpfr(1), 1 << 25)
+    a, b = gmpy2.Accumulator(), gmpy2.Accumulator()
+    a.extend([big, 3])
+    b.extend([-big] + [0.25]*300)
+    a.merge(b)
+    assert a.result() == mpfr(78)
+    assert pickle.loads(pickle.dumps(a)).result() == mpfr(78)
+
+    a = gmpy2.Accumulator()
+    def gen():
+        for i in range(1000):
+            a.add(1)
+            yield 2
+    a.extend(gen())
+    assert a.result() == mpfr(3000)
+
+    pytest.raises(TypeError, lambda: gmpy2.Accumulator(1))
+    pytest.raises(TypeError, lambda: a.merge(1))
+    pytest.raises(TypeError, lambda: a.extend(1))
+    pytest.raises(TypeError, lambda: a.add('a'))
+    pytest.raises(TypeError, lambda: a.__setstate__((1, 0, None)))
+    pytest.raises(TypeError, lambda: a.__setstate__((mpfr(1), 0, [1])))
+
+
+def test_accumulator_threads():
+    a, b = gmpy2.Accumulator(), gmpy2.Accumulator()
+
+    def worker(k):
+        c = gmpy2.Accumulator()
+        for i in range(2000):
+            a.add(k + i)
+            b.extend([0.5, k])
+            if i % 500 == 0:
+                c.merge(a)
+                b.result()
+
+    threads = [threading.Thread(target=worker, args=(k,)) for k in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert a.result() == sum(k + i for k in range(8) for i in range(2000))
+    assert b.result() == 8*2000*0.5 + 2000*sum(range(8))
 
 
 def test_next_toward():
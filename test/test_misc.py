@@ -1,5 +1,8 @@
 import platform
 import sys
+import sysconfig
+import threading
+import tracemalloc
 
 import pytest
 
@@ -25,3 +28,241 @@ def test_misc():
 def test_sizeof():
     assert sys.getsizeof(gmpy2.mpz(10)) > 0
     assert sys.getsizeof(gmpy2.mpfr('1.0')) > 0
+
+
+def test_threads():
+    # Objects are created in one thread and released in another so they
+    # move between the object caches of different threads.
+    results = []
+
+    def work(k):
+        out = []
+        for i in range(2000):
+            out.append((gmpy2.mpz(i) * k, gmpy2.xmpz(i), gmpy2.mpq(i, k),
+                        gmpy2.mpfr(i) / k, gmpy2.mpc(i, k)))
+        results.append(out)
+
+    threads = [threading.Thread(target=work, args=(k,)) for k in range(1, 5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(results) == 4
+    assert sorted(r[-1][0] for r in results) == [1999, 3998, 5997, 7996]
+    del results
+    assert gmpy2.mpz(12) + 30 == 42
+
+
+@pytest.mark.skipif(platform.python_implementation() == "PyPy",
+                    reason="no tracemalloc support")
+def test_thread_caches():
+    # On the free-threaded build each thread has its own object caches.
+    # They must be freed when the thread exits.
+    if sysconfig.get_config_var('Py_GIL_DISABLED'):
+        assert not sys._is_gil_enabled()
+
+    def work():
+        values = ([gmpy2.mpz(i) for i in range(200)] +
+                  [gmpy2.mpq(i, 3) for i in range(200)] +
+                  [gmpy2.mpfr(i) for i in range(200)])
+        del values
+
+    def run(n):
+        for _ in range(n):
+            t = threading.Thread(target=work)
+            t.start()
+            t.join()
+
+    tracemalloc.start()
+    try:
+        run(2)
+        before = tracemalloc.get_traced_memory()[0]
+        run(50)
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    assert after - before < 100000
+
+
+@pytest.mark.skipif(platform.python_implementation() == "PyPy",
+                    reason="objects are not cached")
+def test_cache():
+    old = gmpy2.get_cache()
+    assert old['size'] == 100
+    assert old['mpz_limbs'] == 64
+    assert old['mpfr_bits'] == 1024
+
+    try:
+        gmpy2.set_cache(size=500, mpz_limbs=8)
+        cache = gmpy2.get_cache()
+        assert cache['size'] == 500
+        assert cache['mpz_limbs'] == 8
+        assert cache['mpfr_bits'] == 1024
+        assert cache['mpz'] == 0
+
+        small = [gmpy2.mpz(i) + 1 for i in range(1000)]
+        large = [gmpy2.mpz(2)**4096 + i for i in range(10)]
+        del small, large
+        assert gmpy2.get_cache()['mpz'] == 500
+        assert gmpy2.mpz(2)**4096 - (gmpy2.mpz(2)**4096 - 7) == 7
+
+        gmpy2.set_cache(size=0)
+        assert gmpy2.get_cache()['mpz'] == 0
+        values = [gmpy2.mpfr(i) for i in range(10)]
+        del values
+        assert gmpy2.get_cache()['mpfr'] == 0
+        assert gmpy2.mpfr(1) + 1 == 2
+
+        gmpy2.set_cache(size=gmpy2.mpz(10), mpfr_bits=gmpy2.xmpz(2048))
+        assert gmpy2.get_cache()['size'] == 10
+        assert gmpy2.get_cache()['mpfr_bits'] == 2048
+        values = [gmpy2.mpc(i, precision=2000) for i in range(20)]
+        del values
+        assert gmpy2.get_cache()['mpc'] == 10
+        gmpy2.set_cache()
+        assert gmpy2.get_cache()['mpc'] == 0
+    finally:
+        gmpy2.set_cache(size=old['size'], mpz_limbs=old['mpz_limbs'],
+                        mpfr_bits=old['mpfr_bits'])
+
+    pytest.raises(TypeError, lambda: gmpy2.set_cache(100))
+    pytest.raises(TypeError, lambda: gmpy2.set_cache(size=1.5))
+    pytest.raises(TypeError, lambda: gmpy2.set_cache(objsize=10))
+    pytest.raises(ValueError, lambda: gmpy2.set_cache(size=-1))
+    pytest.raises(ValueError, lambda: gmpy2.set_cache(size=10**7))
+    pytest.raises(ValueError, lambda: gmpy2.set_cache(mpz_limbs=-1))
+    pytest.raises(ValueError, lambda: gmpy2.set_cache(mpfr_bits=2**100))
+    pytest.raises(ValueError, lambda: gmpy2.set_cache(size=gmpy2.mpz(-1)))
+    pytest.raises(TypeError, lambda: gmpy2.set_cache(size=gmpy2.mpq(1, 2)))
+    assert gmpy2.get_cache()['size'] == old['size']
+
+
+@pytest.mark.skipif(platform.python_implementation() == "PyPy",
+                    reason="objects are not cached")
+def test_cache_stats():
+    stats = gmpy2.cache_stats()
+    assert sorted(stats) == ['mpc', 'mpfr', 'mpq', 'mpz', 'xmpz']
+    assert sorted(stats['mpz']) == ['cached', 'full', 'hits', 'in_cache',
+                                    'live', 'misses', 'too_large']
+
+    old = gmpy2.get_cache()
+    try:
+        gmpy2.set_cache(size=10, mpz_limbs=4)
+        before = gmpy2.cache_stats()['mpz']
+        assert before['in_cache'] == 0
+        small = [gmpy2.mpz(i) + 1 for i in range(30)]
+        large = [gmpy2.mpz(2)**1000 + i for i in range(5)]
+        during = gmpy2.cache_stats()['mpz']
+        assert during['live'] >= before['live'] + 35
+        del small, large
+        after = gmpy2.cache_stats()['mpz']
+        assert after['in_cache'] == 10
+        assert after['live'] == before['live']
+        assert after['too_large'] >= before['too_large'] + 5
+        assert after['full'] >= before['full'] + 20
+        assert after['hits'] + after['misses'] >= \
+            before['hits'] + before['misses'] + 35
+
+        x = gmpy2.mpz(5) + 1
+        assert gmpy2.cache_stats()['mpz']['hits'] > after['hits']
+        del x
+    finally:
+        gmpy2.set_cache(size=old['size'], mpz_limbs=old['mpz_limbs'],
+                        mpfr_bits=old['mpfr_bits'])
+
+    before = gmpy2.cache_stats()['mpfr']
+    values = [gmpy2.mpfr(i) for i in range(5)]
+    assert gmpy2.cache_stats()['mpfr']['live'] == before['live'] + 5
+    del values
+    assert gmpy2.cache_stats()['mpfr']['live'] == before['live']
+
+
+@pytest.fixture
+def restore_allocator():
+    allocator = gmpy2.allocator_stats()['allocator']
+    yield
+    gmpy2.set_allocator(allocator)
+
+
+@pytest.mark.skipif(platform.python_implementation() == "PyPy",
+                    reason="no tracemalloc support")
+@pytest.mark.skipif(sys.flags.dev_mode, reason="debug memory hooks")
+def test_allocator(restore_allocator):
+    stats = gmpy2.allocator_stats()
+    assert sorted(stats) == ['allocations', 'allocator', 'arena_bytes',
+                             'bytes_allocated', 'bytes_freed',
+                             'bytes_in_use', 'frees', 'reallocations']
+    assert stats['allocator'] == 'system'
+
+    gmpy2.set_allocator('system')
+    before = gmpy2.allocator_stats()
+    x = gmpy2.mpz(7)**10000
+    after = gmpy2.allocator_stats()
+    assert after['bytes_in_use'] >= before['bytes_in_use'] + 3500
+    assert after['allocations'] > before['allocations']
+    del x
+    assert gmpy2.allocator_stats()['frees'] > after['frees']
+
+    gmpy2.set_allocator('arena')
+    assert gmpy2.allocator_stats()['allocator'] == 'arena'
+    values = [gmpy2.mpz(3)**(i + 100) for i in range(1000)]
+    assert gmpy2.allocator_stats()['arena_bytes'] > 0
+    assert values[-1] == 3**1099
+    assert sum(values[:10]) == sum(3**(i + 100) for i in range(10))
+    values += [gmpy2.mpfr(i, 2000) for i in range(100)]
+
+    gmpy2.set_allocator('pymalloc')
+    del values
+    tracemalloc.start()
+    try:
+        x = gmpy2.mpz(7)**100000
+        assert tracemalloc.get_traced_memory()[0] >= 35000
+        del x
+        assert tracemalloc.get_traced_memory()[0] < 35000
+
+        # A block is freed by the allocator that created it.
+        x = gmpy2.mpz(7)**100000
+        gmpy2.set_allocator('system')
+        del x
+        assert tracemalloc.get_traced_memory()[0] < 35000
+    finally:
+        tracemalloc.stop()
+    assert gmpy2.allocator_stats()['bytes_in_use'] >= 0
+    assert gmpy2.mpz(12) * 12 == 144
+    gmpy2.set_allocator('system')
+
+    pytest.raises(TypeError, lambda: gmpy2.set_allocator(1))
+    pytest.raises(ValueError, lambda: gmpy2.set_allocator('libc'))
+    assert gmpy2.allocator_stats()['allocator'] == 'system'
+
+
+@pytest.mark.skipif(platform.python_implementation() == "PyPy",
+                    reason="no tracemalloc support")
+@pytest.mark.skipif(sys.flags.dev_mode, reason="debug memory hooks")
+def test_allocator_threads(restore_allocator):
+    # The arena grows while native threads allocate without the GIL and
+    # another Python thread allocates with it. This used to deadlock when
+    # tracemalloc was active.
+    ps = [gmpy2.next_prime(gmpy2.mpz(2)**61 + 1000*i) for i in range(8)]
+    basis = gmpy2.CRTBasis(ps)
+    residues = [[(i*j) % p for j, p in enumerate(ps)] for i in range(5000)]
+    stop = False
+
+    def work():
+        while not stop:
+            values = [gmpy2.mpz(i)*3 for i in range(5000)]
+            del values
+
+    gmpy2.set_allocator('arena')
+    tracemalloc.start()
+    t = threading.Thread(target=work)
+    t.start()
+    try:
+        for _ in range(5):
+            result = basis.combine_batch(residues, threads=4)
+    finally:
+        stop = True
+        t.join()
+        tracemalloc.stop()
+    assert result[7] == basis.combine(residues[7])
+    gmpy2.set_allocator('system')
@@ -0,0 +1,83 @@
+import pickle
+
+import pytest
+from hypothesis import given, settings
+from hypothesis.strategies import integers, lists
+
+from gmpy2 import ModRing, mpz, xmpz
+
+
+def test_modring_init():
+    R = ModRing(1009)
+    assert R.modulus == 1009
+    assert type(R.modulus) is mpz
+    assert repr(R) == 'ModRing(1009)'
+    assert ModRing(xmpz(15)).modulus == 15
+
+    pytest.raises(ValueError, lambda: ModRing(1))
+    pytest.raises(ValueError, lambda: ModRing(-7))
+    pytest.raises(ValueError, lambda: ModRing(1000))
+    pytest.raises(TypeError, lambda: ModRing(7.0))
+    pytest.raises(TypeError, lambda: ModRing())
+    pytest.raises(TypeError, lambda: ModRing(7, m=7))
+
+    R2 = pickle.loads(pickle.dumps(R))
+    assert type(R2) is ModRing
+    assert R2.modulus == 1009
+
+
+def test_modring_methods():
+    m = 2**127 - 1
+    R = ModRing(m)
+    x, y = 3**100, -(5**60)
+
+    assert R.add(x, y) == (x + y) % m
+    assert R.sub(x, y) == (x - y) % m
+    assert R.mul(x, y) == (x * y) % m
+    assert R.sqr(y) == (y * y) % m
+    assert R.pow(x, 0) == 1
+    assert R.pow(x, 65537) == pow(x, 65537, m)
+    assert R.pow(y, -3) == pow(y, -3, m)
+    assert R.inv(x) == pow(x, -1, m)
+
+    R = ModRing(15)
+    pytest.raises(ZeroDivisionError, lambda: R.inv(6))
+    pytest.raises(ValueError, lambda: R.pow(6, -1))
+    pytest.raises(TypeError, lambda: R.mul(1, 2.0))
+    pytest.raises(TypeError, lambda: R.mul(1))
+    pytest.raises(TypeError, lambda: R.pow(1, 2, 3))
+
+
+def test_modring_batch():
+    m = mpz(2)**1279 - 1
+    R = ModRing(m)
+    xs = [mpz(3)**i - 7 * i for i in range(50)]
+    ys = [mpz(5)**i + i for i in range(50)]
+
+    assert R.mul_list(xs, ys) == [x * y % m for x, y in zip(xs, ys)]
+    assert R.mul_list(xs, 12345) == [x * 12345 % m for x in xs]
+    assert R.pow_list(xs, 2**200 + 1) == [pow(x, 2**200 + 1, m) for x in xs]
+    assert R.pow_list(xs[1:], list(range(-1, 48))) == [pow(x, e, m) for x, e
+                                                       in zip(xs[1:], range(-1, 48))]
+    prod = 1
+    for x in xs:
+        prod = prod * x % m
+    assert R.prod(xs) == prod
+    assert R.prod([]) == 1
+    assert R.mul_list([], 3) == []
+
+    pytest.raises(ValueError, lambda: R.mul_list(xs, ys[1:]))
+    pytest.raises(ValueError, lambda: ModRing(15).pow_list([2, 3], -1))
+    pytest.raises(TypeError, lambda: R.prod([1, 2.0]))
+    pytest.raises(TypeError, lambda: R.pow_list(xs))
+
+
+@settings(max_examples=200)
+@given(integers(min_value=1), integers(), integers(), integers(min_value=0,
+                                                              max_value=2**300))
+def test_modring_hypothesis(m, x, y, e):
+    m = 2 * m + 1
+    R = ModRing(m)
+    assert R.mul(x, y) == x * y % m
+    assert R.pow(x, e) == pow(x, e, m)
+    assert R.prod([x, y, e]) == x * y * e % m
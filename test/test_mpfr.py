@@ -882,6 +882,31 @@ def test_mpfr_pickle():
     assert pickle.loads(pickle.dumps(mpfr(0))) == mpfr('0.0')
 
 
+def test_mpfr_pickle_buffers():
+    ctx = gmpy2.context(precision=600000)
+    big = ctx.mul(mpfr(3, 600000), mpz(7)**200000)
+    values = [big, ctx.div(-1, 7), ctx.div(1, mpz(3)**100000),
+              mpc(big, -big, precision=(600000, 600000)),
+              mpc(big, 0, precision=(600000, 10)),
+              mpc(nan(), inf(-1), precision=(600000, 600000))]
+    for x in values:
+        for proto in range(pickle.HIGHEST_PROTOCOL + 1):
+            y = pickle.loads(pickle.dumps(x, protocol=proto))
+            assert type(y) is type(x) and repr(y) == repr(x)
+        buffers = []
+        data = pickle.dumps(x, protocol=5, buffer_callback=buffers.append)
+        y = pickle.loads(data, buffers=[b.raw() for b in buffers])
+        assert type(y) is type(x) and repr(y) == repr(x)
+        assert x.precision == y.precision and x.rc == y.rc
+        if is_nan(x.real):
+            assert not buffers
+        else:
+            assert buffers and to_binary(y) == to_binary(x)
+
+    pytest.raises(ValueError, lambda: gmpy2._from_limbs(4, (8, 0, 0, 64, 0, 1), bytes(8)))
+    pytest.raises(ValueError, lambda: gmpy2._from_limbs(4, (8, 0, 0, 0, 0, 1), bytes(8)))
+
+
 def test_mpfr_floor():
     a = mpfr('12.34')
 
@@ -923,3 +948,41 @@ def test_issue_540():
     ctxD = gmpy2.context(round=gmpy2.RoundDown)
 
     assert ctxD.div(a, b) == mpfr('0.099999999999999992')
+
+
+def test_vmap():
+    xs = [1, 2.5, mpz(3), mpq(1, 3), Fraction(-7, 2), mpfr('1.25')]
+
+    for name in ['sin', 'exp', 'atan', 'cbrt', 'rint_floor']:
+        func = getattr(gmpy2, name)
+        assert gmpy2.vmap(name, xs) == [func(x) for x in xs]
+        for threads in [2, 3, 8]:
+            assert gmpy2.vmap(name, xs, threads=threads) == [func(x) for x in xs]
+
+    assert gmpy2.vmap('square', [3, mpfr(1.5)]) == [mpfr(9), mpfr(2.25)]
+    assert gmpy2.vmap('sin', iter(range(5))) == [gmpy2.sin(i) for i in range(5)]
+    assert gmpy2.vmap('exp', [], threads=4) == []
+
+    ctx = gmpy2.ieee(32)
+    res = ctx.vmap('exp', [1, 1e10])
+    assert res == [ctx.exp(1), inf()]
+    assert res[0].precision == 24
+    assert ctx.overflow and ctx.inexact and not ctx.invalid
+
+    ctx = gmpy2.context()
+    res = ctx.vmap('log', [-1, 0, 1])
+    assert is_nan(res[0])
+    assert res[1:] == [-inf(), 0]
+    assert ctx.invalid and ctx.divzero
+
+    ctx = gmpy2.context(trap_invalid=True)
+    pytest.raises(gmpy2.InvalidOperationError,
+                  lambda: ctx.vmap('sqrt', [4, -1, 9]))
+
+    pytest.raises(TypeError, lambda: gmpy2.vmap('sin'))
+    pytest.raises(TypeError, lambda: gmpy2.vmap(gmpy2.sin, [1]))
+    pytest.raises(ValueError, lambda: gmpy2.vmap('atan2', [1]))
+    pytest.raises(TypeError, lambda: gmpy2.vmap('sin', 1))
+    pytest.raises(TypeError, lambda: gmpy2.vmap('sin', [1, 1j]))
+    pytest.raises(TypeError, lambda: gmpy2.vmap('sin', [1], thread=2))
+    pytest.raises(ValueError, lambda: gmpy2.vmap('sin', [1], threads=0))
@@ -0,0 +1,220 @@
+import array
+import sys
+import threading
+
+import pytest
+from hypothesis import given
+from hypothesis.strategies import floats, lists
+
+import gmpy2
+from gmpy2 import mpfr, mpfr_array, mpq, mpz
+
+
+def test_mpfr_array_init():
+    a = mpfr_array([1, -2.5, mpz(3), mpq(1, 3), '0.1', mpfr('1.5')])
+    assert len(a) == 6
+    assert a.precision == 53
+    assert a.tolist() == [1, -2.5, 3, mpfr(mpq(1, 3)), mpfr('0.1'), 1.5]
+    assert all(type(x) is mpfr for x in a)
+    assert list(a) == a.tolist()
+    assert len(mpfr_array()) == 0
+    assert mpfr_array(3).tolist() == [0, 0, 0]
+    assert mpfr_array(mpz(2), 100).precision == 100
+
+    b = mpfr_array(['0.1', mpq(1, 3)], 100)
+    assert b.precision == 100
+    assert b.tolist() == [mpfr('0.1', 100), mpfr(mpq(1, 3), 100)]
+    assert all(x.precision == 100 for x in b)
+    assert mpfr_array(b).precision == 100
+    assert mpfr_array(b) is not b
+    assert mpfr_array(b, 24).tolist() == [mpfr('0.1', 24), mpfr(mpq(1, 3), 24)]
+    assert mpfr_array(b, precision=24).precision == 24
+
+    with gmpy2.context(precision=70):
+        assert mpfr_array([1]).precision == 70
+
+    assert repr(mpfr_array([1, '0.5'])) == "mpfr_array(['1.0', '0.5'], 53)"
+    assert repr(mpfr_array([], 10)) == "mpfr_array([], 10)"
+    assert repr(eval(repr(b))) == repr(b)
+
+    pytest.raises(TypeError, lambda: mpfr_array([1, 1j]))
+    pytest.raises(TypeError, lambda: mpfr_array(1.5))
+    pytest.raises(ValueError, lambda: mpfr_array(['a']))
+    pytest.raises(ValueError, lambda: mpfr_array(-1))
+    pytest.raises(ValueError, lambda: mpfr_array([1], 1))
+    pytest.raises(ValueError, lambda: mpfr_array([1], -1))
+    pytest.raises(TypeError, lambda: mpfr_array([1], x=1))
+    pytest.raises(TypeError, lambda: hash(a))
+
+
+def test_mpfr_array_items():
+    a = mpfr_array([10, 20, 30, 40])
+    assert a[0] == 10
+    assert a[-1] == 40
+    assert a[1:3].tolist() == [20, 30]
+    assert a[::-2].tolist() == [40, 20]
+    assert a[5:].tolist() == []
+
+    a[0] = '1.5'
+    a[-1] = mpq(1, 3)
+    assert a.tolist() == [1.5, 20, 30, mpfr(mpq(1, 3))]
+    a[1:3] = [7, 8]
+    assert a.tolist()[1:3] == [7, 8]
+    a[::3] = mpfr_array([0, 0])
+    assert a.tolist() == [0, 7, 8, 0]
+
+    b = mpfr_array([0], 10)
+    b[0] = 1/3
+    assert b[0] == mpfr(1/3, 10) and b[0].precision == 10
+
+    pytest.raises(IndexError, lambda: a[4])
+    pytest.raises(IndexError, lambda: a[-5])
+    pytest.raises(TypeError, lambda: a['a'])
+    with pytest.raises(IndexError):
+        a[4] = 1
+    with pytest.raises(TypeError):
+        a[0] = 1j
+    with pytest.raises(ValueError):
+        a[0:2] = [1, 2, 3]
+    with pytest.raises(TypeError):
+        del a[0]
+
+
+def test_mpfr_array_arithmetic():
+    a = mpfr_array([7, -7, 0, 2**70, 0.1])
+    b = mpfr_array([2, 3, -5, 2**65 + 1, 3])
+    x, y = a.tolist(), b.tolist()
+
+    assert (a + b).tolist() == [i + j for i, j in zip(x, y)]
+    assert (a - b).tolist() == [i - j for i, j in zip(x, y)]
+    assert (a * b).tolist() == [i * j for i, j in zip(x, y)]
+    assert (a / b).tolist() == [i / j for i, j in zip(x, y)]
+    assert (-a).tolist() == [-i for i in x]
+    assert (a + 1).tolist() == [i + 1 for i in x]
+    assert (1 - a).tolist() == [1 - i for i in x]
+    assert (mpfr(2) * a).tolist() == [2 * i for i in x]
+    assert (a / mpq(1, 3)).tolist() == [i / mpq(1, 3) for i in x]
+
+    c = mpfr_array([1, 3], 100)
+    assert (c / 10).precision == 100
+    assert (c + mpfr_array([1, 3], 24)).precision == 100
+    assert (mpfr_array([1, 3], 24) / 10).tolist() == [mpfr(0.1, 24), mpfr(0.3, 24)]
+
+    with gmpy2.context(round=gmpy2.RoundDown):
+        assert (mpfr_array([1]) / 3)[0] == gmpy2.div(1, 3)
+
+    pytest.raises(ValueError, lambda: a + mpfr_array([1, 2]))
+    pytest.raises(TypeError, lambda: a + 1j)
+    pytest.raises(TypeError, lambda: a + [1, 2, 3, 4, 5])
+
+
+def test_mpfr_array_context():
+    with gmpy2.context() as ctx:
+        r = mpfr_array([1, -1, 0]) / 0
+    assert gmpy2.is_nan(r[2]) and r[0] == gmpy2.inf()
+    assert ctx.divzero and ctx.invalid and not ctx.overflow
+
+    with gmpy2.context(trap_divzero=True):
+        pytest.raises(gmpy2.DivisionByZeroError, lambda: mpfr_array([1]) / 0)
+        assert (mpfr_array([1]) / 2)[0] == 0.5
+
+    with gmpy2.ieee(32) as ctx:
+        r = mpfr_array([1e30, 1e-30], 24) * 1e20
+        assert r[0] == gmpy2.inf() and r[1] == mpfr(1e-10, 24)
+    assert ctx.overflow
+
+    a = mpfr_array([1, 2])
+    with gmpy2.context(trap_inexact=True):
+        with pytest.raises(gmpy2.InexactResultError):
+            a[0] = '0.1'
+    assert a.tolist() == [1, 2]
+
+
+def test_mpfr_array_sum_dot():
+    a = mpfr_array([1e100, 1, -1e100, 0.5])
+    assert a.sum() == 1.5
+    assert gmpy2.fsum(a) == 1.5
+    assert mpfr_array().sum() == 0
+    b = mpfr_array([1, 2, 3, 4])
+    assert a.dot(b) == -2 * mpfr(1e100)
+    assert b.dot(b) == 30
+
+    with gmpy2.context(precision=200):
+        s = mpfr_array(['0.1'] * 10, 100).sum()
+        assert s.precision == 200
+        assert s == 10 * mpfr('0.1', 100)
+
+    pytest.raises(TypeError, lambda: a.dot([1, 2, 3, 4]))
+    pytest.raises(ValueError, lambda: a.dot(mpfr_array([1])))
+
+
+def test_mpfr_array_buffer():
+    a = mpfr_array([1, 2.5, '0.1', mpq(1, 3)], 100)
+    m = memoryview(a)
+    assert m.format == 'd' and m.itemsize == 8 and m.shape == (4,)
+    assert m.readonly
+    assert m.tolist() == [1.0, 2.5, 0.1, 1/3]
+    a[0] = 5
+    assert m.tolist() == [1.0, 2.5, 0.1, 1/3]
+    assert memoryview(a).tolist() == [5.0, 2.5, 0.1, 1/3]
+    assert list(array.array('d', bytes(a))) == [5.0, 2.5, 0.1, 1/3]
+    assert mpfr_array(array.array('d', [0.5, 1e300])).tolist() == [0.5, 1e300]
+    assert mpfr_array(memoryview(b'\x01\x02')).tolist() == [1, 2]
+    assert sys.getsizeof(mpfr_array(100)) < sum(sys.getsizeof(mpfr(0)) for i in range(100))
+
+
+def test_mpfr_array_numpy():
+    np = pytest.importorskip('numpy')
+
+    x = np.linspace(-1, 1, 7)
+    a = mpfr_array(x)
+    assert a.tolist() == list(x)
+    assert np.array_equal(np.asarray(a), x)
+    assert np.asarray(a).dtype == np.float64
+    assert np.array_equal(np.frombuffer(a), x)
+    assert mpfr_array(x[::2]).tolist() == list(x[::2])
+    pytest.raises(TypeError, lambda: mpfr_array(np.zeros((2, 2))))
+
+
+def test_mpfr_array_vmap():
+    a = mpfr_array(range(1, 50), 80)
+    r = gmpy2.vmap('log', a)
+    assert type(r) is mpfr_array and r.precision == 53
+    assert r.tolist() == [gmpy2.log(x) for x in a]
+    assert gmpy2.vmap('log', a, threads=4).tolist() == r.tolist()
+    with gmpy2.context(precision=100):
+        assert gmpy2.vmap('exp', a).precision == 100
+
+    ctx = gmpy2.context()
+    assert gmpy2.is_nan(ctx.vmap('sqrt', mpfr_array([-1, 4]))[0])
+    assert ctx.invalid
+    ctx = gmpy2.context(trap_invalid=True)
+    pytest.raises(gmpy2.InvalidOperationError,
+                  lambda: ctx.vmap('sqrt', mpfr_array([4, -1])))
+
+
+@given(lists(floats(allow_nan=False)), floats(allow_nan=False))
+def test_mpfr_array_hypothesis(x, y):
+    a = mpfr_array(x)
+    assert a.tolist() == x
+    # compare the repr so that inf - inf == nan is handled
+    assert list(map(repr, (a + y).tolist())) == [repr(mpfr(i) + y) for i in x]
+    assert list(map(repr, (a * a).tolist())) == [repr(mpfr(i) * i) for i in x]
+
+
+def test_mpfr_array_threads():
+    a = mpfr_array([0]*64, precision=200)
+    values = [mpfr_array([k]*64, precision=200) for k in range(8)]
+
+    def worker(k):
+        for _ in range(500):
+            a[:] = values[k]
+            assert len(set(a[:].tolist())) == 1
+
+    threads = [threading.Thread(target=worker, args=(k,)) for k in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(set(a.tolist())) == 1
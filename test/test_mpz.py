@@ -1,6 +1,7 @@
 import math
 import numbers
 import pickle
+import sys
 from fractions import Fraction
 
 import pytest
@@ -12,7 +13,8 @@ from supportclasses import a, b, c, d, q, z
 import gmpy2
 from gmpy2 import (cmp, cmp_abs, from_binary, is_nan, is_prime, mp_version,
                    mpc, mpfr, mpq, mpz, mpz_random, mpz_rrandomb, mpz_urandomb,
-                   next_prime, pack, random_state, to_binary, unpack, xmpz)
+                   next_prime, pack, pack_bytes, random_state, to_binary, unpack,
+                   unpack_bytes, xmpz)
 
 
 def test_mpz_to_bytes_interface():
@@ -149,6 +151,39 @@ def test_mpz_pickling():
             assert pickle.loads(pickle.dumps(x, protocol=proto)) == x
 
 
+def test_mpz_pickle_buffers():
+    big = mpz(3)**500000
+    for x in [big, -big, xmpz(big), mpq(big, big + 2), mpq(-big, 7)]:
+        for proto in range(pickle.HIGHEST_PROTOCOL + 1):
+            y = pickle.loads(pickle.dumps(x, protocol=proto))
+            assert type(y) is type(x) and y == x
+        buffers = []
+        data = pickle.dumps(x, protocol=5, buffer_callback=buffers.append)
+        assert len(data) < 100
+        assert len(buffers) == (2 if type(x) is mpq else 1)
+        y = pickle.loads(data, buffers=[b.raw() for b in buffers])
+        assert type(y) is type(x) and y == x
+        assert to_binary(y) == to_binary(x)
+
+    # The limbs of an mpz are not copied.
+    buffers = []
+    pickle.dumps(big, protocol=5, buffer_callback=buffers.append)
+    assert buffers[0].raw().tobytes() == big.limbs().tobytes()
+
+    # Small values use the same pickle for every protocol.
+    assert mpz(5).__reduce_ex__(5) == (gmpy2.from_binary, (to_binary(mpz(5)),))
+
+    x = xmpz(big)
+    data = pickle.dumps(x, protocol=5, buffer_callback=buffers.append)
+    x += 1
+    assert pickle.loads(data, buffers=[b.raw() for b in buffers[1:]]) == big
+
+    pytest.raises(ValueError, lambda: gmpy2._from_limbs(9, (8, 0, 1), b''))
+    pytest.raises(ValueError, lambda: gmpy2._from_limbs(1, (8, 0), b''))
+    pytest.raises(ValueError, lambda: gmpy2._from_limbs(1, (8, 0, 1), b'abc'))
+    pytest.raises(ValueError, lambda: gmpy2._from_limbs(3, (8, 0, 1), b'', b''))
+
+
 @settings(max_examples=1000)
 @given(integers(), integers())
 @example(0, 0)
@@ -222,6 +257,55 @@ def test_mpz_pack_unpack():
     raises(ValueError, lambda: unpack(-1, 1))
 
 
+@settings(max_examples=1000)
+@given(integers(), integers(min_value=1, max_value=40),
+       sampled_from(['big', 'little']), booleans())
+def test_mpz_pack_bytes(x, width, byteorder, signed):
+    values = [x, x // 3, -x, 0]
+    try:
+        expected = b''.join(v.to_bytes(width, byteorder, signed=signed)
+                            for v in values)
+    except OverflowError:
+        with raises(OverflowError):
+            pack_bytes(values, width, byteorder, signed=signed)
+        return
+    assert pack_bytes(values, width, byteorder, signed=signed) == expected
+    assert pack_bytes(map(mpz, values), width, byteorder,
+                      signed=signed) == expected
+    assert pack_bytes(gmpy2.mpz_array(values), width, byteorder,
+                      signed=signed) == expected
+    assert unpack_bytes(expected, width, None, byteorder,
+                        signed=signed) == values
+    assert unpack_bytes(expected, width, byteorder=byteorder, signed=signed,
+                        array=True).tolist() == values
+
+
+def test_mpz_pack_bytes_interface():
+    out = bytearray(10)
+    assert pack_bytes([1, 2], 4, 'little', out=out) == 8
+    assert out == b'\x01\0\0\0\x02\0\0\0\0\0'
+    assert unpack_bytes(out, 4, 2, 'little') == [1, 2]
+    assert unpack_bytes(memoryview(out)[4:], 2, 2, 'little') == [2, 0]
+    assert pack_bytes([], 3) == b''
+    assert unpack_bytes(b'', 3) == []
+    assert unpack_bytes(b'\xff\xff', 1, signed=True) == [-1, -1]
+
+    raises(OverflowError, lambda: pack_bytes([256], 1))
+    raises(OverflowError, lambda: pack_bytes([-1], 1))
+    raises(OverflowError, lambda: pack_bytes([128], 1, signed=True))
+    raises(TypeError, lambda: pack_bytes([1.5], 1))
+    raises(TypeError, lambda: pack_bytes(1, 1))
+    raises(ValueError, lambda: pack_bytes([1], 0))
+    raises(ValueError, lambda: pack_bytes([1], 1, 'middle'))
+    raises(ValueError, lambda: pack_bytes([1, 2], 4, out=bytearray(7)))
+    raises(BufferError, lambda: pack_bytes([1], 4, out=b'1234'))
+    raises(ValueError, lambda: unpack_bytes(b'abc', 2))
+    raises(ValueError, lambda: unpack_bytes(b'abc', 1, 4))
+    raises(ValueError, lambda: unpack_bytes(b'abc', 1, -1))
+    raises(ValueError, lambda: unpack_bytes(b'abc', 0))
+    raises(TypeError, lambda: unpack_bytes([1, 2], 1))
+
+
 def test_mpz_cmp():
     assert cmp(0, mpz(0)) == 0
     assert cmp(1, mpz(0)) == 1
@@ -1556,6 +1640,32 @@ def test_mpz_is_prime():
     assert not gmpy2.is_prime(-3)
 
 
+def test_mpz_is_prime_proven():
+    raises(TypeError, lambda: gmpy2.is_prime_proven())
+    raises(TypeError, lambda: gmpy2.is_prime_proven(1, 2))
+    raises(TypeError, lambda: gmpy2.is_prime_proven('a'))
+    raises(TypeError, lambda: gmpy2.is_prime(7, proof=True, n=3))
+    raises(TypeError, lambda: mpz(7).is_prime(proofs=True))
+
+    assert [n for n in range(-10, 3000) if gmpy2.is_prime_proven(n)] == \
+           [n for n in range(-10, 3000) if gmpy2.is_prime(n)]
+    for n in (561, 3215031751, 3825123056546413051, 318665857834031151167461):
+        assert not gmpy2.is_prime_proven(n)
+
+    p = 80**81 + 81**80
+    q = gmpy2.next_prime(mpz(10)**100)
+    assert gmpy2.is_prime_proven(p)
+    assert gmpy2.is_prime_proven(q)
+    assert gmpy2.is_prime_proven(xmpz(2**127 - 1))
+    assert not gmpy2.is_prime_proven(p * q)
+    assert gmpy2.is_prime(p, proof=True)
+    assert gmpy2.is_prime(p, 1, proof=True)
+    assert not gmpy2.is_prime(p * q, proof=True)
+    assert mpz(q).is_prime(proof=True)
+    assert not mpz(-q).is_prime(proof=True)
+    assert not mpz(129).is_prime(proof=False)
+
+
 def test_mpz_is_probab_prime():
     raises(OverflowError, lambda: gmpy2.is_probab_prime(3,-3))
     raises(TypeError, lambda: gmpy2.is_probab_prime())
@@ -1796,3 +1906,27 @@ def test_mpz_array():
     raises(TypeError, lambda: m.__array__(int, dtype=None))
     raises(TypeError, lambda: m.__array__(int, None, copy=None))
     raises(TypeError, lambda: m.__array__(spam=123))
+
+
+def test_mpz_limbs():
+    bits = 8*gmpy2.xmpz.limb_size
+    x = mpz(2**(2*bits) + 2**bits + 7)
+    v = x.limbs()
+    assert v.readonly
+    assert v.ndim == 1
+    assert v.itemsize == gmpy2.xmpz.limb_size
+    assert v.tolist() == [7, 1, 1]
+    assert v.obj is not x
+    raises(TypeError, lambda: v.__setitem__(0, 1))
+    assert mpz(-7).limbs().tolist() == [7]
+    assert len(mpz(0).limbs()) == 0
+    assert bytes(mpz(1).limbs()) == (1).to_bytes(gmpy2.xmpz.limb_size, sys.byteorder)
+    assert mpz.from_bytes(bytes(x.limbs()), sys.byteorder) == x
+
+    numpy = pytest.importorskip('numpy')
+    dtype = numpy.dtype('u%d' % gmpy2.xmpz.limb_size)
+    assert numpy.frombuffer(x.limbs(), dtype=dtype).tolist() == [7, 1, 1]
+    # An mpz itself does not export a buffer, so numpy still treats it as
+    # an integer.
+    assert numpy.array(mpz(5)).shape == ()
+    assert numpy.array([mpz(1), mpz(2**70)]).dtype == object
@@ -0,0 +1,151 @@
+import io
+
+import pytest
+from hypothesis import given
+from hypothesis.strategies import integers, lists
+
+import gmpy2
+from gmpy2 import mpz, mpz_array, xmpz
+
+
+def test_mpz_array_init():
+    a = mpz_array([1, -2, mpz(3), xmpz(4), 2**100])
+    assert len(a) == 5
+    assert a.tolist() == [1, -2, 3, 4, 2**100]
+    assert all(type(x) is mpz for x in a)
+    assert list(a) == a.tolist()
+    assert len(mpz_array()) == 0
+    assert mpz_array(range(3)).tolist() == [0, 1, 2]
+    assert mpz_array(a) is a
+    assert repr(mpz_array([1, -2, 3])) == 'mpz_array([1, -2, 3])'
+    assert repr(mpz_array()) == 'mpz_array([])'
+
+    pytest.raises(TypeError, lambda: mpz_array([1, 2.0]))
+    pytest.raises(TypeError, lambda: mpz_array(1))
+    pytest.raises(TypeError, lambda: mpz_array([1], x=1))
+    pytest.raises(TypeError, lambda: hash(a))
+
+
+def test_mpz_array_getitem():
+    a = mpz_array([10, 20, 30, 40])
+    assert a[0] == 10
+    assert a[-1] == 40
+    assert a[1:3].tolist() == [20, 30]
+    assert a[::-2].tolist() == [40, 20]
+    assert a[5:].tolist() == []
+
+    pytest.raises(IndexError, lambda: a[4])
+    pytest.raises(IndexError, lambda: a[-5])
+    pytest.raises(TypeError, lambda: a['a'])
+
+
+def test_mpz_array_arithmetic():
+    a = mpz_array([7, -7, 0, 2**70])
+    b = mpz_array([2, 3, -5, 2**65 + 1])
+    x, y = a.tolist(), b.tolist()
+
+    assert (a + b).tolist() == [i + j for i, j in zip(x, y)]
+    assert (a - b).tolist() == [i - j for i, j in zip(x, y)]
+    assert (a * b).tolist() == [i * j for i, j in zip(x, y)]
+    assert (a // b).tolist() == [i // j for i, j in zip(x, y)]
+    assert (a % b).tolist() == [i % j for i, j in zip(x, y)]
+    assert (a + 1).tolist() == [i + 1 for i in x]
+    assert (1 - a).tolist() == [1 - i for i in x]
+    assert (mpz(100) // b).tolist() == [100 // j for j in y]
+    assert (a ** 3).tolist() == [i ** 3 for i in x]
+    assert (2 ** mpz_array([0, 1, 100])).tolist() == [1, 2, 2**100]
+
+    pytest.raises(ZeroDivisionError, lambda: a // mpz_array([1, 0, 1, 1]))
+    pytest.raises(ZeroDivisionError, lambda: a % 0)
+    pytest.raises(ValueError, lambda: a + mpz_array([1, 2]))
+    pytest.raises(ValueError, lambda: a ** -1)
+    pytest.raises(ValueError, lambda: a ** 2**100)
+    pytest.raises(TypeError, lambda: a + 1.5)
+    pytest.raises(TypeError, lambda: a + [1, 2, 3, 4])
+
+
+def test_mpz_array_powmod():
+    a = mpz_array([2, 3, -4, 10**20])
+    e = mpz_array([5, -1, 7, 3])
+    m = mpz_array([7, 11, 13, -17])
+    assert pow(a, e, m).tolist() == [pow(int(i), int(j), int(k))
+                                     for i, j, k in zip(a, e, m)]
+    assert a.powmod(3, 1000).tolist() == [pow(int(i), 3, 1000) for i in a]
+    assert a.powmod(e, 101).tolist() == [pow(int(i), int(j), 101)
+                                         for i, j in zip(a, e)]
+
+    pytest.raises(ValueError, lambda: pow(a, 2, 0))
+    pytest.raises(ValueError, lambda: a.powmod(-1, 4))
+    pytest.raises(TypeError, lambda: a.powmod(1))
+    pytest.raises(TypeError, lambda: a.powmod(1, 2.0))
+
+
+def test_mpz_array_gcd():
+    a = mpz_array([12, -18, 0, 7])
+    assert a.gcd(mpz_array([8, 12, 5, 0])).tolist() == [4, 6, 5, 7]
+    assert a.gcd(6).tolist() == [6, 6, 6, 1]
+    pytest.raises(TypeError, lambda: a.gcd(1.0))
+
+
+def test_mpz_array_richcompare():
+    a = mpz_array([1, 2, 3])
+    b = mpz_array([3, 2, 1])
+    assert (a == b) is False
+    assert (a != b) is True
+    assert (a == mpz_array([1, 2, 3])) is True
+    assert (a != mpz_array([1, 2, 3])) is False
+    assert a != mpz_array([1, 2])
+    assert a != mpz_array([1, 2, 3, 4])
+    assert mpz_array() == mpz_array()
+    assert mpz_array([2**100]) == mpz_array([2**100])
+    assert mpz_array([2**100]) != mpz_array([-2**100])
+    assert (a == [1, 2, 3]) is False
+    assert (a == 'a') is False
+    assert a[1:2] == mpz_array([2])
+    pytest.raises(TypeError, lambda: a < b)
+    pytest.raises(TypeError, lambda: a >= 2)
+
+    assert a.cmp(b) == mpz_array([-1, 0, 1])
+    assert a.cmp(2) == mpz_array([-1, 0, 1])
+    assert a.cmp(mpz(2**100)).tolist() == [-1, -1, -1]
+    assert mpz_array([2**100, -2**100]).cmp(0).tolist() == [1, -1]
+    assert mpz_array().cmp(1) == mpz_array()
+    pytest.raises(ValueError, lambda: a.cmp(mpz_array([1])))
+    pytest.raises(TypeError, lambda: a.cmp(1.0))
+
+
+@given(lists(integers()), integers())
+def test_mpz_array_hypothesis(x, y):
+    a = mpz_array(x)
+    assert a.tolist() == x
+    assert (a + y).tolist() == [i + y for i in x]
+    assert (a * a).tolist() == [i * i for i in x]
+    if y:
+        assert (a % y).tolist() == [i % y for i in x]
+
+
+def test_mpz_array_save_open(tmp_path):
+    x = [0, 1, -1, 2**64, -3**200, 12345]
+    path = tmp_path / 'a.bin'
+    mpz_array(x).save(str(path))
+    a = mpz_array.open(path)
+    assert type(a) is mpz_array
+    assert a.tolist() == x
+    assert (a * 2).tolist() == [i * 2 for i in x]
+    assert a[2:].tolist() == x[2:]
+    assert a.__sizeof__() < mpz_array(x).__sizeof__()
+
+    f = io.BytesIO()
+    mpz_array(x).save(f)
+    assert f.getvalue() == path.read_bytes()
+
+    mpz_array().save(path)
+    assert len(mpz_array.open(str(path))) == 0
+
+    data = f.getvalue()
+    for bad in (data[:10], b'x' * len(data), data[:-1], data + bytes(8),
+                data[:6] + b'Z\x02' + data[8:], data[:16] + b'\x07' + data[17:]):
+        path.write_bytes(bad)
+        pytest.raises(ValueError, lambda: mpz_array.open(path))
+    pytest.raises(FileNotFoundError, lambda: mpz_array.open(tmp_path / 'none'))
+    pytest.raises(TypeError, lambda: mpz_array(x).save(None))
@@ -0,0 +1,76 @@
+import pickle
+
+import pytest
+from hypothesis import given, settings
+from hypothesis.strategies import integers
+
+from gmpy2 import mpz, powmod_fixed_base, xmpz
+
+
+def test_powmod_fixed_base_init():
+    F = powmod_fixed_base(-2, 1009, 64)
+    assert F.base == 1007
+    assert type(F.base) is mpz
+    assert F.modulus == 1009
+    assert F.max_exp_bits == 64
+    assert repr(F) == 'powmod_fixed_base(1007, 1009, 64)'
+    assert powmod_fixed_base(xmpz(3), xmpz(8), mpz(5)).modulus == 8
+
+    pytest.raises(ValueError, lambda: powmod_fixed_base(2, 0, 64))
+    pytest.raises(ValueError, lambda: powmod_fixed_base(2, -7, 64))
+    pytest.raises(ValueError, lambda: powmod_fixed_base(2, 7, 0))
+    pytest.raises(OverflowError, lambda: powmod_fixed_base(2, 7, -1))
+    pytest.raises(TypeError, lambda: powmod_fixed_base(2, 7.0, 64))
+    pytest.raises(TypeError, lambda: powmod_fixed_base(2, 7))
+    pytest.raises(TypeError, lambda: powmod_fixed_base(2, 7, max_exp_bits=8))
+    pytest.raises(ValueError, lambda: powmod_fixed_base(3, 2**2048 - 1, 2**22))
+    pytest.raises(ValueError, lambda: powmod_fixed_base(3, 7, 2**64 - 1))
+
+    F2 = pickle.loads(pickle.dumps(F))
+    assert type(F2) is powmod_fixed_base
+    assert repr(F2) == repr(F)
+    assert F2(12345) == F(12345)
+
+
+def test_powmod_fixed_base_call():
+    for m in (mpz(2)**521 - 1, mpz(2)**300, 1000, 1):
+        g = mpz(3)**200 + 1
+        F = powmod_fixed_base(g, m, 256)
+        for e in (0, 1, 2, 65537, 2**255 + 12345, 2**256 - 1, 2**256,
+                  3**400, mpz(7)**60, xmpz(11)):
+            assert F(e) == pow(g, e, m)
+
+    F = powmod_fixed_base(3, 1009, 32)
+    assert F(-5) == pow(3, -5, 1009)
+    assert F(-2**40) == pow(3, -2**40, 1009)
+
+    F = powmod_fixed_base(6, 15, 32)
+    pytest.raises(ValueError, lambda: F(-1))
+    pytest.raises(TypeError, lambda: F(1.0))
+    pytest.raises(TypeError, lambda: F())
+    pytest.raises(TypeError, lambda: F(1, 2))
+
+
+def test_powmod_fixed_base_batch():
+    m = mpz(2)**1279 - 1
+    F = powmod_fixed_base(7, m, 1279)
+    exps = [mpz(3)**i - 5 * i for i in range(100)]
+    res = [pow(7, e, m) for e in exps]
+
+    assert F.batch(exps) == res
+    for threads in (2, 3, 8):
+        assert F.batch(exps, threads=threads) == res
+    assert F.batch([]) == []
+
+    pytest.raises(TypeError, lambda: F.batch([1, 2.0]))
+    pytest.raises(TypeError, lambda: F.batch(exps, thread=2))
+    pytest.raises(ValueError, lambda: F.batch(exps, threads=0))
+    pytest.raises(ValueError, lambda: powmod_fixed_base(6, 15, 8).batch([1, -1]))
+
+
+@settings(max_examples=200)
+@given(integers(), integers(min_value=1), integers(min_value=1, max_value=400),
+       integers(min_value=0, max_value=2**400))
+def test_powmod_fixed_base_hypothesis(g, m, bits, e):
+    F = powmod_fixed_base(g, m, bits)
+    assert F(e) == pow(g, e, m)
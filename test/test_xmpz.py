@@ -1,3 +1,4 @@
+import threading
 from ctypes import memmove
 
 import pytest
@@ -52,6 +53,49 @@ def test_xmpz_limbs():
     assert int(y) == 987654321
 
 
+def test_xmpz_limbs_view():
+    bits = 8*xmpz.limb_size
+    x = xmpz(2**bits + 3)
+
+    with x.limbs() as v:
+        assert not v.readonly
+        assert v.itemsize == xmpz.limb_size
+        assert v.tolist() == [3, 1]
+        v[0] = 9
+        pytest.raises(BufferError, lambda: x.__iadd__(1))
+        pytest.raises(BufferError, lambda: x.__ilshift__(1))
+        pytest.raises(BufferError, lambda: x.__setitem__(0, 0))
+        pytest.raises(BufferError, lambda: x.make_mpz())
+        pytest.raises(BufferError, lambda: -x)
+        pytest.raises(BufferError, lambda: x.limbs_write(4))
+        assert x == 2**bits + 9
+    x += 1
+    assert x == 2**bits + 10
+
+    with x.limbs() as v:
+        v[1] = 0
+    assert x == 10
+    assert x.num_limbs() == 1
+
+    x = xmpz(-2**bits)
+    with x.limbs() as v:
+        v[0], v[1] = 5, 0
+    assert x == -5
+
+    x = xmpz(0)
+    with x.limbs() as v:
+        assert len(v) == 0
+    x += 1
+    assert x == 1
+
+    v1, v2 = x.limbs(), x.limbs()
+    v1.release()
+    pytest.raises(BufferError, lambda: x.__iadd__(1))
+    v2.release()
+    x += 1
+    assert x == 2
+
+
 def test_xmpz_attributes():
     x = xmpz(10)
 
@@ -439,3 +483,26 @@ def test_xmpz_to_from_binary(x):
     x = xmpz(x)
 
     assert from_binary(to_binary(x)) == x
+
+
+def test_xmpz_threads():
+    x, y = xmpz(0), xmpz(0)
+
+    def worker(k):
+        z = x
+        for i in range(2000):
+            z += 3
+            z -= 1
+            y[64*k + i % 64] = 1
+            if i % 100 == 0:
+                with x.limbs():
+                    pass
+
+    threads = [threading.Thread(target=worker, args=(k,)) for k in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert x == 8*2000*2
+    assert y == 2**512 - 1